@@ -201,6 +201,33 @@ def register_core_options():
         section="runner", key="identifier_format", default="{uri}", help_msg=help_msg
     )
 
+    help_msg = (
+        "The amount of time (in seconds) between the first reports of a "
+        "runner that a test is still running.  The interval doubles after "
+        'each report, up to "runner.heartbeat.max_interval", and goes back '
+        "to this value whenever the test produces any other status (such "
+        "as output)."
+    )
+    stgs.register_option(
+        section="runner.heartbeat",
+        key="interval",
+        key_type=float,
+        default=0.5,
+        help_msg=help_msg,
+    )
+
+    help_msg = (
+        "The maximum amount of time (in seconds) between the reports of a "
+        "runner that a test is still running."
+    )
+    stgs.register_option(
+        section="runner.heartbeat",
+        key="max_interval",
+        key_type=float,
+        default=5.0,
+        help_msg=help_msg,
+    )
+
     help_msg = "List of test references (aliases or paths)"
     stgs.register_option(
         section="resolver",
@@ -210,6 +237,20 @@ def register_core_options():
         help_msg=help_msg,
     )
 
+    help_msg = (
+        "Number of processes used to resolve test references.  With more "
+        "than one, references (such as the files found in directories) are "
+        "resolved in parallel, in batches of consecutive references, and "
+        "their resolutions are kept in the same order."
+    )
+    stgs.register_option(
+        section="resolver",
+        key="parallel",
+        key_type=int,
+        default=1,
+        help_msg=help_msg,
+    )
+
     help_msg = (
         "Selects the runner implementation from one of the "
         "installed and active implementations.  You can run "
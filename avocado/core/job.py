@@ -17,7 +17,6 @@
 Job module - describes a sequence of automated test operations.
 """
 
-
 import datetime
 import logging
 import os
@@ -175,6 +174,15 @@ class Job:
         self.status = "RUNNING"
         self.result = None
         self.interrupted_reason = None
+        #: Functions given the runnable of a task, which must all return
+        #: True before the task is started.  Plugins running before the
+        #: tests may add to these, to hold tests back until what they
+        #: need is ready
+        self.task_start_checks = []
+        #: Called, from any thread, when what the start checks wait for
+        #: may have become ready, so that the tests held back by them are
+        #: checked again.  Set by the runner while the tests run
+        self.task_start_recheck = None
 
         self._timeout = None
         self._unique_id = None
@@ -3,7 +3,11 @@ import inspect
 import json
 import os
 import re
+import select
+import signal
+import socket
 import sys
+import traceback
 
 import pkg_resources
 
@@ -123,6 +127,13 @@ class BaseRunnerApp:
         (("recipe",), {"type": str, "help": "Path to the task recipe file"}),
     )
 
+    CMD_TASK_SERVER_ARGS = (
+        (
+            ("path",),
+            {"type": str, "help": "Path of the UNIX domain socket to listen on"},
+        ),
+    )
+
     CMD_STATUS_SERVER_ARGS = (
         (("uri",), {"type": str, "help": "URI to bind a status server to"}),
     )
@@ -303,3 +314,129 @@ class BaseRunnerApp:
         task = Task.from_recipe(args.get("recipe"))
         for status in task.run():
             self.echo(status)
+
+    def _task_server_fork(self, connection, close_fds):
+        """Forks a process that runs the task requested on a connection.
+
+        :returns: the PID of the forked process, or None on failures
+        """
+        try:
+            with connection.makefile("rb") as request:
+                task_args = json.loads(request.readline())
+        except (OSError, ValueError):
+            return None
+        pid = os.fork()
+        if pid:
+            return pid
+        # the forked process should look like a newly started runner
+        status = 1
+        try:
+            for fd in close_fds:
+                os.close(fd)
+            connection.close()
+            signal.set_wakeup_fd(-1)
+            signal.signal(signal.SIGCHLD, signal.SIG_DFL)
+            null = os.open(os.devnull, os.O_RDONLY)
+            os.dup2(null, sys.stdin.fileno())
+            os.close(null)
+            args = vars(self.parser.parse_args(["task-run"] + task_args))
+            self.command_task_run(args)
+            status = 0
+        except BaseException:  # pylint: disable=W0703
+            traceback.print_exc()
+        finally:
+            sys.stdout.flush()
+            sys.stderr.flush()
+            os._exit(status)  # pylint: disable=W0212
+
+    def command_task_server(self, args):
+        """
+        Runs tasks, requested on a UNIX domain socket, in forked processes
+
+        The runners for the kinds of runnables this application is capable
+        of are imported once, before any task is requested, so that each
+        task only pays the price of a fork, instead of the start up of a
+        new runner process.
+
+        A task is requested by connecting to the socket and sending the
+        "task-run" command arguments as a JSON list, in a single line.
+        The server replies with the PID of the process running the task,
+        and later with its exit code, each in a line, and closes the
+        connection.
+
+        The server stops when its standard input is closed.
+
+        :param args: parsed command line arguments turned into a dictionary
+        :type args: dict
+        """
+        for kind in self.RUNNABLE_KINDS_CAPABLE:
+            Runnable.pick_runner_class_from_entry_point_kind(kind)
+
+        # SIGCHLD wakes up the server, so that exit codes are sent promptly
+        wakeup_read, wakeup_write = os.pipe()
+        os.set_blocking(wakeup_read, False)
+        os.set_blocking(wakeup_write, False)
+        signal.set_wakeup_fd(wakeup_write)
+        signal.signal(signal.SIGCHLD, lambda signum, frame: None)
+
+        connections = {}
+        path = args.get("path")
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+            server.bind(path)
+            server.listen()
+            self.echo(json.dumps({"status": "listening", "path": path}))
+            sys.stdout.flush()
+            # just like tasks run by standalone runners, the output of
+            # forked processes is not collected
+            null = os.open(os.devnull, os.O_WRONLY)
+            os.dup2(null, sys.stdout.fileno())
+            os.close(null)
+            stdin = sys.stdin.fileno()
+            close_fds = (server.fileno(), wakeup_read, wakeup_write)
+            try:
+                while True:
+                    readable, _, _ = select.select([server, wakeup_read, stdin], [], [])
+                    if stdin in readable and not os.read(stdin, 4096):
+                        break
+                    if wakeup_read in readable:
+                        try:
+                            while os.read(wakeup_read, 4096):
+                                pass
+                        except BlockingIOError:
+                            pass
+                    if server in readable:
+                        connection, _ = server.accept()
+                        # the forked process shouldn't hold any of the
+                        # server's resources, including other connections
+                        pid = self._task_server_fork(
+                            connection,
+                            close_fds + tuple(c.fileno() for c in connections.values()),
+                        )
+                        if pid is None:
+                            connection.close()
+                        else:
+                            connection.sendall(f"{pid}\n".encode())
+                            connections[pid] = connection
+                    self._task_server_reap(connections)
+            finally:
+                os.unlink(path)
+
+    @staticmethod
+    def _task_server_reap(connections):
+        while connections:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+            connection = connections.pop(pid, None)
+            if connection is None:
+                continue
+            try:
+                returncode = os.waitstatus_to_exitcode(status)
+                connection.sendall(f"{returncode}\n".encode())
+            except OSError:
+                pass
+            finally:
+                connection.close()
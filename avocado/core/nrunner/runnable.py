@@ -1,11 +1,14 @@
 import base64
 import collections
 import copy
+import importlib.util
 import json
 import logging
 import os
+import shutil
 import subprocess
 import sys
+import tempfile
 import warnings
 
 import pkg_resources
@@ -21,6 +24,7 @@ from avocado.core.dependencies.dependency import Dependency
 from avocado.core.nrunner.config import ConfigDecoder, ConfigEncoder
 from avocado.core.settings import settings
 from avocado.core.utils.eggenv import get_python_path_env_if_egg
+from avocado.core.version import VERSION
 
 LOG = logging.getLogger(__name__)
 
@@ -31,6 +35,10 @@ RUNNERS_REGISTRY_STANDALONE_EXECUTABLE = {}
 #: The configuration that is known to be used by standalone runners
 STANDALONE_EXECUTABLE_CONFIG_USED = {}
 
+#: Name of the file, within the "cache" directory of the data directory,
+#: that keeps the capabilities of runner commands across Avocado executions
+RUNNERS_CAPABILITIES_CACHE_FILENAME = "runners_capabilities.json"
+
 #: Location used for schemas when packaged (as in RPMs)
 SYSTEM_WIDE_SCHEMA_PATH = "/usr/share/avocado/schemas"
 
@@ -512,9 +520,31 @@ class Runnable:
 
         In case of failures, an empty capabilities dictionary is returned.
 
+        The capabilities are first looked up in the persistent capabilities
+        cache (see :class:`RunnerCapabilitiesCache`), and only if not found
+        there (or if the cached entry is stale), the runner is executed.
+
         When the capabilities are obtained, it also updates the
         :data:`STANDALONE_EXECUTABLE_CONFIG_USED` info.
         """
+        capabilities_cache = RunnerCapabilitiesCache()
+        capabilities = capabilities_cache.get(runner_command)
+        if capabilities is None:
+            capabilities = Runnable._probe_capabilities(runner_command, env)
+            if capabilities:
+                capabilities_cache.set(runner_command, capabilities)
+
+        # lists are not hashable, and here it'd make more sense to have
+        # a command as it'd be seen in a command line anyway
+        cmd = " ".join(runner_command)
+        if cmd not in STANDALONE_EXECUTABLE_CONFIG_USED:
+            STANDALONE_EXECUTABLE_CONFIG_USED[cmd] = capabilities.get(
+                "configuration_used", []
+            )
+        return capabilities
+
+    @staticmethod
+    def _probe_capabilities(runner_command, env=None):
         cmd = runner_command + ["capabilities"]
         try:
             process = subprocess.Popen(
@@ -529,18 +559,9 @@ class Runnable:
         out, _ = process.communicate()
 
         try:
-            capabilities = json.loads(out.decode())
+            return json.loads(out.decode())
         except json.decoder.JSONDecodeError:
-            capabilities = {}
-
-        # lists are not hashable, and here it'd make more sense to have
-        # a command as it'd be seen in a command line anyway
-        cmd = " ".join(runner_command)
-        if cmd not in STANDALONE_EXECUTABLE_CONFIG_USED:
-            STANDALONE_EXECUTABLE_CONFIG_USED[cmd] = capabilities.get(
-                "configuration_used", []
-            )
-        return capabilities
+            return {}
 
     @staticmethod
     def is_kind_supported_by_runner_command(
@@ -681,3 +702,172 @@ class Runnable:
         if runner is not None:
             return runner
         raise ValueError(f"Unsupported kind of runnable: {self.kind}")
+
+
+class RunnerCapabilitiesCache:
+    """Persistent cache of the capabilities of runner commands.
+
+    Probing the capabilities of a runner means executing it, which for
+    runners written in Python, means starting a new interpreter.  This
+    keeps the capabilities of runners in a file shared by all Avocado
+    processes (such as the job and the spawned tasks), so that probes
+    are paid once per installation.
+
+    Only the kinds of commands picked by :meth:`Runnable.pick_runner_command`,
+    that is, a standalone executable or a Python module run with
+    ``python -m``, are cached.  Each entry is keyed by the command, and
+    is valid as long as the Avocado version, and the path, modification
+    time and size of the runner executable (and of the module of its
+    entry point, for console scripts) or module file match.
+    """
+
+    def __init__(self, path=None):
+        """Initializes a new RunnerCapabilitiesCache
+
+        :param path: the path of the cache file.  If not given, it's
+                     placed within the "cache" directory of the data
+                     directory (set in "datadir.paths.data_dir"), apart
+                     from the assets.  If that's not set, the cache is
+                     disabled
+        :type path: str
+        """
+        if path is None:
+            data_dir = settings.as_dict().get("datadir.paths.data_dir")
+            if data_dir:
+                path = os.path.join(
+                    os.path.expanduser(data_dir),
+                    "cache",
+                    RUNNERS_CAPABILITIES_CACHE_FILENAME,
+                )
+        self.path = path
+
+    @staticmethod
+    def _get_module_path(module_name):
+        try:
+            spec = importlib.util.find_spec(module_name)
+        except (ImportError, ValueError):
+            return None
+        if spec is not None:
+            return spec.origin
+        return None
+
+    @classmethod
+    def _get_runner_paths(cls, runner_command):
+        """Returns the paths of the files run by a runner command.
+
+        Those are the runner executable, along with the module of its
+        entry point if it's a console script, or the runner module.
+
+        :rtype: list of str
+        """
+        if len(runner_command) == 1:
+            path = shutil.which(runner_command[0])
+            if path is None:
+                return []
+            paths = [path]
+            # the console script wrapper doesn't change with the runner
+            for ep in pkg_resources.iter_entry_points(
+                "console_scripts", os.path.basename(path)
+            ):
+                module_path = cls._get_module_path(ep.module_name)
+                if module_path is not None:
+                    paths.append(module_path)
+                break
+            return paths
+        if len(runner_command) == 3 and runner_command[:2] == [sys.executable, "-m"]:
+            path = cls._get_module_path(runner_command[2])
+            if path is not None:
+                return [path]
+        return []
+
+    def _get_stamp(self, runner_command):
+        """Returns what identifies the runner in its current state.
+
+        :rtype: list or None
+        """
+        paths = self._get_runner_paths(runner_command)
+        if not paths:
+            return None
+        stamp = []
+        for path in paths:
+            try:
+                stat = os.stat(path)
+            except OSError:
+                return None
+            stamp.append([path, stat.st_mtime_ns, stat.st_size])
+        return stamp
+
+    def _load(self):
+        try:
+            with open(self.path, "r", encoding="utf-8") as cache_file:
+                cache = json.load(cache_file)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(cache, dict) or cache.get("version") != VERSION:
+            return {}
+        return cache.get("commands", {})
+
+    def get_all(self):
+        """Returns all cached entries, valid or not, keyed by command.
+
+        :rtype: dict
+        """
+        if self.path is None:
+            return {}
+        return self._load()
+
+    def clear(self):
+        """Removes all cached entries."""
+        if self.path is not None and os.path.exists(self.path):
+            os.remove(self.path)
+
+    def get(self, runner_command):
+        """Returns the cached capabilities of a runner command.
+
+        :param runner_command: the runner command, without the
+                               "capabilities" argument
+        :type runner_command: list of str
+        :returns: the capabilities, or None if not cached or stale
+        :rtype: dict or None
+        """
+        if self.path is None:
+            return None
+        entry = self._load().get(" ".join(runner_command))
+        if entry is None:
+            return None
+        stamp = self._get_stamp(runner_command)
+        if stamp is None or entry.get("stamp") != stamp:
+            return None
+        return entry.get("capabilities")
+
+    def set(self, runner_command, capabilities):
+        """Saves the capabilities of a runner command, if it can be cached.
+
+        :param runner_command: the runner command, without the
+                               "capabilities" argument
+        :type runner_command: list of str
+        :param capabilities: the capabilities as reported by the runner
+        :type capabilities: dict
+        """
+        if self.path is None:
+            return
+        stamp = self._get_stamp(runner_command)
+        if stamp is None:
+            return
+        commands = self._load()
+        commands[" ".join(runner_command)] = {
+            "stamp": stamp,
+            "capabilities": capabilities,
+        }
+        directory = os.path.dirname(self.path)
+        try:
+            os.makedirs(directory, exist_ok=True)
+            # writes are atomic, so concurrent readers never see a
+            # partially written cache
+            with tempfile.NamedTemporaryFile(
+                "w", encoding="utf-8", dir=directory, delete=False
+            ) as cache_file:
+                json.dump({"version": VERSION, "commands": commands}, cache_file)
+            os.replace(cache_file.name, self.path)
+        except OSError as details:
+            LOG.debug("Could not save the runner capabilities cache: %s", details)
@@ -10,6 +10,11 @@ RUNNER_RUN_CHECK_INTERVAL = 0.01
 #: runner that performs its work asynchronously
 RUNNER_RUN_STATUS_INTERVAL = 0.5
 
+#: The maximum amount of time (in seconds) between "running" status
+#: reports (heartbeats) from a runner whose runnable has been running
+#: for a while without anything else to report
+RUNNER_RUN_STATUS_MAX_INTERVAL = 5.0
+
 
 def check_runnables_runner_requirements(runnables, runners_registry=None):
     """
@@ -40,6 +45,73 @@ def check_runnables_runner_requirements(runnables, runners_registry=None):
     return (ok, missing)
 
 
+class Heartbeat:
+    """Paces the "running" status reports (heartbeats) of a runner.
+
+    The interval between heartbeats starts at a given value, and doubles
+    after each heartbeat, up to a maximum value.  Whenever the runner
+    reports anything else, the interval goes back to its starting value.
+    """
+
+    def __init__(
+        self,
+        interval=RUNNER_RUN_STATUS_INTERVAL,
+        max_interval=RUNNER_RUN_STATUS_MAX_INTERVAL,
+    ):
+        """Instantiates a new Heartbeat.
+
+        :param interval: the starting interval, in seconds
+        :type interval: float
+        :param max_interval: the maximum interval, in seconds
+        :type max_interval: float
+        """
+        self.interval = interval
+        self.max_interval = max(interval, max_interval)
+        self._current_interval = interval
+        self._next = time.monotonic() + interval
+
+    @classmethod
+    def from_config(cls, config):
+        """Creates a Heartbeat from a runnable configuration.
+
+        :param config: a runnable configuration, which may contain the
+                       "runner.heartbeat.interval" and
+                       "runner.heartbeat.max_interval" keys
+        :type config: dict
+        """
+        interval = config.get("runner.heartbeat.interval")
+        if interval is None:
+            interval = RUNNER_RUN_STATUS_INTERVAL
+        max_interval = config.get("runner.heartbeat.max_interval")
+        if max_interval is None:
+            max_interval = RUNNER_RUN_STATUS_MAX_INTERVAL
+        return cls(float(interval), float(max_interval))
+
+    def is_due(self):
+        """Checks if a heartbeat is due, and if so, schedules the next one.
+
+        :rtype: bool
+        """
+        now = time.monotonic()
+        if now < self._next:
+            return False
+        self._current_interval = min(self._current_interval * 2, self.max_interval)
+        self._next = now + self._current_interval
+        return True
+
+    def get_remaining(self):
+        """Returns the amount of time, in seconds, until the next heartbeat.
+
+        :rtype: float
+        """
+        return max(self._next - time.monotonic(), 0.0)
+
+    def reset(self):
+        """Signals that the runner has reported something else."""
+        self._current_interval = self.interval
+        self._next = time.monotonic() + self.interval
+
+
 class BaseRunner(RunnableRunner):
 
     #: The "main Avocado" configuration keys (AKA namespaces) that
@@ -66,23 +138,27 @@ class BaseRunner(RunnableRunner):
         status.update({"status": status_type, "time": time.monotonic()})
         return status
 
-    def running_loop(self, condition):
+    def running_loop(self, condition, heartbeat=None, wait=None):
         """Produces timely running messages until end condition is found.
 
         :param condition: a callable that will be evaluated as a
                           condition for continuing the loop
+        :param heartbeat: paces the running messages.  If not given, one
+                          with the default intervals is used
+        :type heartbeat: :class:`Heartbeat`
+        :param wait: a callable that blocks until the end condition may
+                     have been met, for at most the amount of time (in
+                     seconds) given as its argument, which is the time
+                     until the next heartbeat.  If not given, the end
+                     condition is checked every
+                     :data:`RUNNER_RUN_CHECK_INTERVAL`
         """
-        most_current_execution_state_time = None
+        if heartbeat is None:
+            heartbeat = Heartbeat()
         while not condition():
-            now = time.monotonic()
-            if most_current_execution_state_time is not None:
-                next_execution_state_mark = (
-                    most_current_execution_state_time + RUNNER_RUN_STATUS_INTERVAL
-                )
-            if (
-                most_current_execution_state_time is None
-                or now > next_execution_state_mark
-            ):
-                most_current_execution_state_time = now
+            if heartbeat.is_due():
                 yield self.prepare_status("running")
-            time.sleep(RUNNER_RUN_CHECK_INTERVAL)
+            if wait is None:
+                time.sleep(RUNNER_RUN_CHECK_INTERVAL)
+            else:
+                wait(heartbeat.get_remaining())
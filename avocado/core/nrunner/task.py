@@ -1,6 +1,7 @@
 import base64
 import json
 import logging
+import select
 import socket
 import tempfile
 import time
@@ -10,6 +11,11 @@ from avocado.core.nrunner.runnable import (
     RUNNERS_REGISTRY_STANDALONE_EXECUTABLE,
     Runnable,
 )
+from avocado.core.status.utils import (
+    FRAMES_HANDSHAKE,
+    FRAMES_HANDSHAKE_REPLY,
+    frame_encode,
+)
 
 LOG = logging.getLogger(__name__)
 
@@ -17,6 +23,15 @@ LOG = logging.getLogger(__name__)
 #: task results to be included in the job results
 TASK_DEFAULT_CATEGORY = "test"
 
+#: Maximum amount of time, in seconds, that a "running" status message
+#: is held back to be sent together with others in a single frame
+STATUS_FRAME_MAX_DELAY = 0.1
+
+#: Maximum amount of time, in seconds, to wait for the status server to
+#: reply to the frames handshake when closing the connection.  It's short,
+#: as servers of older versions never reply.
+STATUS_HANDSHAKE_TIMEOUT = 0.5
+
 
 class StatusEncoder(json.JSONEncoder):
 
@@ -35,12 +50,27 @@ class TaskStatusService:
     """
     Implementation of interface that a task can use to post status updates
 
+    Status updates are sent as JSON lines, unless the status server
+    acknowledges, right after the connection, that it accepts frames.  In
+    that case, messages are sent in frames, with their raw data (such as
+    the content of logs) carried as is.  "Running" messages without any
+    output are held back for a short while, and sent together with the
+    following ones in a single frame.  Messages carrying output are never
+    held back, so that it's not lost if the task is killed.
+
     TODO: make the interface generic and this just one of the implementations
     """
 
-    def __init__(self, uri):
+    def __init__(self, uri, use_frames=True):
         self.uri = uri
         self._connection = None
+        #: Whether frames should be used if the server accepts them
+        self._use_frames = use_frames
+        #: Whether the server has acknowledged that it accepts frames
+        self._frames = False
+        self._handshake_reply = b""
+        self._pending = []
+        self._pending_since = None
 
     @property
     def connection(self):
@@ -67,23 +97,89 @@ class TaskStatusService:
         else:
             self._connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
             self._connection.connect(self.uri)
+        self._frames = False
+        self._handshake_reply = b""
+        if self._use_frames:
+            self._connection.sendall(FRAMES_HANDSHAKE)
+
+    def _check_handshake_reply(self, timeout=0):
+        """Checks if the server has accepted frames.
+
+        :param timeout: how long to wait for the server's reply, by default
+                        not blocking at all
+        :type timeout: float
+        """
+        deadline = time.monotonic() + timeout
+        while len(self._handshake_reply) < len(FRAMES_HANDSHAKE_REPLY):
+            remaining = max(deadline - time.monotonic(), 0)
+            readable, _, _ = select.select([self.connection], [], [], remaining)
+            if not readable:
+                return
+            data = self.connection.recv(
+                len(FRAMES_HANDSHAKE_REPLY) - len(self._handshake_reply)
+            )
+            if not data:
+                return
+            self._handshake_reply += data
+        self._frames = self._handshake_reply == FRAMES_HANDSHAKE_REPLY
+
+    def _should_hold(self, status):
+        if status.get("status") != "running" or "log" in status:
+            return False
+        if self._pending_since is None:
+            return True
+        return time.monotonic() - self._pending_since < STATUS_FRAME_MAX_DELAY
+
+    def _send(self, status):
+        if self._use_frames and not self._frames:
+            self._check_handshake_reply()
+        if not self._frames:
+            data = json_dumps(status)
+            self.connection.send(data.encode("ascii") + "\n".encode("ascii"))
+            return
+        self._pending.append(status)
+        if self._should_hold(status):
+            if self._pending_since is None:
+                self._pending_since = time.monotonic()
+            return
+        self.flush()
+
+    def flush(self):
+        """Sends all the status updates held back, if any."""
+        if not self._pending:
+            return
+        pending = self._pending
+        self._pending = []
+        self._pending_since = None
+        self.connection.sendall(frame_encode(pending))
 
     def post(self, status):
-        data = json_dumps(status)
         try:
-            self.connection.send(data.encode("ascii") + "\n".encode("ascii"))
+            self._send(status)
         except BrokenPipeError:
             try:
                 self._create_connection()
-                self.connection.send(data.encode("ascii") + "\n".encode("ascii"))
+                self._send(status)
             except ConnectionRefusedError:
                 LOG.warning(f"Connection with {self.uri} has been lost.")
                 return False
         return True
 
     def close(self):
-        if self.connection is not None:
-            self.connection.close()
+        if self._connection is not None:
+            if self._frames:
+                self.flush()
+            elif self._use_frames:
+                # closing the connection with the handshake reply unread
+                # resets it, and the server would lose the messages it
+                # has not read yet, so the reply is waited for first
+                try:
+                    self._connection.shutdown(socket.SHUT_WR)
+                    self._check_handshake_reply(STATUS_HANDSHAKE_TIMEOUT)
+                except OSError:
+                    pass
+            self._connection.close()
+            self._connection = None
 
     def __repr__(self):
         return f'<TaskStatusService uri="{self.uri}">'
@@ -240,3 +336,5 @@ class Task:
                 )
                 damaged_status_services.clear()
             yield status
+        for status_service in running_status_services:
+            status_service.close()
@@ -15,9 +15,13 @@
 Module related to test parameters
 """
 
+import functools
 import logging
 import re
 
+#: The number of path patterns that are kept compiled
+PATH_PATTERN_CACHE_SIZE = 1024
+
 
 class NoMatchError(KeyError):
     pass
@@ -93,10 +97,14 @@ class AvocadoParams:
         return path_leaves
 
     @staticmethod
+    @functools.lru_cache(maxsize=PATH_PATTERN_CACHE_SIZE)
     def _greedy_path_to_re(path):
         """
         Converts user-friendly path with asterisk to a regex and compiles it
 
+        The most recently used paths are kept compiled, as the same ones
+        are usually used over and over by the tests.
+
         :param path: a more natural, file-system-like/glob-like
                      expression for the paths
         :type path: builtin.str
@@ -213,12 +221,20 @@ class AvocadoParam:
         # names cache (leaf.path is quite expensive)
         self._leaf_names = [leaf.path + "/" for leaf in leaves]
         self.name = name
+        #: Positions of the leaves matching each path pattern
+        self._path_index = {}
+        #: Positions of the leaves containing each key, built on first use
+        self._key_index = None
 
     def __eq__(self, other):
-        if self.__dict__ == other.__dict__:
-            return True
-        else:
+        if not isinstance(other, AvocadoParam):
             return False
+        # the indexes are derived from the leaves, so they're not compared
+        return (self.name, self._leaf_names, self._leaves) == (
+            other.name,
+            other._leaf_names,
+            other._leaves,
+        )
 
     def __ne__(self, other):
         return not (self == other)
@@ -228,15 +244,36 @@ class AvocadoParam:
         """String with identifier and all params"""
         return f"{self.name} ({self._leaf_names})"
 
+    def _get_leaf_indexes(self, path):
+        """
+        Get the positions of all leaves matching the path
+        """
+        indexes = self._path_index.get(path.pattern)
+        if indexes is None:
+            indexes = [
+                i
+                for i in range(len(self._leaf_names))
+                if path.search(self._leaf_names[i])
+            ]
+            self._path_index[path.pattern] = indexes
+        return indexes
+
+    def _get_key_index(self):
+        """
+        Get the positions of the leaves containing each key
+        """
+        if self._key_index is None:
+            self._key_index = {}
+            for i, leaf in enumerate(self._leaves):
+                for key in leaf.environment:
+                    self._key_index.setdefault(key, set()).add(i)
+        return self._key_index
+
     def _get_leaves(self, path):
         """
         Get all leaves matching the path
         """
-        return [
-            self._leaves[i]
-            for i in range(len(self._leaf_names))
-            if path.search(self._leaf_names[i])
-        ]
+        return [self._leaves[i] for i in self._get_leaf_indexes(path)]
 
     def get_or_die(self, path, key):
         """
@@ -244,19 +281,26 @@ class AvocadoParam:
         :raise NoMatchError: When no matches
         :raise KeyError: When value is not certain (multiple matches)
         """
-        leaves = self._get_leaves(path)
+        with_key = self._get_key_index().get(key, ())
         ret = [
-            (leaf.environment[key], leaf.environment.origin[key])
-            for leaf in leaves
-            if key in leaf.environment
+            (
+                self._leaves[i].environment[key],
+                self._leaves[i].environment.origin[key],
+            )
+            for i in self._get_leaf_indexes(path)
+            if i in with_key
         ]
         if not ret:
             raise NoMatchError(
                 f"No matches to {path.pattern} => "
                 f" {key} in {self.str_leaves_variant}"
             )
-        # make sure all params come from the same origin
-        if len(set([_[1].path for _ in ret])) == 1:
+        # make sure all params come from the same origin (the very same
+        # node, as usual, or nodes with the same path)
+        if (
+            len(set(id(_[1]) for _ in ret)) == 1
+            or len(set(_[1].path for _ in ret)) == 1
+        ):
             return ret[0][0]
         else:
             raise ValueError(
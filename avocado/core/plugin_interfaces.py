@@ -440,6 +440,11 @@ class Spawner(Plugin):
         :rtype: bool
         """
 
+    async def close(self):
+        """Releases the resources held by the spawner, such as the helper
+        processes it has started, once it won't spawn any other task.
+        """
+
 
 class DeploymentSpawner(Spawner):
     """Spawners that needs basic deployment are based on this class.
@@ -16,7 +16,9 @@
 Test resolver module.
 """
 
+import concurrent.futures
 import glob
+import logging
 import os
 import stat
 from enum import Enum
@@ -24,6 +26,13 @@ from enum import Enum
 from avocado.core.enabled_extension_manager import EnabledExtensionManager
 from avocado.core.exceptions import JobTestSuiteReferenceResolutionError
 from avocado.core.output import LOG_UI
+from avocado.core.safeloader.index import ModuleIndex
+
+LOG = logging.getLogger(__name__)
+
+#: Number of consecutive references resolved by a single process, when
+#: references are resolved in parallel
+PARALLEL_RESOLUTION_BATCH_SIZE = 64
 
 
 class ReferenceResolutionAssetType(Enum):
@@ -47,6 +56,11 @@ class ReferenceResolutionResult(Enum):
     #: Internal error in the resolution process
     ERROR = object()
 
+    def __reduce_ex__(self, protocol):
+        # the values are unique objects, which are not the same once
+        # unpickled, so the members are pickled by their names
+        return getattr, (self.__class__, self.name)
+
 
 class ReferenceResolutionAction(Enum):
     #: Stop trying to resolve the reference
@@ -259,60 +273,193 @@ def _extend_directory(path):
     return paths
 
 
-def resolve(references, hint=None, ignore_missing=True, config=None):
-    resolutions = []
-    hint_references = {}
+class _ResolverWorker:
+    """Resolves references within the processes of a parallel resolution."""
 
-    if hint:
-        hint_references = {r.reference: r for r in hint.get_resolutions()}
+    #: The resolver, initialized once per process
+    resolver = None
+    #: The module index shared by all references resolved in the process
+    index = None
 
-    if not references and hint_references:
-        references = list(hint_references.keys())
+    @classmethod
+    def initialize(cls, config):
+        cls.resolver = Resolver(config)
+        cls.index = ModuleIndex()
+
+    @classmethod
+    def resolve(cls, references):
+        """Resolves a batch of references.
 
-    if references:
-        # should be initialized with args, to define the behavior
-        # of this instance as a whole
-        resolver = Resolver(config)
-        extended_references = []
-        for reference in references:
-            # a reference extender is not (yet?) an extensible feature
-            # here it walks directories if one is given, and extends
-            # the original reference into final file paths
-            extended_references.extend(_extend_directory(reference))
-        for reference in extended_references:
-            if reference in hint_references:
-                resolutions.append(hint_references[reference])
+        :returns: the resolutions of each reference, along with the
+                  number of times each source file was parsed, and the
+                  number of times a parsed one was reused
+        :rtype: tuple
+        """
+        parse_counts = cls.index.parse_counts.copy()
+        reused = cls.index.reused
+        with cls.index.activate():
+            resolutions = [cls.resolver.resolve(reference) for reference in references]
+        return (
+            resolutions,
+            cls.index.parse_counts - parse_counts,
+            cls.index.reused - reused,
+        )
+
+
+def _iter_resolve_in_parallel(resolver, references, config, processes, index):
+    """Resolves references, in batches, within a pool of processes.
+
+    Batches are made of consecutive references, so that the ones from the
+    same directory, which usually share parent modules, are resolved by
+    the same process.  Batches that can not be resolved in the pool (such
+    as when a resolution can not be sent back) are resolved by the given
+    resolver.
+
+    :returns: the resolutions of each reference, in the given order
+    :rtype: generator of list
+    """
+    batches = [
+        references[start : start + PARALLEL_RESOLUTION_BATCH_SIZE]
+        for start in range(0, len(references), PARALLEL_RESOLUTION_BATCH_SIZE)
+    ]
+    executor = concurrent.futures.ProcessPoolExecutor(
+        processes, initializer=_ResolverWorker.initialize, initargs=(config,)
+    )
+    try:
+        futures = [executor.submit(_ResolverWorker.resolve, batch) for batch in batches]
+        for batch, future in zip(batches, futures):
+            try:
+                resolutions, parse_counts, reused = future.result()
+            except Exception as details:  # pylint: disable=W0703
+                LOG.debug("Resolving references in this process: %s", details)
+                resolutions = [resolver.resolve(reference) for reference in batch]
             else:
-                resolutions.extend(resolver.resolve(reference))
-    else:
+                index.parse_counts.update(parse_counts)
+                index.reused += reused
+            yield from resolutions
+    finally:
+        # batches still pending are of no use if the resolution is abandoned
+        executor.shutdown(cancel_futures=True)
+
+
+def _get_hint_references(hint):
+    if not hint:
+        return {}
+    return {r.reference: r for r in hint.get_resolutions()}
+
+
+def _iter_resolutions(references, hint_references, config, index):
+    if not references:
         discoverer = Discoverer(config)
-        resolutions.extend(discoverer.discover())
-
-    for res in resolutions:
-        if res.result == ReferenceResolutionResult.CORRUPT:
-            LOG_UI.warning(
-                "Reference %s might be resolved by %s resolver, but the file is corrupted: %s",
-                res.reference,
-                res.origin,
-                res.info or "",
-            )
-    # This came up from a previous method and can be refactored to improve
-    # performance since that we could merge with the loop above.
-    if not ignore_missing:
-        missing = []
-        for reference in references:
-            results = [res.result for res in resolutions if res.reference == reference]
-            if ReferenceResolutionResult.SUCCESS not in results:
-                missing.append(reference)
-        # directories are automatically expanded, and thus they can
-        # not be considered a reference that needs to exist after the
-        # resolution process
-        missing = [_ for _ in missing if not os.path.isdir(_)]
-        if missing:
-            msg = (
-                f"No tests found for given test references: {', '.join(missing)}\n"
-                f"Try 'avocado -V list {' '.join(missing)}' for details"
-            )
-            raise JobTestSuiteReferenceResolutionError(msg)
+        yield from discoverer.discover()
+        return
+
+    # should be initialized with args, to define the behavior
+    # of this instance as a whole
+    resolver = Resolver(config)
+    extended_references = []
+    for reference in references:
+        # a reference extender is not (yet?) an extensible feature
+        # here it walks directories if one is given, and extends
+        # the original reference into final file paths
+        extended_references.extend(_extend_directory(reference))
+    unresolved = [
+        reference
+        for reference in extended_references
+        if reference not in hint_references
+    ]
+    processes = (config or {}).get("resolver.parallel") or 1
+    if processes > 1 and len(unresolved) > PARALLEL_RESOLUTION_BATCH_SIZE:
+        resolved = _iter_resolve_in_parallel(
+            resolver, unresolved, config, processes, index
+        )
+    else:
+        resolved = (resolver.resolve(reference) for reference in unresolved)
+    for reference in extended_references:
+        if reference in hint_references:
+            yield hint_references[reference]
+        else:
+            yield from next(resolved)
+
+
+def check_missing_references(references, resolutions, hint=None):
+    """Checks that all test references have been successfully resolved.
+
+    Directories are not checked, as they are automatically expanded, and
+    thus they can not be considered a reference that needs to exist after
+    the resolution process.
+
+    :param references: the test references given to the resolution.  If
+                       none are given, the references from the hint are
+                       checked
+    :type references: list of str
+    :param resolutions: the resolutions of those references
+    :type resolutions: list of :class:`ReferenceResolution`
+    :param hint: the parsed ".avocado.hint" file, if any
+    :type hint: :class:`avocado.core.parser.HintParser`
+    :raises: :class:`avocado.core.exceptions.JobTestSuiteReferenceResolutionError`
+             if any of the references has not been resolved
+    """
+    if not references:
+        references = list(_get_hint_references(hint).keys())
+    resolved = {
+        res.reference
+        for res in resolutions
+        if res.result == ReferenceResolutionResult.SUCCESS
+    }
+    missing = [
+        reference
+        for reference in references
+        if reference not in resolved and not os.path.isdir(reference)
+    ]
+    if missing:
+        msg = (
+            f"No tests found for given test references: {', '.join(missing)}\n"
+            f"Try 'avocado -V list {' '.join(missing)}' for details"
+        )
+        raise JobTestSuiteReferenceResolutionError(msg)
 
+
+def resolve(references, hint=None, ignore_missing=True, config=None):
+    """Resolves test references.
+
+    :param references: the test references, such as paths to files or
+                       directories.  If none are given, references from
+                       the hint, or else, from the discoverer plugins,
+                       are used
+    :type references: list of str
+    :param hint: the parsed ".avocado.hint" file, if any
+    :type hint: :class:`avocado.core.parser.HintParser`
+    :param ignore_missing: whether references without a successful
+                           resolution are ignored, instead of raising
+                           an error (see :func:`check_missing_references`)
+    :type ignore_missing: bool
+    :param config: the configuration given to the resolver plugins
+    :type config: dict
+    :rtype: list of :class:`ReferenceResolution`
+    """
+    hint_references = _get_hint_references(hint)
+    if not references and hint_references:
+        references = list(hint_references.keys())
+
+    resolutions = []
+    # all resolvers share the Python source files parsed in this resolution
+    with ModuleIndex.session() as index:
+        for res in _iter_resolutions(references, hint_references, config, index):
+            if res.result == ReferenceResolutionResult.CORRUPT:
+                LOG_UI.warning(
+                    "Reference %s might be resolved by %s resolver, but the file is corrupted: %s",
+                    res.reference,
+                    res.origin,
+                    res.info or "",
+                )
+            resolutions.append(res)
+    LOG.debug(
+        "Parsed %s Python source files %s times, and reused them %s times",
+        len(index.parse_counts),
+        sum(index.parse_counts.values()),
+        index.reused,
+    )
+    if not ignore_missing:
+        check_missing_references(references, resolutions, hint)
     return resolutions
@@ -0,0 +1,216 @@
+import glob
+import hashlib
+import json
+import logging
+import os
+import sys
+import tempfile
+
+from avocado.core.settings import settings
+from avocado.core.version import VERSION
+
+LOG = logging.getLogger(__name__)
+
+#: Name of the directory, within the "cache" directory of the data
+#: directory, where the results of the safeloader are kept
+SAFELOADER_CACHE_DIRNAME = "safeloader"
+
+
+def get_file_hash(path):
+    """Returns the SHA-256 hash of a file's content.
+
+    :rtype: str
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as source_file:
+        for chunk in iter(lambda: source_file.read(2**16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def get_file_stamp(path):
+    """Returns what identifies a file in its current state.
+
+    :returns: the path, modification time, size and content hash
+    :rtype: list
+    :raises: OSError if the file can not be accessed
+    """
+    stat = os.stat(path)
+    return [path, stat.st_mtime_ns, stat.st_size, get_file_hash(path)]
+
+
+def get_directory_stamp(path):
+    """Returns what identifies a directory, or its absence, in its current
+    state.
+
+    The modification time of a directory changes when files are added to
+    it or removed from it.
+
+    :returns: the path, and modification time (or None if it doesn't
+              exist), with neither size nor content hash
+    :rtype: list
+    """
+    try:
+        return [path, os.stat(path).st_mtime_ns, None, None]
+    except OSError:
+        return [path, None, None, None]
+
+
+def is_file_stamp_current(stamp):
+    """Checks if a file is still in the state given by its stamp.
+
+    Files whose modification time and size match are not read.  When
+    only the modification time differs (such as after a "touch" or a
+    checkout), the content hash is checked.  Directories (see
+    :func:`get_directory_stamp`) only have their modification time
+    checked.
+
+    :type stamp: list
+    :rtype: bool
+    """
+    path, mtime_ns, size, content_hash = stamp
+    if content_hash is None:
+        try:
+            return os.stat(path).st_mtime_ns == mtime_ns
+        except OSError:
+            return mtime_ns is None
+    try:
+        stat = os.stat(path)
+        if stat.st_size != size:
+            return False
+        if stat.st_mtime_ns == mtime_ns:
+            return True
+        return get_file_hash(path) == content_hash
+    except OSError:
+        return False
+
+
+class SafeloaderCache:
+    """Persistent cache of the Python tests found in source files.
+
+    Finding tests means parsing a source file, and recursively, the
+    source files of the modules its classes inherit from.  This keeps
+    the tests found in each file, along with the stamps (path,
+    modification time, size and content hash) of all the files that
+    were examined to find them.  An entry is valid as long as all those
+    files are unchanged, the Avocado version matches, and so does the
+    module search path (:data:`sys.path`), which is where parent modules
+    are found.
+
+    Each entry is kept in its own file, so that looking up, or saving,
+    the tests of a file does not depend on the number of files cached.
+    """
+
+    def __init__(self, path=None):
+        """Initializes a new SafeloaderCache
+
+        :param path: the path of the cache directory.  If not given, it's
+                     placed within the "cache" directory of the data
+                     directory (set in "datadir.paths.data_dir"), apart
+                     from the assets.  If that's not set, the cache is
+                     disabled
+        :type path: str
+        """
+        if path is None:
+            data_dir = settings.as_dict().get("datadir.paths.data_dir")
+            if data_dir:
+                path = os.path.join(
+                    os.path.expanduser(data_dir), "cache", SAFELOADER_CACHE_DIRNAME
+                )
+        self.path = path
+
+    def _get_entry_path(self, key, path):
+        content = json.dumps([VERSION, sys.path, key, os.path.abspath(path)])
+        name = hashlib.sha1(content.encode("utf-8")).hexdigest()
+        return os.path.join(self.path, f"{name}.json")
+
+    @staticmethod
+    def _load(entry_path):
+        try:
+            with open(entry_path, "r", encoding="utf-8") as entry_file:
+                entry = json.load(entry_file)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(entry, dict) or entry.get("version") != VERSION:
+            return None
+        return entry
+
+    def get_all(self):
+        """Returns all cached entries, valid or not.
+
+        :rtype: list of dict
+        """
+        if self.path is None:
+            return []
+        entries = []
+        for entry_path in glob.glob(os.path.join(self.path, "*.json")):
+            entry = self._load(entry_path)
+            if entry is not None:
+                entries.append(entry)
+        return entries
+
+    def clear(self):
+        """Removes all cached entries."""
+        if self.path is None:
+            return
+        for entry_path in glob.glob(os.path.join(self.path, "*.json")):
+            try:
+                os.remove(entry_path)
+            except FileNotFoundError:
+                pass
+
+    def get(self, key, path):
+        """Returns the cached result of finding tests in a file.
+
+        :param key: identifies how the tests were found, such as the
+                    target module and class
+        :type key: str
+        :param path: path to a Python source code file
+        :type path: str
+        :returns: the result, or None if not cached or stale
+        """
+        if self.path is None:
+            return None
+        entry = self._load(self._get_entry_path(key, path))
+        if entry is None:
+            return None
+        if not all(is_file_stamp_current(stamp) for stamp in entry["files"]):
+            return None
+        return entry.get("result")
+
+    def set(self, key, path, result, stamps):
+        """Saves the result of finding tests in a file.
+
+        :param key: identifies how the tests were found, such as the
+                    target module and class
+        :type key: str
+        :param path: path to a Python source code file
+        :type path: str
+        :param result: the result, which must be serializable to JSON
+        :param stamps: the stamps (see :func:`get_file_stamp`) of all
+                       source files examined to produce the result, taken
+                       before they were read
+        :type stamps: list
+        """
+        if self.path is None:
+            return
+        try:
+            os.makedirs(self.path, exist_ok=True)
+            # writes are atomic, so concurrent readers never see a
+            # partially written entry
+            with tempfile.NamedTemporaryFile(
+                "w", encoding="utf-8", dir=self.path, delete=False
+            ) as entry_file:
+                json.dump(
+                    {
+                        "version": VERSION,
+                        "key": key,
+                        "path": os.path.abspath(path),
+                        "files": stamps,
+                        "result": result,
+                    },
+                    entry_file,
+                )
+            os.replace(entry_file.name, self._get_entry_path(key, path))
+        except OSError as details:
+            LOG.debug('Could not save the safeloader cache for "%s": %s', path, details)
@@ -1,8 +1,10 @@
 import ast
 import collections
+import os
 import sys
 from importlib.machinery import PathFinder
 
+from avocado.core.safeloader.cache import get_directory_stamp, get_file_stamp
 from avocado.core.safeloader.docstring import (
     check_docstring_directive,
     get_docstring_directives,
@@ -72,6 +74,47 @@ def _exted_tests_tags(tests, tags, force_update=False):
                 test[1].setdefault(tag, value)
 
 
+def _get_module(path, target_module, target_class, examined=None):
+    """Returns a PythonModule, keeping track of the examined source files.
+
+    :param examined: where the stamps (see
+                     :func:`avocado.core.safeloader.cache.get_file_stamp`)
+                     of the source files examined are kept, by their paths
+    :type examined: dict
+    """
+    if examined is not None:
+        if os.path.isdir(path):
+            path = os.path.join(path, "__init__.py")
+        if path not in examined:
+            try:
+                examined[path] = get_file_stamp(path)
+            except OSError:
+                pass
+    return PythonModule(path, target_module, target_class)
+
+
+def _get_importable_spec(imported_symbol, symbol_is_module=False, examined=None):
+    """Returns the spec of an imported module, keeping track of the
+    directories searched for it.
+
+    As a module may show up later in any of those directories (or in one
+    searched before the one it was found in), their stamps (see
+    :func:`avocado.core.safeloader.cache.get_directory_stamp`) are kept
+    along with the ones of the source files examined.
+
+    :param examined: where the stamps are kept, by their paths
+    :type examined: dict
+    """
+    if examined is None:
+        return imported_symbol.get_importable_spec(symbol_is_module)
+    searched = []
+    spec = imported_symbol.get_importable_spec(symbol_is_module, searched)
+    for directory in searched:
+        if directory not in examined:
+            examined[directory] = get_directory_stamp(directory)
+    return spec
+
+
 def _examine_same_module(
     parents,
     info,
@@ -82,6 +125,7 @@ def _examine_same_module(
     target_class,
     determine_match,
     info_class_tags,
+    examined=None,
 ):
     # Searching the parents in the same module
     for parent in parents[:]:
@@ -102,6 +146,7 @@ def _examine_same_module(
             module.path,
             parent_class,
             match,
+            examined,
         )
         if _info:
             parents.remove(parent)
@@ -208,7 +253,13 @@ def _find_import_match(parent_path, parent_module):
 
 
 def _examine_class(
-    target_module, target_class, determine_match, path, class_name, match
+    target_module,
+    target_class,
+    determine_match,
+    path,
+    class_name,
+    match,
+    examined=None,
 ):
     """
     Examine a class from a given path
@@ -236,13 +287,16 @@ def _examine_class(
     :param match: whether the inheritance from <target_module.target_class> has
                   been determined or not
     :type match: bool
+    :param examined: where the stamps of the source files examined are
+                     kept, by their paths
+    :type examined: dict
     :returns: tuple where first item is a list of test methods detected
               for given class; second item is set of class names which
               look like avocado tests but are force-disabled;
               third is dict of class tags.
     :rtype: tuple
     """
-    module = PythonModule(path, target_module, target_class)
+    module = _get_module(path, target_module, target_class, examined)
     info = []
     class_tags = {}
     disabled = set()
@@ -263,8 +317,9 @@ def _examine_class(
             get_docstring_directives_dependencies(docstring),
         )
 
-        # Getting the list of parents of the current class
-        parents = klass.bases
+        # Getting the list of parents of the current class (a copy, as
+        # parents are removed from it, and syntax trees may be shared)
+        parents = list(klass.bases)
 
         match = _examine_same_module(
             parents,
@@ -276,6 +331,7 @@ def _examine_class(
             target_class,
             determine_match,
             class_tags,
+            examined,
         )
 
         # If there are parents left to be discovered, they
@@ -288,7 +344,9 @@ def _examine_class(
                     symbol_is_module,
                 ) = _get_attributes_for_further_examination(parent, module)
 
-                found_spec = imported_symbol.get_importable_spec(symbol_is_module)
+                found_spec = _get_importable_spec(
+                    imported_symbol, symbol_is_module, examined
+                )
                 if found_spec is None:
                     continue
 
@@ -302,6 +360,7 @@ def _examine_class(
                 found_spec.origin,
                 parent_class,
                 match,
+                examined,
             )
             if _info:
                 _exted_tests_tags(info, parent_tags)
@@ -314,7 +373,7 @@ def _examine_class(
     if not match and module.interesting_klass_found:
         imported_symbol = module.imported_symbols[class_name]
         if imported_symbol:
-            found_spec = imported_symbol.get_importable_spec()
+            found_spec = _get_importable_spec(imported_symbol, examined=examined)
             if found_spec:
                 _info, _disabled, _class_tags, _match = _examine_class(
                     target_module,
@@ -323,6 +382,7 @@ def _examine_class(
                     found_spec.origin,
                     class_name,
                     match,
+                    examined,
                 )
                 if _info:
                     _exted_tests_tags(info, _class_tags)
@@ -338,7 +398,48 @@ def _examine_class(
     return info, disabled, class_tags, match
 
 
-def find_python_tests(target_module, target_class, determine_match, path):
+def _tests_to_json(result):
+    tests, disabled = result
+    return {
+        "tests": [
+            [
+                klass,
+                [
+                    [
+                        method,
+                        {
+                            key: sorted(value) if value is not None else None
+                            for key, value in tags.items()
+                        },
+                        dependencies,
+                    ]
+                    for method, tags, dependencies in methods_info
+                ],
+            ]
+            for klass, methods_info in tests.items()
+        ],
+        "disabled": sorted(disabled),
+    }
+
+
+def _tests_from_json(content):
+    tests = collections.OrderedDict()
+    for klass, methods_info in content["tests"]:
+        tests[klass] = [
+            (
+                method,
+                {
+                    key: set(value) if value is not None else None
+                    for key, value in tags.items()
+                },
+                dependencies,
+            )
+            for method, tags, dependencies in methods_info
+        ]
+    return tests, set(content["disabled"])
+
+
+def find_python_tests(target_module, target_class, determine_match, path, cache=None):
     """
     Attempts to find Python tests from source files
 
@@ -363,13 +464,36 @@ def find_python_tests(target_module, target_class, determine_match, path):
     :type determine_match: function
     :param path: path to a Python source code file
     :type path: str
+    :param cache: where the tests found are kept, and looked up, as long
+                  as the source files examined are unchanged
+    :type cache: :class:`avocado.core.safeloader.cache.SafeloaderCache`
     :returns: tuple where first item is dict with class name and additional
               info such as method names and tags; the second item is
               set of class names which look like Python tests but have been
               forcefully disabled.
     :rtype: tuple
     """
-    module = PythonModule(path, target_module, target_class)
+    if cache is None:
+        return _find_python_tests(target_module, target_class, determine_match, path)
+    key = (
+        f"{target_module}.{target_class}:"
+        f"{determine_match.__module__}.{determine_match.__qualname__}"
+    )
+    cached = cache.get(key, path)
+    if cached is not None:
+        return _tests_from_json(cached)
+    examined = {}
+    result = _find_python_tests(
+        target_module, target_class, determine_match, path, examined
+    )
+    cache.set(key, path, _tests_to_json(result), list(examined.values()))
+    return result
+
+
+def _find_python_tests(
+    target_module, target_class, determine_match, path, examined=None
+):
+    module = _get_module(path, target_module, target_class, examined)
     # The resulting test classes
     result = collections.OrderedDict()
     disabled = set()
@@ -406,8 +530,9 @@ def find_python_tests(target_module, target_class, determine_match, path):
             class_tags,
             get_docstring_directives_dependencies(docstring),
         )
-        # Getting the list of parents of the current class
-        parents = klass.bases
+        # Getting the list of parents of the current class (a copy, as
+        # parents are removed from it, and syntax trees may be shared)
+        parents = list(klass.bases)
 
         match = _examine_same_module(
             parents,
@@ -419,6 +544,7 @@ def find_python_tests(target_module, target_class, determine_match, path):
             target_class,
             determine_match,
             class_tags,
+            examined,
         )
 
         # If there are parents left to be discovered, they
@@ -431,7 +557,9 @@ def find_python_tests(target_module, target_class, determine_match, path):
                     symbol_is_module,
                 ) = _get_attributes_for_further_examination(parent, module)
 
-                found_spec = imported_symbol.get_importable_spec(symbol_is_module)
+                found_spec = _get_importable_spec(
+                    imported_symbol, symbol_is_module, examined
+                )
                 if found_spec is None:
                     continue
 
@@ -445,6 +573,7 @@ def find_python_tests(target_module, target_class, determine_match, path):
                 found_spec.origin,
                 parent_class,
                 match,
+                examined,
             )
             if _info:
                 _exted_tests_tags(info, parent_tags)
@@ -479,10 +608,12 @@ def _determine_match_python(module, klass, docstring):
     return module.is_matching_klass(klass)
 
 
-def find_avocado_tests(path):
-    return find_python_tests("avocado", "Test", _determine_match_python, path)
+def find_avocado_tests(path, cache=None):
+    return find_python_tests("avocado", "Test", _determine_match_python, path, cache)
 
 
-def find_python_unittests(path):
-    found, _ = find_python_tests("unittest", "TestCase", _determine_match_python, path)
+def find_python_unittests(path, cache=None):
+    found, _ = find_python_tests(
+        "unittest", "TestCase", _determine_match_python, path, cache
+    )
     return found
@@ -79,7 +79,7 @@ class ImportedSymbol:
                 previous = ""
             yield (component, previous)
 
-    def get_importable_spec(self, symbol_is_module=False):
+    def get_importable_spec(self, symbol_is_module=False, searched=None):
         """Returns the specification of an actual importable module.
 
         This is a check based on the limitations that we do not
@@ -90,15 +90,20 @@ class ImportedSymbol:
                                  a module, include it in the search for
                                  an importable spec
         :type symbol_is_module: bool
+        :param searched: where the directories searched for the modules
+                         are appended, whether they were found there or
+                         not
+        :type searched: list
         """
-        modules_paths = sys.path
-        modules_paths.insert(0, self.get_relative_module_fs_path())
+        modules_paths = [self.get_relative_module_fs_path()] + sys.path
         spec = None
         for component, previous in self._walk_importable_components(symbol_is_module):
             if previous:
                 modules_paths = [
                     os.path.join(mod, previous) for mod in modules_paths[:]
                 ]
+            if searched is not None:
+                searched.extend(modules_paths)
             spec = PathFinder.find_spec(component, modules_paths)
             if spec is None:
                 break
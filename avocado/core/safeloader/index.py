@@ -0,0 +1,97 @@
+import ast
+import collections
+import contextlib
+import os
+
+
+class ModuleIndex:
+    """Index of the Python source files parsed during a resolution session.
+
+    Finding tests in a source file may require parsing the files of the
+    modules its classes inherit from, and different resolvers (such as
+    the ones for Avocado instrumented tests and Python unittests) look
+    at the very same files.  While an index is active (see
+    :meth:`session`), each source file is read and parsed only once,
+    and its syntax tree is shared by all of those.
+    """
+
+    #: The module index of the resolution session in progress, if any
+    _active = None
+
+    def __init__(self):
+        #: The parsed syntax trees, keyed by the source file path
+        self._trees = {}
+        #: Number of times each source file has been parsed
+        self.parse_counts = collections.Counter()
+        #: Number of times a syntax tree has been reused instead of
+        #: parsing its source file again
+        self.reused = 0
+
+    def get_tree(self, path):
+        """Returns the syntax tree of a Python source file.
+
+        :param path: path to a Python source code file
+        :type path: str
+        :rtype: :class:`ast.Module`
+        """
+        path = os.path.abspath(path)
+        tree = self._trees.get(path)
+        if tree is not None:
+            self.reused += 1
+            return tree
+        tree = parse(path)
+        self.parse_counts[path] += 1
+        self._trees[path] = tree
+        return tree
+
+    def __len__(self):
+        return len(self._trees)
+
+    @classmethod
+    def get_active(cls):
+        """Returns the module index of the resolution session in progress.
+
+        :rtype: :class:`ModuleIndex` or None
+        """
+        return cls._active
+
+    @classmethod
+    @contextlib.contextmanager
+    def session(cls):
+        """Shares a module index with all safeloader users within the context.
+
+        If a session is already in progress, its index is kept being used.
+
+        :returns: the active module index
+        :rtype: :class:`ModuleIndex`
+        """
+        if cls._active is not None:
+            yield cls._active
+            return
+        with cls().activate() as index:
+            yield index
+
+    @contextlib.contextmanager
+    def activate(self):
+        """Makes this the active module index within the context.
+
+        :returns: this module index
+        :rtype: :class:`ModuleIndex`
+        """
+        previous = ModuleIndex._active
+        ModuleIndex._active = self
+        try:
+            yield self
+        finally:
+            ModuleIndex._active = previous
+
+
+def parse(path):
+    """Reads and parses a Python source file.
+
+    :param path: path to a Python source code file
+    :type path: str
+    :rtype: :class:`ast.Module`
+    """
+    with open(path, encoding="utf-8") as source_file:
+        return ast.parse(source_file.read(), path)
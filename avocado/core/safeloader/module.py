@@ -2,6 +2,7 @@ import ast
 import os
 
 from avocado.core.safeloader.imported import ImportedSymbol
+from avocado.core.safeloader.index import ModuleIndex, parse
 from avocado.core.safeloader.utils import get_statement_import_as
 
 
@@ -46,8 +47,11 @@ class PythonModule:
         self.module = module
         self.klass = klass
         self.imported_symbols = {}
-        with open(self.path, encoding="utf-8") as source_file:
-            self.mod = ast.parse(source_file.read(), self.path)
+        index = ModuleIndex.get_active()
+        if index is None:
+            self.mod = parse(self.path)
+        else:
+            self.mod = index.get_tree(self.path)
         self.interesting_klass_found = False
 
     def is_matching_klass(self, klass):
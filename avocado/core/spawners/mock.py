@@ -1,5 +1,6 @@
 import asyncio
 import random
+import time
 
 from avocado.core.plugin_interfaces import Spawner
 from avocado.core.spawners.common import SpawnMethod
@@ -72,3 +73,43 @@ class MockRandomAliveSpawner(MockSpawner):
         if alive is None:
             return False
         return random.choice([True, True, True, True, False])
+
+
+class MockStatusRepoSpawner(MockSpawner):
+    """A mocking spawner that reports tasks as finished into a status repo.
+
+    Tasks asked to be spawned by this spawner are never alive, and have
+    their "started" and "finished" status messages processed straight by
+    the given status repository, as if a runner had sent them.
+    """
+
+    def __init__(self, status_repo, result="pass"):
+        super().__init__()
+        self._status_repo = status_repo
+        self._result = result
+
+    def is_task_alive(self, runtime_task):
+        return False
+
+    async def spawn_task(self, runtime_task):
+        task_id = str(runtime_task.task.identifier)
+        job_id = self._status_repo.job_id
+        self._status_repo.process_message(
+            {
+                "id": task_id,
+                "job_id": job_id,
+                "status": "started",
+                "time": time.monotonic(),
+                "output_dir": runtime_task.task.runnable.output_dir,
+            }
+        )
+        self._status_repo.process_message(
+            {
+                "id": task_id,
+                "job_id": job_id,
+                "status": "finished",
+                "time": time.monotonic(),
+                "result": self._result,
+            }
+        )
+        return True
@@ -1,7 +1,16 @@
+import asyncio
+import collections
 import heapq
 import logging
+import os
+from array import array
 
-from avocado.core.status.utils import json_loads
+from avocado.core.status.utils import (
+    FRAME_HEADER,
+    frame_decode,
+    frame_encode,
+    json_loads,
+)
 from avocado.core.teststatus import STATUSES
 
 LOG = logging.getLogger(__name__)
@@ -11,19 +20,66 @@ class StatusMsgMissingDataError(Exception):
     """Status message does not contain the required data."""
 
 
+#: The default maximum amount of memory, in bytes, used to cache task
+#: messages when those are kept in a journal
+STATUS_REPO_MAX_MEMORY = 2**25
+
+
+#: The keys of a message (once its "id" has been taken out) that only
+#: signal that a task is still running
+HEARTBEAT_KEYS = frozenset(("status", "time"))
+
+
+def is_heartbeat(message):
+    """Checks if a message is a heartbeat, that is, a bare running message."""
+    return (
+        message.get("status") == "running" and message.keys() - {"id"} <= HEARTBEAT_KEYS
+    )
+
+
 class StatusRepo:
     """Maintains tasks' status related data and provides aggregated info."""
 
-    def __init__(self, job_id):
+    def __init__(self, job_id, journal_path=None, max_memory=STATUS_REPO_MAX_MEMORY):
         """Initializes a new StatusRepo
 
         :param job_id: the job unique identification for which the
                        messages are destined to.
         :type job_id: str
+        :param journal_path: path of a file where all messages received
+                             are appended to.  If given, only the latest
+                             message of each task, and a cache of recent
+                             messages, are kept in memory.  Other messages
+                             are read back from the journal when needed.
+        :type journal_path: str
+        :param max_memory: the maximum amount of memory, in bytes, used to
+                           cache messages when they're kept in a journal
+        :type max_memory: int
         """
         self.job_id = job_id
-        #: Contains all received messages by a given task (by its ID)
+        #: Contains all received messages by a given task (by its ID),
+        #: unless those are kept in the journal
         self._all_data = {}
+        #: The file where messages are appended to, as frames with a
+        #: single message each (see :func:`frame_encode`)
+        self._journal = None
+        #: The size of the journal, that is, where the next frame goes
+        self._journal_size = 0
+        #: Contains the offset and size of the body of every frame in the
+        #: journal, flattened into an array, keyed by the task ID
+        self._journal_index = {}
+        #: Contains the latest message received by a given task (by its
+        #: ID), when messages are kept in the journal
+        self._latest_data = {}
+        #: Contains the most recently used messages, keyed by a tuple with
+        #: (task_id, index), and their size in the journal
+        self._cache = collections.OrderedDict()
+        self._cache_size = 0
+        self._max_memory = max_memory
+        if journal_path is not None:
+            self._journal = open(journal_path, "ab+")
+            self._journal.seek(0, os.SEEK_END)
+            self._journal_size = self._journal.tell()
         #: Contains the most up to date status of a task, and the time
         #: it was set in a tuple (status, time).  This is keyed
         #: by the task ID, and the most up to date status is determined by
@@ -33,8 +89,20 @@ class StatusRepo:
         #: entry containing a tuple with (task_id, status, time).  It discards
         #: status that have been superseded by newer status.
         self._status_journal_summary = []
+        #: Contains futures of those waiting for an entry to be available
+        #: in the status journal summary
+        self._status_journal_summary_waiters = []
+        #: Contains futures of those waiting for all entries in the status
+        #: journal summary to be picked
+        self._status_journal_summary_drained_waiters = []
         #: Contains the task IDs keyed by the result received
         self._by_result = {}
+        #: Contains the same task IDs as :attr:`_by_result`, but in sets,
+        #: for constant time membership checks
+        self._by_result_ids = {}
+        #: Contains futures, keyed by task ID, of those waiting for a
+        #: task's result to be received
+        self._result_waiters = {}
 
     def _handle_task_finished(self, message):
         task_id = message["id"]
@@ -43,9 +111,9 @@ class StatusRepo:
         if result is not None and result.upper() not in STATUSES:
             overridden = "error"
             message["result"] = overridden
-            message[
-                "fail_reason"
-            ] = f'Runner error occurred: Test reports unsupported status "{result}"'
+            message["fail_reason"] = (
+                f'Runner error occurred: Test reports unsupported status "{result}"'
+            )
             LOG.error(
                 'Task "%s" finished message with unsupported status '
                 '"%s", changing to "%s"',
@@ -57,6 +125,24 @@ class StatusRepo:
         self._set_by_result(message)
         self._set_task_data(message)
         LOG.debug('Task "%s" finished message: "%s"', task_id, message)
+        if message.get("result") is not None:
+            self._wake_result_waiters(task_id)
+
+    def _wake_result_waiters(self, task_id):
+        self._wake_waiters(self._result_waiters.pop(task_id, []))
+
+    @staticmethod
+    def _wake_waiters(waiters):
+        for future in waiters:
+            if not future.done():
+                future.set_result(None)
+        waiters.clear()
+
+    @staticmethod
+    async def _wait(waiters):
+        future = asyncio.get_running_loop().create_future()
+        waiters.append(future)
+        await future
 
     def _handle_task_started(self, message):
         if "output_dir" not in message:
@@ -74,34 +160,165 @@ class StatusRepo:
         result = message.get("result")
         if result not in self._by_result:
             self._by_result[result] = []
-        if message["id"] not in self._by_result[result]:
+            self._by_result_ids[result] = set()
+        if message["id"] not in self._by_result_ids[result]:
             self._by_result[result].append(message["id"])
+            self._by_result_ids[result].add(message["id"])
 
     def _set_task_data(self, message):
         """Appends all data on message to an entry keyed by the task's ID."""
         task_id = message.pop("id")
+        if self._journal is not None:
+            self._journal_append(task_id, message)
+            return
         if task_id not in self._all_data:
             self._all_data[task_id] = []
         self._all_data[task_id].append(message)
 
+    def _journal_append(self, task_id, message):
+        frame = frame_encode([{"id": task_id, **message}])
+        self._journal.seek(0, os.SEEK_END)
+        self._journal.write(frame)
+        offset = self._journal_size + FRAME_HEADER.size
+        size = len(frame) - FRAME_HEADER.size
+        self._journal_size += len(frame)
+        if task_id not in self._journal_index:
+            self._journal_index[task_id] = array("Q")
+        index = self._journal_index[task_id]
+        index.extend((offset, size))
+        self._latest_data[task_id] = message
+        self._cache_add((task_id, len(index) // 2 - 1), message, size)
+
+    def _journal_replace_latest(self, task_id, message):
+        """Replaces the latest message of a task in the journal.
+
+        Its frame is rewritten in place if it's the last one in the
+        journal, or else, the new frame is appended, and the old one is
+        left unused.
+        """
+        index = self._journal_index[task_id]
+        offset, size = index[-2:]
+        if offset + size == self._journal_size:
+            self._journal_size = offset - FRAME_HEADER.size
+            self._journal.truncate(self._journal_size)
+        frame = frame_encode([{"id": task_id, **message}])
+        # the journal is opened for appending
+        self._journal.write(frame)
+        index[-2:] = array(
+            "Q",
+            (self._journal_size + FRAME_HEADER.size, len(frame) - FRAME_HEADER.size),
+        )
+        self._journal_size += len(frame)
+        self._latest_data[task_id] = message
+        key = (task_id, len(index) // 2 - 1)
+        cached = self._cache.pop(key, None)
+        if cached is not None:
+            self._cache_size -= cached[1]
+        self._cache_add(key, message, len(frame) - FRAME_HEADER.size)
+
+    def _journal_read(self, task_id, index):
+        cached = self._cache.get((task_id, index))
+        if cached is not None:
+            self._cache.move_to_end((task_id, index))
+            return cached[0]
+        offset, size = self._journal_index[task_id][index * 2 : index * 2 + 2]
+        self._journal.flush()
+        self._journal.seek(offset)
+        message = frame_decode(self._journal.read(size))[0]
+        del message["id"]
+        self._cache_add((task_id, index), message, size)
+        return message
+
+    def _cache_add(self, key, message, size):
+        self._cache[key] = (message, size)
+        self._cache_size += size
+        while self._cache_size > self._max_memory and self._cache:
+            _, (_, evicted_size) = self._cache.popitem(last=False)
+            self._cache_size -= evicted_size
+
+    def _get_task_data_count(self, task_id):
+        if self._journal is not None:
+            return len(self._journal_index.get(task_id, ())) // 2
+        return len(self._all_data.get(task_id, ()))
+
     def get_all_task_data(self, task_id):
         """Returns all data on a given task, by its ID."""
+        if self._journal is not None:
+            if task_id not in self._journal_index:
+                return None
+            return [
+                self.get_task_data(task_id, index)
+                for index in range(self._get_task_data_count(task_id))
+            ]
         return self._all_data.get(task_id)
 
     def get_task_data(self, task_id, index):
         """Returns the data on the index of a given task, by its ID."""
+        if self._journal is not None:
+            count = self._get_task_data_count(task_id)
+            if index < 0:
+                index += count
+            if not 0 <= index < count:
+                raise IndexError("task data index out of range")
+            if index == count - 1:
+                return self._latest_data[task_id]
+            return self._journal_read(task_id, index)
         task_data = self._all_data.get(task_id)
         return task_data[index]
 
     def get_latest_task_data(self, task_id):
         """Returns the latest data on a given task, by its ID."""
+        if self._journal is not None:
+            return self._latest_data.get(task_id)
         task_data = self._all_data.get(task_id)
         if task_data is None:
             return None
         return task_data[-1]
 
+    def close(self):
+        """Closes the journal, if messages are kept in one."""
+        if self._journal is not None:
+            self._journal.close()
+
+    async def wait_task_result(self, task_id):
+        """Waits until the result of a given task, by its ID, is received.
+
+        :returns: the latest data on the task, which contains its result
+        :rtype: dict
+        """
+        latest_task_data = self.get_latest_task_data(task_id) or {}
+        while latest_task_data.get("result") is None:
+            await self._wait(self._result_waiters.setdefault(task_id, []))
+            latest_task_data = self.get_latest_task_data(task_id) or {}
+        return latest_task_data
+
+    def _status_journal_summary_push(self, entry):
+        heapq.heappush(self._status_journal_summary, entry)
+        self._wake_waiters(self._status_journal_summary_waiters)
+
     def status_journal_summary_pop(self):
-        return heapq.heappop(self._status_journal_summary)
+        entry = heapq.heappop(self._status_journal_summary)
+        if not self._status_journal_summary:
+            self._wake_waiters(self._status_journal_summary_drained_waiters)
+        return entry
+
+    async def status_journal_summary_get(self):
+        """Pops an entry from the status journal summary.
+
+        If the journal is empty, this waits until an entry is available,
+        that is, until a message with a status update is processed.
+
+        :returns: a tuple with (time, task_id, status, index)
+        :rtype: tuple
+        """
+        while not self._status_journal_summary:
+            await self._wait(self._status_journal_summary_waiters)
+        return self.status_journal_summary_pop()
+
+    async def wait_status_journal_summary_drained(self):
+        """Waits until all entries in the status journal summary are picked."""
+        while self._status_journal_summary:
+            await self._wait(self._status_journal_summary_drained_waiters)
 
     def _update_status(self, message):
         """Update the latest status of a task (by message)."""
@@ -112,7 +329,7 @@ class StatusRepo:
             return
         if task_id not in self._status:
             self._status[task_id] = (status, time)
-            heapq.heappush(self._status_journal_summary, (time, task_id, status, 0))
+            self._status_journal_summary_push((time, task_id, status, 0))
         else:
             current_status, _ = self._status[task_id]
             if current_status == "finished":
@@ -127,8 +344,37 @@ class StatusRepo:
                 )
             else:
                 self._status[task_id] = (status, time)
-            index = len(self.get_all_task_data(task_id))
-            heapq.heappush(self._status_journal_summary, (time, task_id, status, index))
+            index = self._get_task_data_count(task_id)
+            self._status_journal_summary_push((time, task_id, status, index))
+
+    def _coalesce_heartbeat(self, message):
+        """Merges a heartbeat into the previous one, if that's the latest data.
+
+        A heartbeat carries no information other than the time, so there's
+        no point in keeping (and handling) consecutive ones for a task.
+
+        :returns: whether the message was merged into the previous one
+        :rtype: bool
+        """
+        if not is_heartbeat(message):
+            return False
+        task_id = message["id"]
+        if self._status.get(task_id, (None, None))[0] != "running":
+            return False
+        latest_task_data = self.get_latest_task_data(task_id)
+        if latest_task_data is None or not is_heartbeat(latest_task_data):
+            return False
+        time = message.get("time")
+        if time is not None and time > latest_task_data.get("time", time - 1):
+            if self._journal is not None:
+                # so that the journal agrees with the message in memory
+                self._journal_replace_latest(
+                    task_id, {**latest_task_data, "time": time}
+                )
+            else:
+                latest_task_data["time"] = time
+            self._status[task_id] = ("running", time)
+        return True
 
     def process_message(self, message):
         for required_field in ("id", "job_id"):
@@ -141,6 +387,8 @@ class StatusRepo:
             return
         message.pop("job_id")
 
+        if self._coalesce_heartbeat(message):
+            return
         self._update_status(message)
         handlers = {
             "started": self._handle_task_started,
@@ -161,16 +409,11 @@ class StatusRepo:
     def get_task_status(self, task_id):
         return self._status.get(task_id, (None, None))[0]
 
-    @staticmethod
-    def _is_in_task(tasks, task_ids):
-        """Returns True if any of the tasks is in task_ids."""
-        return any([True for task_id in task_ids if task_id in tasks])
-
     def get_result_set_for_tasks(self, task_ids):
         """Returns a set of results for the given tasks."""
-        results = [
+        task_ids = set(str(task_id) for task_id in task_ids)
+        return set(
             key
-            for key, value in self._by_result.items()
-            if self._is_in_task(value, task_ids)
-        ]
-        return set(results)
+            for key, value in self._by_result_ids.items()
+            if not task_ids.isdisjoint(value)
+        )
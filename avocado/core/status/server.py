@@ -2,6 +2,13 @@ import asyncio
 import os
 
 from avocado.core.settings import settings
+from avocado.core.status.utils import (
+    FRAME_HEADER,
+    FRAME_MARKER,
+    FRAMES_HANDSHAKE,
+    FRAMES_HANDSHAKE_REPLY,
+    frame_decode,
+)
 
 
 class StatusServer:
@@ -48,12 +55,37 @@ class StatusServer:
         if os.path.exists(self._uri):
             os.unlink(self._uri)
 
-    async def cb(self, reader, _):
+    async def cb(self, reader, writer):
+        """Handles a client connection.
+
+        Clients can send status messages either as JSON lines, or, after
+        a handshake, as frames containing a number of messages each.  As
+        a JSON line never starts with the frame marker, each message can
+        be told apart by its first byte.
+        """
         while True:
             try:
-                raw_message = await reader.readline()
+                first = await reader.read(1)
+                if first == FRAME_MARKER:
+                    header = first + await reader.readexactly(FRAME_HEADER.size - 1)
+                    _, size = FRAME_HEADER.unpack(header)
+                    body = await reader.readexactly(size)
+                else:
+                    raw_message = first + await reader.readline()
+            except asyncio.IncompleteReadError:
+                return
             except ConnectionResetError:
                 continue
-            if not raw_message:
+            if not first:
                 return
-            self._repo.process_raw_message(raw_message)
+            if first == FRAME_MARKER:
+                for message in frame_decode(body):
+                    self._repo.process_message(message)
+            elif raw_message == FRAMES_HANDSHAKE:
+                try:
+                    writer.write(FRAMES_HANDSHAKE_REPLY)
+                    await writer.drain()
+                except ConnectionError:
+                    return
+            else:
+                self._repo.process_raw_message(raw_message)
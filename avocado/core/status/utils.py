@@ -1,11 +1,49 @@
 import base64
 import json
+import struct
 
 
 class StatusMsgInvalidJSONError(Exception):
     """Status message does not contain valid JSON."""
 
 
+class StatusMsgInvalidFrameError(Exception):
+    """Status message frame is not well formed."""
+
+
+#: Line sent by a client, right after connecting, to signal that it's
+#: able to send framed messages.  It's also a valid (JSON) status message,
+#: which servers that don't know about frames will discard, as it's not
+#: destined to any job
+FRAMES_HANDSHAKE = b'{"id": "", "job_id": "", "protocol": "frames/1"}\n'
+
+#: Reply sent by a server to a client that sent :data:`FRAMES_HANDSHAKE`,
+#: signaling that the client may start sending framed messages
+FRAMES_HANDSHAKE_REPLY = b"frames/1\n"
+
+#: The first byte of a frame.  JSON lines never start with it, so both
+#: can be told apart from the first byte of a message
+FRAME_MARKER = b"\x00"
+
+#: Frame header, with the marker and the size of the frame body
+FRAME_HEADER = struct.Struct("!cI")
+
+#: Header of each message within a frame body, with the size of the
+#: message metadata (encoded as JSON)
+FRAME_MESSAGE_HEADER = struct.Struct("!I")
+
+#: Key, in the metadata of a message within a frame, listing the names
+#: and sizes of the raw bytes values that follow the metadata
+FRAME_PAYLOADS_KEY = "__payloads__"
+
+
+def json_base64_encode(obj):
+    """base64 encode default hook for custom JSON encoding."""
+    if isinstance(obj, bytes):
+        return {"__base64_encoded__": base64.b64encode(obj).decode("ascii")}
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
 def json_base64_decode(dct):
     """base64 decode object hook for custom JSON encoding."""
     key_name = "__base64_encoded__"
@@ -28,3 +66,66 @@ def json_loads(data):
         return json.loads(data, object_hook=json_base64_decode)
     except json.decoder.JSONDecodeError:
         raise StatusMsgInvalidJSONError(data)
+
+
+def frame_encode(messages):
+    """Encodes a number of status messages into a single frame.
+
+    Top level values of type bytes (such as the content of log, stdout
+    and stderr messages) are carried as is, after the message metadata,
+    instead of being base64 encoded within JSON.
+
+    :param messages: the status messages
+    :type messages: list of dict
+    :returns: the encoded frame, including its header
+    :rtype: bytes
+    """
+    chunks = []
+    for message in messages:
+        metadata = {}
+        payloads = []
+        for key, value in message.items():
+            if isinstance(value, bytes):
+                payloads.append((key, value))
+            else:
+                metadata[key] = value
+        if payloads:
+            metadata[FRAME_PAYLOADS_KEY] = [
+                [key, len(value)] for key, value in payloads
+            ]
+        metadata = json.dumps(
+            metadata, ensure_ascii=True, default=json_base64_encode
+        ).encode("ascii")
+        chunks.append(FRAME_MESSAGE_HEADER.pack(len(metadata)))
+        chunks.append(metadata)
+        chunks.extend(value for _, value in payloads)
+    body = b"".join(chunks)
+    return FRAME_HEADER.pack(FRAME_MARKER, len(body)) + body
+
+
+def frame_decode(body):
+    """Decodes the status messages in the body of a frame.
+
+    :param body: the frame body, that is, without the frame header
+    :type body: bytes
+    :raises: StatusMsgInvalidFrameError
+    :returns: the status messages
+    :rtype: list of dict
+    """
+    messages = []
+    offset = 0
+    try:
+        while offset < len(body):
+            (size,) = FRAME_MESSAGE_HEADER.unpack_from(body, offset)
+            offset += FRAME_MESSAGE_HEADER.size
+            message = json_loads(body[offset : offset + size])
+            offset += size
+            for key, size in message.pop(FRAME_PAYLOADS_KEY, []):
+                message[key] = body[offset : offset + size]
+                offset += size
+            messages.append(message)
+    except (struct.error, ValueError, TypeError) as details:
+        raise StatusMsgInvalidFrameError(str(details)) from details
+    if offset != len(body):
+        raise StatusMsgInvalidFrameError("frame body size mismatch")
+    return messages
@@ -13,7 +13,8 @@
 # Author: Beraldo Leal <bleal@redhat.com>
 
 import os
-from copy import deepcopy
+from collections.abc import Sequence
+from copy import copy
 from enum import Enum
 from uuid import uuid4
 
@@ -83,6 +84,65 @@ def resolutions_to_runnables(resolutions, config):
     return result
 
 
+class TestVariants(Sequence):
+    """The tests of a suite, each one combined with each of the variants.
+
+    Instead of copying every test for every variant up front, a test with
+    a variant is only created when it's first accessed.  It shares all of
+    its data, but the variant, with the original test, and a variant is
+    serialized only once, and shared by all the tests with it.
+    """
+
+    def __init__(self, runnables, variants, tests_per_variant=False):
+        """
+        :param runnables: the tests of the suite
+        :type runnables: list of :class:`avocado.core.nrunner.runnable.Runnable`
+        :param variants: the variants, as produced by
+                         :meth:`avocado.core.varianter.Varianter.itertests`
+        :type variants: list of dict
+        :param tests_per_variant: whether all tests are run with a variant
+                                  before the next variant, instead of each
+                                  test being run with all variants before
+                                  the next test
+        :type tests_per_variant: bool
+        """
+        self._runnables = list(runnables)
+        self._variants = list(variants)
+        self._tests_per_variant = tests_per_variant
+        #: The serialized variants, keyed by their position
+        self._dumped_variants = {}
+        #: The tests with a variant already created, keyed by their position
+        self._runnables_with_variant = {}
+
+    def __len__(self):
+        return len(self._runnables) * len(self._variants)
+
+    def _get_dumped_variant(self, index):
+        dumped = self._dumped_variants.get(index)
+        if dumped is None:
+            dumped = dump_variant(self._variants[index])
+            self._dumped_variants[index] = dumped
+        return dumped
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("test variant index out of range")
+        runnable = self._runnables_with_variant.get(index)
+        if runnable is None:
+            if self._tests_per_variant:
+                variant, test = divmod(index, len(self._runnables))
+            else:
+                test, variant = divmod(index, len(self._variants))
+            runnable = copy(self._runnables[test])
+            runnable.variant = self._get_dumped_variant(variant)
+            self._runnables_with_variant[index] = runnable
+        return runnable
+
+
 class TestSuite:
     def __init__(
         self,
@@ -275,32 +335,23 @@ class TestSuite:
         return self._variants
 
     def _get_test_variants(self):
-        def add_variant(runnable, variant):
-            runnable = deepcopy(runnable)
-            runnable.variant = dump_variant(variant)
-            runnable_with_variant.append(runnable)
-
-        runnable_with_variant = []
         if self.test_parameters:
             paths = ["/"]
             tree_nodes = TreeNode().get_node(paths[0], True)
             tree_nodes.value = self.test_parameters
             variant = {"variant": tree_nodes, "variant_id": None, "paths": paths}
-            for runnable in self.tests:
-                add_variant(runnable, variant)
-        elif self.variants:
+            return TestVariants(self.tests, [variant])
+        if self.variants:
             # let's use variants when parameters are not available
             # define execution order
             execution_order = self.config.get("run.execution_order")
-            if execution_order == "variants-per-test":
-                for runnable in self.tests:
-                    for variant in self.variants.itertests():
-                        add_variant(runnable, variant)
-            elif execution_order == "tests-per-variant":
-                for variant in self.variants.itertests():
-                    for runnable in self.tests:
-                        add_variant(runnable, variant)
-        return runnable_with_variant
+            if execution_order in ("variants-per-test", "tests-per-variant"):
+                return TestVariants(
+                    self.tests,
+                    self.variants.itertests(),
+                    execution_order == "tests-per-variant",
+                )
+        return []
 
     def get_test_variants(self):
         """Computes test variants based on the parameters"""
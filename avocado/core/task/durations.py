@@ -0,0 +1,205 @@
+import glob
+import heapq
+import json
+import logging
+import os
+import statistics
+
+LOG = logging.getLogger(__name__)
+
+#: The default number of previous jobs, the most recent ones, whose
+#: results are used to tell how long each test is expected to take
+DURATION_HISTORY_JOBS = 10
+
+
+def get_test_name(runtime_task):
+    """Returns the name of the task's test, as recorded in job results.
+
+    :returns: the name, including the variant, or None for tasks that
+              are not tests
+    :rtype: str
+    """
+    if runtime_task.task.category != "test":
+        return None
+    identifier = runtime_task.task.identifier
+    return f"{identifier.name}{identifier.str_variant}"
+
+
+class DurationHistory:
+    """The durations of tests, as recorded by previous jobs."""
+
+    def __init__(self, durations=None):
+        """Initializes a new DurationHistory
+
+        :param durations: the recorded durations, in seconds, of each test
+                          (by its name, including the variant)
+        :type durations: dict of lists
+        """
+        self._durations = durations or {}
+
+    @classmethod
+    def from_results_dir(cls, logs_dir, jobs=DURATION_HISTORY_JOBS, exclude=None):
+        """Loads the durations from the results of previous jobs.
+
+        Only the "results.json" files of the most recent jobs are read.
+
+        :param logs_dir: the directory containing the job results
+        :type logs_dir: str
+        :param jobs: the number of jobs whose results are used
+        :type jobs: int
+        :param exclude: the results directory of a job to skip, usually
+                        the current one
+        :type exclude: str
+        :rtype: :class:`DurationHistory`
+        """
+        results = []
+        for path in glob.glob(os.path.join(logs_dir, "*", "results.json")):
+            if exclude is not None and os.path.dirname(path) == exclude:
+                continue
+            try:
+                results.append((os.path.getmtime(path), path))
+            except OSError:
+                continue
+        durations = {}
+        for _, path in heapq.nlargest(jobs, results):
+            try:
+                with open(path, "r", encoding="utf-8") as results_file:
+                    tests = json.load(results_file).get("tests", [])
+            except (OSError, ValueError) as details:
+                LOG.debug('Ignoring job results "%s": %s', path, details)
+                continue
+            for test in tests:
+                elapsed = test.get("time_elapsed", -1)
+                if not isinstance(elapsed, (int, float)) or elapsed < 0:
+                    continue
+                if test.get("status") in ("SKIP", "CANCEL", "INTERRUPTED"):
+                    continue
+                durations.setdefault(test.get("name"), []).append(elapsed)
+        return cls(durations)
+
+    def __len__(self):
+        return len(self._durations)
+
+    def get(self, name):
+        """Returns the expected duration of a test, if it has been recorded.
+
+        :param name: the name of the test, including the variant
+        :type name: str
+        :rtype: float or None
+        """
+        durations = self._durations.get(name)
+        if not durations:
+            return None
+        return statistics.mean(durations)
+
+    def get_expected_durations(self, runtime_tasks):
+        """Returns the expected duration of each of the given tasks.
+
+        Tests without a recorded duration are expected to take the median
+        of the recorded durations of the other tests, and tasks that are
+        not tests (such as dependencies) are expected to take no time.
+
+        :type runtime_tasks: list of :class:`RuntimeTask`
+        :rtype: dict
+        """
+        expected = {}
+        known = []
+        unknown = []
+        for runtime_task in runtime_tasks:
+            name = get_test_name(runtime_task)
+            if name is None:
+                expected[runtime_task] = 0.0
+                continue
+            duration = self.get(name)
+            if duration is None:
+                unknown.append(runtime_task)
+            else:
+                expected[runtime_task] = duration
+                known.append(duration)
+        default = statistics.median(known) if known else 0.0
+        for runtime_task in unknown:
+            expected[runtime_task] = default
+        return expected
+
+
+def order_by_duration(runtime_tasks, expected):
+    """Orders tasks so that the ones expected to take longer come first.
+
+    Tasks are prioritized by the expected duration of the longest chain
+    of tasks that starts with them (that is, the task itself followed by
+    the tasks depending on it), so dependencies of long tests come first
+    too.  The order given is kept for tasks with the same priority, and
+    dependencies always come before the tasks depending on them.
+
+    :param runtime_tasks: tasks, in the order they would otherwise run
+    :type runtime_tasks: list of :class:`RuntimeTask`
+    :param expected: the expected duration of each task
+    :type expected: dict
+    :rtype: list
+    """
+    position = {runtime_task: index for index, runtime_task in enumerate(runtime_tasks)}
+    dependents = {runtime_task: [] for runtime_task in runtime_tasks}
+    pending = {}
+    for runtime_task in runtime_tasks:
+        dependencies = [dep for dep in runtime_task.dependencies if dep in position]
+        pending[runtime_task] = len(dependencies)
+        for dependency in dependencies:
+            dependents[dependency].append(runtime_task)
+
+    rank = {}
+
+    def get_rank(runtime_task):
+        if runtime_task not in rank:
+            rank[runtime_task] = expected.get(runtime_task, 0.0) + max(
+                (get_rank(dependent) for dependent in dependents[runtime_task]),
+                default=0.0,
+            )
+        return rank[runtime_task]
+
+    for runtime_task in runtime_tasks:
+        get_rank(runtime_task)
+
+    ready = [
+        (-rank[runtime_task], position[runtime_task], runtime_task)
+        for runtime_task in runtime_tasks
+        if not pending[runtime_task]
+    ]
+    heapq.heapify(ready)
+    ordered = []
+    while ready:
+        _, _, runtime_task = heapq.heappop(ready)
+        ordered.append(runtime_task)
+        for dependent in dependents[runtime_task]:
+            pending[dependent] -= 1
+            if not pending[dependent]:
+                heapq.heappush(
+                    ready, (-rank[dependent], position[dependent], dependent)
+                )
+    return ordered
+
+
+def predict_makespan(runtime_tasks, expected, slots):
+    """Predicts how long running the tasks, in the given order, takes.
+
+    Each task takes the first of the slots to become free, but not
+    before its dependencies are finished.
+
+    :param runtime_tasks: tasks, in the order they're started
+    :type runtime_tasks: list of :class:`RuntimeTask`
+    :param expected: the expected duration of each task
+    :type expected: dict
+    :param slots: the number of tasks running in parallel
+    :type slots: int
+    :returns: the expected duration, in seconds, of all tasks
+    :rtype: float
+    """
+    free = [0.0] * max(slots, 1)
+    finish = {}
+    for runtime_task in runtime_tasks:
+        slot_free = heapq.heappop(free)
+        start = max(
+            [slot_free] + [finish.get(dep, 0.0) for dep in runtime_task.dependencies]
+        )
+        finish[runtime_task] = start + expected.get(runtime_task, 0.0)
+        heapq.heappush(free, finish[runtime_task])
+    return max(finish.values(), default=0.0)
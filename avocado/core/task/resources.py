@@ -0,0 +1,202 @@
+import collections
+import logging
+import os
+
+from avocado.utils import data_structures, memory
+
+LOG = logging.getLogger(__name__)
+
+#: Tag key with the number of CPUs a task uses, such as in
+#: ":avocado: tags=resources_cpu:2".  Fractions are allowed.
+RESOURCES_CPU_TAG = "resources_cpu"
+
+#: Tag key with the amount of memory a task uses, such as in
+#: ":avocado: tags=resources_memory:512M"
+RESOURCES_MEMORY_TAG = "resources_memory"
+
+#: Number of times the task at the head of the ready queue may be
+#: bypassed by tasks that fit in the available resources, before no
+#: other task is allowed to start ahead of it.  This keeps tasks with
+#: large resource demands from starving.
+RESOURCES_MAX_BYPASS = 8
+
+#: Number of tasks, from the head of the ready queue, that are looked
+#: at when searching for a task that fits in the available resources
+RESOURCES_READY_WINDOW = 64
+
+
+class TaskResources(collections.namedtuple("TaskResources", ["cpu", "memory"])):
+    """The resources, CPUs and memory in bytes, a task uses."""
+
+    __slots__ = ()
+
+    @classmethod
+    def from_runnable(cls, runnable):
+        """Creates the resources of a task from its runnable's tags.
+
+        Tasks use 1 CPU and no memory, unless their runnables are
+        tagged with :data:`RESOURCES_CPU_TAG` or
+        :data:`RESOURCES_MEMORY_TAG`.  Invalid values are ignored.
+
+        :type runnable: :class:`avocado.core.nrunner.runnable.Runnable`
+        :rtype: :class:`TaskResources`
+        """
+        tags = runnable.tags or {}
+        cpu = 1.0
+        memory_bytes = 0
+        try:
+            cpu_values = tags.get(RESOURCES_CPU_TAG) or ()
+            if cpu_values:
+                cpu = max(float(value) for value in cpu_values)
+        except ValueError:
+            LOG.warning('Ignoring invalid "%s" tag: %s', RESOURCES_CPU_TAG, cpu_values)
+        try:
+            memory_values = tags.get(RESOURCES_MEMORY_TAG) or ()
+            if memory_values:
+                memory_bytes = max(
+                    int(data_structures.DataSize(value).b) for value in memory_values
+                )
+        except data_structures.InvalidDataSize:
+            LOG.warning(
+                'Ignoring invalid "%s" tag: %s', RESOURCES_MEMORY_TAG, memory_values
+            )
+        return cls(cpu, memory_bytes)
+
+
+def get_available_memory():
+    """Returns the memory available in the system, in bytes, if known.
+
+    :rtype: int or None
+    """
+    try:
+        available = memory.read_from_meminfo("MemAvailable")
+    except (OSError, AttributeError):
+        return None
+    if available is None:
+        return None
+    return available * 1024
+
+
+def get_available_cpus():
+    """Returns the number of CPUs this process is allowed to run on."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+class ResourceBudget:
+    """Keeps track of the CPU and memory budgets for running tasks.
+
+    Tasks are admitted to run only when their resources fit in what's
+    left of the budgets.  A task whose resources exceed the budgets is
+    admitted when nothing else is running, so it can still run.
+    """
+
+    def __init__(self, cpu=None, memory_bytes=None, sample_memory=False):
+        """Initializes a new ResourceBudget
+
+        :param cpu: the number of CPUs that running tasks may use.
+                    Defaults to the number of CPUs available.
+        :type cpu: float
+        :param memory_bytes: the amount of memory, in bytes, that running
+                             tasks may use.  Defaults to the memory
+                             available in the system, if known, or no
+                             limit otherwise.
+        :type memory_bytes: int
+        :param sample_memory: whether the memory available in the system
+                              is also checked when admitting a task, which
+                              accounts for memory used by other processes
+        :type sample_memory: bool
+        """
+        if cpu is None:
+            cpu = get_available_cpus()
+        if memory_bytes is None:
+            memory_bytes = get_available_memory()
+        self.cpu = cpu
+        self.memory = memory_bytes
+        self.sample_memory = sample_memory
+        #: Resources of the admitted tasks that haven't been released
+        self._in_use = {}
+        self._cpu_in_use = 0.0
+        self._memory_in_use = 0
+        #: How many times the task at the head of the queue was bypassed
+        self._bypassed = 0
+
+    @property
+    def cpu_in_use(self):
+        return self._cpu_in_use
+
+    @property
+    def memory_in_use(self):
+        return self._memory_in_use
+
+    def fits(self, resources):
+        """Checks if resources fit in what's left of the budgets.
+
+        :type resources: :class:`TaskResources`
+        :rtype: bool
+        """
+        if not self._in_use:
+            return True
+        if self._cpu_in_use + resources.cpu > self.cpu:
+            return False
+        if self.memory is not None:
+            if self._memory_in_use + resources.memory > self.memory:
+                return False
+        if self.sample_memory and resources.memory:
+            available = get_available_memory()
+            if available is not None and resources.memory > available:
+                return False
+        return True
+
+    def acquire(self, runtime_task, resources):
+        self._in_use[runtime_task] = resources
+        self._cpu_in_use += resources.cpu
+        self._memory_in_use += resources.memory
+
+    def release(self, runtime_task):
+        """Releases the resources of a task, if it had acquired them."""
+        resources = self._in_use.pop(runtime_task, None)
+        if resources is None:
+            return
+        self._cpu_in_use -= resources.cpu
+        self._memory_in_use -= resources.memory
+
+    def admit(self, runtime_task, ready):
+        """Picks a task to start, and acquires its resources.
+
+        The given task, just taken from the head of the ready queue, is
+        admitted if it fits.  Otherwise it's put back at the head of the
+        queue, and the first task, within :data:`RESOURCES_READY_WINDOW`,
+        that fits is admitted instead (first-fit), unless the head of the
+        queue has already been bypassed :data:`RESOURCES_MAX_BYPASS` times.
+
+        This must be called with the state machine lock held.
+
+        :param runtime_task: the task taken from the head of the queue
+        :type runtime_task: :class:`avocado.core.task.runtime.RuntimeTask`
+        :param ready: the queue of tasks ready to start
+        :type ready: :class:`avocado.core.task.statemachine.TaskQueue`
+        :returns: the admitted task, already removed from the queue, or
+                  None if no task fits
+        """
+        resources = runtime_task.resources
+        if self.fits(resources):
+            self._bypassed = 0
+            self.acquire(runtime_task, resources)
+            return runtime_task
+        ready.appendleft(runtime_task)
+        if self._bypassed >= RESOURCES_MAX_BYPASS:
+            return None
+        for index, candidate in enumerate(ready):
+            if index == 0:
+                continue
+            if index > RESOURCES_READY_WINDOW:
+                break
+            if self.fits(candidate.resources):
+                self._bypassed += 1
+                ready.remove(candidate)
+                self.acquire(candidate, candidate.resources)
+                return candidate
+        return None
@@ -4,6 +4,7 @@ from enum import Enum
 
 from avocado.core.dispatcher import TestPostDispatcher, TestPreDispatcher
 from avocado.core.nrunner.task import TASK_DEFAULT_CATEGORY, Task
+from avocado.core.task.resources import TaskResources
 from avocado.core.test_id import TestID
 
 
@@ -148,6 +149,7 @@ class RuntimeTask(RuntimeTaskMixin):
             ]
         #: Flag to detect if the task should be save to cache
         self.is_cacheable = False
+        self._resources = None
 
     def __repr__(self):
         if self.status is None:
@@ -170,6 +172,16 @@ class RuntimeTask(RuntimeTaskMixin):
     def result(self):
         return self._result
 
+    @property
+    def resources(self):
+        """The resources (CPU and memory) the task uses when running.
+
+        :rtype: :class:`avocado.core.task.resources.TaskResources`
+        """
+        if self._resources is None:
+            self._resources = TaskResources.from_runnable(self.task.runnable)
+        return self._resources
+
     @property
     def satisfiable_deps_execution_statuses(self):
         return self._satisfiable_deps_execution_statuses
@@ -11,21 +11,99 @@ from avocado.core.utils import messages
 
 LOG = logging.getLogger(__name__)
 
+#: Upper bound, in seconds, that an idle worker waits for a transition
+#: notification before re-checking the state machine queues.  Workers
+#: are normally woken up as soon as a relevant transition happens, so
+#: this is only a safety net.
+TRANSITION_WAIT_TIMEOUT = 1.0
+
+
+class TaskQueue:
+    """An ordered queue of runtime tasks with constant time operations.
+
+    Besides adding and popping tasks at both ends, checking whether a
+    task is in the queue and removing a task from anywhere in the queue
+    are also constant time operations, because tasks are indexed by
+    themselves (and runtime tasks hash to their identifiers).
+    """
+
+    def __init__(self, tasks=()):
+        self._tasks = collections.OrderedDict.fromkeys(tasks)
+
+    def append(self, runtime_task):
+        self._tasks[runtime_task] = None
+        self._tasks.move_to_end(runtime_task)
+
+    def appendleft(self, runtime_task):
+        self._tasks[runtime_task] = None
+        self._tasks.move_to_end(runtime_task, last=False)
+
+    def pop(self):
+        try:
+            return self._tasks.popitem(last=True)[0]
+        except KeyError as details:
+            raise IndexError("pop from an empty task queue") from details
+
+    def popleft(self):
+        try:
+            return self._tasks.popitem(last=False)[0]
+        except KeyError as details:
+            raise IndexError("pop from an empty task queue") from details
+
+    def remove(self, runtime_task):
+        try:
+            del self._tasks[runtime_task]
+        except KeyError as details:
+            raise ValueError(f"{runtime_task} is not in the task queue") from details
+
+    def __contains__(self, runtime_task):
+        return runtime_task in self._tasks
+
+    def __iter__(self):
+        return iter(self._tasks)
+
+    def __len__(self):
+        return len(self._tasks)
+
+    def __repr__(self):
+        return f"<TaskQueue {list(self._tasks)}>"
+
 
 class TaskStateMachine:
     """Represents all phases that a task can go through its life."""
 
-    def __init__(self, tasks, status_repo):
-        self._requested = collections.deque(tasks)
+    def __init__(self, tasks, status_repo, resource_budget=None, start_checks=None):
+        self._requested = TaskQueue(tasks)
         self._status_repo = status_repo
-        self._triaging = []
-        self._ready = []
-        self._started = []
-        self._monitored = []
-        self._finished = []
+        #: The CPU and memory budgets that started tasks must fit in, if
+        #: any (see :class:`avocado.core.task.resources.ResourceBudget`)
+        self._resource_budget = resource_budget
+        #: Functions given the runnable of a task, which must all return
+        #: True before the task leaves triage
+        self._start_checks = list(start_checks or [])
+        self._triaging = TaskQueue()
+        #: Tasks held back by the start checks, out of the way of the
+        #: others until :meth:`release_held` finds they may start
+        self._held = TaskQueue()
+        self._ready = TaskQueue()
+        self._started = TaskQueue()
+        self._monitored = TaskQueue()
+        self._finished = TaskQueue()
         self._lock = asyncio.Lock()
         self._cache_lock = asyncio.Lock()
+        #: Condition (sharing :attr:`lock`) used to wake up workers
+        #: waiting for a transition of tasks between the queues
+        self._transition = asyncio.Condition(self._lock)
+        #: Monotonic counter of notified transitions, used by waiters
+        #: to detect transitions that happened before they started to wait
+        self._transitions = 0
         self._task_size = len(tasks)
+        #: The event loop the tasks are held back in, to which
+        #: :meth:`release_held_threadsafe` hands over
+        self._loop = None
+        #: Keeps the tasks created by :meth:`release_held_threadsafe`
+        #: alive until they are done
+        self._releases = set()
 
         self._tasks_by_id = {
             str(runtime_task.task.identifier): runtime_task.task
@@ -40,6 +118,10 @@ class TaskStateMachine:
     def triaging(self):
         return self._triaging
 
+    @property
+    def held(self):
+        return self._held
+
     @property
     def ready(self):
         return self._ready
@@ -60,18 +142,118 @@ class TaskStateMachine:
     def lock(self):
         return self._lock
 
+    @property
+    def resource_budget(self):
+        return self._resource_budget
+
     @property
     def cache_lock(self):
         return self._cache_lock
 
+    def may_start(self, runtime_task):
+        """Tells whether a task passes all the start checks.
+
+        :type runtime_task: :class:`avocado.core.task.runtime.RuntimeTask`
+        :rtype: bool
+        """
+        return all(check(runtime_task.task.runnable) for check in self._start_checks)
+
+    async def hold(self, runtime_task):
+        """Holds back a task which doesn't pass the start checks.
+
+        This is not a transition: the task is only checked again by
+        :meth:`release_held`.
+        """
+        self._loop = asyncio.get_running_loop()
+        async with self._lock:
+            self._held.append(runtime_task)
+            runtime_task.status = RuntimeTaskStatus.WAIT
+
+    async def release_held(self):
+        """Moves the held tasks which now pass the start checks back to the
+        front of the requested queue, in their order."""
+        async with self._lock:
+            released = [
+                runtime_task
+                for runtime_task in self._held
+                if self.may_start(runtime_task)
+            ]
+            if not released:
+                return
+            for runtime_task in reversed(released):
+                self._held.remove(runtime_task)
+                self._requested.appendleft(runtime_task)
+                LOG.debug('Task "%s": held -> requested', runtime_task.task.identifier)
+            self.notify_transition()
+
+    def release_held_threadsafe(self):
+        """Has :meth:`release_held` run soon, from any thread.
+
+        It's meant to be called when what the start checks wait for may
+        have become ready.
+        """
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        loop.call_soon_threadsafe(self._schedule_release)
+
+    def _schedule_release(self):
+        release = asyncio.ensure_future(self.release_held())
+        self._releases.add(release)
+        release.add_done_callback(self._releases.discard)
+
     @property
     def task_size(self):
         return self._task_size
 
+    @property
+    def transitions(self):
+        """Number of transitions notified so far."""
+        return self._transitions
+
+    def notify_transition(self):
+        """Wakes up workers waiting on a transition.
+
+        This must be called with :attr:`lock` held, right after a task
+        has been moved into a queue in a way that may allow other
+        workers to make progress.  Putting a task back into the queue it
+        was taken from (because it has to wait) is not a transition.
+        """
+        self._transitions += 1
+        self._transition.notify_all()
+
+    async def wait_for_transition(self, since, timeout=TRANSITION_WAIT_TIMEOUT):
+        """Waits until a transition newer than the given one is notified.
+
+        :param since: the value of :attr:`transitions` known by the caller
+        :type since: int
+        :param timeout: maximum amount of time to wait, in seconds
+        :type timeout: float
+        :returns: whether a newer transition was notified
+        :rtype: bool
+        """
+        async with self._transition:
+            try:
+                await asyncio.wait_for(
+                    self._transition.wait_for(lambda: self._transitions != since),
+                    timeout,
+                )
+            except asyncio.TimeoutError:
+                return False
+        return True
+
     @property
     async def complete(self):
         async with self._lock:
-            pending = any([self._requested, self._triaging, self._ready, self._started])
+            pending = any(
+                [
+                    self._requested,
+                    self._triaging,
+                    self._held,
+                    self._ready,
+                    self._started,
+                ]
+            )
         return not pending
 
     @property
@@ -82,6 +264,7 @@ class TaskStateMachine:
         async with self.lock:
             self._requested.appendleft(runtime_task)
             self._tasks_by_id[str(runtime_task.task.identifier)] = runtime_task.task
+            self.notify_transition()
         return
 
     async def abort(self, status_reason=None):
@@ -94,6 +277,7 @@ class TaskStateMachine:
         """
         await self.abort_queue("requested", status_reason)
         await self.abort_queue("triaging", status_reason)
+        await self.abort_queue("held", status_reason)
         await self.abort_queue("ready", status_reason)
 
     async def abort_queue(self, queue_name, status_reason=None):
@@ -106,11 +290,7 @@ class TaskStateMachine:
         async with self._lock:
             queue = getattr(self, queue_name)
             for _ in range(len(queue)):
-                if queue_name == "requested":
-                    runtime_task = queue.popleft()
-                else:
-                    runtime_task = queue.pop(0)
-                to_remove.append(runtime_task)
+                to_remove.append(queue.popleft())
 
         if to_remove:
             if status_reason:
@@ -140,6 +320,8 @@ class TaskStateMachine:
         :param status_reason: string reason. Optional.
         """
         async with self._lock:
+            if self._resource_budget is not None:
+                self._resource_budget.release(runtime_task)
             if runtime_task not in self.finished:
                 if status_reason:
                     runtime_task.status = status_reason
@@ -151,6 +333,7 @@ class TaskStateMachine:
                 else:
                     LOG.debug('Task "%s" finished', runtime_task.task.identifier)
                 self.finished.append(runtime_task)
+                self.notify_transition()
 
 
 class Worker:
@@ -227,6 +410,7 @@ class Worker:
                 if len(self._state_machine.triaging) < self._max_triaging:
                     runtime_task = self._state_machine.requested.popleft()
                     self._state_machine.triaging.append(runtime_task)
+                    self._state_machine.notify_transition()
                     LOG.debug(
                         'Task "%s": requested -> triaging', runtime_task.task.identifier
                     )
@@ -240,10 +424,18 @@ class Worker:
 
         try:
             async with self._state_machine.lock:
-                runtime_task = self._state_machine.triaging.pop(0)
+                runtime_task = self._state_machine.triaging.popleft()
         except IndexError:
             return
 
+        # a task may be held back until what it needs, but does not
+        # describe as requirements, is ready.  it's set aside, so that
+        # it doesn't take the place of other tasks in triage
+        if not self._state_machine.may_start(runtime_task):
+            LOG.debug('Task "%s": triaging -> held', runtime_task.task.identifier)
+            await self._state_machine.hold(runtime_task)
+            return
+
         # a task waiting requirements already checked its requirements
         if runtime_task.status != RuntimeTaskStatus.WAIT_DEPENDENCIES:
             # check for requirements a task may have
@@ -267,7 +459,6 @@ class Worker:
                 async with self._state_machine.lock:
                     self._state_machine.triaging.append(runtime_task)
                     runtime_task.status = RuntimeTaskStatus.WAIT_DEPENDENCIES
-                await asyncio.sleep(0.1)
                 return
 
             # dependencies finished, let's check if they finished
@@ -312,7 +503,6 @@ class Worker:
                         async with self._state_machine.lock:
                             self._state_machine.triaging.append(runtime_task)
                             runtime_task.status = RuntimeTaskStatus.WAIT
-                            await asyncio.sleep(0.1)
                         return
 
                     if is_task_in_cache:
@@ -346,12 +536,13 @@ class Worker:
         # the task is ready to run
         async with self._state_machine.lock:
             self._state_machine.ready.append(runtime_task)
+            self._state_machine.notify_transition()
 
     async def start(self):
         """Reads from ready, moves into either: started or finished."""
         try:
             async with self._state_machine.lock:
-                runtime_task = self._state_machine.ready.pop(0)
+                runtime_task = self._state_machine.ready.popleft()
         except IndexError:
             return
 
@@ -359,15 +550,23 @@ class Worker:
         # running) tasks.  this is a global limit, but the spawners
         # can also be queried with regards to their capacity to handle
         # new tasks
-        should_wait = False
         async with self._state_machine.lock:
             if len(self._state_machine.started) >= self._max_running:
-                self._state_machine.ready.insert(0, runtime_task)
+                self._state_machine.ready.appendleft(runtime_task)
                 runtime_task.status = RuntimeTaskStatus.WAIT
-                should_wait = True
-        if should_wait:
-            await asyncio.sleep(0.1)
-            return
+                return
+            # on top of that, the resources (CPU and memory) used by the
+            # task must fit in the budgets, if those are set.  another
+            # task, further in the ready queue, may be started instead
+            resource_budget = self._state_machine.resource_budget
+            if resource_budget is not None:
+                admitted = resource_budget.admit(
+                    runtime_task, self._state_machine.ready
+                )
+                if admitted is None:
+                    runtime_task.status = RuntimeTaskStatus.WAIT
+                    return
+                runtime_task = admitted
 
         LOG.debug(
             'Task "%s": about to be spawned with "%s"',
@@ -382,6 +581,7 @@ class Worker:
                 runtime_task.execution_timeout = time.monotonic() + self._task_timeout
             async with self._state_machine.lock:
                 self._state_machine.started.append(runtime_task)
+                self._state_machine.notify_transition()
         else:
             await self._state_machine.finish_task(
                 runtime_task, RuntimeTaskStatus.FAIL_START
@@ -391,7 +591,7 @@ class Worker:
         """Reads from started, moves into finished."""
         try:
             async with self._state_machine.lock:
-                runtime_task = self._state_machine.started.pop(0)
+                runtime_task = self._state_machine.started.popleft()
         except IndexError:
             return
 
@@ -401,6 +601,7 @@ class Worker:
             )
             async with self._state_machine.lock:
                 self._state_machine._monitored.append(runtime_task)
+                self._state_machine.notify_transition()
             try:
                 if runtime_task.execution_timeout is None:
                     remaining = None
@@ -426,23 +627,11 @@ class Worker:
                 runtime_task.task.identifier,
             )
 
-        # from here, this `task` ran, so, let's check
-        # its latest data in the status repo
-        latest_task_data = (
-            self._state_machine._status_repo.get_latest_task_data(
-                str(runtime_task.task.identifier)
-            )
-            or {}
+        # from here, this `task` ran, so, let's check its latest data in
+        # the status repo, waiting for its results if not available yet
+        latest_task_data = await self._state_machine._status_repo.wait_task_result(
+            str(runtime_task.task.identifier)
         )
-        # or maybe its results are not available yet
-        while latest_task_data.get("result") is None:
-            await asyncio.sleep(0.1)
-            latest_task_data = (
-                self._state_machine._status_repo.get_latest_task_data(
-                    str(runtime_task.task.identifier)
-                )
-                or {}
-            )
         if runtime_task.task.category != "test":
             async with self._state_machine.cache_lock:
                 await self._spawner.update_requirement_cache(
@@ -469,16 +658,19 @@ class Worker:
         terminated = []
         while True:
             async with self._state_machine.lock:
+                transitions = self._state_machine.transitions
                 try:
-                    runtime_task = self._state_machine.monitored.pop(0)
+                    runtime_task = self._state_machine.monitored.popleft()
                     await self._terminate_task(runtime_task, task_status)
                     terminated.append(runtime_task)
+                    continue
                 except IndexError:
                     if (
                         len(self._state_machine.finished) + len(terminated)
                         == self._state_machine.task_size
                     ):
                         break
+            await self._state_machine.wait_for_transition(transitions)
         return terminated
 
     async def terminate_tasks_timeout(self):
@@ -494,8 +686,15 @@ class Worker:
         await self._send_finished_tasks_message(terminated, "Interrupted by user")
 
     async def run(self):
-        """Pushes Tasks forward and makes them do something with their lives."""
+        """Pushes Tasks forward and makes them do something with their lives.
+
+        When a full pass over all phases does not move any task forward
+        (and no other worker did so in the mean time), the worker sleeps
+        until the next transition is notified, instead of polling.  The
+        tasks held back by the start checks are checked again then.
+        """
         while True:
+            transitions = self._state_machine.transitions
             is_complete = await self._state_machine.complete
             if is_complete:
                 break
@@ -503,3 +702,6 @@ class Worker:
             await self.triage()
             await self.start()
             await self.monitor()
+            if self._state_machine.transitions == transitions:
+                await self._state_machine.wait_for_transition(transitions)
+                await self._state_machine.release_held()
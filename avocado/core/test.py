@@ -868,7 +868,13 @@ class Test(unittest.TestCase, TestData):
                 raise e
 
         asset_obj = asset.Asset(
-            name, asset_hash, algorithm, locations, self.cache_dirs, expire
+            name,
+            asset_hash,
+            algorithm,
+            locations,
+            self.cache_dirs,
+            expire,
+            connections=self._config.get("assets.fetch.connections", 1),
         )
 
         try:
@@ -321,7 +321,8 @@ class TreeNode:
 
     def get_path(self, sep="/"):
         """Get node path"""
-        if not self.parent:
+        # "not self.parent" would count all the leaves of the parent
+        if self.parent is None:
             return sep + astring.to_text(self.name)
         path = [astring.to_text(self.name)]
         for node in self.iter_parents():
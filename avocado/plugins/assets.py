@@ -17,20 +17,32 @@ Assets subcommand
 """
 
 import ast
+import concurrent.futures
 import os
+import threading
+import time
 from datetime import datetime
 
 from avocado.core import exit_codes, safeloader
 from avocado.core.nrunner.runnable import Runnable
 from avocado.core.output import LOG_UI
-from avocado.core.plugin_interfaces import CLICmd, JobPreTests
+from avocado.core.plugin_interfaces import CLICmd, JobPostTests, JobPreTests
+from avocado.core.safeloader.index import ModuleIndex, parse
 from avocado.core.settings import settings
 from avocado.utils import data_structures
-from avocado.utils.asset import SUPPORTED_OPERATORS, Asset
+from avocado.utils.asset import (
+    SUPPORTED_OPERATORS,
+    Asset,
+    AssetCatalog,
+    AssetStore,
+)
 from avocado.utils.astring import iter_tabular_output
 from avocado.utils.data_structures import DataSize, InvalidDataSize
 from avocado.utils.output import display_data_size
 
+#: Default maximum number of assets fetched at the same time
+ASSET_PREFETCH_WORKERS = 4
+
 
 class FetchAssetHandler(ast.NodeVisitor):  # pylint: disable=R0902
     """
@@ -63,9 +75,13 @@ class FetchAssetHandler(ast.NodeVisitor):  # pylint: disable=R0902
             )[0]
         self.tests = test_file_parse_cache[file_name]
 
-        # create Abstract Syntax Tree from test source file
-        with open(self.file_name, encoding="utf-8") as source_file:
-            self.tree = ast.parse(source_file.read(), self.file_name)
+        # create Abstract Syntax Tree from test source file, unless it's
+        # been parsed already to find the tests
+        index = ModuleIndex.get_active()
+        if index is None:
+            self.tree = parse(self.file_name)
+        else:
+            self.tree = index.get_tree(self.file_name)
 
         # build list of keyword arguments from calls that match pattern
         self.visit(self.tree)
@@ -237,6 +253,7 @@ def fetch_assets(
     """
     cache_dirs = settings.as_dict().get("datadir.paths.cache_dirs")
     timeout = settings.as_dict().get("assets.fetch.timeout")
+    connections = settings.as_dict().get("assets.fetch.connections")
     success = []
     fail = []
     handler = FetchAssetHandler(test_file, test_file_parse_cache, klass, method)
@@ -246,7 +263,9 @@ def fetch_assets(
             expire = data_structures.time_to_seconds(str(expire))
 
         try:
-            asset_obj = Asset(**call, cache_dirs=cache_dirs, expire=expire)
+            asset_obj = Asset(
+                **call, cache_dirs=cache_dirs, expire=expire, connections=connections
+            )
             if logger is not None:
                 logger.info("Fetching asset from %s:%s.%s", test_file, klass, method)
             asset_obj.fetch(timeout)
@@ -256,7 +275,189 @@ def fetch_assets(
     return success, fail
 
 
-class FetchAssetJob(JobPreTests):  # pylint: disable=R0903
+class AssetPrefetch:
+    """Fetches the assets of many tests, within a pool of threads.
+
+    The assets are found in the `fetch_asset` statements of the tests
+    (see :class:`FetchAssetHandler`).  The ones asked for with the very
+    same arguments, by the same or different tests, are fetched only once.
+    Different assets that end up in the same cache file are still
+    serialized by the lock each fetch holds on that file.
+    """
+
+    def __init__(
+        self, workers=None, timeout=None, cache_dirs=None, logger=None, connections=1
+    ):
+        """
+        :param workers: maximum number of assets fetched at the same time
+        :type workers: int
+        :param timeout: timeout for the fetch of each asset
+        :type timeout: int
+        :param cache_dirs: the cache directories.  Defaults to the ones
+                           in the "datadir.paths.cache_dirs" setting
+        :type cache_dirs: list
+        :param logger: where the progress of each fetch is logged to
+        :type logger: :class:`logging.Logger`
+        :param connections: maximum number of connections used at the same
+                            time to download each asset
+        :type connections: int
+        """
+        self.workers = workers or ASSET_PREFETCH_WORKERS
+        self.timeout = timeout
+        if cache_dirs is None:
+            cache_dirs = settings.as_dict().get("datadir.paths.cache_dirs")
+        self.cache_dirs = cache_dirs
+        self.logger = logger
+        self.connections = connections
+        #: the arguments of each asset to be fetched, by key
+        self._calls = {}
+        self._futures = {}
+        self._callbacks = []
+        self._executor = None
+        self._fetched = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _get_key(call):
+        return tuple(
+            (keyword, tuple(value) if isinstance(value, list) else value)
+            for keyword, value in sorted(call.items())
+        )
+
+    def add(self, test_file, test_file_parse_cache, klass=None, method=None):
+        """Adds the assets of a test (or of all tests in a file).
+
+        :param test_file: file name of instrumented test to be evaluated
+        :type test_file: str
+        :returns: the keys of the assets of the test
+        :rtype: list
+        """
+        keys = []
+        handler = FetchAssetHandler(test_file, test_file_parse_cache, klass, method)
+        for call in handler.calls:
+            key = self._get_key(call)
+            if key not in self._calls:
+                self._calls[key] = call
+            keys.append(key)
+        return keys
+
+    def __len__(self):
+        return len(self._calls)
+
+    def _log(self, msg, *args):
+        if self.logger is not None:
+            self.logger.info(msg, *args)
+
+    def _fetch(self, call):
+        call = dict(call)
+        expire = call.pop("expire", None)
+        if expire is not None:
+            expire = data_structures.time_to_seconds(str(expire))
+        start = time.monotonic()
+        try:
+            Asset(
+                **call,
+                cache_dirs=self.cache_dirs,
+                expire=expire,
+                connections=self.connections,
+            ).fetch(self.timeout)
+        except (OSError, ValueError) as failed:
+            with self._lock:
+                self._fetched += 1
+                fetched = self._fetched
+            self._log(
+                "Failed to fetch asset %s (%s of %s): %s",
+                call["name"],
+                fetched,
+                len(self),
+                failed,
+            )
+            raise
+        with self._lock:
+            self._fetched += 1
+            fetched = self._fetched
+        self._log(
+            "Asset %s fetched (%s of %s) in %.2fs",
+            call["name"],
+            fetched,
+            len(self),
+            time.monotonic() - start,
+        )
+        return call["name"]
+
+    def add_done_callback(self, callback):
+        """Has a function called, with no arguments, as each asset fetch
+        is over.
+
+        It's called from the thread that fetched the asset, and must be
+        added before :meth:`start`.
+        """
+        self._callbacks.append(callback)
+
+    def _done(self, _):
+        for callback in self._callbacks:
+            callback()
+
+    def start(self):
+        """Starts fetching all the assets added."""
+        if self._executor is not None:
+            return
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            self.workers, thread_name_prefix="asset-prefetch"
+        )
+        for key, call in self._calls.items():
+            self._log("Fetching asset %s", call["name"])
+            self._futures[key] = self._executor.submit(self._fetch, call)
+            self._futures[key].add_done_callback(self._done)
+
+    def wait(self):
+        """Waits for all the assets to be fetched.
+
+        :returns: names that were successfully fetched and list of fails
+        :rtype: tuple
+        """
+        self.start()
+        self._executor.shutdown(wait=True)
+        return self.get_results(self._futures)
+
+    def are_fetched(self, keys):
+        """Tells whether the fetches of some of the assets are over.
+
+        :param keys: keys of assets (as returned by :meth:`add`)
+        :rtype: bool
+        """
+        return all(self._futures[key].done() for key in keys)
+
+    def cancel(self):
+        """Cancels the fetches not started yet, and waits for the others."""
+        if self._executor is None:
+            return
+        cancelled = sum(future.cancel() for future in self._futures.values())
+        if cancelled:
+            self._log("Cancelled the fetch of %s asset(s)", cancelled)
+        self._executor.shutdown(wait=True)
+
+    def get_results(self, keys):
+        """Returns the results of fetching some of the assets.
+
+        It waits for those to be fetched.
+
+        :param keys: keys of assets (as returned by :meth:`add`)
+        :returns: names that were successfully fetched and list of fails
+        :rtype: tuple
+        """
+        self.start()
+        success = []
+        fail = []
+        for key in keys:
+            try:
+                success.append(self._futures[key].result())
+            except (OSError, ValueError) as failed:
+                fail.append(failed)
+        return success, fail
+
+
+class FetchAssetJob(JobPreTests, JobPostTests):
     """Implements the assets fetch job pre tests.
 
     This has the same effect of running the 'avocado assets fetch
@@ -268,14 +469,24 @@ class FetchAssetJob(JobPreTests):  # pylint: disable=R0903
     description = "Fetch assets before the test run"
 
     def __init__(self, config=None):  # pylint: disable=W0231
-        pass
+        self.prefetch = None
+        #: the keys of the assets of each test, by the test's URI
+        self._keys = {}
+
+    def _are_assets_fetched(self, runnable):
+        return self.prefetch.are_fetched(self._keys.get(runnable.uri, []))
+
+    @staticmethod
+    def _recheck_task_start(job):
+        if job.task_start_recheck is not None:
+            job.task_start_recheck()
 
     def pre_tests(self, job):
         if not job.config.get("stdout_claimed_by", None):
             logger = job.log
         else:
             logger = None
-        candidates = []
+        candidates = {}
         for suite in job.test_suites:
             for test in suite.tests:
                 # nrunner/resolver based test should describe their requirements
@@ -286,15 +497,37 @@ class FetchAssetJob(JobPreTests):  # pylint: disable=R0903
                     if test.kind == "avocado-instrumented":
                         module_path, klass_method = test.uri.split(":", 1)
                         klass, method = klass_method.split(".", 1)
-                        candidate = (module_path, klass, method)
-                        if candidate not in candidates:
-                            candidates.append(candidate)
+                        candidates[test.uri] = (module_path, klass, method)
 
+        self.prefetch = AssetPrefetch(
+            job.config.get("assets.fetch.workers"),
+            job.config.get("assets.fetch.timeout"),
+            logger=logger,
+            connections=job.config.get("assets.fetch.connections"),
+        )
         test_file_parse_cache = {}
-        for candidate in candidates:
-            fetch_assets(
-                candidate[0], test_file_parse_cache, candidate[1], candidate[2], logger
-            )
+        with ModuleIndex.session():
+            for uri, (module_path, klass, method) in candidates.items():
+                self._keys[uri] = self.prefetch.add(
+                    module_path, test_file_parse_cache, klass, method
+                )
+        if job.config.get("assets.fetch.background"):
+            # tests are held back until their own assets are fetched,
+            # instead of waiting for them (and timing out) on their locks
+            job.task_start_checks.append(self._are_assets_fetched)
+            self.prefetch.add_done_callback(lambda: self._recheck_task_start(job))
+            self.prefetch.start()
+        else:
+            self.prefetch.wait()
+
+    def post_tests(self, job):
+        if self.prefetch is None:
+            return
+        # the tests that needed the assets still pending were not run
+        if job.interrupted_reason is not None or job.status != "PASS":
+            self.prefetch.cancel()
+        else:
+            self.prefetch.wait()
 
 
 class Assets(CLICmd):
@@ -415,6 +648,46 @@ class Assets(CLICmd):
             long_arg="--timeout",
         )
 
+        help_msg = "Maximum number of assets to be fetched at the same time."
+        settings.register_option(
+            section="assets.fetch",
+            key="workers",
+            help_msg=help_msg,
+            default=ASSET_PREFETCH_WORKERS,
+            key_type=int,
+            metavar="WORKERS",
+            parser=fetch_subcommand_parser,
+            long_arg="--workers",
+        )
+
+        help_msg = (
+            "Maximum number of connections used at the same time to "
+            "download each asset, if the server supports range requests."
+        )
+        settings.register_option(
+            section="assets.fetch",
+            key="connections",
+            help_msg=help_msg,
+            default=1,
+            key_type=int,
+            metavar="CONNECTIONS",
+            parser=fetch_subcommand_parser,
+            long_arg="--connections",
+        )
+
+        help_msg = (
+            "Whether the tests of a job start while the assets found in "
+            "them are still being fetched.  Each test is only started once "
+            "its own assets are fetched."
+        )
+        settings.register_option(
+            section="assets.fetch",
+            key="background",
+            help_msg=help_msg,
+            default=False,
+            key_type=bool,
+        )
+
         register_subcommand_parser = subcommands.add_parser(
             "register", help="Register an asset directly to the cacche"
         )
@@ -462,6 +735,34 @@ class Assets(CLICmd):
         list_subcommand_parser = subcommands.add_parser("list", help=help_msg)
         register_filter_options(list_subcommand_parser, "assets.list")
 
+        help_msg = (
+            "Updates the catalogs of the cached assets with the files found "
+            "in the cache directories."
+        )
+        subcommands.add_parser("rescan", help=help_msg)
+
+        help_msg = (
+            "Converts the cache directories to the content-addressed layout, "
+            "where assets with the same content are stored once."
+        )
+        migrate_subcommand_parser = subcommands.add_parser("migrate", help=help_msg)
+
+        help_msg = (
+            "Makes the asset files hard links to their content in the store, "
+            "so that they take no additional space on filesystems without "
+            "reflinks.  Tests must then not modify them in place.  Without "
+            "it, the asset files are made reflinks or copies again."
+        )
+        settings.register_option(
+            section="assets.migrate",
+            key="hardlinks",
+            help_msg=help_msg,
+            default=False,
+            key_type=bool,
+            parser=migrate_subcommand_parser,
+            long_arg="--hardlinks",
+        )
+
     def handle_purge(self, config):
         days = config.get("assets.purge.days")
         size_filter = config.get("assets.purge.size_filter")
@@ -510,30 +811,25 @@ class Assets(CLICmd):
 
         cache_dirs = config.get("datadir.paths.cache_dirs")
         try:
-            assets = None
             if days is not None:
-                assets = Asset.get_assets_unused_for_days(days, cache_dirs)
+                entries = Asset.get_catalog_entries(cache_dirs, days=days)
             elif size_filter is not None:
-                assets = Asset.get_assets_by_size(size_filter, cache_dirs)
-            elif assets is None:
-                assets = Asset.get_all_assets(cache_dirs)
+                entries = Asset.get_catalog_entries(cache_dirs, size_filter=size_filter)
+            else:
+                entries = Asset.get_catalog_entries(cache_dirs)
         except (FileNotFoundError, OSError) as e:
             LOG_UI.error("Could get assets: %s", e)
             return exit_codes.AVOCADO_FAIL
 
         matrix = []
-        for asset in assets:
-            stat = os.stat(asset)
-            basename = os.path.basename(asset)
-            hash_path = f"{asset}-CHECKSUM"
-            atime = datetime.fromtimestamp(stat.st_atime)
-            _, checksum = Asset.read_hash_from_file(hash_path)
+        for entry in entries:
+            atime = datetime.fromtimestamp(entry.atime)
             matrix.append(
                 (
-                    basename,
-                    str(checksum or "unknown")[:10],
+                    entry.name,
+                    str(entry.asset_hash or "unknown")[:10],
                     atime.strftime("%Y-%m-%d %H:%M:%S"),
-                    display_data_size(stat.st_size),
+                    display_data_size(entry.size),
                 )
             )
         header = ("asset", "checksum", "atime", "size")
@@ -549,21 +845,33 @@ class Assets(CLICmd):
         exitcode = exit_codes.AVOCADO_ALL_OK
         # fetch assets from instrumented tests
         cache = {}
-        for test_file in config.get("assets.fetch.references"):
-            if os.path.isfile(test_file) and test_file.endswith(".py"):
-                LOG_UI.debug("Fetching assets from %s.", test_file)
-                success, fail = fetch_assets(test_file, cache)
+        prefetch = AssetPrefetch(
+            config.get("assets.fetch.workers"),
+            config.get("assets.fetch.timeout"),
+            connections=config.get("assets.fetch.connections"),
+        )
+        test_files = {}
+        with ModuleIndex.session():
+            for test_file in config.get("assets.fetch.references"):
+                if os.path.isfile(test_file) and test_file.endswith(".py"):
+                    test_files[test_file] = prefetch.add(test_file, cache)
+                else:
+                    LOG_UI.warning("No such file or file not supported: %s", test_file)
+                    exitcode |= exit_codes.AVOCADO_FAIL
+        prefetch.start()
 
-                for asset_file in success:
-                    LOG_UI.debug("  File %s fetched or already on cache.", asset_file)
-                for asset_file in fail:
-                    LOG_UI.error(asset_file)
+        for test_file, keys in test_files.items():
+            LOG_UI.debug("Fetching assets from %s.", test_file)
+            success, fail = prefetch.get_results(keys)
 
-                if fail:
-                    exitcode |= exit_codes.AVOCADO_FAIL
-            else:
-                LOG_UI.warning("No such file or file not supported: %s", test_file)
+            for asset_file in success:
+                LOG_UI.debug("  File %s fetched or already on cache.", asset_file)
+            for asset_file in fail:
+                LOG_UI.error(asset_file)
+
+            if fail:
                 exitcode |= exit_codes.AVOCADO_FAIL
+        prefetch.wait()
 
         # check if we should ignore the errors
         if config.get("assets.fetch.ignore_errors"):
@@ -598,6 +906,33 @@ class Assets(CLICmd):
                 LOG_UI.error(e)
                 return exit_codes.AVOCADO_FAIL
 
+    @staticmethod
+    def handle_rescan(config):
+        for cache_dir in config.get("datadir.paths.cache_dirs"):
+            count = AssetCatalog(cache_dir).rescan()
+            LOG_UI.info("Found %s assets in %s", count, cache_dir)
+        return exit_codes.AVOCADO_ALL_OK
+
+    @staticmethod
+    def handle_migrate(config):
+        for cache_dir in config.get("datadir.paths.cache_dirs"):
+            try:
+                count, freed, added = AssetStore(cache_dir).migrate(
+                    hardlinks=config.get("assets.migrate.hardlinks")
+                )
+            except OSError as details:
+                LOG_UI.error("Could not migrate %s: %s", cache_dir, details)
+                return exit_codes.AVOCADO_FAIL
+            AssetCatalog(cache_dir).rescan()
+            LOG_UI.info(
+                "Migrated %s assets in %s, freeing %s and adding %s",
+                count,
+                cache_dir,
+                display_data_size(freed),
+                display_data_size(added),
+            )
+        return exit_codes.AVOCADO_ALL_OK
+
     def run(self, config):
         subcommand = config.get("assets_subcommand")
 
@@ -609,5 +944,9 @@ class Assets(CLICmd):
             return self.handle_purge(config)
         elif subcommand == "list":
             return self.handle_list(config)
+        elif subcommand == "rescan":
+            return self.handle_rescan(config)
+        elif subcommand == "migrate":
+            return self.handle_migrate(config)
         else:
             return exit_codes.UTILITY_FAIL
@@ -240,6 +240,14 @@ class List(CLICmd):
             allow_multiple=True,
         )
 
+        settings.add_argparser_to_option(
+            namespace="resolver.parallel",
+            metavar="NUMBER_OF_PROCESSES",
+            parser=parser,
+            long_arg="--resolver-parallel",
+            allow_multiple=True,
+        )
+
         help_msg = "Writes runnable recipe files to a directory."
         settings.register_option(
             section="list.recipes",
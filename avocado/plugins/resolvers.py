@@ -33,6 +33,7 @@ from avocado.core.resolver import (
     get_file_assets,
 )
 from avocado.core.safeloader import find_avocado_tests, find_python_unittests
+from avocado.core.safeloader.cache import SAFELOADER_CACHE_DIRNAME, SafeloaderCache
 from avocado.core.settings import settings
 
 
@@ -68,7 +69,22 @@ class ExecTestResolver(BaseExec, Resolver):
         )
 
 
-def python_resolver(name, reference, find_tests):
+def get_safeloader_cache(config):
+    """Returns the cache of Python tests found, if enabled in the config.
+
+    :rtype: :class:`avocado.core.safeloader.cache.SafeloaderCache` or None
+    """
+    if not config.get("resolver.safeloader_cache"):
+        return None
+    data_dir = config.get("datadir.paths.data_dir")
+    if not data_dir:
+        return None
+    return SafeloaderCache(
+        os.path.join(os.path.expanduser(data_dir), "cache", SAFELOADER_CACHE_DIRNAME)
+    )
+
+
+def python_resolver(name, reference, find_tests, cache=None):
     module_path, tests_filter = reference_split(reference)
     if tests_filter is not None:
         tests_filter = re.compile(tests_filter)
@@ -78,7 +94,7 @@ def python_resolver(name, reference, find_tests):
         return criteria_check
 
     # disabled tests not needed here
-    class_methods_info, _ = find_tests(module_path)
+    class_methods_info, _ = find_tests(module_path, cache)
     runnables = []
     for klass, methods_tags_depens in class_methods_info.items():
         for method, tags, depens in methods_tags_depens:
@@ -109,13 +125,16 @@ class PythonUnittestResolver(Resolver):
     description = "Test resolver for Python Unittests"
 
     @staticmethod
-    def _find_compat(module_path):
+    def _find_compat(module_path, cache=None):
         """Used as compatibility for the :func:`python_resolver()` interface."""
-        return find_python_unittests(module_path), None
+        return find_python_unittests(module_path, cache), None
 
     def resolve(self, reference):
         return python_resolver(
-            PythonUnittestResolver.name, reference, PythonUnittestResolver._find_compat
+            PythonUnittestResolver.name,
+            reference,
+            PythonUnittestResolver._find_compat,
+            get_safeloader_cache(self.config),
         )
 
 
@@ -127,7 +146,10 @@ class AvocadoInstrumentedResolver(Resolver):
 
     def resolve(self, reference):
         return python_resolver(
-            AvocadoInstrumentedResolver.name, reference, find_avocado_tests
+            AvocadoInstrumentedResolver.name,
+            reference,
+            find_avocado_tests,
+            get_safeloader_cache(self.config),
         )
 
 
@@ -200,6 +222,28 @@ class RunnablesRecipeResolver(Resolver):
         return self._validate_and_load_runnables(reference)
 
 
+class PythonResolversInit(Init):
+    name = "python-resolvers"
+    description = "Configuration for the Python test resolver plugins"
+
+    def initialize(self):
+        help_msg = (
+            "Whether the Python tests found in source files (by resolvers "
+            'such as "avocado-instrumented" and "python-unittest") are '
+            "kept in a cache, and reused while those source files, and the "
+            "ones of the modules their classes inherit from, are unchanged. "
+            "It pays off when the same tests are resolved again and again, "
+            "but it makes the first resolution slower."
+        )
+        settings.register_option(
+            section="resolver",
+            key="safeloader_cache",
+            key_type=bool,
+            default=False,
+            help_msg=help_msg,
+        )
+
+
 class ExecRunnablesRecipeInit(Init):
     name = "exec-runnables-recipe"
     description = 'Configuration for resolver plugin "exec-runnables-recipe" plugin'
@@ -282,6 +282,14 @@ class Run(CLICmd):
             allow_multiple=True,
         )
 
+        settings.add_argparser_to_option(
+            namespace="resolver.parallel",
+            metavar="NUMBER_OF_PROCESSES",
+            parser=parser,
+            long_arg="--resolver-parallel",
+            allow_multiple=True,
+        )
+
         parser_common_args.add_tag_filter_args(parser)
 
     def run(self, config):
@@ -22,6 +22,7 @@ import os
 import platform
 import random
 import tempfile
+import time
 
 from avocado.core.dispatcher import SpawnerDispatcher
 from avocado.core.exceptions import JobError, JobFailFast
@@ -30,13 +31,29 @@ from avocado.core.nrunner.runner import check_runnables_runner_requirements
 from avocado.core.output import LOG_JOB
 from avocado.core.plugin_interfaces import CLI, Init, SuiteRunner
 from avocado.core.settings import settings
-from avocado.core.status.repo import StatusRepo
+from avocado.core.status.repo import STATUS_REPO_MAX_MEMORY, StatusRepo
 from avocado.core.status.server import StatusServer
+from avocado.core.task.durations import (
+    DURATION_HISTORY_JOBS,
+    DurationHistory,
+    order_by_duration,
+    predict_makespan,
+)
+from avocado.core.task.resources import (
+    RESOURCES_CPU_TAG,
+    RESOURCES_MEMORY_TAG,
+    ResourceBudget,
+)
 from avocado.core.task.runtime import RuntimeTaskGraph
 from avocado.core.task.statemachine import TaskStateMachine, Worker
+from avocado.utils.data_structures import DataSize, InvalidDataSize
 
 DEFAULT_SERVER_URI = "127.0.0.1:8888"
 
+#: Name of the file, in the job results directory, where the status
+#: messages are kept when "run.status_repo_journal" is enabled
+STATUS_REPO_JOURNAL_FILENAME = "status_journal"
+
 
 class RunnerInit(Init):
 
@@ -113,6 +130,61 @@ class RunnerInit(Init):
             help_msg=help_msg,
         )
 
+        help_msg = (
+            "Whether the messages received by the status server should "
+            "be kept in a journal, in the job results directory, instead "
+            "of in memory.  This is useful for jobs with a large number "
+            "of tests, or tests that generate a lot of output."
+        )
+        settings.register_option(
+            section=section,
+            key="status_repo_journal",
+            default=False,
+            key_type=bool,
+            help_msg=help_msg,
+        )
+
+        help_msg = (
+            "Maximum amount of memory, in bytes, used to cache messages "
+            "when those are kept in a journal. The latest message of each "
+            "task is always kept in memory. Default is 33554432 (32MiB)"
+        )
+        settings.register_option(
+            section=section,
+            key="status_repo_max_memory",
+            key_type=int,
+            default=STATUS_REPO_MAX_MEMORY,
+            help_msg=help_msg,
+        )
+
+        help_msg = (
+            "Whether tests expected to take longer, according to the "
+            "results of previous jobs, are started first (while still "
+            "respecting their dependencies). This usually shortens jobs "
+            "running tasks in parallel, where a slow test started last "
+            "would keep the job running on its own."
+        )
+        settings.register_option(
+            section=section,
+            key="order_by_duration",
+            default=False,
+            key_type=bool,
+            help_msg=help_msg,
+        )
+
+        help_msg = (
+            "Number of previous jobs, the most recent ones, whose results "
+            "are used to tell how long each test is expected to take, "
+            "when ordering tests by their duration."
+        )
+        settings.register_option(
+            section=section,
+            key="duration_history_jobs",
+            default=DURATION_HISTORY_JOBS,
+            key_type=int,
+            help_msg=help_msg,
+        )
+
         help_msg = (
             "Number of maximum number tasks running in parallel. You "
             "can disable parallel execution by setting this to 1. "
@@ -126,6 +198,59 @@ class RunnerInit(Init):
             help_msg=help_msg,
         )
 
+        help_msg = (
+            "Whether tasks are only started when the CPUs and memory they "
+            f'use (set with the "{RESOURCES_CPU_TAG}" and '
+            f'"{RESOURCES_MEMORY_TAG}" tags) fit in what is left of the CPU '
+            "and memory budgets. Tasks that do not fit may be started after "
+            "tasks that come later and do fit."
+        )
+        settings.register_option(
+            section=section,
+            key="resources_scheduling",
+            default=False,
+            key_type=bool,
+            help_msg=help_msg,
+        )
+
+        help_msg = (
+            "Number of CPUs that tasks started in parallel may use, when "
+            "scheduling by resources. Defaults to the number of CPUs "
+            "available on this machine."
+        )
+        settings.register_option(
+            section=section,
+            key="resources_cpu",
+            default=None,
+            key_type=float,
+            help_msg=help_msg,
+        )
+
+        help_msg = (
+            "Amount of memory (such as 4G) that tasks started in parallel "
+            "may use, when scheduling by resources. Defaults to the memory "
+            "available on this machine when the job starts."
+        )
+        settings.register_option(
+            section=section,
+            key="resources_memory",
+            default=None,
+            help_msg=help_msg,
+        )
+
+        help_msg = (
+            "Whether the memory available on this machine is also checked "
+            "before starting a task, when scheduling by resources, which "
+            "accounts for memory used by other processes."
+        )
+        settings.register_option(
+            section=section,
+            key="resources_sample_memory",
+            default=False,
+            key_type=bool,
+            help_msg=help_msg,
+        )
+
         help_msg = (
             "Spawn tasks in a specific spawner. Available spawners: "
             "'process' and 'podman'"
@@ -184,6 +309,20 @@ class RunnerCLI(CLI):
             metavar="HOST_PORT",
         )
 
+        settings.add_argparser_to_option(
+            namespace="run.status_repo_journal",
+            parser=parser,
+            long_arg="--status-repo-journal",
+            action="store_true",
+        )
+
+        settings.add_argparser_to_option(
+            namespace="run.order_by_duration",
+            parser=parser,
+            long_arg="--order-by-duration",
+            action="store_true",
+        )
+
         settings.add_argparser_to_option(
             namespace="run.max_parallel_tasks",
             parser=parser,
@@ -191,6 +330,27 @@ class RunnerCLI(CLI):
             metavar="NUMBER_OF_TASKS",
         )
 
+        settings.add_argparser_to_option(
+            namespace="run.resources_scheduling",
+            parser=parser,
+            long_arg="--resources-scheduling",
+            action="store_true",
+        )
+
+        settings.add_argparser_to_option(
+            namespace="run.resources_cpu",
+            parser=parser,
+            long_arg="--resources-cpu",
+            metavar="NUMBER_OF_CPUS",
+        )
+
+        settings.add_argparser_to_option(
+            namespace="run.resources_memory",
+            parser=parser,
+            long_arg="--resources-memory",
+            metavar="SIZE",
+        )
+
         settings.add_argparser_to_option(
             namespace="run.spawner",
             parser=parser,
@@ -241,24 +401,44 @@ class Runner(SuiteRunner):
         self._sync_status_server_urls(test_suite.config)
         listen = self._determine_status_server(test_suite, "run.status_server_listen")
         # pylint: disable=W0201
-        self.status_repo = StatusRepo(job.unique_id)
+        journal_path = None
+        if test_suite.config.get("run.status_repo_journal"):
+            journal_path = os.path.join(job.logdir, STATUS_REPO_JOURNAL_FILENAME)
+        self.status_repo = StatusRepo(
+            job.unique_id,
+            journal_path,
+            test_suite.config.get("run.status_repo_max_memory"),
+        )
         # pylint: disable=W0201
         self.status_server = StatusServer(listen, self.status_repo)
 
     async def _update_status(self, job):
         message_handler = MessageHandler()
         while True:
-            try:
-                (_, task_id, _, index) = self.status_repo.status_journal_summary_pop()
-
-            except IndexError:
-                await asyncio.sleep(0.05)
-                continue
-
+            entry = await self.status_repo.status_journal_summary_get()
+            _, task_id, _, index = entry
             message = self.status_repo.get_task_data(task_id, index)
             task = self.tsm.tasks_by_id.get(task_id)
             message_handler.process_message(message, task, job)
 
+    @staticmethod
+    def _create_resource_budget(config):
+        if not config.get("run.resources_scheduling"):
+            return None
+        memory = config.get("run.resources_memory")
+        if memory is not None:
+            try:
+                memory = int(DataSize(memory).b)
+            except InvalidDataSize as details:
+                raise JobError(
+                    f'Invalid value for "run.resources_memory": {details}'
+                ) from details
+        return ResourceBudget(
+            config.get("run.resources_cpu"),
+            memory,
+            config.get("run.resources_sample_memory"),
+        )
+
     @staticmethod
     def _abort_if_missing_runners(runnables):
         if runnables:
@@ -313,15 +493,39 @@ class Runner(SuiteRunner):
 
         if test_suite.config.get("run.shuffle"):
             random.shuffle(self.runtime_tasks)
+        max_running = min(
+            test_suite.config.get("run.max_parallel_tasks"), len(self.runtime_tasks)
+        )
+        predicted_makespan = None
+        if test_suite.config.get("run.order_by_duration"):
+            history = DurationHistory.from_results_dir(
+                test_suite.config.get("datadir.paths.logs_dir"),
+                test_suite.config.get("run.duration_history_jobs"),
+                job.logdir,
+            )
+            expected = history.get_expected_durations(self.runtime_tasks)
+            self.runtime_tasks = order_by_duration(self.runtime_tasks, expected)
+            predicted_makespan = predict_makespan(
+                self.runtime_tasks, expected, max_running
+            )
+            LOG_JOB.info(
+                "Ordered tasks by the durations of %s tests recorded in "
+                "the last %s jobs",
+                len(history),
+                test_suite.config.get("run.duration_history_jobs"),
+            )
         test_ids = [
             rt.task.identifier
             for rt in self.runtime_tasks
             if rt.task.category == "test"
         ]
-        self.tsm = TaskStateMachine(self.runtime_tasks, self.status_repo)
-        max_running = min(
-            test_suite.config.get("run.max_parallel_tasks"), len(self.runtime_tasks)
+        self.tsm = TaskStateMachine(
+            self.runtime_tasks,
+            self.status_repo,
+            self._create_resource_budget(test_suite.config),
+            job.task_start_checks,
         )
+        job.task_start_recheck = self.tsm.release_held_threadsafe
         timeout = test_suite.config.get("task.timeout.running")
         failfast = test_suite.config.get("run.failfast")
         workers = [
@@ -334,15 +538,22 @@ class Runner(SuiteRunner):
             ).run()
             for _ in range(max_running)
         ]
-        asyncio.ensure_future(self._update_status(job))
+        status_updater = asyncio.ensure_future(self._update_status(job))
         loop = asyncio.get_event_loop()
         try:
             try:
+                start = time.monotonic()
                 loop.run_until_complete(
                     asyncio.wait_for(
                         asyncio.shield(asyncio.gather(*workers)), job.timeout or None
                     )
                 )
+                if predicted_makespan is not None:
+                    LOG_JOB.info(
+                        "Tasks were predicted to take %.2f s, and took %.2f s",
+                        predicted_makespan,
+                        time.monotonic() - start,
+                    )
             except asyncio.TimeoutError:
                 terminate_worker = Worker(
                     state_machine=self.tsm,
@@ -373,17 +584,24 @@ class Runner(SuiteRunner):
             LOG_JOB.info(str(ex))
             job.interrupted_reason = str(ex)
             summary.add("INTERRUPTED")
+        loop.run_until_complete(spawner.close())
 
-        # Wait until all messages may have been processed by the
-        # status_updater. This should be replaced by a mechanism
-        # that only waits if there are missing status messages to
-        # be processed, and, only for a given amount of time.
+        # Wait until all messages received have been processed by the
+        # status_updater (unless it has given up for some reason).
         # Tests with non received status will always show as SKIP
         # because of result reconciliation.
-        loop.run_until_complete(asyncio.sleep(0.05))
+        status_drained = asyncio.ensure_future(
+            self.status_repo.wait_status_journal_summary_drained()
+        )
+        loop.run_until_complete(
+            asyncio.wait(
+                [status_drained, status_updater], return_when=asyncio.FIRST_COMPLETED
+            )
+        )
 
         job.result.end_tests()
         self.status_server.close()
+        self.status_repo.close()
         if self.status_server_dir is not None:
             self.status_server_dir.cleanup()
 
@@ -3,12 +3,12 @@ import os
 import signal
 import sys
 import tempfile
-import time
 import traceback
+from queue import Empty
 
 from avocado.core.exceptions import TestInterrupt
 from avocado.core.nrunner.app import BaseRunnerApp
-from avocado.core.nrunner.runner import RUNNER_RUN_CHECK_INTERVAL, BaseRunner
+from avocado.core.nrunner.runner import BaseRunner, Heartbeat
 from avocado.core.test import TestID
 from avocado.core.tree import TreeNodeEnvOnly
 from avocado.core.utils import loader, messages
@@ -39,6 +39,8 @@ class AvocadoInstrumentedTestRunner(BaseRunner):
         "core.show",
         "job.output.loglevel",
         "job.run.store_logging_stream",
+        "runner.heartbeat.interval",
+        "runner.heartbeat.max_interval",
     ]
 
     @staticmethod
@@ -137,18 +139,20 @@ class AvocadoInstrumentedTestRunner(BaseRunner):
                 )
             )
 
-    @staticmethod
-    def _monitor(queue):
+    def _monitor(self, queue):
+        heartbeat = Heartbeat.from_config(self.runnable.config)
         while True:
-            time.sleep(RUNNER_RUN_CHECK_INTERVAL)
-            if queue.empty():
-                yield messages.RunningMessage.get()
-            else:
-                message = queue.get()
-                if message.get("type") != "early_state":
-                    yield message
-                if message.get("status") == "finished":
-                    break
+            try:
+                message = queue.get(timeout=heartbeat.get_remaining())
+            except Empty:
+                if heartbeat.is_due():
+                    yield messages.RunningMessage.get()
+                continue
+            heartbeat.reset()
+            if message.get("type") != "early_state":
+                yield message
+            if message.get("status") == "finished":
+                break
 
     def run(self, runnable):
         # pylint: disable=W0201
@@ -156,7 +160,7 @@ class AvocadoInstrumentedTestRunner(BaseRunner):
         self.runnable = runnable
         yield messages.StartedMessage.get()
         try:
-            queue = multiprocessing.SimpleQueue()
+            queue = multiprocessing.Queue()
             process = multiprocessing.Process(
                 target=self._run_avocado, args=(self.runnable, queue)
             )
@@ -8,7 +8,7 @@ import tempfile
 import pkg_resources
 
 from avocado.core.nrunner.app import BaseRunnerApp
-from avocado.core.nrunner.runner import BaseRunner
+from avocado.core.nrunner.runner import BaseRunner, Heartbeat
 
 
 class ExecTestRunner(BaseRunner):
@@ -37,6 +37,8 @@ class ExecTestRunner(BaseRunner):
         "run.keep_tmp",
         "runner.exectest.exitcodes.skip",
         "runner.exectest.clear_env",
+        "runner.heartbeat.interval",
+        "runner.heartbeat.max_interval",
     ]
 
     def _process_final_status(
@@ -192,7 +194,15 @@ class ExecTestRunner(BaseRunner):
         def poll_proc():
             return process.poll() is not None
 
-        yield from self.running_loop(poll_proc)
+        def wait_proc(timeout):
+            try:
+                process.wait(timeout)
+            except subprocess.TimeoutExpired:
+                pass
+
+        yield from self.running_loop(
+            poll_proc, Heartbeat.from_config(runnable.config), wait_proc
+        )
 
         if process.stdout is not None:
             stdout = process.stdout.read()
@@ -0,0 +1,42 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# See LICENSE for more details.
+#
+# Copyright: Red Hat Inc. 2026
+
+from avocado.core import output
+from avocado.core.nrunner.runnable import RunnerCapabilitiesCache
+from avocado.core.plugin_interfaces import Cache
+from avocado.utils import astring
+
+
+class RunnersCache(Cache):
+
+    name = "runners"
+    description = "Provides the runners' capabilities cache entries"
+
+    def list(self):
+        matrix = [
+            [
+                command,
+                entry["stamp"][0],
+                ", ".join(entry["capabilities"].get("runnables", [])),
+            ]
+            for command, entry in sorted(RunnerCapabilitiesCache().get_all().items())
+        ]
+        header = (
+            output.TERM_SUPPORT.header_str("Command"),
+            output.TERM_SUPPORT.header_str("Path"),
+            output.TERM_SUPPORT.header_str("Runnables"),
+        )
+        return astring.tabular_output(matrix, header=header, strip=True)
+
+    def clear(self):
+        RunnerCapabilitiesCache().clear()
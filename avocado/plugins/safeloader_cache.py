@@ -0,0 +1,46 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# See LICENSE for more details.
+#
+# Copyright: Red Hat Inc. 2026
+
+from avocado.core import output
+from avocado.core.plugin_interfaces import Cache
+from avocado.core.safeloader import cache
+from avocado.utils import astring
+
+
+class SafeloaderCache(Cache):
+
+    name = "safeloader"
+    description = "Provides the cache entries of Python tests found in source files"
+
+    def list(self):
+        matrix = [
+            [
+                entry["path"],
+                entry["key"].split(":", 1)[0],
+                sum(len(methods) for _, methods in entry["result"]["tests"]),
+                len(entry["files"]),
+            ]
+            for entry in sorted(
+                cache.SafeloaderCache().get_all(), key=lambda e: (e["path"], e["key"])
+            )
+        ]
+        header = (
+            output.TERM_SUPPORT.header_str("Path"),
+            output.TERM_SUPPORT.header_str("Target"),
+            output.TERM_SUPPORT.header_str("Tests"),
+            output.TERM_SUPPORT.header_str("Files examined"),
+        )
+        return astring.tabular_output(matrix, header=header, strip=True)
+
+    def clear(self):
+        cache.SafeloaderCache().clear()
@@ -1,9 +1,15 @@
 import asyncio
+import json
 import os
+import signal
 import socket
+import tempfile
 
 from avocado.core.dependencies.requirements import cache
-from avocado.core.plugin_interfaces import Spawner
+from avocado.core.nrunner.runnable import Runnable
+from avocado.core.output import LOG_JOB
+from avocado.core.plugin_interfaces import CLI, Init, Spawner
+from avocado.core.settings import settings
 from avocado.core.spawners.common import SpawnCapabilities, SpawnerMixin, SpawnMethod
 from avocado.core.teststatus import STATUSES_NOT_OK
 from avocado.core.utils.eggenv import get_python_path_env_if_egg
@@ -12,6 +18,99 @@ ENVIRONMENT_TYPE = "local"
 ENVIRONMENT = socket.gethostname()
 
 
+class ProcessSpawnerInit(Init):
+
+    description = "Process based spawner initialization"
+
+    def initialize(self):
+        help_msg = (
+            "Whether to run tasks in processes forked from a pool of task "
+            "servers, one per runner, which have the runners already "
+            "imported.  This avoids the start up cost of a new runner "
+            "process for every task, which is significant for suites with "
+            "many short tests.  Runners that don't support the "
+            '"task-server" command are started as usual.'
+        )
+        settings.register_option(
+            section="spawner.process",
+            key="pool",
+            key_type=bool,
+            default=False,
+            help_msg=help_msg,
+        )
+
+
+class ProcessSpawnerCLI(CLI):
+
+    name = "process"
+    description = 'process spawner command line options for "run"'
+
+    def configure(self, parser):
+        super().configure(parser)
+        parser = parser.subcommands.choices.get("run", None)
+        if parser is None:
+            return
+
+        parser = parser.add_argument_group("process spawner specific options")
+        settings.add_argparser_to_option(
+            namespace="spawner.process.pool",
+            parser=parser,
+            long_arg="--spawner-process-pool",
+            action="store_true",
+        )
+
+    def run(self, config):
+        pass
+
+
+#: Maximum amount of time, in seconds, for a task server to stop once
+#: its standard input is closed, before it's killed
+TASK_SERVER_STOP_TIMEOUT = 5
+
+
+class TaskServerProcess:
+    """A process forked by a task server to run a task.
+
+    It implements the subset of :class:`asyncio.subprocess.Process` used
+    by the process spawner.  The process is not a child of this one, so
+    its exit code is given by the task server, on the connection used to
+    request the task.
+    """
+
+    def __init__(self, pid, reader, writer):
+        self.pid = pid
+        self.returncode = None
+        self._reader = reader
+        self._writer = writer
+        self._wait_task = None
+
+    async def _wait(self):
+        line = await self._reader.readline()
+        self._writer.close()
+        try:
+            self.returncode = int(line)
+        except ValueError:
+            # the task server went away, so the exit code is unknown
+            self.returncode = -signal.SIGKILL
+        return self.returncode
+
+    async def wait(self):
+        if self._wait_task is None:
+            self._wait_task = asyncio.ensure_future(self._wait())
+        return await asyncio.shield(self._wait_task)
+
+    def send_signal(self, signum):
+        if self.returncode is not None:
+            raise ProcessLookupError(self.pid)
+        os.kill(self.pid, signum)
+
+    def terminate(self):
+        self.send_signal(signal.SIGTERM)
+
+    def kill(self):
+        self.send_signal(signal.SIGKILL)
+
+
 class ProcessSpawnerHandle:
     def __init__(self, process):
         self.process = process
@@ -38,9 +137,92 @@ class ProcessSpawner(Spawner, SpawnerMixin):
         SpawnCapabilities.FILESYSTEM_SHARING,
     ]
 
+    def __init__(self, config=None, job=None):  # pylint: disable=W0231
+        SpawnerMixin.__init__(self, config, job)
+        #: Contains futures, keyed by runner command, with the path of the
+        #: socket of each task server (or None if it could not be started)
+        self._task_servers = {}
+        self._task_servers_dir = None
+        self._task_servers_procs = []
+
     def is_operational(self):
         return True
 
+    async def close(self):
+        procs = self._task_servers_procs
+        self._task_servers = {}
+        self._task_servers_procs = []
+        for proc in procs:
+            proc.stdin.close()
+        for proc in procs:
+            try:
+                await asyncio.wait_for(proc.wait(), TASK_SERVER_STOP_TIMEOUT)
+            except asyncio.TimeoutError:
+                proc.kill()
+                await proc.wait()
+        if self._task_servers_dir is not None:
+            self._task_servers_dir.cleanup()
+            self._task_servers_dir = None
+
+    async def _start_task_server(self, runner):
+        capabilities = Runnable.get_capabilities_from_runner_command(
+            runner, env=get_python_path_env_if_egg()
+        )
+        if "task-server" not in capabilities.get("commands", []):
+            return None
+        if self._task_servers_dir is None:
+            self._task_servers_dir = tempfile.TemporaryDirectory(prefix="avocado_")
+        path = os.path.join(
+            self._task_servers_dir.name, f"task_server_{len(self._task_servers)}.sock"
+        )
+        try:
+            # the task server stops when its standard input is closed,
+            # that is, at the latest, when this process ends
+            proc = await asyncio.create_subprocess_exec(
+                runner[0],
+                *runner[1:],
+                "task-server",
+                path,
+                stdin=asyncio.subprocess.PIPE,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.DEVNULL,
+                env=get_python_path_env_if_egg(),
+            )
+        except (FileNotFoundError, PermissionError):
+            return None
+        self._task_servers_procs.append(proc)
+        if not await proc.stdout.readline():
+            LOG_JOB.warning('Could not start a task server for "%s"', " ".join(runner))
+            return None
+        return path
+
+    async def _get_task_server(self, runner):
+        """Returns the socket path of the task server for a runner command.
+
+        The task server is started on the first request for a runner.
+        """
+        if not (hasattr(os, "fork") and hasattr(socket, "AF_UNIX")):
+            return None
+        key = tuple(runner)
+        if key not in self._task_servers:
+            self._task_servers[key] = asyncio.ensure_future(
+                self._start_task_server(runner)
+            )
+        return await asyncio.shield(self._task_servers[key])
+
+    async def _spawn_task_from_server(self, runtime_task, path):
+        try:
+            reader, writer = await asyncio.open_unix_connection(path)
+            args = json.dumps(runtime_task.task.get_command_args())
+            writer.write(f"{args}\n".encode())
+            await writer.drain()
+            pid = int(await reader.readline())
+        except (OSError, ValueError):
+            return False
+        proc = TaskServerProcess(pid, reader, writer)
+        runtime_task.spawner_handle = ProcessSpawnerHandle(proc)
+        return True
+
     @staticmethod
     def is_task_alive(runtime_task):
         if runtime_task.spawner_handle is None:
@@ -53,6 +235,10 @@ class ProcessSpawner(Spawner, SpawnerMixin):
         self.create_task_output_dir(runtime_task)
         task = runtime_task.task
         runner = task.runnable.runner_command()
+        if self.config.get("spawner.process.pool"):
+            path = await self._get_task_server(runner)
+            if path is not None:
+                return await self._spawn_task_from_server(runtime_task, path)
         args = runner[1:] + ["task-run"] + task.get_command_args()
         runner = runner[0]
 
@@ -16,7 +16,11 @@
 Asset fetcher from multiple locations
 """
 
+import atexit
+import collections
+import contextlib
 import errno
+import fcntl
 import hashlib
 import json
 import logging
@@ -24,16 +28,18 @@ import operator
 import os
 import re
 import shutil
+import sqlite3
 import stat
 import sys
+import tempfile
+import threading
 import time
 import uuid
-from datetime import datetime
 from urllib.parse import urlparse
 
 from avocado.utils import astring, crypto
 from avocado.utils import path as utils_path
-from avocado.utils.download import url_download
+from avocado.utils.download import url_download_resume
 from avocado.utils.filelock import FileLock
 
 LOG = logging.getLogger(__name__)
@@ -51,6 +57,149 @@ SUPPORTED_OPERATORS = {
     ">=": operator.ge,
 }
 
+#: The name of the catalog of assets, kept in each cache directory
+CATALOG_FILENAME = "assets.sqlite"
+
+#: The resolution, in seconds, of the last access time of the assets in
+#: the catalog, so that it's not written each time an asset is used
+CATALOG_ATIME_RESOLUTION = 60
+
+#: The name of the directory, at the top of a cache directory, where the
+#: content of the assets is stored by hash, if the cache directory uses
+#: the content-addressed layout (see :class:`AssetStore`)
+STORE_DIRNAME = "by_hash"
+
+#: The name of the file, in the store of a cache directory, whose presence
+#: means the asset files are hard links to the content in the store
+STORE_HARDLINKS_FILENAME = "HARDLINKS"
+
+#: The ioctl request to clone a file, sharing its data until written, on
+#: the Linux filesystems which support it (such as btrfs and XFS)
+FICLONE = 0x40049409
+
+#: Suffixes of the files of a partial download: the file being downloaded,
+#: and the journal where the progress of the download is kept
+PARTIAL_SUFFIXES = ("-PARTIAL", "-PARTIAL.journal", "-PARTIAL.journal.tmp")
+
+#: Suffixes of the files kept in cache directories which are not assets
+NON_ASSET_SUFFIXES = (
+    "-CHECKSUM",
+    "_metadata.json",
+    *PARTIAL_SUFFIXES,
+    ".lock",
+    CATALOG_FILENAME,
+    f"{CATALOG_FILENAME}-journal",
+)
+
+#: The definition of the database schema of the catalog of assets
+CATALOG_SCHEMA = [
+    (
+        "CREATE TABLE IF NOT EXISTS asset ("
+        "path TEXT PRIMARY KEY,"
+        "name TEXT,"
+        "hash TEXT,"
+        "algorithm TEXT,"
+        "size INTEGER,"
+        "atime REAL,"
+        "metadata TEXT"
+        ")"
+    ),
+    "CREATE INDEX IF NOT EXISTS asset_atime_idx ON asset (atime)",
+    "CREATE INDEX IF NOT EXISTS asset_size_idx ON asset (size)",
+]
+
+#: An asset in the catalog, where path is the full path of the asset
+#: file, atime is the time it was last used, and metadata is the
+#: content of its metadata file, if any
+CatalogEntry = collections.namedtuple(
+    "CatalogEntry", "path name asset_hash algorithm size atime metadata"
+)
+
+#: The connections to the catalogs of assets, by the path of their
+#: database, along with the process which opened them
+_CATALOG_CONNECTIONS = {}
+
+#: Serializes the use of the connections to the catalogs of assets,
+#: which are shared by the threads of a process
+_CATALOG_LOCK = threading.RLock()
+
+
+def _find_cache_dir(asset_path, entry):
+    """
+    Finds the cache directory an asset file is in, by the file or directory
+    at its top.
+
+    :param asset_path: full path of the asset file.
+    :param entry: name of the file or directory at the top of the cache
+                  directory.
+    :returns: the cache directory, or None if not found
+    :rtype: str
+    """
+    directory = os.path.dirname(os.path.abspath(asset_path))
+    while not os.path.exists(os.path.join(directory, entry)):
+        parent = os.path.dirname(directory)
+        if parent == directory:
+            return None
+        directory = parent
+    return directory
+
+
+def _clone_file(source, destination, hardlink=False, copy=True):
+    """
+    Makes a file with the same content as another one, sharing it if
+    possible: as a reflink (a copy which shares the data until written),
+    or else as a plain copy.
+
+    :param source: path of the existing file.
+    :param destination: path of the file to be made, which must not exist.
+    :param hardlink: whether a hard link is tried first, so that the
+                     files are the same, and changes to one of them are
+                     seen in the other.
+    :param copy: whether a plain copy is made if the content can't be
+                 shared.
+    :returns: how the file was made: "hardlink", "reflink" or "copy"
+    :rtype: str
+    :raises OSError: when the file can't be made
+    """
+    if hardlink:
+        try:
+            os.link(source, destination)
+            return "hardlink"
+        except OSError as details:
+            LOG.debug("Could not link %s to %s: %s", destination, source, details)
+    try:
+        with open(source, "rb") as source_file:
+            with open(destination, "wb") as destination_file:
+                fcntl.ioctl(destination_file.fileno(), FICLONE, source_file.fileno())
+        return "reflink"
+    except OSError:
+        if os.path.exists(destination):
+            os.remove(destination)
+        if not copy:
+            raise
+    shutil.copyfile(source, destination)
+    return "copy"
+
+
+def _supports_reflinks(directory):
+    """
+    Tells whether the files in a directory can be cloned as reflinks.
+
+    :param directory: path of an existing directory.
+    :rtype: bool
+    """
+    try:
+        with tempfile.NamedTemporaryFile(dir=directory, suffix="-PARTIAL") as source:
+            source.write(b"a")
+            source.flush()
+            with tempfile.NamedTemporaryFile(
+                dir=directory, suffix="-PARTIAL"
+            ) as destination:
+                fcntl.ioctl(destination.fileno(), FICLONE, source.fileno())
+    except OSError:
+        return False
+    return True
+
 
 class UnsupportedProtocolError(OSError):
     """
@@ -73,6 +222,7 @@ class Asset:
         cache_dirs=None,
         expire=None,
         metadata=None,
+        connections=1,
     ):
         """Initialize the Asset() class.
 
@@ -83,6 +233,9 @@ class Asset:
         :param cache_dirs: list of cache directories
         :param expire: time in seconds for the asset to expire
         :param metadata: metadata which will be saved inside metadata file
+        :param connections: maximum number of connections used at the same
+                            time to download the asset, if the server
+                            supports range requests
         """
         self.name = name or ""
         self.asset_hash = asset_hash
@@ -100,6 +253,7 @@ class Asset:
         self.cache_dirs = cache_dirs or []
         self.expire = expire
         self.metadata = metadata
+        self.connections = connections or 1
 
     def _create_hash_file(self, asset_path):
         """
@@ -138,35 +292,72 @@ class Asset:
         :rtype: bool
         """
         timeout = timeout or DOWNLOAD_TIMEOUT
-        try:
-            # Temporary unique name to use while downloading
-            temp = f"{asset_path}.{str(uuid.uuid4())}"
-
-            # To avoid parallel downloads of the same asset, and errors during
-            # the write after download, let's get the lock before start the
-            # download.
-            with FileLock(asset_path, timeout):
+        # Name to use while downloading.  If the download is interrupted,
+        # the partial file is kept, and the next download resumes it.
+        partial = f"{asset_path}-PARTIAL"
+
+        # To avoid parallel downloads of the same asset, and errors during
+        # the write after download, let's get the lock before start the
+        # download.
+        with FileLock(asset_path, timeout):
+            try:
+                self.find_asset_file(create_metadata=True)
+                return True
+            except OSError:
+                LOG.debug("Asset not in cache after lock, fetching it.")
+
+            if self.expire is not None:
+                # a download not resumed within the expiration time of
+                # the asset is started over
+                self._remove_partial_download(partial, time.time() - self.expire)
+
+            # the hash is computed along with the download, so that the
+            # asset is not read again
+            asset_hash = url_download_resume(
+                url_obj.geturl(),
+                partial,
+                self.algorithm,
+                timeout=timeout,
+                connections=self.connections,
+            )
+            if self.asset_hash is not None and asset_hash != self.asset_hash:
+                os.remove(partial)
+                msg = "Hash mismatch. Ignoring asset from the cache"
+                raise OSError(msg)
+            self._remove_hash_file(asset_path)
+            # the asset shows up in the cache only when complete
+            os.replace(partial, asset_path)
+            self._add_hash_to_hash_file(
+                self._get_hash_file(asset_path), asset_hash, self.algorithm
+            )
+            store = AssetStore.for_path(asset_path)
+            if store is not None:
                 try:
-                    self.find_asset_file(create_metadata=True)
-                    return True
-                except OSError:
-                    LOG.debug("Asset not in cache after lock, fetching it.")
+                    if store.add(asset_path, asset_hash, self.algorithm):
+                        LOG.info("Asset content was already in the store.")
+                except OSError as details:
+                    LOG.error("Could not add %s to the store: %s", asset_path, details)
+            return True
 
-                url_download(url_obj.geturl(), temp, timeout=timeout)
-                shutil.copy(temp, asset_path)
-                self._create_hash_file(asset_path)
-                if not self._verify_hash(asset_path):
-                    msg = "Hash mismatch. Ignoring asset from the cache"
-                    raise OSError(msg)
-                return True
-        finally:
-            try:
-                os.remove(temp)
-            except FileNotFoundError:
-                LOG.info(
-                    "Temporary asset file unavailable due to failed"
-                    " download attempt."
-                )
+    def _get_from_store(self, store, asset_path, timeout=None):
+        """
+        Makes the asset file from the content in the store, if it's there.
+
+        :param store: the store of the cache directory.
+        :type store: :class:`AssetStore`
+        :param asset_path: full path of the asset file.
+        :param timeout: timeout in seconds to get the lock of the asset file.
+        :returns: if the asset file was made.
+        :rtype: bool
+        """
+        with FileLock(asset_path, timeout or DOWNLOAD_TIMEOUT):
+            self._remove_hash_file(asset_path)
+            if not store.materialize(asset_path, self.asset_hash, self.algorithm):
+                return False
+            self._add_hash_to_hash_file(
+                self._get_hash_file(asset_path), self.asset_hash, self.algorithm
+            )
+            return True
 
     @staticmethod
     def _get_hash_file(asset_path):
@@ -179,6 +370,19 @@ class Asset:
         """
         return f"{asset_path}-CHECKSUM"
 
+    @classmethod
+    def _remove_hash_file(cls, asset_path):
+        """
+        Removes the CHECKSUM file of an asset file about to be replaced,
+        as its hashes would be stale.
+
+        :param asset_path: full path of the asset file.
+        """
+        try:
+            os.remove(cls._get_hash_file(asset_path))
+        except FileNotFoundError:
+            pass
+
     def _get_hash_from_file(self, asset_path):
         """
         Read the CHECKSUM file from the asset and return the hash.
@@ -209,7 +413,7 @@ class Asset:
                     for line in hash_file:
                         # md5 is 32 chars big and sha512 is 128 chars big.
                         # others supported algorithms are between those.
-                        if re.match(f"^{algorithm}\b.* [a-f0-9]{32,128}", line):
+                        if re.match(rf"^{algorithm}\b.* [a-f0-9]{{32,128}}", line):
                             return line.split()
                     return [None, None]
         except Exception:  # pylint: disable=W0703
@@ -252,6 +456,7 @@ class Asset:
             path = url_obj.path
 
         with FileLock(asset_path, 1):
+            self._remove_hash_file(asset_path)
             try:
                 os.symlink(path, asset_path)
                 self._create_hash_file(asset_path)
@@ -407,6 +612,18 @@ class Asset:
         # A writable cache directory is then needed. The first available
         # writable cache directory will be used.
         cache_dir = self._get_writable_cache_dir()
+        # With the content-addressed layout, the same content may already
+        # be there, under another name or from another location.
+        store = AssetStore(cache_dir)
+        if self.asset_hash is not None and store.enabled:
+            asset_file = os.path.join(cache_dir, self.relative_dir)
+            os.makedirs(os.path.dirname(asset_file), exist_ok=True)
+            if self._get_from_store(store, asset_file, timeout):
+                LOG.info("Asset found in the store of the cache directory.")
+                if self.metadata is not None:
+                    self._create_metadata_file(asset_file)
+                AssetCatalog(cache_dir).add(asset_file, self.asset_hash, self.algorithm)
+                return asset_file
         # Now we have a writable cache_dir. Let's get the asset.
         for url in self.urls:
             if url is None:
@@ -433,6 +650,7 @@ class Asset:
                     LOG.info("Asset downloaded.")
                     if self.metadata is not None:
                         self._create_metadata_file(asset_file)
+                    AssetCatalog(cache_dir).add(asset_file)
                     return asset_file
             except Exception:  # pylint: disable=W0703
                 exc_type, exc_value = sys.exc_info()[:2]
@@ -477,9 +695,12 @@ class Asset:
             if not self._has_valid_hash(asset_file, self.asset_hash, self.algorithm):
                 continue
 
-            if create_metadata:
+            if create_metadata and self.metadata is not None:
                 self._create_metadata_file(asset_file)
-
+                # the metadata in the catalog is updated as well
+                AssetCatalog(cache_dir).add(asset_file)
+            else:
+                AssetCatalog(cache_dir).touch(asset_file)
             LOG.info("Asset already exists in cache.")
             return asset_file
 
@@ -522,21 +743,39 @@ class Asset:
         return os.path.basename(self.parsed_name.path)
 
     @classmethod
-    def get_all_assets(cls, cache_dirs, sort=True):
-        """Returns all assets stored in all cache dirs."""
-        assets = []
+    def get_catalog_entries(cls, cache_dirs, days=None, size_filter=None):
+        """Returns the assets in the catalogs of all cache dirs.
+
+        :param cache_dirs: list of directories to use during the search.
+        :param days: only the assets *not* used during the last given days.
+        :param size_filter: only the assets whose size (in bytes) matches
+                            this filter (comparison operator + value).
+                            Ex ">20", "<=200".  Supported operators: ==,
+                            <, >, <=, >=.
+        :returns: the assets, the most recently used first.
+        :rtype: list of :class:`CatalogEntry`
+        """
+        unused_since = None
+        if days is not None:
+            unused_since = time.time() - days * 24 * 60 * 60
+        if size_filter is not None:
+            size_filter = cls._parse_size_filter(size_filter)
+        entries = []
         for cache_dir in cache_dirs:
-            expanded = os.path.expanduser(cache_dir)
-            for root, _, files in os.walk(expanded):
-                for f in files:
-                    if not f.endswith("-CHECKSUM") and not f.endswith("_metadata.json"):
-                        assets.append(os.path.join(root, f))
-        if sort:
-            assets = {a: os.stat(a).st_atime for a in assets}
-            return [
-                a[0] for a in sorted(assets.items(), key=lambda x: x[1], reverse=True)
-            ]
-        return assets
+            entries.extend(
+                AssetCatalog(cache_dir).get_entries(unused_since, size_filter)
+            )
+        return sorted(entries, key=operator.attrgetter("atime"), reverse=True)
+
+    @classmethod
+    def get_all_assets(cls, cache_dirs, sort=True):
+        """Returns all assets stored in all cache dirs.
+
+        :param sort: whether the assets are sorted, the most recently used
+                     first.  They always are, and this is kept for
+                     compatibility.
+        """
+        return [entry.path for entry in cls.get_catalog_entries(cache_dirs)]
 
     @classmethod
     def get_asset_by_name(cls, name, cache_dirs, expire=None, asset_hash=None):
@@ -573,6 +812,7 @@ class Asset:
             if not cls._has_valid_hash(asset_file, asset_hash):
                 continue
 
+            AssetCatalog(cache_dir).touch(asset_file)
             return asset_file
 
         raise OSError(f"File {name} not found in the cache.")
@@ -588,13 +828,7 @@ class Asset:
                      the last 10 days.
         :param cache_dirs: list of directories to use during the search.
         """
-        result = []
-        for file_path in cls.get_all_assets(cache_dirs):
-            stats = os.stat(file_path)
-            diff = datetime.now() - datetime.fromtimestamp(stats.st_atime)
-            if diff.days >= days:
-                result.append(file_path)
-        return result
+        return [entry.path for entry in cls.get_catalog_entries(cache_dirs, days=days)]
 
     @classmethod
     def get_assets_by_size(cls, size_filter, cache_dirs):
@@ -605,6 +839,21 @@ class Asset:
                             ==, <, >, <=, >=.
         :param cache_dirs: list of directories to use during the search.
         """
+        return [
+            entry.path
+            for entry in cls.get_catalog_entries(cache_dirs, size_filter=size_filter)
+        ]
+
+    @staticmethod
+    def _parse_size_filter(size_filter):
+        """Parses a size filter.
+
+        :param size_filter: a string with a filter (comparison operator +
+                            value). Ex ">20", "<=200".
+        :returns: the comparison operator and the value.
+        :rtype: tuple
+        :raises OSError: when the filter is not valid.
+        """
         try:
             op = re.match("^(\\D+)(\\d+)$", size_filter).group(1)
             value = int(re.match("^(\\D+)(\\d+)$", size_filter).group(2))
@@ -615,21 +864,13 @@ class Asset:
             )
             raise OSError(msg) from exc
 
-        try:
-            method = SUPPORTED_OPERATORS[op]
-        except KeyError as exc:
+        if op not in SUPPORTED_OPERATORS:
             msg = (
                 "Operator not supported. Currented valid values are: ",
                 ", ".join(SUPPORTED_OPERATORS),
             )
-            raise OSError(msg) from exc
-
-        result = []
-        for file_path in cls.get_all_assets(cache_dirs):
-            file_size = os.path.getsize(file_path)
-            if method(file_size, value):
-                result.append(file_path)
-        return result
+            raise OSError(msg)
+        return op, value
 
     @classmethod
     def remove_assets_by_overall_limit(cls, limit, cache_dirs):
@@ -647,10 +888,10 @@ class Asset:
         :param cache_dirs: list of directories to use during the search.
         """
         size_sum = 0
-        for asset in cls.get_all_assets(cache_dirs):
-            size_sum += os.stat(asset).st_size
+        for entry in cls.get_catalog_entries(cache_dirs):
+            size_sum += entry.size
             if size_sum >= limit:
-                cls.remove_asset_by_path(asset)
+                cls.remove_asset_by_path(entry.path)
 
     @classmethod
     def remove_assets_by_size(cls, size_filter, cache_dirs):
@@ -661,6 +902,64 @@ class Asset:
     def remove_assets_by_unused_for_days(cls, days, cache_dirs):
         for file_path in cls.get_assets_unused_for_days(days, cache_dirs):
             cls.remove_asset_by_path(file_path)
+        cls.remove_partial_downloads_unused_for_days(days, cache_dirs)
+
+    @staticmethod
+    def _remove_partial_download(partial, unused_since):
+        """Removes a partial download, if not written to since a given time.
+
+        :param partial: path of the partial file, ending in "-PARTIAL"
+        :param unused_since: the time (in seconds since the epoch) after
+                             which the partial file, or its journal, must
+                             have been written to for them to be kept
+        :returns: whether the partial download was removed
+        :rtype: bool
+        """
+        paths = [partial, f"{partial}.journal", f"{partial}.journal.tmp"]
+        mtimes = []
+        for path in paths:
+            try:
+                mtimes.append(os.stat(path).st_mtime)
+            except FileNotFoundError:
+                continue
+        if not mtimes or max(mtimes) >= unused_since:
+            return False
+        for path in paths:
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                continue
+        LOG.debug("Removed the partial download %s", partial)
+        return True
+
+    @classmethod
+    def remove_partial_downloads_unused_for_days(cls, days, cache_dirs):
+        """Removes the partial downloads not resumed for some days.
+
+        The file of an interrupted download is kept, with its journal, so
+        that the next fetch of the asset resumes it.  The ones written to
+        neither for the given number of days are considered abandoned.
+
+        :param days: how many days ago will be the threshold
+        :param cache_dirs: list of directories to use during the search.
+        :returns: the paths of the partial files removed
+        :rtype: list of str
+        """
+        unused_since = time.time() - days * 24 * 60 * 60
+        removed = []
+        for cache_dir in cache_dirs:
+            for root, _, files in os.walk(os.path.expanduser(cache_dir)):
+                partials = set()
+                for filename in files:
+                    for suffix in PARTIAL_SUFFIXES:
+                        if filename.endswith(suffix):
+                            base = filename[: -len(suffix)]
+                            partials.add(os.path.join(root, f"{base}-PARTIAL"))
+                            break
+                for partial in sorted(partials):
+                    if cls._remove_partial_download(partial, unused_since):
+                        removed.append(partial)
+        return removed
 
     @property
     def name_scheme(self):
@@ -706,6 +1005,14 @@ class Asset:
 
         :param asset_path: full path of the asset file.
         """
+        store = AssetStore.for_path(asset_path)
+        if store is not None:
+            # it's removed from the catalog as well
+            store.release(asset_path)
+        else:
+            catalog = AssetCatalog.for_path(asset_path)
+            if catalog is not None:
+                catalog.remove(asset_path)
         try:
             os.remove(asset_path)
             filename = f"{asset_path}-CHECKSUM"
@@ -726,3 +1033,710 @@ class Asset:
             urls.extend(self.locations)
 
         return urls
+
+
+class AssetCatalog:
+    """
+    Catalog of the assets kept in a cache directory.
+
+    The name, hash, size, last access time and metadata of each asset are
+    kept in a SQLite database at the top of the cache directory, so that
+    assets can be listed, and selected to be removed, without walking the
+    whole cache directory.  It's kept up to date as assets are fetched,
+    used and removed by :class:`Asset`, and it's built, or repaired after
+    the cache directory is changed by other means, by :meth:`rescan`.
+
+    The connection to the database is shared by the catalogs of the same
+    cache directory in a process, and closed when it exits.  If the
+    database can not be used (such as in a read-only cache directory),
+    the assets used are not recorded, and the catalog is built by a
+    rescan, in memory, each time it's read.
+    """
+
+    def __init__(self, cache_dir):
+        """
+        :param cache_dir: the cache directory
+        :type cache_dir: str
+        """
+        self.cache_dir = os.path.expanduser(cache_dir)
+        self.path = os.path.join(self.cache_dir, CATALOG_FILENAME)
+
+    @classmethod
+    def for_path(cls, asset_path):
+        """
+        Returns the catalog of the cache directory an asset file is in.
+
+        :param asset_path: full path of the asset file.
+        :rtype: :class:`AssetCatalog` or None
+        """
+        cache_dir = _find_cache_dir(asset_path, CATALOG_FILENAME)
+        if cache_dir is None:
+            return None
+        return cls(cache_dir)
+
+    @classmethod
+    def close_connections(cls):
+        """
+        Closes the connections to the catalogs opened by this process.
+
+        It's called when the process exits.
+        """
+        with _CATALOG_LOCK:
+            for pid, connection in _CATALOG_CONNECTIONS.values():
+                if pid == os.getpid():
+                    connection.close()
+            _CATALOG_CONNECTIONS.clear()
+
+    def _connect(self):
+        """
+        Connects to the database, which is created if needed.
+
+        The connection is shared by the catalogs of the same cache
+        directory in this process, and used with :data:`_CATALOG_LOCK`
+        held.
+
+        :returns: the connection, or None if the cache directory doesn't exist
+        :rtype: :class:`sqlite3.Connection`
+        :raises sqlite3.Error: when the database can not be used
+        """
+        key = os.path.abspath(self.path)
+        pid, connection = _CATALOG_CONNECTIONS.get(key, (None, None))
+        # a connection inherited from the parent process can not be used
+        if connection is not None and pid == os.getpid():
+            return connection
+        if not os.path.isdir(self.cache_dir):
+            return None
+        new = not os.path.isfile(self.path)
+        connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        try:
+            with connection:
+                for statement in CATALOG_SCHEMA:
+                    connection.execute(statement)
+        except sqlite3.Error:
+            connection.close()
+            raise
+        _CATALOG_CONNECTIONS[key] = (os.getpid(), connection)
+        if new:
+            self._rescan(connection)
+        return connection
+
+    def _connect_in_memory(self):
+        """
+        Connects to an empty catalog in memory, for when the database can
+        not be used.
+
+        :returns: the connection, to be closed by the caller
+        :rtype: :class:`sqlite3.Connection`
+        """
+        connection = sqlite3.connect(":memory:")
+        with connection:
+            for statement in CATALOG_SCHEMA:
+                connection.execute(statement)
+        return connection
+
+    def _get_row(
+        self,
+        asset_path,
+        relative_path=None,
+        atime=None,
+        asset_hash=None,
+        algorithm=None,
+        siblings=None,
+    ):
+        """
+        Gets the row of the catalog of an asset file.
+
+        :param asset_path: full path of the asset file.
+        :param relative_path: path of the asset file relative to the cache
+                              directory, if already known.
+        :param atime: the last access time, instead of the one of the file.
+        :param asset_hash: hash of the asset, instead of the one in its
+                           CHECKSUM file.
+        :param algorithm: algorithm of the hash of the asset.
+        :param siblings: names of all files in the directory of the asset,
+                         if already known, so that the CHECKSUM and
+                         metadata files are not looked for in vain.
+        :raises OSError: when the asset file can not be accessed.
+        """
+        stats = os.stat(asset_path)
+        if relative_path is None:
+            relative_path = os.path.relpath(asset_path, self.cache_dir)
+        name = os.path.basename(asset_path)
+        if asset_hash is None:
+            algorithm = None
+            hash_path = Asset._get_hash_file(asset_path)
+            if siblings is None or os.path.basename(hash_path) in siblings:
+                try:
+                    with open(hash_path, encoding="utf-8") as hash_file:
+                        algorithm, asset_hash = hash_file.readline().split()[:2]
+                except (OSError, ValueError):
+                    algorithm, asset_hash = None, None
+        metadata = None
+        metadata_path = f"{os.path.splitext(asset_path)[0]}_metadata.json"
+        if siblings is None or os.path.basename(metadata_path) in siblings:
+            try:
+                with open(metadata_path, encoding="utf-8") as metadata_file:
+                    metadata = metadata_file.read()
+            except OSError:
+                pass
+        return (
+            relative_path,
+            name,
+            asset_hash,
+            algorithm,
+            stats.st_size,
+            stats.st_atime if atime is None else atime,
+            metadata,
+        )
+
+    def add(self, asset_path, asset_hash=None, algorithm=None):
+        """
+        Adds an asset file, which has just been used, to the catalog.
+
+        :param asset_path: full path of the asset file.
+        :param asset_hash: hash of the asset.  If not given, it's read from
+                           its CHECKSUM file, if any.
+        :param algorithm: algorithm of the hash of the asset.
+        """
+        with _CATALOG_LOCK:
+            try:
+                connection = self._connect()
+                if connection is None:
+                    return
+                row = self._get_row(
+                    asset_path,
+                    atime=time.time(),
+                    asset_hash=asset_hash,
+                    algorithm=algorithm,
+                )
+                with connection:
+                    connection.execute(
+                        "INSERT OR REPLACE INTO asset VALUES (?, ?, ?, ?, ?, ?, ?)",
+                        row,
+                    )
+            except (OSError, sqlite3.Error) as details:
+                LOG.debug("Could not add %s to the catalog: %s", asset_path, details)
+
+    def touch(self, asset_path):
+        """
+        Records that an asset file has just been used.
+
+        The last access time in the catalog is only written when it's older
+        than :data:`CATALOG_ATIME_RESOLUTION`.
+
+        :param asset_path: full path of the asset file.
+        """
+        now = time.time()
+        relative_path = os.path.relpath(asset_path, self.cache_dir)
+        with _CATALOG_LOCK:
+            try:
+                connection = self._connect()
+                if connection is None:
+                    return
+                row = connection.execute(
+                    "SELECT atime FROM asset WHERE path = ?", (relative_path,)
+                ).fetchone()
+                if row is not None:
+                    if row[0] is None or row[0] <= now - CATALOG_ATIME_RESOLUTION:
+                        with connection:
+                            connection.execute(
+                                "UPDATE asset SET atime = ? WHERE path = ?",
+                                (now, relative_path),
+                            )
+                    return
+            except sqlite3.Error as details:
+                LOG.debug("Could not update %s in the catalog: %s", asset_path, details)
+                return
+            self.add(asset_path)
+
+    def remove(self, asset_path):
+        """
+        Removes an asset file from the catalog.
+
+        :param asset_path: full path of the asset file.
+        """
+        with _CATALOG_LOCK:
+            try:
+                connection = self._connect()
+                if connection is None:
+                    return
+                with connection:
+                    connection.execute(
+                        "DELETE FROM asset WHERE path = ?",
+                        (os.path.relpath(asset_path, self.cache_dir),),
+                    )
+            except sqlite3.Error as details:
+                LOG.debug(
+                    "Could not remove %s from the catalog: %s", asset_path, details
+                )
+
+    def rescan(self):
+        """
+        Updates the catalog with the asset files found in the cache directory.
+
+        The last access time of the assets already in the catalog is kept,
+        unless the one of their files is more recent.
+
+        :returns: the number of assets found
+        :rtype: int
+        """
+        with _CATALOG_LOCK:
+            try:
+                connection = self._connect()
+            except sqlite3.Error as details:
+                LOG.debug("Could not update the catalog at %s: %s", self.path, details)
+                with contextlib.closing(self._connect_in_memory()) as connection:
+                    return self._rescan(connection)
+            if connection is None:
+                return 0
+            return self._rescan(connection)
+
+    def _rescan(self, connection):
+        """
+        Updates a catalog, in the database or in memory, with the asset
+        files found in the cache directory.
+
+        :param connection: the connection to the catalog.
+        :type connection: :class:`sqlite3.Connection`
+        :returns: the number of assets found
+        :rtype: int
+        """
+        rows = []
+        for root, dirs, files in os.walk(self.cache_dir):
+            relative_root = os.path.relpath(root, self.cache_dir)
+            if relative_root == os.curdir and STORE_DIRNAME in dirs:
+                # the content of the assets, found under their names
+                dirs.remove(STORE_DIRNAME)
+            siblings = set(files)
+            for filename in files:
+                if filename.endswith(NON_ASSET_SUFFIXES):
+                    continue
+                if relative_root == os.curdir:
+                    relative_path = filename
+                else:
+                    relative_path = os.path.join(relative_root, filename)
+                try:
+                    rows.append(
+                        self._get_row(
+                            os.path.join(root, filename),
+                            relative_path,
+                            siblings=siblings,
+                        )
+                    )
+                except OSError:
+                    # removed in the meantime, or a broken link
+                    continue
+        with connection:
+            connection.execute("CREATE TEMP TABLE IF NOT EXISTS found (path TEXT)")
+            connection.execute("DELETE FROM found")
+            connection.executemany(
+                "INSERT INTO found VALUES (?)", ((row[0],) for row in rows)
+            )
+            connection.execute(
+                "DELETE FROM asset WHERE path NOT IN (SELECT path FROM found)"
+            )
+            connection.executemany(
+                "INSERT INTO asset VALUES (?, ?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(path) DO UPDATE SET "
+                "name = excluded.name, hash = excluded.hash, "
+                "algorithm = excluded.algorithm, size = excluded.size, "
+                "atime = MAX(atime, excluded.atime), metadata = excluded.metadata",
+                rows,
+            )
+        return len(rows)
+
+    def get_entries(self, unused_since=None, size_filter=None):
+        """
+        Returns the assets in the catalog, most recently used first.
+
+        :param unused_since: only the assets not used since this time
+                             (in seconds since the epoch)
+        :type unused_since: float
+        :param size_filter: only the assets whose size (in bytes) matches
+                            this comparison operator (one of
+                            :data:`SUPPORTED_OPERATORS`) and value
+        :type size_filter: tuple
+        :rtype: list of :class:`CatalogEntry`
+        """
+        conditions = []
+        parameters = []
+        if unused_since is not None:
+            conditions.append("atime <= ?")
+            parameters.append(unused_since)
+        if size_filter is not None:
+            op, value = size_filter
+            if op not in SUPPORTED_OPERATORS:
+                raise ValueError(f"Operator not supported: {op}")
+            conditions.append(f"size {op} ?")
+            parameters.append(value)
+        sql = "SELECT * FROM asset"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        sql += " ORDER BY atime DESC"
+        with _CATALOG_LOCK:
+            try:
+                connection = self._connect()
+                if connection is None:
+                    return []
+                rows = connection.execute(sql, parameters).fetchall()
+            except sqlite3.Error as details:
+                LOG.debug(
+                    "Could not read the catalog at %s, rescanning: %s",
+                    self.path,
+                    details,
+                )
+                with contextlib.closing(self._connect_in_memory()) as connection:
+                    self._rescan(connection)
+                    rows = connection.execute(sql, parameters).fetchall()
+        return [
+            CatalogEntry(os.path.join(self.cache_dir, row[0]), *row[1:]) for row in rows
+        ]
+
+    def has_hash(self, asset_hash, algorithm):
+        """
+        Returns if any asset in the catalog has the given hash.
+
+        :param asset_hash: hash of the content of the asset.
+        :param algorithm: algorithm of the hash.
+        :returns: if there's such an asset, or if the catalog can not be
+                  read, so that it's assumed there is
+        :rtype: bool
+        """
+        with _CATALOG_LOCK:
+            try:
+                connection = self._connect()
+                if connection is None:
+                    return False
+                row = connection.execute(
+                    "SELECT 1 FROM asset WHERE hash = ? AND algorithm = ? LIMIT 1",
+                    (asset_hash, algorithm),
+                ).fetchone()
+            except sqlite3.Error as details:
+                LOG.debug("Could not read the catalog at %s: %s", self.path, details)
+                return True
+        return row is not None
+
+
+atexit.register(AssetCatalog.close_connections)
+
+
+class AssetStore:
+    """
+    Content-addressed store of the assets in a cache directory.
+
+    A cache directory uses the content-addressed layout when it has a
+    :data:`STORE_DIRNAME` directory, which :meth:`migrate` creates.  The
+    content of each asset downloaded into it is then kept there once,
+    keyed by its hash, and the asset files, under their usual paths (by
+    name or by location), are made from it: as reflinks, or else as
+    copies.  So the same content, fetched under different names or from
+    different locations, is not downloaded again if its hash is known,
+    and takes the space of a single copy, which is why :meth:`migrate`
+    requires a filesystem with reflinks.
+
+    The asset files can instead be hard links to the content, if asked
+    to :meth:`migrate`, so that they take no additional space on any
+    filesystem.  They must then not be modified in place, which would
+    change the content in the store and every asset file linked to it,
+    so the content is checked against its hash before it's used.
+    """
+
+    def __init__(self, cache_dir):
+        """
+        :param cache_dir: the cache directory
+        :type cache_dir: str
+        """
+        self.cache_dir = os.path.expanduser(cache_dir)
+        self.path = os.path.join(self.cache_dir, STORE_DIRNAME)
+
+    @classmethod
+    def for_path(cls, asset_path):
+        """
+        Returns the store of the cache directory an asset file is in.
+
+        :param asset_path: full path of the asset file.
+        :rtype: :class:`AssetStore` or None, if the cache directory
+                doesn't use the content-addressed layout
+        """
+        cache_dir = _find_cache_dir(asset_path, STORE_DIRNAME)
+        if cache_dir is None:
+            return None
+        return cls(cache_dir)
+
+    @property
+    def enabled(self):
+        """If the cache directory uses the content-addressed layout."""
+        return os.path.isdir(self.path)
+
+    def get_content_path(self, asset_hash, algorithm):
+        """
+        Returns the path of some content in the store.
+
+        :param asset_hash: hash of the content.
+        :param algorithm: algorithm of the hash.
+        :rtype: str
+        """
+        return os.path.join(self.path, algorithm, asset_hash[:2], asset_hash)
+
+    @property
+    def hardlinks(self):
+        """If the asset files are hard links to the content in the store."""
+        return os.path.isfile(os.path.join(self.path, STORE_HARDLINKS_FILENAME))
+
+    def materialize(self, asset_path, asset_hash, algorithm):
+        """
+        Makes an asset file, replacing it if it exists, from the content
+        in the store.
+
+        :param asset_path: full path of the asset file.
+        :param asset_hash: hash of the content of the asset.
+        :param algorithm: algorithm of the hash.
+        :returns: if the content is in the store, and the file was made
+        :rtype: bool
+        """
+        return self._materialize(asset_path, asset_hash, algorithm) is not None
+
+    def _materialize(self, asset_path, asset_hash, algorithm, copy=True):
+        """
+        Makes an asset file, replacing it if it exists, from the content
+        in the store.
+
+        :param asset_path: full path of the asset file.
+        :param asset_hash: hash of the content of the asset.
+        :param algorithm: algorithm of the hash.
+        :param copy: whether the file is made as a plain copy if the
+                     content can't be shared.
+        :returns: how the file was made (see :func:`_clone_file`), or None
+                  if the content is not in the store, or it can't be
+                  shared and no copy is made
+        :rtype: str
+        """
+        content_path = self.get_content_path(asset_hash, algorithm)
+        if not os.path.isfile(content_path):
+            return None
+        hardlink = self.hardlinks
+        # the content is changed by changes to any asset file linked to it
+        if hardlink and not self._check_content(content_path, asset_hash, algorithm):
+            return None
+        # the asset file is replaced only when complete
+        temp_path = f"{asset_path}-{uuid.uuid4().hex}-PARTIAL"
+        try:
+            method = _clone_file(content_path, temp_path, hardlink, copy)
+            os.replace(temp_path, asset_path)
+        except OSError as details:
+            LOG.debug("Could not make %s from the store: %s", asset_path, details)
+            return None
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        LOG.debug("Asset %s made from the store (%s)", asset_path, method)
+        return method
+
+    @staticmethod
+    def _check_content(content_path, asset_hash, algorithm):
+        """
+        Checks some content in the store against its hash, removing it from
+        the store if it doesn't match.
+
+        :param content_path: path of the content in the store.
+        :param asset_hash: hash of the content.
+        :param algorithm: algorithm of the hash.
+        :returns: if the content matches its hash
+        :rtype: bool
+        """
+        try:
+            if crypto.hash_file(content_path, algorithm=algorithm) == asset_hash:
+                return True
+            LOG.error(
+                "Content %s in the store was modified, along with the "
+                "asset files linked to it. Removing it from the store.",
+                content_path,
+            )
+            os.remove(content_path)
+        except OSError as details:
+            LOG.debug("Could not check %s: %s", content_path, details)
+        return False
+
+    def add(self, asset_path, asset_hash, algorithm):
+        """
+        Adds the content of an asset file to the store.
+
+        If the same content is already there, the asset file is made from
+        it instead, if it can share its space.
+
+        :param asset_path: full path of the asset file.
+        :param asset_hash: hash of the content of the asset.
+        :param algorithm: algorithm of the hash.
+        :returns: if the asset file was made from the same content already
+                  in the store, sharing its space
+        :rtype: bool
+        """
+        return self._add(asset_path, asset_hash, algorithm)[0]
+
+    def _add(self, asset_path, asset_hash, algorithm):
+        """
+        Adds the content of an asset file to the store, see :meth:`add`.
+
+        :returns: if the asset file shares the space of the content already
+                  in the store, and the number of bytes copied, whose
+                  space is not shared
+        :rtype: tuple
+        """
+        content_path = self.get_content_path(asset_hash, algorithm)
+        hardlink = self.hardlinks
+        try:
+            linked = os.path.samefile(asset_path, content_path)
+        except FileNotFoundError:
+            os.makedirs(os.path.dirname(content_path), exist_ok=True)
+            temp_path = f"{content_path}-{uuid.uuid4().hex}-PARTIAL"
+            try:
+                method = _clone_file(asset_path, temp_path, hardlink)
+                mode = stat.S_IMODE(os.stat(temp_path).st_mode)
+                os.chmod(
+                    temp_path, mode & ~(stat.S_IWUSR | stat.S_IWGRP | stat.S_IWOTH)
+                )
+                os.replace(temp_path, content_path)
+            finally:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+            return False, os.stat(content_path).st_size if method == "copy" else 0
+        if linked:
+            if not hardlink:
+                # linked when hard links were used, made a file of its own
+                method = self._materialize(asset_path, asset_hash, algorithm)
+                if method == "copy":
+                    return False, os.stat(asset_path).st_size
+            return False, 0
+        # a copy of the content would take as much space as the asset file
+        method = self._materialize(asset_path, asset_hash, algorithm, copy=False)
+        return method is not None, 0
+
+    def release(self, asset_path):
+        """
+        Removes from the store the content of an asset file about to be
+        removed, if no other asset file uses it, and removes the asset file
+        from the catalog of the cache directory.
+
+        :param asset_path: full path of the asset file.
+        """
+        catalog = AssetCatalog(self.cache_dir)
+        catalog.remove(asset_path)
+        for algorithm, asset_hash in self._read_hashes(asset_path):
+            content_path = self.get_content_path(asset_hash, algorithm)
+            try:
+                if os.path.samefile(asset_path, content_path):
+                    # the links are the asset file and the content itself
+                    if os.stat(content_path).st_nlink <= 2:
+                        os.remove(content_path)
+                elif not catalog.has_hash(asset_hash, algorithm):
+                    os.remove(content_path)
+            except OSError as details:
+                LOG.debug("Could not release %s: %s", content_path, details)
+
+    @staticmethod
+    def _read_hashes(asset_path):
+        """
+        Reads all hashes in the CHECKSUM file of an asset file.
+
+        :param asset_path: full path of the asset file.
+        :returns: the algorithm and hash pairs
+        :rtype: list of tuple
+        """
+        hashes = []
+        try:
+            with open(Asset._get_hash_file(asset_path), encoding="utf-8") as hash_file:
+                for line in hash_file:
+                    fields = line.split()
+                    if len(fields) == 2:
+                        hashes.append(tuple(fields))
+        except OSError:
+            pass
+        return hashes
+
+    def migrate(self, algorithm=DEFAULT_HASH_ALGORITHM, hardlinks=False):
+        """
+        Converts the cache directory to the content-addressed layout.
+
+        The store is created, if needed, and the content of every asset
+        file is added to it, so that assets with the same content are kept
+        once.  On a cache directory which already uses the layout, the
+        asset files not in the store yet (such as those copied into the
+        cache directory by other means) are added, and the content in the
+        store no longer used by any asset is removed.
+
+        :param algorithm: algorithm of the hashes by which the content of
+                          the assets is stored.
+        :param hardlinks: whether the asset files are made hard links to
+                          the content in the store.  If not, the asset
+                          files which are hard links are made files of
+                          their own.
+        :returns: the number of assets, the number of bytes freed, and the
+                  number of bytes added by copies of the content
+        :rtype: tuple
+        :raises OSError: when the asset files are not made hard links, and
+                         the filesystem doesn't support reflinks, so that
+                         the store would only add a copy of each asset
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        if not hardlinks and not _supports_reflinks(self.cache_dir):
+            raise OSError(
+                f"The filesystem of {self.cache_dir} doesn't support "
+                f"reflinks, so the asset files must be hard links to "
+                f"their content in the store"
+            )
+        os.makedirs(self.path, exist_ok=True)
+        hardlinks_path = os.path.join(self.path, STORE_HARDLINKS_FILENAME)
+        if hardlinks:
+            with open(hardlinks_path, "w", encoding="utf-8"):
+                pass
+        elif os.path.exists(hardlinks_path):
+            os.remove(hardlinks_path)
+        assets = freed = added = 0
+        used = set()
+        for root, dirs, files in os.walk(self.cache_dir):
+            if root == self.cache_dir and STORE_DIRNAME in dirs:
+                dirs.remove(STORE_DIRNAME)
+            for filename in files:
+                if filename.endswith(NON_ASSET_SUFFIXES):
+                    continue
+                asset_path = os.path.join(root, filename)
+                # local files are linked, not copied, into the cache
+                if os.path.islink(asset_path):
+                    continue
+                hashes = dict(self._read_hashes(asset_path))
+                try:
+                    if algorithm not in hashes:
+                        hashes[algorithm] = crypto.hash_file(
+                            asset_path, algorithm=algorithm
+                        )
+                        Asset._add_hash_to_hash_file(
+                            Asset._get_hash_file(asset_path),
+                            hashes[algorithm],
+                            algorithm,
+                        )
+                    size = os.stat(asset_path).st_size
+                    shared, copied = self._add(asset_path, hashes[algorithm], algorithm)
+                    if shared:
+                        freed += size
+                    added += copied
+                except OSError as details:
+                    LOG.error("Could not migrate %s: %s", asset_path, details)
+                    continue
+                used.update(hashes.items())
+                assets += 1
+        for root, _, files in os.walk(self.path, topdown=False):
+            if root == self.path:
+                continue
+            for filename in files:
+                content_path = os.path.join(root, filename)
+                algorithm = os.path.relpath(root, self.path).split(os.sep)[0]
+                try:
+                    stats = os.stat(content_path)
+                    if stats.st_nlink == 1 and (algorithm, filename) not in used:
+                        os.remove(content_path)
+                        freed += stats.st_size
+                except OSError as details:
+                    LOG.debug("Could not remove %s: %s", content_path, details)
+            if not os.listdir(root):
+                os.rmdir(root)
+        return assets, freed, added
@@ -17,15 +17,20 @@
 Methods to download URLs and regular files.
 """
 
+import concurrent.futures
+import hashlib
+import json
 import logging
 import os
 import shutil
 import socket
 import sys
+import threading
+import time
 import urllib.parse
 from multiprocessing import Process
 from urllib.error import HTTPError
-from urllib.request import urlopen
+from urllib.request import Request, urlopen
 
 from avocado.utils import crypto, output
 
@@ -103,6 +108,222 @@ def url_download(url, filename, data=None, timeout=300):
         raise OSError("Aborting downloading. Timeout was reached.")
 
 
+def url_download_hash(
+    url, filename, algorithm="md5", data=None, timeout=300, chunk_size=1048576
+):
+    """
+    Retrieve a file from given url, computing its hash while it's written.
+
+    Unlike :func:`url_download`, the file is downloaded by the calling
+    process, and its content is read only once, as it's received.
+
+    :param url: source URL.
+    :param filename: destination path.
+    :param algorithm: hash algorithm (any supported by :mod:`hashlib`).
+    :param data: (optional) data to post.
+    :param timeout: (optional) default timeout in seconds.
+    :param chunk_size: amount of data to read at a time.
+    :return: the hash of the file, as an hexadecimal string.
+    :raises: `OSError` if it fails or the timeout is reached.
+    """
+    deadline = time.monotonic() + timeout
+    hash_obj = hashlib.new(algorithm)
+    log.info("Fetching %s -> %s", url, filename)
+    with urlopen(url, data=data, timeout=timeout) as src_file:
+        with open(filename, "wb") as dest_file:
+            while True:
+                chunk = src_file.read(chunk_size)
+                if not chunk:
+                    break
+                hash_obj.update(chunk)
+                dest_file.write(chunk)
+                if time.monotonic() > deadline:
+                    raise OSError("Aborting downloading. Timeout was reached.")
+    return hash_obj.hexdigest()
+
+
+def _url_get_range_info(url, timeout):
+    """
+    Gets the size of the file at given url, and its ETag or Last-Modified
+    header, if the server supports range requests for it.
+
+    :return: size and validator, or (None, None) if ranges are not supported.
+    """
+    try:
+        with urlopen(Request(url, method="HEAD"), timeout=timeout) as response:
+            headers = response.headers
+    except HTTPError:
+        return None, None
+    if headers.get("Accept-Ranges", "").lower() != "bytes":
+        return None, None
+    try:
+        size = int(headers["Content-Length"])
+    except (KeyError, ValueError):
+        return None, None
+    return size, headers.get("ETag") or headers.get("Last-Modified")
+
+
+def _load_journal(journal_path):
+    try:
+        with open(journal_path, encoding="utf-8") as journal_file:
+            return json.load(journal_file)
+    except (OSError, ValueError):
+        return None
+
+
+def _save_journal(journal_path, journal):
+    with open(f"{journal_path}.tmp", "w", encoding="utf-8") as journal_file:
+        json.dump(journal, journal_file)
+    os.replace(f"{journal_path}.tmp", journal_path)
+
+
+class _RangeDownload:
+    """
+    Download of a file in ranges, whose progress is kept in a journal.
+    """
+
+    def __init__(self, url, filename, journal, timeout, chunk_size):
+        self.url = url
+        self.filename = filename
+        self.journal = journal
+        self.journal_path = f"{filename}.journal"
+        self.deadline = time.monotonic() + timeout
+        self.timeout = timeout
+        self.chunk_size = chunk_size
+        self._lock = threading.Lock()
+
+    def download(self, index, hash_obj=None):
+        """
+        Downloads what is missing of one of the ranges in the journal.
+
+        :param index: index of the range in the journal.
+        :param hash_obj: (optional) hash object updated with the data.
+        """
+        position, stop = self.journal["ranges"][index]
+        if position >= stop:
+            return
+        headers = {"Range": f"bytes={position}-{stop - 1}"}
+        if self.journal["validator"]:
+            # the whole file is sent if it has changed
+            headers["If-Range"] = self.journal["validator"]
+        request = Request(self.url, headers=headers)
+        with urlopen(request, timeout=self.timeout) as src_file:
+            if src_file.status != 206:
+                raise OSError(f"File at {self.url} changed during the download.")
+            with open(self.filename, "r+b") as dest_file:
+                dest_file.seek(position)
+                while position < stop:
+                    chunk = src_file.read(min(self.chunk_size, stop - position))
+                    if not chunk:
+                        raise OSError(f"Connection to {self.url} closed prematurely.")
+                    dest_file.write(chunk)
+                    # the data must be in the file before the journal
+                    # tells it is
+                    dest_file.flush()
+                    if hash_obj is not None:
+                        hash_obj.update(chunk)
+                    position += len(chunk)
+                    with self._lock:
+                        self.journal["ranges"][index][0] = position
+                        _save_journal(self.journal_path, self.journal)
+                    if time.monotonic() > self.deadline:
+                        raise OSError("Aborting downloading. Timeout was reached.")
+
+
+def url_download_resume(
+    url, filename, algorithm="md5", timeout=300, connections=1, chunk_size=1048576
+):
+    """
+    Retrieve a file from given url, resuming a previous partial download.
+
+    When the server supports range requests for the file, the progress of
+    the download is kept in a journal, at `filename` plus ".journal".  A
+    download which is interrupted, by a failure, its timeout, or even the
+    process being killed, is resumed from where it stopped the next time
+    it's retrieved to the same destination, as long as the file at given
+    url is the same (that is, it has the same size, and ETag or
+    Last-Modified header).  The download may also be split in ranges,
+    retrieved over many connections at the same time.
+
+    Otherwise, this is the same as :func:`url_download_hash`.
+
+    :param url: source URL.
+    :param filename: destination path.
+    :param algorithm: hash algorithm (any supported by :mod:`hashlib`).
+    :param timeout: (optional) default timeout in seconds.
+    :param connections: maximum number of connections used at the same
+                        time, each one retrieving a range of the file.
+    :param chunk_size: amount of data to read at a time, which is also the
+                       minimum size of each range.
+    :return: the hash of the file, as an hexadecimal string.
+    :raises: `OSError` if it fails or the timeout is reached.
+    """
+    hash_obj = hashlib.new(algorithm)
+    journal_path = f"{filename}.journal"
+    size, validator = _url_get_range_info(url, timeout)
+    if size is None:
+        if os.path.isfile(journal_path):
+            os.remove(journal_path)
+        try:
+            return url_download_hash(
+                url, filename, algorithm, timeout=timeout, chunk_size=chunk_size
+            )
+        except OSError:
+            # there's no way to resume it
+            if os.path.isfile(filename):
+                os.remove(filename)
+            raise
+
+    journal = _load_journal(journal_path)
+    if (
+        journal is not None
+        and journal.get("url") == url
+        and journal.get("size") == size
+        and journal.get("validator") == validator
+        and os.path.isfile(filename)
+        and os.path.getsize(filename) == size
+    ):
+        log.info("Resuming %s -> %s", url, filename)
+    else:
+        log.info("Fetching %s -> %s", url, filename)
+        count = max(1, min(connections, size // chunk_size))
+        bounds = [size * index // count for index in range(count + 1)]
+        journal = {
+            "url": url,
+            "size": size,
+            "validator": validator,
+            "ranges": [[start, stop] for start, stop in zip(bounds, bounds[1:])],
+        }
+        with open(filename, "wb") as dest_file:
+            dest_file.truncate(size)
+        _save_journal(journal_path, journal)
+
+    download = _RangeDownload(url, filename, journal, timeout, chunk_size)
+    if len(journal["ranges"]) == 1:
+        # what was retrieved before is hashed, and the rest is hashed
+        # as it's written
+        position = journal["ranges"][0][0]
+        with open(filename, "rb") as partial_file:
+            while position > 0:
+                chunk = partial_file.read(min(chunk_size, position))
+                hash_obj.update(chunk)
+                position -= len(chunk)
+        download.download(0, hash_obj)
+    else:
+        with concurrent.futures.ThreadPoolExecutor(len(journal["ranges"])) as executor:
+            futures = [
+                executor.submit(download.download, index)
+                for index in range(len(journal["ranges"]))
+            ]
+            for future in futures:
+                future.result()
+        with open(filename, "rb") as dest_file:
+            for chunk in iter(lambda: dest_file.read(chunk_size), b""):
+                hash_obj.update(chunk)
+    os.remove(journal_path)
+    return hash_obj.hexdigest()
+
+
 def url_download_interactive(url, output_file, title="", chunk_size=102400):
     """
     Interactively downloads a given file url to a given output file.
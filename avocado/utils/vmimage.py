@@ -16,6 +16,7 @@
 Provides VM images acquired from official repositories
 """
 
+import json
 import logging
 import os
 import re
@@ -648,9 +649,9 @@ class Image:
         """
         Find a cached image using asset.py enhanced built-in functionality.
 
-        This version uses the enhanced Asset.get_metadata() method which supports
-        both normal asset names and direct file paths, maximizing utilization of
-        existing asset.py caching features.
+        This version uses the metadata kept in the catalog of assets of each
+        cache directory, so that the metadata files are not read one by one,
+        and the most recently used image is found first.
         """
 
         # pylint: disable-next=invalid-name
@@ -671,9 +672,16 @@ class Image:
                 and (not compatible_arches or metadata.get("arch") in compatible_arches)
             )
 
-        # Use Asset.get_all_assets() to find cached assets
-        for asset_path in asset.Asset.get_all_assets(cache_dirs, sort=False):
+        # Use Asset.get_catalog_entries() to find cached assets
+        for entry in asset.Asset.get_catalog_entries(cache_dirs):
+            asset_path = entry.path
             try:
+                if not entry.metadata:
+                    continue
+                metadata = json.loads(entry.metadata)
+                if not isinstance(metadata, dict):
+                    continue
+
                 temp_asset = asset.Asset(
                     name=asset_path,
                     asset_hash=checksum,
@@ -681,13 +689,6 @@ class Image:
                     cache_dirs=cache_dirs,
                 )
 
-                try:
-                    metadata = temp_asset.get_metadata()
-                    if not metadata:
-                        continue
-                except OSError:
-                    continue
-
                 if matches_image_criteria(
                     metadata, name, version, build, compatible_arches
                 ):
@@ -67,7 +67,13 @@ class GolangRunner(BaseRunner):
         def poll_proc():
             return process.poll() is not None
 
-        yield from self.running_loop(poll_proc)
+        def wait_proc(timeout):
+            try:
+                process.wait(timeout)
+            except subprocess.TimeoutExpired:
+                pass
+
+        yield from self.running_loop(poll_proc, wait=wait_proc)
 
         result = "pass" if process.returncode == 0 else "fail"
         yield messages.StdoutMessage.get(process.stdout.read())
@@ -1,5 +1,7 @@
+import concurrent.futures
 import logging
 import random
+import time
 
 from avocado_varianter_cit.CombinationMatrix import CombinationMatrix
 from avocado_varianter_cit.Solver import Solver
@@ -12,15 +14,18 @@ LOG.setLevel(logging.INFO)
 
 
 class Cit:
-    def __init__(self, input_data, t_value, constraints):
+    def __init__(self, input_data, t_value, constraints, seed=None):
         """
         Creation of CombinationMatrix from user input
 
         :param input_data: parameters from user
         :param t_value: size of one combination
         :param constraints: constraints of combinations
+        :param seed: seed of the random choices of the search, for it to be
+                     repeatable. If None, the search is different each time
         """
         self.data = input_data
+        self.random = random.Random(seed)
         self.t_value = t_value
         # CombinationMatrix creation
         self.combination_matrix = CombinationMatrix(input_data, t_value)
@@ -52,13 +57,16 @@ class Cit:
             self.final_matrix.append(new_row)
         return self.final_matrix
 
-    def compute(self):
+    def compute(self, deadline=None):
         """
         Searching for the best solution. It creates one solution and from that,
         it tries to create smaller solution. This searching process is limited
         by ITERATIONS_SIZE. When ITERATIONS_SIZE is 0 the last found solution is
         the best solution.
 
+        :param deadline: time (as given by :func:`time.monotonic`) after which
+                         the search for smaller solutions is stopped, and the
+                         best solution found so far is returned
         :return: The best solution
         """
         self.final_matrix = self.final_matrix_init()
@@ -68,7 +76,7 @@ class Cit:
         deleted_rows = []
         while step_size != 0:
             for i in range(step_size):
-                delete_row = matrix.pop(random.randint(0, len(matrix) - 1))
+                delete_row = matrix.pop(self.random.randint(0, len(matrix) - 1))
                 self.combination_matrix.uncover_solution_row(delete_row)
                 deleted_rows.append(delete_row)
             LOG.debug(
@@ -76,7 +84,9 @@ class Cit:
                 len(matrix),
                 iterations,
             )
-            matrix, is_better_solution = self.find_better_solution(iterations, matrix)
+            matrix, is_better_solution = self.find_better_solution(
+                iterations, matrix, deadline
+            )
             if is_better_solution:
                 self.final_matrix = matrix[:]
                 deleted_rows = []
@@ -90,19 +100,29 @@ class Cit:
                 for i in range(step_size):
                     self.combination_matrix.cover_solution_row(deleted_rows[i])
                     matrix.append(deleted_rows[i])
-                if step_size > 1:
+                if step_size > 1 and not self.is_past(deadline):
                     step_size = 1
                 else:
                     step_size = 0
 
         return self.final_matrix
 
-    def find_better_solution(self, counter, matrix):
+    @staticmethod
+    def is_past(deadline):
+        """
+        :param deadline: time (as given by :func:`time.monotonic`), or None
+        :return: whether the deadline has been reached
+        """
+        return deadline is not None and time.monotonic() >= deadline
+
+    def find_better_solution(self, counter, matrix, deadline=None):
         """
         Changing the matrix to cover all combinations
 
         :param counter: maximum number of changes in the matrix
         :param matrix: matrix to be changed
+        :param deadline: time (as given by :func:`time.monotonic`) after which
+                         no more changes are tried
         :return: new matrix and is changes have been successful?
         """
         while self.combination_matrix.total_uncovered != 0:
@@ -112,7 +132,7 @@ class Cit:
                 self.combination_matrix.uncover_solution_row(matrix[row_index])
                 self.combination_matrix.cover_solution_row(solution)
                 matrix[row_index] = solution
-            if counter == 0:
+            if counter == 0 or self.is_past(deadline):
                 return matrix, False
             counter -= 1
         return matrix, True
@@ -125,7 +145,7 @@ class Cit:
         :param matrix: matrix to be changed
         :return: new row of matrix, index of row inside matrix and parameters which has been changed
         """
-        switch = random.randint(0, 9)
+        switch = self.random.randint(0, 9)
         if switch == 0:
             solution, row_index, parameters = self.change_one_value(matrix)
         elif switch == 1:
@@ -146,7 +166,7 @@ class Cit:
             row = [-1] * len(self.data)
             while len(possible_parameters) != 0:
                 # finding uncovered combination
-                combination_parameters_index = random.randint(
+                combination_parameters_index = self.random.randint(
                     0, len(possible_parameters) - 1
                 )
                 combination_parameters = possible_parameters[
@@ -156,11 +176,13 @@ class Cit:
                 combination_row = self.combination_matrix.get_row(
                     combination_parameters
                 )
-                possible_combinations = list(
-                    combination_row.get_all_uncovered_combinations()
+                possible_combinations = combination_row.get_all_uncovered_indexes()
+                combination_index = self.random.randint(
+                    0, len(possible_combinations) - 1
+                )
+                combination = combination_row.get_combination(
+                    possible_combinations[combination_index]
                 )
-                combination_index = random.randint(0, len(possible_combinations) - 1)
-                combination = possible_combinations[combination_index]
                 is_parameter_used = False
                 # Are parameters already used in row?
                 for i in combination_parameters:
@@ -180,7 +202,7 @@ class Cit:
                 if r == -1:
                     is_valid = False
                     while not is_valid:
-                        row[index] = random.randint(0, self.data[index] - 1)
+                        row[index] = self.random.randint(0, self.data[index] - 1)
                         is_valid = self.combination_matrix.is_valid_solution(row)
             is_valid_row = self.combination_matrix.is_valid_solution(row)
 
@@ -202,17 +224,16 @@ class Cit:
             solution = [x for x in matrix[row_index]]
             for index, item in enumerate(parameters):
                 solution[item] = combination[index]
-            if self.combination_matrix.is_valid_combination(solution, parameters):
-                self.combination_matrix.uncover_combination(
-                    matrix[row_index], parameters
-                )
-                self.combination_matrix.cover_combination(solution, parameters)
-                if self.combination_matrix.total_uncovered < best_uncover:
-                    best_uncover = self.combination_matrix.total_uncovered
+            # Is the solution valid, and how does it change the coverage?
+            difference = self.combination_matrix.get_uncovered_difference(
+                matrix[row_index], solution, parameters
+            )
+            if difference is not None:
+                uncover = self.combination_matrix.total_uncovered + difference
+                if uncover < best_uncover:
+                    best_uncover = uncover
                     best_solution = solution
                     best_row_index = row_index
-                self.combination_matrix.uncover_combination(solution, parameters)
-                self.combination_matrix.cover_combination(matrix[row_index], parameters)
                 if best_uncover == 0:
                     break
         return best_solution, best_row_index, parameters
@@ -224,12 +245,16 @@ class Cit:
         :return: parameter of combination and values of combination
         """
         possible_parameters = list(self.combination_matrix.uncovered_rows)
-        combination_parameters_index = random.randint(0, len(possible_parameters) - 1)
+        combination_parameters_index = self.random.randint(
+            0, len(possible_parameters) - 1
+        )
         combination_parameters = possible_parameters[combination_parameters_index]
         combination_row = self.combination_matrix.get_row(combination_parameters)
-        possible_combinations = list(combination_row.get_all_uncovered_combinations())
-        combination_index = random.randint(0, len(possible_combinations) - 1)
-        combination = possible_combinations[combination_index]
+        possible_combinations = combination_row.get_all_uncovered_indexes()
+        combination_index = self.random.randint(0, len(possible_combinations) - 1)
+        combination = combination_row.get_combination(
+            possible_combinations[combination_index]
+        )
         return combination_parameters, combination
 
     def change_one_column(self, matrix):
@@ -240,7 +265,7 @@ class Cit:
         :param matrix: matrix to be changed
         :return: solution, index of solution inside matrix and parameters which has been changed
         """
-        column_index = random.randint(0, len(self.data) - 1)
+        column_index = self.random.randint(0, len(self.data) - 1)
         best_uncover = float("inf")
         best_solution = []
         best_row_index = 0
@@ -251,14 +276,16 @@ class Cit:
                 )
             except ValueError:
                 continue
-            self.combination_matrix.uncover_combination(matrix[row_index], parameters)
-            self.combination_matrix.cover_combination(solution, parameters)
-            if self.combination_matrix.total_uncovered < best_uncover:
-                best_uncover = self.combination_matrix.total_uncovered
+            uncover = (
+                self.combination_matrix.total_uncovered
+                + self.combination_matrix.get_uncovered_difference(
+                    matrix[row_index], solution, parameters
+                )
+            )
+            if uncover < best_uncover:
+                best_uncover = uncover
                 best_solution = solution
                 best_row_index = row_index
-            self.combination_matrix.uncover_combination(solution, parameters)
-            self.combination_matrix.cover_combination(matrix[row_index], parameters)
             if best_uncover == 0:
                 break
         return best_solution, best_row_index, [column_index]
@@ -275,27 +302,27 @@ class Cit:
         is_cell_chosen = True
         if row_index is None:
             is_cell_chosen = False
-            row_index = random.randint(0, len(matrix) - 1)
+            row_index = self.random.randint(0, len(matrix) - 1)
         row = [x for x in matrix[row_index]]
         if column_index is None:
             is_cell_chosen = False
-            column_index = random.randint(0, len(row) - 1)
+            column_index = self.random.randint(0, len(row) - 1)
         possible_numbers = list(range(0, row[column_index])) + list(
             range(row[column_index] + 1, self.data[column_index])
         )
-        row[column_index] = random.choice(possible_numbers)
+        row[column_index] = self.random.choice(possible_numbers)
         while not self.combination_matrix.is_valid_combination(row, [column_index]):
             possible_numbers.remove(row[column_index])
             if len(possible_numbers) == 0:
                 if is_cell_chosen:
                     raise ValueError("Selected cell can't be changed")
-                column_index = random.randint(0, len(row) - 1)
-                row_index = random.randint(0, len(matrix) - 1)
+                column_index = self.random.randint(0, len(row) - 1)
+                row_index = self.random.randint(0, len(matrix) - 1)
                 row = [x for x in matrix[row_index]]
                 possible_numbers = list(range(0, row[column_index])) + list(
                     range(row[column_index] + 1, self.data[column_index])
                 )
-            row[column_index] = random.choice(possible_numbers)
+            row[column_index] = self.random.choice(possible_numbers)
         return row, row_index, [column_index]
 
     def compute_row_using_hamming_distance(self):
@@ -330,8 +357,110 @@ class Cit:
         data_size = len(self.data)
         row = [-1] * data_size
 
-        for parameter in random.sample(range(data_size), data_size):
+        for parameter in self.random.sample(range(data_size), data_size):
             possible_values = self.solver.get_possible_values(row, parameter)
-            value_choice = random.choice(possible_values)
+            value_choice = self.random.choice(possible_values)
             row[parameter] = value_choice
         return row
+
+
+def _search(input_data, t_value, constraints, seed, deadline, required):
+    """
+    Runs one search for the best solution
+
+    :param required: whether the search has to be run even if the deadline
+                     has been reached, so that there's at least one solution
+    :return: the best solution and the time spent, or None if not run
+    """
+    if not required and Cit.is_past(deadline):
+        return None
+    start = time.monotonic()
+    matrix = Cit(input_data, t_value, constraints, seed).compute(deadline)
+    return matrix, time.monotonic() - start
+
+
+def compute_multi_start(
+    input_data,
+    t_value,
+    constraints,
+    searches,
+    processes=None,
+    time_budget=None,
+    seed=None,
+):
+    """
+    Searching for the best solution with several independent searches, each
+    one started from a different random solution, and run within a pool of
+    processes. The smallest of their solutions is the best solution, and
+    when some are of the same size, the one of the first search is.
+
+    :param input_data: parameters from user
+    :param t_value: size of one combination
+    :param constraints: constraints of combinations
+    :param searches: number of independent searches
+    :param processes: number of processes searching at the same time. If
+                      None, the number of CPUs. If 1, the searches are run,
+                      one after the other, in this process
+    :param time_budget: seconds after which the searches in progress are
+                        stopped, and the ones not started yet are skipped.
+                        The first search always returns a solution. If
+                        None, searches run until they can't do better
+    :param seed: seed from which the seed of each search is generated, so
+                 that the best solution is the same each time, as long as
+                 the time budget is not exhausted
+    :return: The best solution
+    :raises ValueError: if the number of searches is lower than 1
+    """
+    if searches < 1:
+        raise ValueError(f"at least one search is needed, got {searches}")
+    generator = random.Random(seed)
+    seeds = [generator.getrandbits(32) for _ in range(searches)]
+    deadline = None
+    if time_budget is not None:
+        deadline = time.monotonic() + time_budget
+    arguments = [
+        (input_data, t_value, constraints, search_seed, deadline, index == 0)
+        for index, search_seed in enumerate(seeds)
+    ]
+    results = [None] * searches
+    # the progress of a single search is not worth reporting
+    level = logging.INFO if searches > 1 else logging.DEBUG
+    done = []
+
+    def report(index, result):
+        results[index] = result
+        done.append(index)
+        if result is None:
+            LOG.log(
+                level,
+                "Search %s of %s (%s done): skipped, out of time",
+                index + 1,
+                searches,
+                len(done),
+            )
+        else:
+            LOG.log(
+                level,
+                "Search %s of %s (%s done, seed %s): solution with size %s "
+                "found in %.2fs",
+                index + 1,
+                searches,
+                len(done),
+                seeds[index],
+                len(result[0]),
+                result[1],
+            )
+
+    if processes == 1 or searches == 1:
+        for index, args in enumerate(arguments):
+            report(index, _search(*args))
+    else:
+        with concurrent.futures.ProcessPoolExecutor(processes) as executor:
+            futures = {
+                executor.submit(_search, *args): index
+                for index, args in enumerate(arguments)
+            }
+            for future in concurrent.futures.as_completed(futures):
+                report(futures[future], future.result())
+    solutions = [result[0] for result in results if result is not None]
+    return min(solutions, key=len)
@@ -1,5 +1,6 @@
 import itertools
 
+from avocado_varianter_cit.CombinationRow import DISABLED
 from avocado_varianter_cit.CombinationRow import CombinationRow as Row
 
 
@@ -21,37 +22,74 @@ class CombinationMatrix:
         self.uncovered_rows = {}
         self.total_uncovered = 0
         self.total_covered_more_than_ones = 0
+        # Rows which combine each parameter, in the order of the hash table
+        self._rows_by_parameter = [[] for _ in input_data]
+        # The last rows which combine more parameters, as the same ones
+        # are usually looked for many times in a row
+        self._last_rows_with = (None, None)
         # Creation of rows
         for c in itertools.combinations(range(len(input_data)), t_value):
             row = Row(input_data, t_value, c)
             self.total_uncovered += row.uncovered
             self.hash_table[c] = row
             self.uncovered_rows[c] = c
+            for parameter in c:
+                self._rows_by_parameter[parameter].append((c, row))
 
-    def cover_solution_row(self, row):
+    def _get_rows_with(self, parameters):
         """
-        Cover all combination by one row from possible solution
+        Rows which combine any of the given parameters
 
-        :param row: one row from solution
-        :return: number of still uncovered combinations
+        :param parameters: parameters which has to be combined
+        :return: list of keys and rows, in the order of the hash table
         """
-        for key, value in self.hash_table.items():
-            val = []
-            # Getting combination from solution
-            for i in key:
-                val.append(row[i])
+        if len(parameters) == 1:
+            return self._rows_by_parameter[parameters[0]]
+        parameters = tuple(parameters)
+        last_parameters, rows = self._last_rows_with
+        if parameters != last_parameters:
+            rows = {}
+            for parameter in parameters:
+                rows.update(self._rows_by_parameter[parameter])
+            rows = sorted(rows.items())
+            self._last_rows_with = (parameters, rows)
+        return rows
 
-            uncovered_difference, covered_more_than_ones_difference = value.cover_cell(
-                val
-            )
+    def _cover_rows(self, row, rows):
+        for key, value in rows:
+            (
+                uncovered_difference,
+                covered_more_than_ones_difference,
+            ) = value.cover_index(value.get_row_index(row))
             # Deleting covered row from uncovered rows
             if value.uncovered == 0:
                 self.uncovered_rows.pop(key, None)
             self.total_uncovered += uncovered_difference
             self.total_covered_more_than_ones += covered_more_than_ones_difference
+        return self.total_uncovered
 
+    def _uncover_rows(self, row, rows):
+        for key, value in rows:
+            (
+                uncovered_difference,
+                covered_more_than_ones_difference,
+            ) = value.uncover_index(value.get_row_index(row))
+            # Adding uncovered row to uncovered rows
+            if value.uncovered != 0:
+                self.uncovered_rows[key] = key
+            self.total_uncovered += uncovered_difference
+            self.total_covered_more_than_ones += covered_more_than_ones_difference
         return self.total_uncovered
 
+    def cover_solution_row(self, row):
+        """
+        Cover all combination by one row from possible solution
+
+        :param row: one row from solution
+        :return: number of still uncovered combinations
+        """
+        return self._cover_rows(row, self.hash_table.items())
+
     def cover_combination(self, row, parameters):
         """
         Cover combination of specific parameters by one row from possible solution
@@ -60,27 +98,7 @@ class CombinationMatrix:
         :param parameters: parameters which has to be covered
         :return: number of still uncovered combinations
         """
-        for key, value in self.hash_table.items():
-            for parameter in parameters:
-                if parameter in key:
-                    val = []
-                    # Getting combination from solution
-                    for i in key:
-                        val.append(row[i])
-
-                    (
-                        uncovered_difference,
-                        covered_more_than_ones_difference,
-                    ) = value.cover_cell(val)
-                    # Deleting covered row from uncovered rows
-                    if value.uncovered == 0:
-                        self.uncovered_rows.pop(key, None)
-                    self.total_uncovered += uncovered_difference
-                    self.total_covered_more_than_ones += (
-                        covered_more_than_ones_difference
-                    )
-                    break
-        return self.total_uncovered
+        return self._cover_rows(row, self._get_rows_with(parameters))
 
     def uncover_solution_row(self, row):
         """
@@ -89,23 +107,7 @@ class CombinationMatrix:
         :param row: one row from solution
         :return: number of uncovered combinations
         """
-        for key, value in self.hash_table.items():
-            val = []
-            # Getting combination from solution
-            for i in key:
-                val.append(row[i])
-
-            (
-                uncovered_difference,
-                covered_more_than_ones_difference,
-            ) = value.uncover_cell(val)
-            # Adding uncovered row to uncovered rows
-            if value.uncovered != 0:
-                self.uncovered_rows[key] = key
-            self.total_uncovered += uncovered_difference
-            self.total_covered_more_than_ones += covered_more_than_ones_difference
-
-        return self.total_uncovered
+        return self._uncover_rows(row, self.hash_table.items())
 
     def uncover_combination(self, row, parameters):
         """
@@ -115,27 +117,39 @@ class CombinationMatrix:
         :param parameters: parameters which has to be covered
         :return: number of uncovered combinations
         """
-        for key, value in self.hash_table.items():
-            for parameter in parameters:
-                if parameter in key:
-                    val = []
-                    # Getting combination from solution
-                    for i in key:
-                        val.append(row[i])
-
-                    (
-                        uncovered_difference,
-                        covered_more_than_ones_difference,
-                    ) = value.uncover_cell(val)
-                    # Adding uncovered row to uncovered rows
-                    if value.uncovered != 0:
-                        self.uncovered_rows[key] = key
-                    self.total_uncovered += uncovered_difference
-                    self.total_covered_more_than_ones += (
-                        covered_more_than_ones_difference
-                    )
-                    break
-        return self.total_uncovered
+        return self._uncover_rows(row, self._get_rows_with(parameters))
+
+    def get_uncovered_difference(self, row, new_row, parameters):
+        """
+        Computes how the number of uncovered combinations would change if one
+        row from solution was replaced by a new one which differs only in the
+        values of specific parameters. Nothing is changed, but the result is
+        the same as uncovering the combination by the row and covering it by
+        the new one.
+
+        :param row: one row from solution
+        :param new_row: row which would replace it
+        :param parameters: parameters whose values are different
+        :return: difference of the number of uncovered combinations, or None
+                 if the new row does not match the constraints
+        """
+        difference = 0
+        for _, value in self._get_rows_with(parameters):
+            index = new_index = 0
+            for parameter, multiplier in value.weights:
+                index += row[parameter] * multiplier
+                new_index += new_row[parameter] * multiplier
+            coverage = value.coverage
+            new_coverage = coverage[new_index]
+            if new_coverage == DISABLED:
+                return None
+            if index == new_index:
+                continue
+            if coverage[index] == 1:
+                difference += 1
+            if new_coverage == 0:
+                difference -= 1
+        return difference
 
     def uncover(self):
         """
@@ -153,14 +167,9 @@ class CombinationMatrix:
 
         :param row: one row from solution
         """
-        for key, value in self.hash_table.items():
-            val = []
-            for i in key:
-                val.append(row[i])
-
-            if not value.is_valid(val):
+        for value in self.hash_table.values():
+            if not value.is_valid_row(row):
                 return False
-
         return True
 
     def is_valid_combination(self, row, parameters):
@@ -170,16 +179,9 @@ class CombinationMatrix:
         :param row: one row from solution
         :param parameters: parameters from row
         """
-        for key, value in self.hash_table.items():
-            for parameter in parameters:
-                if parameter in key:
-                    val = []
-                    for i in key:
-                        val.append(row[i])
-
-                    if not value.is_valid(val):
-                        return False
-                    break
+        for _, value in self._get_rows_with(parameters):
+            if not value.is_valid_row(row):
+                return False
         return True
 
     def del_cell(self, parameters, combination):
@@ -1,12 +1,57 @@
-import itertools
+import array
+from collections.abc import MutableMapping
+
+#: Value stored in the coverage array for combinations which are disabled,
+#: that is, which do not match the constraints
+DISABLED = -1
+
+
+class CoverageTable(MutableMapping):
+    """
+    Dictionary-like view of the coverage of a Row object. Keys are the
+    combinations of values and values are the number of times each
+    combination is covered, or None if the combination is disabled.
+    """
+
+    def __init__(self, row):
+        self._row = row
+
+    def __getitem__(self, key):
+        value = self._row.coverage[self._row.get_index(key)]
+        return None if value == DISABLED else value
+
+    def __setitem__(self, key, value):
+        self._row.coverage[self._row.get_index(key)] = (
+            DISABLED if value is None else value
+        )
+
+    def __delitem__(self, key):
+        raise TypeError("Combinations can not be removed, but can be disabled")
+
+    def __iter__(self):
+        for index in range(len(self._row.coverage)):
+            yield self._row.get_combination(index)
+
+    def __len__(self):
+        return len(self._row.coverage)
+
+    def __eq__(self, other):
+        if isinstance(other, CoverageTable):
+            return (
+                self._row.sizes == other._row.sizes
+                and self._row.coverage == other._row.coverage
+            )
+        return super().__eq__(other)
 
 
 class CombinationRow:
     """
-    Row object store all combinations between two parameters into dictionary.
-    Keys in dictionary are values of combinations and values in dictionary are
-    information about coverage. Row object has information how many combinations
-    are uncovered and how many of them are covered more than ones.
+    Row object store all combinations between t parameters. Each combination
+    of values is identified by its index in mixed radix, in which each digit
+    is the value of one parameter, and its coverage is kept in an array of
+    integers at that index. The coverage is the number of times the
+    combination is covered, or DISABLED. Row object has information how many
+    combinations are uncovered and how many of them are covered more than ones.
     """
 
     def __init__(self, input_data, t_value, parameters):
@@ -16,16 +61,129 @@ class CombinationRow:
         :param parameters: the tuple of parameters whose combinations Row object represents
         """
 
-        self.hash_table = {}
+        self.parameters = tuple(parameters[:t_value])
+        #: number of values of each parameter
+        self.sizes = tuple(input_data[parameter] for parameter in self.parameters)
+        #: weight of the value of each parameter in the index of a combination
+        self.multipliers = [1] * t_value
+        for i in range(t_value - 1, 0, -1):
+            self.multipliers[i - 1] = self.multipliers[i] * self.sizes[i]
+        #: pairs of each parameter and the weight of its value
+        self.weights = tuple(zip(self.parameters, self.multipliers))
+        self._bounded_weights = tuple(
+            zip(self.parameters, self.sizes, self.multipliers)
+        )
+        size = self.multipliers[0] * self.sizes[0] if t_value else 1
+        self.coverage = array.array("i", bytes(size * array.array("i").itemsize))
         self.covered_more_than_ones = 0
-        self.uncovered = 0
-        array = []
-        "Creation of combinations"
-        for i in range(t_value):
-            array.append(list(range(input_data[parameters[i]])))
-        for i in itertools.product(*array):
+        self.uncovered = size
+
+    @property
+    def hash_table(self):
+        """
+        Coverage of all combinations, keyed by the combinations of values.
+
+        :rtype: :class:`CoverageTable`
+        """
+        return CoverageTable(self)
+
+    def get_index(self, key):
+        """
+        Index of one combination in the coverage array
+
+        :param key: combination of values
+        :return: index of the combination
+        :raises KeyError: when the combination is not valid for the parameters
+        """
+        if len(key) != len(self.sizes):
+            raise KeyError(key)
+        index = 0
+        for value, size, multiplier in zip(key, self.sizes, self.multipliers):
+            if not 0 <= value < size:
+                raise KeyError(key)
+            index += value * multiplier
+        return index
+
+    def get_row_index(self, row):
+        """
+        Index of the combination in a solution row
+
+        :param row: one row from solution
+        :return: index of the combination of the parameters of this Row
+        """
+        index = 0
+        for parameter, multiplier in self.weights:
+            index += row[parameter] * multiplier
+        return index
+
+    def is_valid_row(self, row):
+        """
+        Is the combination in a solution row match the constraints.
+
+        :param row: one row from solution, where values out of range
+                    (such as -1 for unpicked values) are not checked
+        """
+        index = 0
+        for parameter, size, multiplier in self._bounded_weights:
+            value = row[parameter]
+            if not 0 <= value < size:
+                return True
+            index += value * multiplier
+        return self.coverage[index] != DISABLED
+
+    def get_combination(self, index):
+        """
+        Combination of values at one index of the coverage array
+
+        :param index: index of the combination
+        :return: combination of values
+        """
+        combination = []
+        for multiplier in self.multipliers:
+            value, index = divmod(index, multiplier)
+            combination.append(value)
+        return tuple(combination)
+
+    def cover_index(self, index):
+        """
+        Cover one combination, given by its index, inside Row
+
+        :param index: index of the combination to be covered
+        :return: number of new covered combinations and number of new covered combinations more than ones
+        """
+
+        value = self.coverage[index]
+        if value == 0:
+            self.coverage[index] = 1
+            self.uncovered -= 1
+            return -1, 0
+        if value == DISABLED:
+            return 0, 0
+        self.coverage[index] = value + 1
+        if value == 1:
+            self.covered_more_than_ones += 1
+            return 0, 1
+        return 0, 0
+
+    def uncover_index(self, index):
+        """
+        Uncover one combination, given by its index, inside Row
+
+        :param index: index of the combination to be uncovered
+        :return: number of new covered combinations and number of new covered combinations more than ones
+        """
+
+        value = self.coverage[index]
+        if value <= 0:
+            return 0, 0
+        self.coverage[index] = value - 1
+        if value == 1:
             self.uncovered += 1
-            self.hash_table[i] = 0
+            return 1, 0
+        if value == 2:
+            self.covered_more_than_ones -= 1
+            return 0, -1
+        return 0, 0
 
     def cover_cell(self, key):
         """
@@ -35,20 +193,7 @@ class CombinationRow:
         :return: number of new covered combinations and number of new covered combinations more than ones
         """
 
-        old_uncovered = self.uncovered
-        old_covered_more_than_ones = self.covered_more_than_ones
-        value = self.hash_table[tuple(key)]
-        if value is not None:
-            if value == 0:
-                self.uncovered -= 1
-            elif value == 1:
-                self.covered_more_than_ones += 1
-            self.hash_table[tuple(key)] += 1
-
-        return (
-            self.uncovered - old_uncovered,
-            self.covered_more_than_ones - old_covered_more_than_ones,
-        )
+        return self.cover_index(self.get_index(key))
 
     def uncover_cell(self, key):
         """
@@ -58,32 +203,19 @@ class CombinationRow:
         :return: number of new covered combinations and number of new covered combinations more than ones
         """
 
-        old_uncovered = self.uncovered
-        old_covered_more_than_ones = self.covered_more_than_ones
-        value = self.hash_table[tuple(key)]
-        if value is not None and value > 0:
-            if value == 1:
-                self.uncovered += 1
-            elif value == 2:
-                self.covered_more_than_ones -= 1
-            self.hash_table[tuple(key)] -= 1
-
-        return (
-            self.uncovered - old_uncovered,
-            self.covered_more_than_ones - old_covered_more_than_ones,
-        )
+        return self.uncover_index(self.get_index(key))
 
     def completely_uncover(self):
         """
         Uncover all combinations inside Row
         """
 
-        self.uncovered = 0
+        disabled = self.coverage.count(DISABLED)
+        self.coverage = array.array(
+            "i", (DISABLED if value == DISABLED else 0 for value in self.coverage)
+        )
+        self.uncovered = len(self.coverage) - disabled
         self.covered_more_than_ones = 0
-        for key, value in self.hash_table.items():
-            if value is not None:
-                self.hash_table[key] = 0
-                self.uncovered += 1
 
     def del_cell(self, key):
         """
@@ -94,9 +226,9 @@ class CombinationRow:
         :return: number of new covered combinations
         """
 
-        key = tuple(key)
-        if self.hash_table[key] is not None:
-            self.hash_table[key] = None
+        index = self.get_index(key)
+        if self.coverage[index] != DISABLED:
+            self.coverage[index] = DISABLED
             self.uncovered -= 1
             return -1
         else:
@@ -109,22 +241,26 @@ class CombinationRow:
         :param key: combination to valid
         """
 
-        key = tuple(key)
-        if self.hash_table.get(key, 0) is None:
-            return False
-        else:
+        try:
+            return self.coverage[self.get_index(key)] != DISABLED
+        except KeyError:
             return True
 
+    def get_all_uncovered_indexes(self):
+        """
+        :return: list of the indexes of all uncovered combinations
+        """
+
+        if not self.uncovered:
+            return []
+        return [index for index, value in enumerate(self.coverage) if value == 0]
+
     def get_all_uncovered_combinations(self):
         """
         :return: list of all uncovered combination
         """
 
-        combinations = []
-        for key, value in self.hash_table.items():
-            if value == 0:
-                combinations.append(key)
-        return combinations
+        return [self.get_combination(_) for _ in self.get_all_uncovered_indexes()]
 
     def __eq__(self, other):
         return (
@@ -16,7 +16,7 @@ import logging
 import os
 import sys
 
-from avocado_varianter_cit.Cit import LOG, Cit
+from avocado_varianter_cit.Cit import LOG, Cit, compute_multi_start
 from avocado_varianter_cit.Parser import Parser
 
 from avocado.core import exit_codes, varianter
@@ -66,6 +66,68 @@ class VarianterCitCLI(CLI):
                 long_arg="--cit-order-of-combinations",
             )
 
+            help_msg = (
+                "Number of independent searches for the smallest set of "
+                "combinations, each one started from a different random "
+                "set. The smallest set found is used"
+            )
+            settings.register_option(
+                section=f"{name}.cit",
+                key="searches",
+                key_type=int,
+                parser=subparser,
+                help_msg=help_msg,
+                metavar="SEARCHES",
+                default=1,
+                long_arg="--cit-searches",
+            )
+
+            help_msg = (
+                "Number of processes running searches at the same time. "
+                "Defaults to the number of CPUs available on this machine"
+            )
+            settings.register_option(
+                section=f"{name}.cit",
+                key="processes",
+                key_type=int,
+                parser=subparser,
+                help_msg=help_msg,
+                metavar="NUMBER_OF_PROCESSES",
+                default=None,
+                long_arg="--cit-processes",
+            )
+
+            help_msg = (
+                "Time, in seconds, after which the searches are stopped and "
+                "the smallest set found so far is used"
+            )
+            settings.register_option(
+                section=f"{name}.cit",
+                key="time_budget",
+                key_type=float,
+                parser=subparser,
+                help_msg=help_msg,
+                metavar="SECONDS",
+                default=None,
+                long_arg="--cit-time-budget",
+            )
+
+            help_msg = (
+                "Seed of the random choices of the searches, so that the "
+                "same set of combinations is found each time (as long as "
+                "the searches are not stopped by the time budget)"
+            )
+            settings.register_option(
+                section=f"{name}.cit",
+                key="seed",
+                key_type=int,
+                parser=subparser,
+                help_msg=help_msg,
+                metavar="SEED",
+                default=None,
+                long_arg="--cit-seed",
+            )
+
     def run(self, config):
         if config.get("variants.debug"):
             LOG.setLevel(logging.DEBUG)
@@ -86,6 +148,16 @@ class VarianterCit(Varianter):
         if order and order > 6:
             LOG_UI.error("The order of combinations is bigger then 6")
             self.error_exit(config)
+        searches = config.get(f"{subcommand}.cit.searches")
+        if searches is None:
+            searches = 1
+        elif searches < 1:
+            LOG_UI.error("The number of searches must be at least 1")
+            self.error_exit(config)
+        processes = config.get(f"{subcommand}.cit.processes")
+        if processes is not None and processes < 1:
+            LOG_UI.error("The number of processes must be at least 1")
+            self.error_exit(config)
 
         section_key = f"{subcommand}.cit.parameter_file"
         cit_parameter_file = config.get(section_key)
@@ -110,8 +182,20 @@ class VarianterCit(Varianter):
 
         input_data = [len(parameter[1]) for parameter in parameters]
 
-        cit = Cit(input_data, order, constraints)
-        final_list = cit.compute()
+        time_budget = config.get(f"{subcommand}.cit.time_budget")
+        seed = config.get(f"{subcommand}.cit.seed")
+        if searches == 1 and time_budget is None:
+            final_list = Cit(input_data, order, constraints, seed).compute()
+        else:
+            final_list = compute_multi_start(
+                input_data,
+                order,
+                constraints,
+                searches,
+                processes,
+                time_budget,
+                seed,
+            )
         self.headers = [  # pylint: disable=W0201
             parameter[0] for parameter in parameters
         ]
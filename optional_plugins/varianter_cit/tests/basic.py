@@ -2,6 +2,7 @@ import glob
 import os
 import unittest
 
+from avocado.core import exit_codes
 from avocado.utils import process
 from selftests.utils import AVOCADO, BASEDIR, TestCaseTmpDir
 
@@ -24,6 +25,20 @@ class Basic(unittest.TestCase):
             with self.subTest(combination=lines[i]):
                 self.assertIn(b"green", lines[i])
 
+    def test_invalid_searches(self):
+        params_path = os.path.join(
+            BASEDIR, "examples", "varianter_cit", "test_params.cit"
+        )
+        for option in ("--cit-searches=-1", "--cit-searches=0", "--cit-processes=0"):
+            with self.subTest(option=option):
+                cmd_line = (
+                    f"{AVOCADO} variants {option} "
+                    f"--cit-parameter-file {params_path}"
+                )
+                result = process.run(cmd_line, ignore_status=True)
+                self.assertEqual(result.exit_status, exit_codes.AVOCADO_FAIL)
+                self.assertIn(b"must be at least 1", result.stderr)
+
 
 class Run(TestCaseTmpDir):
     def test(self):
@@ -1,8 +1,9 @@
 import random
+import time
 import unittest
 from copy import copy
 
-from avocado_varianter_cit.Cit import Cit
+from avocado_varianter_cit.Cit import Cit, compute_multi_start
 from avocado_varianter_cit.CombinationMatrix import CombinationMatrix
 from avocado_varianter_cit.Solver import Solver
 
@@ -206,3 +207,77 @@ class CitTests(unittest.TestCase):
         row[parameters[0]] = final_matrix[row_index][parameters[0]]
         row[parameters[1]] = final_matrix[row_index][parameters[1]]
         self.assertEqual(final_matrix[row_index], row, "Different value was changed")
+
+
+class CitSearches(unittest.TestCase):
+    def setUp(self):
+        self.parameters = [3, 3, 3, 3, 2]
+        self.constraints = {
+            ((0, 0), (2, 0)),
+            ((0, 1), (1, 1), (2, 0)),
+            ((0, 2), (3, 2)),
+        }
+        self.t_value = 2
+
+    def assert_solution(self, matrix):
+        cit = Cit(self.parameters, self.t_value, self.constraints)
+        for row in matrix:
+            self.assertTrue(cit.combination_matrix.is_valid_solution(row))
+            cit.combination_matrix.cover_solution_row(row)
+        self.assertEqual(0, cit.combination_matrix.total_uncovered)
+
+    def test_seed(self):
+        matrix = Cit(self.parameters, self.t_value, self.constraints, 1).compute()
+        self.assert_solution(matrix)
+        self.assertEqual(
+            matrix, Cit(self.parameters, self.t_value, self.constraints, 1).compute()
+        )
+
+    def test_deadline(self):
+        matrix = Cit(self.parameters, self.t_value, self.constraints, 1).compute(
+            time.monotonic()
+        )
+        self.assert_solution(matrix)
+        # no smaller solution is searched for
+        cit = Cit(self.parameters, self.t_value, self.constraints, 1)
+        self.assertEqual(matrix, cit.final_matrix_init())
+
+    def test_compute_multi_start(self):
+        sequential = compute_multi_start(
+            self.parameters, self.t_value, self.constraints, 3, 1, seed=1
+        )
+        self.assert_solution(sequential)
+        parallel = compute_multi_start(
+            self.parameters, self.t_value, self.constraints, 3, 2, seed=1
+        )
+        self.assertEqual(sequential, parallel)
+        single = compute_multi_start(
+            self.parameters, self.t_value, self.constraints, 1, seed=1
+        )
+        self.assertLessEqual(len(sequential), len(single))
+        # out of time, only the first search is run
+        self.assert_solution(
+            compute_multi_start(
+                self.parameters, self.t_value, self.constraints, 3, 2, 0, seed=1
+            )
+        )
+
+    def test_compute_multi_start_progress(self):
+        with self.assertLogs("avocado.app.Cit", "INFO") as logs:
+            compute_multi_start(
+                self.parameters, self.t_value, self.constraints, 3, 2, seed=1
+            )
+        self.assertEqual(len(logs.records), 3)
+        self.assertEqual(sorted(record.args[2] for record in logs.records), [1, 2, 3])
+
+    def test_compute_multi_start_no_searches(self):
+        for searches in (0, -1):
+            with self.subTest(searches=searches):
+                with self.assertRaises(ValueError):
+                    compute_multi_start(
+                        self.parameters, self.t_value, self.constraints, searches
+                    )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -275,6 +275,34 @@ class CombinationMatrixTest(unittest.TestCase):
                     combination_row_equals(value, self.excepted_hash_table[key])
                 )
 
+    def test_get_uncovered_difference(self):
+        self.matrix.cover_solution_row([1, 0, 2, 3])
+        self.matrix.cover_solution_row([0, 1, 2, 3])
+        self.matrix.del_cell((0, 1), (2, 2))
+        solution_row = [1, 0, 2, 3]
+        for parameters, new_row in (
+            ((0,), [0, 0, 2, 3]),
+            ((3,), [1, 0, 2, 0]),
+            ((0, 3), [2, 0, 2, 1]),
+            ((1, 2), [1, 1, 2, 3]),
+        ):
+            with self.subTest(parameters=parameters, new_row=new_row):
+                total_uncovered = self.matrix.total_uncovered
+                difference = self.matrix.get_uncovered_difference(
+                    solution_row, new_row, parameters
+                )
+                self.assertEqual(self.matrix.total_uncovered, total_uncovered)
+                self.matrix.uncover_combination(solution_row, parameters)
+                self.matrix.cover_combination(new_row, parameters)
+                self.assertEqual(
+                    self.matrix.total_uncovered, total_uncovered + difference
+                )
+                self.matrix.uncover_combination(new_row, parameters)
+                self.matrix.cover_combination(solution_row, parameters)
+        self.assertIsNone(
+            self.matrix.get_uncovered_difference(solution_row, [2, 2, 2, 3], (0, 1))
+        )
+
     def test_uncover(self):
         solution_row = [1, 0, 2, 3]
         self.matrix.cover_solution_row(solution_row)
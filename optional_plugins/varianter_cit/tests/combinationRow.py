@@ -256,6 +256,25 @@ class CombinationRowTest(unittest.TestCase):
             len(ex),
         )
 
+    # Tests of the indexes of combinations
+
+    def test_get_index(self):
+        for index, combination in enumerate(self.row.hash_table):
+            with self.subTest(combination=combination):
+                self.assertEqual(self.row.get_index(combination), index)
+                self.assertEqual(self.row.get_combination(index), combination)
+                self.assertEqual(
+                    self.row.get_row_index([2, combination[0], 0, combination[1]]),
+                    index,
+                )
+        with self.assertRaises(KeyError):
+            self.row.get_index((3, 0))
+
+    def test_get_all_uncovered_indexes(self):
+        self.row.hash_table[(0, 0)] = None
+        self.row.hash_table[(0, 1)] = 1
+        self.assertEqual(self.row.get_all_uncovered_indexes(), list(range(2, 12)))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,362 @@
+# This program is free software; you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation; either version 2 of the License, or
+# (at your option) any later version.
+#
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.
+#
+# See LICENSE for more details.
+#
+# Copyright: Red Hat Inc. 2026
+
+"""Persistent cache of the multiplex trees built from YAML files"""
+
+import base64
+import collections
+import contextlib
+import datetime
+import glob
+import hashlib
+import json
+import logging
+import os
+import tempfile
+
+from avocado_varianter_yaml_to_mux import mux
+
+from avocado.core.safeloader.cache import get_file_stamp, is_file_stamp_current
+from avocado.core.settings import settings
+from avocado.core.tree import TreeEnvironment
+from avocado.core.version import VERSION
+
+LOG = logging.getLogger(__name__)
+
+#: Name of the directory, within the "cache" directory of the data
+#: directory, where the multiplex trees are kept
+MUX_TREE_CACHE_DIRNAME = "yaml_to_mux"
+
+#: Functions that restore the values saved as JSON objects, by the name
+#: of their types (see :func:`_dump_value`)
+_VALUE_LOADERS = {
+    "dict": lambda items: {_load_value(k): _load_value(v) for k, v in items},
+    "OrderedDict": lambda items: collections.OrderedDict(
+        (_load_value(k), _load_value(v)) for k, v in items
+    ),
+    "tuple": lambda items: tuple(_load_value(item) for item in items),
+    "set": lambda items: {_load_value(item) for item in items},
+    "frozenset": lambda items: frozenset(_load_value(item) for item in items),
+    "bytes": base64.b64decode,
+    "date": datetime.date.fromisoformat,
+    "datetime": datetime.datetime.fromisoformat,
+    "complex": lambda parts: complex(*parts),
+}
+
+
+def _dump_value(value):
+    """Turns a value of a node into something serializable to JSON.
+
+    Values of types other than the ones native to JSON are saved as
+    objects with a single item, named after their type, so that they're
+    restored with the same type.  Only the types that YAML files and
+    injected values produce are supported.
+
+    :raises TypeError: if the value, or one within it, is of a type
+                       that's not supported
+    """
+    value_type = type(value)
+    if value is None or value_type in (bool, int, float, str):
+        return value
+    if value_type is list:
+        return [_dump_value(item) for item in value]
+    if value_type in (dict, collections.OrderedDict):
+        return {
+            value_type.__name__: [
+                [_dump_value(key), _dump_value(item)] for key, item in value.items()
+            ]
+        }
+    if value_type in (tuple, set, frozenset):
+        return {value_type.__name__: [_dump_value(item) for item in value]}
+    if value_type is bytes:
+        return {"bytes": base64.b64encode(value).decode("ascii")}
+    if value_type in (datetime.date, datetime.datetime):
+        return {value_type.__name__: value.isoformat()}
+    if value_type is complex:
+        return {"complex": [value.real, value.imag]}
+    raise TypeError(f"values of type {value_type.__name__} can not be cached")
+
+
+def _load_value(data):
+    """Restores a value saved by :func:`_dump_value`."""
+    if isinstance(data, list):
+        return [_load_value(item) for item in data]
+    if isinstance(data, dict):
+        ((type_name, content),) = data.items()
+        return _VALUE_LOADERS[type_name](content)
+    return data
+
+
+def _dump_tree(root):
+    """Turns a multiplex tree into a list of nodes serializable to JSON.
+
+    The nodes are listed in preorder, and refer to their parents, and
+    to the nodes where the values of their environments come from, by
+    their positions in the list.
+
+    :param root: the root of the tree, with the environments of all
+                 its nodes already computed
+    :type root: :class:`avocado_varianter_yaml_to_mux.mux.MuxTreeNode`
+    :raises TypeError: if a value in the tree can not be saved
+    :rtype: list of dict
+    """
+    nodes = list(root.iter_children_preorder())
+    positions = {id(node): position for position, node in enumerate(nodes)}
+    dumped = []
+    for node in nodes:
+        environment = node.environment
+        origin = []
+        for key, origin_node in environment.origin.items():
+            if id(origin_node) not in positions:
+                raise TypeError(f"value {key} comes from a node out of the tree")
+            origin.append([_dump_value(key), positions[id(origin_node)]])
+        dumped.append(
+            {
+                "name": node.name,
+                "parent": positions.get(id(node.parent)),
+                "value": _dump_value(node.value),
+                "filters": [list(node.filters[0]), list(node.filters[1])],
+                "ctrl": [[ctrl.code, _dump_value(ctrl.value)] for ctrl in node.ctrl],
+                "multiplex": node.multiplex,
+                "environment": {
+                    "values": _dump_value(dict(environment)),
+                    "origin": origin,
+                    "filter_only": sorted(environment.filter_only),
+                    "filter_out": sorted(environment.filter_out),
+                },
+            }
+        )
+    return dumped
+
+
+def _load_tree(dumped):
+    """Restores a multiplex tree saved by :func:`_dump_tree`.
+
+    :returns: the root of the tree
+    :rtype: :class:`avocado_varianter_yaml_to_mux.mux.MuxTreeNode`
+    """
+    nodes = []
+    for data in dumped:
+        node = mux.MuxTreeNode(data["name"], _load_value(data["value"]))
+        node.filters = tuple(data["filters"])
+        node.ctrl = [
+            mux.Control(code, _load_value(value)) for code, value in data["ctrl"]
+        ]
+        node.multiplex = data["multiplex"]
+        if data["parent"] is not None:
+            node.parent = nodes[data["parent"]]
+            node.parent.children.append(node)
+        nodes.append(node)
+    for node, data in zip(nodes, dumped):
+        environment = TreeEnvironment()
+        environment.update(_load_value(data["environment"]["values"]))
+        environment.origin = {
+            _load_value(key): nodes[position]
+            for key, position in data["environment"]["origin"]
+        }
+        environment.filter_only.update(data["environment"]["filter_only"])
+        environment.filter_out.update(data["environment"]["filter_out"])
+        node._environment = environment  # pylint: disable=W0212
+    return nodes[0]
+
+
+class MuxTreeCache:
+    """Persistent cache of the multiplex trees built from YAML files.
+
+    Building a tree means parsing the YAML files (and the ones they
+    include), merging their trees, injecting values and applying the
+    filters, and then generating the ids of all its variants.  This
+    keeps the resulting tree, with the environments of its nodes already
+    computed, and the ids of its variants, along with the stamps (path,
+    modification time, size and content hash) of all the YAML files read
+    to build it.  Entries are plain JSON, so that loading them never runs
+    any code.
+    An entry is valid as long as all those files are unchanged, and the
+    Avocado version matches.
+
+    Entries are keyed by the options used to build the tree, such as the
+    YAML files given, the filters and the injected values.
+    """
+
+    #: The stamps of the YAML files read while a tree is being built, if
+    #: they are being recorded (see :meth:`record_files`)
+    _stamps = None
+
+    def __init__(self, path=None):
+        """Initializes a new MuxTreeCache
+
+        :param path: the path of the cache directory.  If not given, it's
+                     placed within the "cache" directory of the data
+                     directory (set in "datadir.paths.data_dir"), apart
+                     from the assets.  If that's not set, the cache is
+                     disabled
+        :type path: str
+        """
+        if path is None:
+            data_dir = settings.as_dict().get("datadir.paths.data_dir")
+            if data_dir:
+                path = os.path.join(
+                    os.path.expanduser(data_dir), "cache", MUX_TREE_CACHE_DIRNAME
+                )
+        self.path = path
+
+    @classmethod
+    @contextlib.contextmanager
+    def record_files(cls):
+        """Records the stamps of the YAML files read within the context.
+
+        :returns: the list the stamps are added to
+        :rtype: list
+        """
+        previous = cls._stamps
+        cls._stamps = stamps = []
+        try:
+            yield stamps
+        finally:
+            cls._stamps = previous
+
+    @classmethod
+    def file_read(cls, path):
+        """Takes note of a YAML file about to be read, if recording.
+
+        :param path: path of the YAML file
+        :type path: str
+        """
+        if cls._stamps is None:
+            return
+        try:
+            cls._stamps.append(get_file_stamp(path))
+        except OSError:
+            # reading it will fail, and so will building the tree
+            pass
+
+    def _get_entry_path(self, key):
+        content = json.dumps([VERSION, os.getcwd(), key])
+        name = hashlib.sha1(content.encode("utf-8")).hexdigest()
+        return os.path.join(self.path, f"{name}.json")
+
+    @staticmethod
+    def _load(entry_path):
+        try:
+            with open(entry_path, "r", encoding="utf-8") as entry_file:
+                entry = json.load(entry_file)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(entry, dict) or entry.get("version") != VERSION:
+            return None
+        return entry
+
+    @staticmethod
+    def _load_entry_tree(entry):
+        try:
+            return _load_tree(entry["nodes"])
+        except (
+            KeyError,
+            IndexError,
+            TypeError,
+            ValueError,
+            AttributeError,
+            RecursionError,
+        ):
+            # corrupted entry
+            return None
+
+    def get_all(self):
+        """Returns all cached entries, valid or not.
+
+        :rtype: list of dict
+        """
+        if self.path is None:
+            return []
+        entries = []
+        for entry_path in glob.glob(os.path.join(self.path, "*.json")):
+            entry = self._load(entry_path)
+            if entry is None:
+                continue
+            entry["tree"] = self._load_entry_tree(entry)
+            if entry["tree"] is not None:
+                entries.append(entry)
+        return entries
+
+    def clear(self):
+        """Removes all cached entries."""
+        if self.path is None:
+            return
+        for entry_path in glob.glob(os.path.join(self.path, "*.json")):
+            try:
+                os.remove(entry_path)
+            except FileNotFoundError:
+                pass
+
+    def get(self, key):
+        """Returns a cached multiplex tree and the ids of its variants.
+
+        :param key: the options used to build the tree, which must be
+                    serializable to JSON
+        :returns: the root of the tree and the ids of its variants, or
+                  (None, None) if not cached or stale
+        :rtype: tuple
+        """
+        if self.path is None:
+            return None, None
+        entry = self._load(self._get_entry_path(key))
+        if entry is None:
+            return None, None
+        if not all(is_file_stamp_current(stamp) for stamp in entry["files"]):
+            return None, None
+        root = self._load_entry_tree(entry)
+        if root is None:
+            return None, None
+        return root, entry.get("variant_ids")
+
+    def set(self, key, tree, stamps, variant_ids):
+        """Saves a multiplex tree.
+
+        The environments of all the nodes are computed before the tree
+        is saved, so that they're readily available when it's loaded.
+
+        :param key: the options used to build the tree, which must be
+                    serializable to JSON
+        :param tree: the root of the tree
+        :type tree: :class:`avocado_varianter_yaml_to_mux.mux.MuxTreeNode`
+        :param stamps: the stamps of all the YAML files read to build the
+                       tree, taken before they were read (see
+                       :meth:`record_files`)
+        :type stamps: list
+        :param variant_ids: the ids of the variants of the tree
+        :type variant_ids: list of str
+        """
+        if self.path is None:
+            return
+        entry_file = None
+        try:
+            entry = {
+                "version": VERSION,
+                "key": key,
+                "files": stamps,
+                "nodes": _dump_tree(tree),
+                "variant_ids": variant_ids,
+            }
+            os.makedirs(self.path, exist_ok=True)
+            # writes are atomic, so concurrent readers never see a
+            # partially written entry
+            with tempfile.NamedTemporaryFile(
+                "w", encoding="utf-8", dir=self.path, delete=False
+            ) as entry_file:
+                json.dump(entry, entry_file)
+            os.replace(entry_file.name, self._get_entry_path(key))
+        except (OSError, TypeError, ValueError, RecursionError) as details:
+            LOG.debug("Could not save the multiplex tree cache: %s", details)
+            if entry_file is not None:
+                with contextlib.suppress(OSError):
+                    os.remove(entry_file.name)
@@ -17,6 +17,7 @@
 This file contains mux-enabled implementations of parts useful for creating
 a custom Varianter plugin.
 """
+
 #
 # Multiplex-enabled tree objects
 #
@@ -70,11 +71,85 @@ class MuxTree:
         """
         Iterates through variants and process the internal filters
 
+        The filters are evaluated while the variants are built, pool by
+        pool, so that all the variants sharing a combination that can
+        not be part of a valid variant are skipped at once.
+
         :yield valid variants
         """
-        for variant in self.iter_variants():
-            if self._valid_variant(variant):
-                yield variant
+        pools = [self._get_pool_choices(pool) for pool in self.pools]
+        # the filter-only filters that the choices of the pools from each
+        # position onwards may still add to a variant
+        future_filter_only = [set() for _ in range(len(pools) + 1)]
+        for i in range(len(pools) - 1, -1, -1):
+            future_filter_only[i] = future_filter_only[i + 1].union(
+                *(choice[2] for choice in pools[i])
+            )
+        if not pools:
+            if self._valid_variant([]):
+                yield []
+            return
+        variant = []
+        paths = []
+        # iterator over the choices of each pool in the combination, with
+        # the size of the combination and its filters before the choice
+        stack = [(iter(pools[0]), 0, frozenset(), frozenset())]
+        while stack:
+            choices, size, filter_only, filter_out = stack[-1]
+            for nodes, node_paths, choice_only, choice_out in choices:
+                del variant[size:]
+                del paths[size:]
+                variant.extend(nodes)
+                paths.extend(node_paths)
+                combination_only = filter_only.union(choice_only)
+                combination_out = filter_out.union(choice_out)
+                if self._valid_combination(
+                    paths,
+                    combination_only,
+                    combination_out,
+                    future_filter_only[len(stack)],
+                ):
+                    break
+            else:
+                stack.pop()
+                continue
+            if len(stack) < len(pools):
+                stack.append(
+                    (
+                        iter(pools[len(stack)]),
+                        len(variant),
+                        combination_only,
+                        combination_out,
+                    )
+                )
+            elif self._valid_variant(variant):
+                yield list(variant)
+
+    @staticmethod
+    def _get_pool_choices(pool):
+        """
+        Get the choices of a pool, along with what's needed to evaluate
+        the filters on them
+
+        :return: list of (nodes, paths of the nodes, filter-only filters,
+                 filter-out filters) tuples
+        """
+        if isinstance(pool, list):
+            # Don't process 2nd level filters in non-root pools
+            variants = itertools.chain(*(_.iter_variants() for _ in pool))
+        else:
+            variants = [[pool]]
+        choices = []
+        for nodes in variants:
+            filter_only = set()
+            filter_out = set()
+            for node in nodes:
+                filter_only.update(node.environment.filter_only)
+                filter_out.update(node.environment.filter_out)
+            choices.append(
+                (nodes, [node.path + "/" for node in nodes], filter_only, filter_out)
+            )
+        return choices
 
     def iter_variants(self):
         """
@@ -97,7 +172,75 @@ class MuxTree:
                 return
 
     @staticmethod
-    def _valid_variant(variant):
+    def _get_filter_only_parents(filter_only):
+        return [str(_).rsplit("/", 2)[0] + "/" for _ in filter_only if _]
+
+    @staticmethod
+    def _is_filtered_only(path, filter_only, filter_only_parents):
+        """
+        Check whether a node is removed by the filter-only filters
+
+        :param path: path of the node, with a trailing "/"
+        :param filter_only: filter-only filters
+        :type filter_only: tuple
+        :param filter_only_parents: paths of the parents of the filters
+        :type filter_only_parents: list
+        """
+        keep = 0
+        remove = 0
+        ppath = path.rsplit("/", 2)[0] + "/"
+        for i in range(len(filter_only)):
+            level = filter_only[i].count("/")
+            if level < max(keep, remove):
+                continue
+            if ppath.startswith(filter_only_parents[i]):
+                if path.startswith(filter_only[i]):
+                    keep = level
+                else:
+                    remove = level
+        return remove > keep
+
+    @classmethod
+    def _valid_combination(cls, paths, filter_only, filter_out, future_filter_only):
+        """
+        Check whether a combination of the first pools can be part of a
+        valid variant
+
+        Filter-out filters can only remove more nodes as more pools are
+        combined, so a node filtered out by them invalidates all of the
+        variants with it.  A node removed by the filter-only filters does
+        the same, unless a filter-only filter that may still be added
+        would keep it.
+
+        :param paths: paths of the nodes of the combination, with a
+                      trailing "/"
+        :param filter_only: filter-only filters of the combination
+        :param filter_out: filter-out filters of the combination
+        :param future_filter_only: filter-only filters that may be added
+                                   by the remaining pools
+        :return: whether the combination can be part of a valid variant
+        """
+        for out in filter_out:
+            for path in paths:
+                if path.startswith(out):
+                    return False
+        if not filter_only:
+            return True
+        filter_only = tuple(filter_only)
+        filter_only_parents = cls._get_filter_only_parents(filter_only)
+        for path in paths:
+            if not cls._is_filtered_only(path, filter_only, filter_only_parents):
+                continue
+            ppath = path.rsplit("/", 2)[0] + "/"
+            if not any(
+                path.startswith(_) and ppath.startswith(_.rsplit("/", 2)[0] + "/")
+                for _ in future_filter_only
+            ):
+                return False
+        return True
+
+    @classmethod
+    def _valid_variant(cls, variant):
         """
         Check the variant for validity of internal filters
 
@@ -112,7 +255,7 @@ class MuxTree:
             return True
         filter_only = tuple(_filter_only)
         filter_out = tuple(_filter_out)
-        filter_only_parents = [str(_).rsplit("/", 2)[0] + "/" for _ in filter_only if _]
+        filter_only_parents = cls._get_filter_only_parents(filter_only)
 
         for out in filter_out:
             for node in variant:
@@ -120,20 +263,8 @@ class MuxTree:
                 if path.startswith(out):
                     return False
         for node in variant:
-            keep = 0
-            remove = 0
             path = node.path + "/"
-            ppath = path.rsplit("/", 2)[0] + "/"
-            for i in range(len(filter_only)):
-                level = filter_only[i].count("/")
-                if level < max(keep, remove):
-                    continue
-                if ppath.startswith(filter_only_parents[i]):
-                    if path.startswith(filter_only[i]):
-                        keep = level
-                    else:
-                        remove = level
-            if remove > keep:
+            if cls._is_filtered_only(path, filter_only, filter_only_parents):
                 return False
         return True
 
@@ -150,19 +281,25 @@ class MuxPlugin:
     paths = None
     variant_ids = []
 
-    def initialize_mux(self, root, paths):
+    def initialize_mux(self, root, paths, variant_ids=None):
         """
         Initialize the basic values
 
+        :param variant_ids: the ids of the variants of the tree, if already
+                            known (such as when the tree comes from a
+                            cache), otherwise they're generated
         :note: We can't use __init__ as this object is intended to be used
                via dispatcher with no __init__ arguments.
         """
         self.root = root
         self.paths = paths
         if self.root is not None:
-            self.variant_ids = [
-                varianter.generate_variant_id(variant) for variant in MuxTree(self.root)
-            ]
+            if variant_ids is None:
+                variant_ids = [
+                    varianter.generate_variant_id(variant)
+                    for variant in MuxTree(self.root)
+                ]
+            self.variant_ids = variant_ids
             self.variants = MuxTree(self.root)
 
     def __iter__(self):
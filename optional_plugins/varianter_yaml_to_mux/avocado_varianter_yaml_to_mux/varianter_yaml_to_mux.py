@@ -22,10 +22,11 @@ import sys
 
 import yaml
 from avocado_varianter_yaml_to_mux import mux  # pylint: disable=W0406
+from avocado_varianter_yaml_to_mux.cache import MUX_TREE_CACHE_DIRNAME, MuxTreeCache
 
-from avocado.core import exit_codes
+from avocado.core import exit_codes, output
 from avocado.core.output import LOG_UI
-from avocado.core.plugin_interfaces import CLI, Init, Varianter
+from avocado.core.plugin_interfaces import CLI, Cache, Init, Varianter
 from avocado.core.settings import settings
 from avocado.utils import astring
 
@@ -302,6 +303,7 @@ def _create_from_yaml(path):
         _BaseLoader.using = using
 
     # Load the tree
+    MuxTreeCache.file_read(path)
     with open(path, encoding="utf-8") as stream:
         loaded_tree = yaml.load(stream, Loader)  # nosec
         if loaded_tree is None:
@@ -403,6 +405,20 @@ class YamlToMuxInit(Init):
             key_type=list,
         )
 
+        help_msg = (
+            "Whether the multiplex trees built from YAML files are kept in "
+            "a cache, and reused while those files (and the ones they "
+            "include) are unchanged, and the same filters and injected "
+            "values are used."
+        )
+        settings.register_option(
+            section=self.name,
+            key="cache",
+            key_type=bool,
+            default=True,
+            help_msg=help_msg,
+        )
+
 
 class YamlToMuxCLI(CLI):
     """
@@ -473,6 +489,34 @@ class YamlToMuxCLI(CLI):
         """
 
 
+class YamlToMuxCache(Cache):
+    """
+    Lists and clears the cache of multiplex trees built from YAML files
+    """
+
+    name = "yaml_to_mux"
+    description = "Provides the cache entries of multiplex trees built from YAML files"
+
+    def list(self):
+        matrix = [
+            [
+                ", ".join(entry["key"][0]),
+                len(entry["files"]),
+                len(entry["tree"].get_leaves()),
+            ]
+            for entry in sorted(MuxTreeCache().get_all(), key=lambda e: e["key"][0])
+        ]
+        header = (
+            output.TERM_SUPPORT.header_str("YAML files"),
+            output.TERM_SUPPORT.header_str("Files read"),
+            output.TERM_SUPPORT.header_str("Leaves"),
+        )
+        return astring.tabular_output(matrix, header=header, strip=True)
+
+    def clear(self):
+        MuxTreeCache().clear()
+
+
 class YamlToMux(mux.MuxPlugin, Varianter):
     """
     Processes the mux options into varianter plugin
@@ -481,7 +525,44 @@ class YamlToMux(mux.MuxPlugin, Varianter):
     name = "yaml_to_mux"
     description = "Multiplexer plugin to parse yaml files to params"
 
+    @staticmethod
+    def _get_cache(config):
+        """Returns the cache of multiplex trees, if enabled in the config."""
+        if not config.get("yaml_to_mux.cache"):
+            return None
+        data_dir = config.get("datadir.paths.data_dir")
+        if not data_dir:
+            return None
+        return MuxTreeCache(
+            os.path.join(os.path.expanduser(data_dir), "cache", MUX_TREE_CACHE_DIRNAME)
+        )
+
     def initialize(self, config):
+        paths = config.get("yaml_to_mux.parameter_paths")
+        tree_cache = None
+        if config.get("yaml_to_mux.files"):
+            tree_cache = self._get_cache(config)
+        if tree_cache is None:
+            data = self._create_tree(config)
+            if data is not None:
+                self.initialize_mux(data, paths)
+            return
+        key = [
+            config.get(f"yaml_to_mux.{option}")
+            for option in ("files", "inject", "filter_only", "filter_out")
+        ]
+        data, variant_ids = tree_cache.get(key)
+        if data is not None:
+            self.initialize_mux(data, paths, variant_ids)
+            return
+        with MuxTreeCache.record_files() as stamps:
+            data = self._create_tree(config)
+        self.initialize_mux(data, paths)
+        tree_cache.set(key, data, stamps, self.variant_ids)
+
+    @staticmethod
+    def _create_tree(config):
+        """Creates the multiplex tree from the YAML files and options."""
         subcommand = config.get("subcommand")
         data = None
 
@@ -519,5 +600,4 @@ class YamlToMux(mux.MuxPlugin, Varianter):
             mux_filter_only = config.get("yaml_to_mux.filter_only")
             mux_filter_out = config.get("yaml_to_mux.filter_out")
             data = mux.apply_filters(data, mux_filter_only, mux_filter_out)
-            paths = config.get("yaml_to_mux.parameter_paths")
-            self.initialize_mux(data, paths)
+        return data
@@ -60,5 +60,8 @@ setup(
         "avocado.plugins.varianter": [
             "yaml_to_mux = avocado_varianter_yaml_to_mux.varianter_yaml_to_mux:YamlToMux"
         ],
+        "avocado.plugins.cache": [
+            "yaml_to_mux = avocado_varianter_yaml_to_mux.varianter_yaml_to_mux:YamlToMuxCache"
+        ],
     },
 )
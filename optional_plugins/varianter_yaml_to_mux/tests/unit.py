@@ -3,13 +3,16 @@ import copy
 import itertools
 import os
 import pickle
-import unittest
+import shutil
+import tempfile
+import unittest.mock
 
 import avocado_varianter_yaml_to_mux.varianter_yaml_to_mux as yaml_to_mux
 import yaml
 from avocado_varianter_yaml_to_mux.varianter_yaml_to_mux import mux
 
 from avocado.core import parameters, tree
+from avocado.core.settings import settings
 from avocado.utils import astring
 
 BASEDIR = os.path.dirname(os.path.abspath(__file__))
@@ -631,6 +634,31 @@ class TestInternalFilters(unittest.TestCase):
         # First we evaluate filter-out and then filter-only
         self.assertFalse(self.check_scenario(("foo", ["/foo"], ["/foo"])))
 
+    def test_pruned_variants(self):
+        root = mux.MuxTreeNode()
+        # keep only the first choice of the first domain, unless the last
+        # choice of the second domain is used, as it keeps the others too
+        root.filters = [["/domain_0/choice_0"], ["/domain_2/choice_1"]]
+        for index in range(3):
+            domain = mux.MuxTreeNode(f"domain_{index}")
+            domain.multiplex = True
+            root.add_child(domain)
+            for choice in range(3):
+                domain.add_child(mux.MuxTreeNode(f"choice_{choice}"))
+        root.children[1].children[2].filters = [
+            ["/domain_0/choice_1", "/domain_0/choice_2"],
+            [],
+        ]
+        mux_tree = mux.MuxTree(root)
+        exp = [
+            variant
+            for variant in mux_tree.iter_variants()
+            if mux.MuxTree._valid_variant(variant)  # pylint: disable=W0212
+        ]
+        act = list(mux_tree)
+        self.assertEqual(act, exp)
+        self.assertEqual(len(act), 2 * 2 + 3 * 2)
+
 
 class TestPathParent(unittest.TestCase):
     def test_empty_string(self):
@@ -691,6 +719,115 @@ class TestCreateFromYaml(unittest.TestCase):
         self.assertEqual(node.path, "/foo")
 
 
+class TestMuxTreeCache(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory(prefix="avocado_yaml_to_mux_")
+        data_dir = os.path.join(BASEDIR, "tests", ".data")
+        # the file and the ones it includes
+        for name in (
+            "mux-selftest-advanced.yaml",
+            "mux-selftest.yaml",
+            "mux-šelftest-distro.yaml",
+        ):
+            shutil.copy(os.path.join(data_dir, name), self.tmpdir.name)
+        self.yaml = os.path.join(self.tmpdir.name, "mux-selftest-advanced.yaml")
+        self.config = settings.as_dict()
+        self.config.update(
+            {
+                "datadir.paths.data_dir": self.tmpdir.name,
+                "yaml_to_mux.cache": True,
+                "yaml_to_mux.files": [self.yaml],
+                "yaml_to_mux.inject": ["/run/hw:injected:1"],
+                "yaml_to_mux.filter_only": [],
+                "yaml_to_mux.filter_out": ["/run/švirt/distro/šmint"],
+                "yaml_to_mux.parameter_paths": ["/run/*"],
+            }
+        )
+
+    def _initialize(self, config):
+        plugin = yaml_to_mux.YamlToMux()
+        plugin.initialize(config)
+        return plugin
+
+    def _check_same(self, cached, fresh):
+        self.assertEqual(cached.root, fresh.root)
+        self.assertEqual(cached.variant_ids, fresh.variant_ids)
+        self.assertEqual(
+            [[(n.path, n.environment) for n in v] for v in cached.variants],
+            [[(n.path, n.environment) for n in v] for v in fresh.variants],
+        )
+
+    def test_cached(self):
+        fresh = self._initialize(dict(self.config, **{"yaml_to_mux.cache": False}))
+        with unittest.mock.patch.object(
+            yaml_to_mux, "create_from_yaml", wraps=yaml_to_mux.create_from_yaml
+        ) as create_from_yaml:
+            self._check_same(self._initialize(self.config), fresh)
+            self._check_same(self._initialize(self.config), fresh)
+        create_from_yaml.assert_called_once()
+        with unittest.mock.patch(
+            "avocado.core.varianter.generate_variant_id"
+        ) as generate_variant_id:
+            self._check_same(self._initialize(self.config), fresh)
+        generate_variant_id.assert_not_called()
+        self.assertIn("injected", fresh.root.get_node("/run/hw").value)
+        self.assertNotIn("šmint", str(fresh.variant_ids))
+
+    def test_changed(self):
+        self._initialize(self.config)
+        # an included file is changed
+        distro = os.path.join(self.tmpdir.name, "mux-šelftest-distro.yaml")
+        with open(distro, "a", encoding="utf-8") as distro_file:
+            distro_file.write("    new_key: new_value\n")
+        fresh = self._initialize(dict(self.config, **{"yaml_to_mux.cache": False}))
+        cached = self._initialize(self.config)
+        self._check_same(cached, fresh)
+        self.assertTrue(
+            any(
+                "new_key" in node.value for node in cached.root.iter_children_preorder()
+            )
+        )
+        # different options
+        config = dict(self.config, **{"yaml_to_mux.filter_out": []})
+        fresh = self._initialize(dict(config, **{"yaml_to_mux.cache": False}))
+        self._check_same(self._initialize(config), fresh)
+        self.assertIn("šmint", str(fresh.variant_ids))
+
+    def test_values(self):
+        injected = [
+            "/run/hw:tuple:(1, 'a')",
+            "/run/hw:set:{1, 2}",
+            "/run/hw:bytes:b'\\x00\\xff'",
+            "/run/hw:complex:1+2j",
+            "/run/hw:dict:{1: [None, 1.5, True]}",
+        ]
+        config = dict(self.config, **{"yaml_to_mux.inject": injected})
+        fresh = self._initialize(dict(config, **{"yaml_to_mux.cache": False}))
+        self._initialize(config)
+        with unittest.mock.patch.object(
+            yaml_to_mux, "create_from_yaml"
+        ) as create_from_yaml:
+            cached = self._initialize(config)
+        create_from_yaml.assert_not_called()
+        self._check_same(cached, fresh)
+        value = cached.root.get_node("/run/hw").value
+        self.assertEqual(value["tuple"], (1, "a"))
+        self.assertEqual(value["set"], {1, 2})
+        self.assertEqual(value["bytes"], b"\x00\xff")
+        self.assertEqual(value["complex"], 1 + 2j)
+        self.assertEqual(value["dict"], {1: [None, 1.5, True]})
+
+    def test_unsupported_value(self):
+        tree_cache = yaml_to_mux.YamlToMux._get_cache(self.config)
+        root = mux.MuxTreeNode("", {"value": object()})
+        tree_cache.set(["key"], root, [], [])
+        self.assertEqual(tree_cache.get(["key"]), (None, None))
+        self.assertEqual(tree_cache.get_all(), [])
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+
 class TestFingerprint(unittest.TestCase):
     def test_fingerprint(self):
         """
@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+
+"""
+Measures the time to list the assets in a cache directory, and to select
+them by size and by last access, using the catalog of assets, against
+the time to rescan the cache directory, which walks it and looks at
+every file, as listing the assets used to do.
+
+A synthetic cache directory is created, with a number of assets, each
+one with its CHECKSUM file.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from avocado.utils.asset import Asset, AssetCatalog
+
+
+def create_cache(cache_dir, assets):
+    for index in range(assets):
+        directory = os.path.join(cache_dir, "by_location", f"{index % 1000:040x}")
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"asset_{index}.img")
+        with open(path, "wb") as asset_file:
+            asset_file.write(b"a" * (index % 4096))
+        with open(f"{path}-CHECKSUM", "w", encoding="utf-8") as hash_file:
+            hash_file.write(f"sha1 {index:040x}\n")
+
+
+def measure(function, runs):
+    start = time.monotonic()
+    for _ in range(runs):
+        result = function()
+    return (time.monotonic() - start) / runs, len(result)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--assets", type=int, default=20000)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="avocado_") as directory:
+        cache_dir = os.path.join(directory, "cache")
+        create_cache(cache_dir, args.assets)
+        cache_dirs = [cache_dir]
+        catalog = AssetCatalog(cache_dir)
+        print(f"{'OPERATION':>16} {'ASSETS':>8} {'WALL (s)':>10}")
+        for name, function in (
+            ("rescan", lambda: [None] * catalog.rescan()),
+            ("list", lambda: Asset.get_all_assets(cache_dirs)),
+            ("by size", lambda: Asset.get_assets_by_size(">=2048", cache_dirs)),
+            ("by days", lambda: Asset.get_assets_unused_for_days(0, cache_dirs)),
+        ):
+            elapsed, count = measure(function, args.runs)
+            print(f"{name:>16} {count:>8} {elapsed:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
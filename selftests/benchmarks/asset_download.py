@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+
+"""
+Measures the time to fetch an asset from a local HTTP server into an
+empty cache, and the number of bytes read and written by the process
+(and its children) to do so, relative to the size of the asset.
+
+Those are taken from the "rchar" and "wchar" fields of /proc/self/io,
+which don't count the bytes received from the server, so the ideal is
+no bytes read and as many bytes written as the asset size.  This runs
+only on Linux.
+"""
+
+import argparse
+import hashlib
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+from avocado.utils.asset import Asset
+
+
+def get_io():
+    counters = {}
+    with open("/proc/self/io", encoding="utf-8") as io_file:
+        for line in io_file:
+            key, value = line.split(":")
+            counters[key] = int(value)
+    return counters["rchar"], counters["wchar"]
+
+
+def get_free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_server(port, timeout=10):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port)):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError("HTTP server did not start")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=256, help="size in MiB")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--hash", action="store_true", help="give the asset hash")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="avocado_") as directory:
+        served = os.path.join(directory, "served")
+        os.makedirs(served)
+        size = args.size * 2**20
+        hash_obj = hashlib.sha1()
+        with open(os.path.join(served, "asset.img"), "wb") as asset_file:
+            for _ in range(args.size):
+                chunk = os.urandom(2**20)
+                hash_obj.update(chunk)
+                asset_file.write(chunk)
+        # the server runs in its own process, not accounted for
+        port = get_free_port()
+        with subprocess.Popen(
+            [sys.executable, "-m", "http.server", str(port)]
+            + ["--bind", "127.0.0.1", "--directory", served],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        ) as server:
+            try:
+                wait_for_server(port)
+                url = f"http://127.0.0.1:{port}/asset.img"
+                cache_dir = os.path.join(directory, "cache")
+                print(
+                    f"{'RUN':>4} {'WALL (s)':>10} {'READ (x)':>10} {'WRITTEN (x)':>12}"
+                )
+                for run in range(args.runs):
+                    shutil.rmtree(cache_dir, ignore_errors=True)
+                    asset = Asset(
+                        url,
+                        asset_hash=hash_obj.hexdigest() if args.hash else None,
+                        algorithm="sha1",
+                        cache_dirs=[cache_dir],
+                    )
+                    read, written = get_io()
+                    start = time.monotonic()
+                    asset.fetch()
+                    elapsed = time.monotonic() - start
+                    read_after, written_after = get_io()
+                    print(
+                        f"{run:>4} {elapsed:>10.3f} "
+                        f"{(read_after - read) / size:>10.2f} "
+                        f"{(written_after - written) / size:>12.2f}"
+                    )
+            finally:
+                server.terminate()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+
+"""
+Measures the time to fetch the same asset, from a local HTTP server,
+under a number of different locations (as if from different mirrors),
+and the disk space the cache directory takes, both with the usual
+layout of the cache directory and with the content-addressed one.
+
+The hash of the asset is given, so with the content-addressed layout
+it's downloaded only once.
+"""
+
+import argparse
+import hashlib
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+from avocado.utils.asset import Asset, AssetStore
+
+
+def get_free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_server(port, timeout=10):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port)):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError("HTTP server did not start")
+
+
+def get_disk_usage(directory):
+    inodes = {}
+    for root, _, files in os.walk(directory):
+        for filename in files:
+            stats = os.lstat(os.path.join(root, filename))
+            inodes[stats.st_ino] = stats.st_blocks * 512
+    return sum(inodes.values())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--size", type=int, default=64, help="size in MiB")
+    parser.add_argument("--locations", type=int, default=8)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="avocado_") as directory:
+        served = os.path.join(directory, "served")
+        os.makedirs(served)
+        hash_obj = hashlib.sha1()
+        first = os.path.join(served, "mirror0.img")
+        with open(first, "wb") as asset_file:
+            for _ in range(args.size):
+                chunk = os.urandom(2**20)
+                hash_obj.update(chunk)
+                asset_file.write(chunk)
+        for index in range(1, args.locations):
+            os.link(first, os.path.join(served, f"mirror{index}.img"))
+        port = get_free_port()
+        with subprocess.Popen(
+            [sys.executable, "-m", "http.server", str(port)]
+            + ["--bind", "127.0.0.1", "--directory", served],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        ) as server:
+            try:
+                wait_for_server(port)
+                print(f"{'LAYOUT':>18} {'WALL (s)':>10} {'DISK (MiB)':>12}")
+                for layout in ("usual", "content-addressed"):
+                    cache_dir = os.path.join(directory, layout)
+                    os.makedirs(cache_dir)
+                    if layout == "content-addressed":
+                        AssetStore(cache_dir).migrate()
+                    start = time.monotonic()
+                    for index in range(args.locations):
+                        Asset(
+                            f"http://127.0.0.1:{port}/mirror{index}.img",
+                            asset_hash=hash_obj.hexdigest(),
+                            algorithm="sha1",
+                            cache_dirs=[cache_dir],
+                        ).fetch()
+                    elapsed = time.monotonic() - start
+                    usage = get_disk_usage(cache_dir) / 2**20
+                    print(f"{layout:>18} {elapsed:>10.3f} {usage:>12.1f}")
+            finally:
+                server.terminate()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+
+"""
+Measures the memory taken by the CIT varianter to keep track of the
+coverage of all combinations, the time it takes to compute a covering
+array, and the size of the resulting array, for an increasing number of
+parameters and orders of combinations.
+
+All parameters have the same number of values, and there are no
+constraints.  The search is seeded, so that runs are comparable.
+"""
+
+import argparse
+import random
+import time
+import tracemalloc
+
+from avocado_varianter_cit.Cit import Cit
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--parameters", type=int, nargs="+", default=[5, 10, 15, 20])
+    parser.add_argument("--orders", type=int, nargs="+", default=[2, 3])
+    parser.add_argument("--values", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(
+        f"{'PARAMETERS':>10} {'ORDER':>6} {'COMBINATIONS':>12} {'ROWS':>6} "
+        f"{'WALL (s)':>10} {'PEAK (MiB)':>10}"
+    )
+    for order in args.orders:
+        for parameters in args.parameters:
+            if order > parameters:
+                continue
+            random.seed(args.seed)
+            tracemalloc.start()
+            cit = Cit([args.values] * parameters, order, set())
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            combinations = cit.combination_matrix.total_uncovered
+            start = time.monotonic()
+            rows = len(cit.compute())
+            elapsed = time.monotonic() - start
+            print(
+                f"{parameters:>10} {order:>6} {combinations:>12} {rows:>6} "
+                f"{elapsed:>10.3f} {peak / 2 ** 20:>10.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
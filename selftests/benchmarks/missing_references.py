@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+
+"""
+Measures the time to check that all test references have been resolved,
+looking up the resolutions of each reference one after the other, and
+with an index of the successfully resolved references.
+"""
+
+import argparse
+import time
+
+from avocado.core.exceptions import JobTestSuiteReferenceResolutionError
+from avocado.core.resolver import (
+    ReferenceResolution,
+    ReferenceResolutionResult,
+    check_missing_references,
+)
+
+
+def check_by_lookup(references, resolutions):
+    missing = []
+    for reference in references:
+        results = [res.result for res in resolutions if res.reference == reference]
+        if ReferenceResolutionResult.SUCCESS not in results:
+            missing.append(reference)
+    return missing
+
+
+def check_by_index(references, resolutions):
+    try:
+        check_missing_references(references, resolutions)
+    except JobTestSuiteReferenceResolutionError:
+        return False
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--references", type=int, nargs="+", default=[1000, 5000])
+    args = parser.parse_args()
+
+    print(f"{'CHECK':>8} {'REFERENCES':>10} {'WALL (s)':>10}")
+    for number in args.references:
+        references = [f"/tests/test_{index:06}.py" for index in range(number)]
+        resolutions = [
+            ReferenceResolution(reference, ReferenceResolutionResult.SUCCESS)
+            for reference in references
+        ]
+        for name, check in (("lookup", check_by_lookup), ("index", check_by_index)):
+            start = time.monotonic()
+            check(references, resolutions)
+            elapsed = time.monotonic() - start
+            print(f"{name:>8} {number:>10} {elapsed:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
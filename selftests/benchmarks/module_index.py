@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+
+"""
+Measures the number of source files parsed, and the time taken, to find
+Python tests with and without a shared module index.
+
+A synthetic tree of test files is created, half of them with Avocado
+instrumented tests, and half with Python unittests, all inheriting from
+classes defined in a shared base module.  Tests are looked for in each
+file the way the resolvers do: as Avocado instrumented tests first, and
+then, if none is found, as Python unittests.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+import unittest.mock
+
+from avocado.core.safeloader import find_avocado_tests, find_python_unittests
+from avocado.core.safeloader import index as safeloader_index
+from avocado.core.safeloader import module as safeloader_module
+
+BASE_MODULE = """import unittest
+
+from avocado import Test
+
+
+class Base(Test):
+    def test_base(self):
+        pass
+
+
+class UnitBase(unittest.TestCase):
+    def test_unit_base(self):
+        pass
+"""
+
+TEST_MODULE = """from base import {base}
+
+
+class Test{index}({base}):
+    def test_a(self):
+        pass
+
+    def test_b(self):
+        pass
+"""
+
+
+def create_tree(directory, number_of_files):
+    with open(os.path.join(directory, "base.py"), "w", encoding="utf-8") as base:
+        base.write(BASE_MODULE)
+    paths = []
+    for index in range(number_of_files):
+        path = os.path.join(directory, f"test_{index:05}.py")
+        base = "Base" if index % 2 else "UnitBase"
+        with open(path, "w", encoding="utf-8") as test:
+            test.write(TEST_MODULE.format(index=index, base=base))
+        paths.append(path)
+    return paths
+
+
+def find_all(paths):
+    tests = 0
+    for path in paths:
+        found, _ = find_avocado_tests(path)
+        if not found:
+            found = find_python_unittests(path)
+        tests += sum(len(methods) for methods in found.values())
+    return tests
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"{'INDEX':>8} {'FILES':>8} {'TESTS':>8} {'PARSES':>8} {'WALL (s)':>10}")
+    with tempfile.TemporaryDirectory(prefix="avocado_") as directory:
+        paths = create_tree(directory, args.files)
+        for name in ("none", "shared"):
+            parse = unittest.mock.Mock(wraps=safeloader_index.parse)
+            with unittest.mock.patch.object(
+                safeloader_index, "parse", parse
+            ), unittest.mock.patch.object(safeloader_module, "parse", parse):
+                start = time.monotonic()
+                if name == "shared":
+                    with safeloader_index.ModuleIndex.session():
+                        tests = find_all(paths)
+                else:
+                    tests = find_all(paths)
+                elapsed = time.monotonic() - start
+            print(
+                f"{name:>8} {args.files:>8} {tests:>8} {parse.call_count:>8} "
+                f"{elapsed:>10.3f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+
+"""
+Measures the number of candidates evaluated, and the time taken, to
+produce the variants of a multiplex tree with filters, by evaluating the
+filters on every combination of all the multiplex domains, and while
+the combinations are built.
+
+The tree has a number of multiplex domains, each with a number of
+choices, and filter-only filters on the root node keeping only one of
+the choices of some of the domains.  Evaluating the filters while
+building the combinations counts every partial combination looked at
+as a candidate.
+"""
+
+import argparse
+import time
+import unittest.mock
+
+from avocado_varianter_yaml_to_mux.varianter_yaml_to_mux import mux
+
+
+def create_tree(domains, choices, filtered):
+    root = mux.MuxTreeNode()
+    root.filters = [[f"/domain_{index}/choice_0" for index in range(filtered)], []]
+    for index in range(domains):
+        domain = mux.MuxTreeNode(f"domain_{index}")
+        domain.multiplex = True
+        root.add_child(domain)
+        for choice in range(choices):
+            domain.add_child(
+                mux.MuxTreeNode(f"choice_{choice}", {"domain": index, "value": choice})
+            )
+    return mux.MuxTree(root)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--domains", type=int, default=6)
+    parser.add_argument("--choices", type=int, default=8)
+    parser.add_argument("--filtered", type=int, default=4)
+    args = parser.parse_args()
+
+    tree = create_tree(args.domains, args.choices, args.filtered)
+    print(f"{'FILTERS':>10} {'CANDIDATES':>12} {'VARIANTS':>10} {'WALL (s)':>10}")
+
+    start = time.monotonic()
+    candidates = 0
+    variants = 0
+    for variant in tree.iter_variants():
+        candidates += 1
+        if tree._valid_variant(variant):  # pylint: disable=W0212
+            variants += 1
+    elapsed = time.monotonic() - start
+    print(f"{'after':>10} {candidates:>12} {variants:>10} {elapsed:>10.3f}")
+
+    valid_combination = unittest.mock.Mock(
+        wraps=mux.MuxTree._valid_combination  # pylint: disable=W0212
+    )
+    with unittest.mock.patch.object(
+        mux.MuxTree, "_valid_combination", valid_combination
+    ):
+        start = time.monotonic()
+        variants = sum(1 for _ in tree)
+        elapsed = time.monotonic() - start
+    print(
+        f"{'while':>10} {valid_combination.call_count:>12} {variants:>10} "
+        f"{elapsed:>10.3f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+
+"""
+Measures the time to build the multiplex tree of the "yaml_to_mux"
+varianter plugin from YAML files, without the cache of multiplex trees,
+with an empty (cold) cache and with a populated (warm) cache.
+
+A synthetic YAML file is created, with a number of multiplex domains,
+each one with a number of choices, all of them with their own values.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from avocado_varianter_yaml_to_mux.varianter_yaml_to_mux import YamlToMux
+
+from avocado.core.settings import settings
+
+
+def create_yaml(path, domains, choices, values):
+    with open(path, "w", encoding="utf-8") as yaml_file:
+        for domain in range(domains):
+            yaml_file.write(f"domain_{domain}: !mux\n")
+            for choice in range(choices):
+                yaml_file.write(f"    choice_{choice}:\n")
+                for value in range(values):
+                    yaml_file.write(f"        key_{value}: value_{choice}_{value}\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--domains", type=int, default=3)
+    parser.add_argument("--choices", type=int, default=10)
+    parser.add_argument("--values", type=int, default=200)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="avocado_") as directory:
+        yaml_path = os.path.join(directory, "mux.yaml")
+        create_yaml(yaml_path, args.domains, args.choices, args.values)
+        config = settings.as_dict()
+        config.update(
+            {
+                "datadir.paths.cache_dirs": [os.path.join(directory, "cache")],
+                "yaml_to_mux.files": [yaml_path],
+                "yaml_to_mux.inject": [],
+                "yaml_to_mux.filter_only": [],
+                "yaml_to_mux.filter_out": [],
+                "yaml_to_mux.parameter_paths": ["/run/*"],
+            }
+        )
+        print(f"{'CACHE':>8} {'VARIANTS':>10} {'WALL (s)':>10}")
+        for name, cache in (("none", False), ("cold", True), ("warm", True)):
+            config["yaml_to_mux.cache"] = cache
+            start = time.monotonic()
+            for _ in range(1 if name == "cold" else args.runs):
+                plugin = YamlToMux()
+                plugin.initialize(config)
+            elapsed = (time.monotonic() - start) / (1 if name == "cold" else args.runs)
+            print(f"{name:>8} {len(plugin.variant_ids):>10} {elapsed:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
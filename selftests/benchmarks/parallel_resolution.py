@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+
+"""
+Measures the time to resolve the references in a directory tree, with
+references resolved one after the other, and in parallel.
+
+A synthetic tree is created with directories of files of different kinds:
+Avocado instrumented tests and Python unittests (inheriting from classes
+defined in a base module of each directory), executable tests, and data
+files.  The whole tree is then resolved with an increasing number of
+processes, with the safeloader cache disabled.
+"""
+
+import argparse
+import multiprocessing
+import os
+import stat
+import tempfile
+import time
+
+from avocado.core.resolver import ReferenceResolutionResult, resolve
+from avocado.core.settings import settings
+
+BASE_MODULE = """import unittest
+
+from avocado import Test
+
+
+class Base(Test):
+    def test_base(self):
+        pass
+
+
+class UnitBase(unittest.TestCase):
+    def test_unit_base(self):
+        pass
+"""
+
+TEST_MODULE = """from base import {base}
+
+
+class Test{index}({base}):
+    def test_a(self):
+        pass
+
+    def test_b(self):
+        pass
+"""
+
+EXEC_TEST = """#!/bin/sh
+exit 0
+"""
+
+FILES_PER_DIRECTORY = 100
+
+
+def create_tree(directory, number_of_files):
+    for index in range(number_of_files):
+        subdirectory = os.path.join(directory, f"dir_{index // FILES_PER_DIRECTORY:04}")
+        if not os.path.isdir(subdirectory):
+            os.mkdir(subdirectory)
+            with open(
+                os.path.join(subdirectory, "base.py"), "w", encoding="utf-8"
+            ) as base:
+                base.write(BASE_MODULE)
+        kind = index % 5
+        if kind in (0, 1):
+            name, content = f"test_{index:05}.py", TEST_MODULE.format(
+                index=index, base="Base"
+            )
+        elif kind == 2:
+            name, content = f"test_{index:05}.py", TEST_MODULE.format(
+                index=index, base="UnitBase"
+            )
+        elif kind == 3:
+            name, content = f"test_{index:05}.sh", EXEC_TEST
+        else:
+            name, content = f"data_{index:05}.txt", "data\n"
+        path = os.path.join(subdirectory, name)
+        with open(path, "w", encoding="utf-8") as test:
+            test.write(content)
+        if kind == 3:
+            os.chmod(path, os.stat(path).st_mode | stat.S_IXUSR)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=10000)
+    parser.add_argument(
+        "--processes",
+        type=int,
+        nargs="+",
+        default=sorted({1, 2, 4, multiprocessing.cpu_count()}),
+    )
+    args = parser.parse_args()
+
+    config = settings.as_dict()
+    config["resolver.safeloader_cache"] = False
+    print(f"CPUs: {multiprocessing.cpu_count()}")
+    print(
+        f"{'PROCESSES':>10} {'FILES':>8} {'TESTS':>8} {'WALL (s)':>10} {'SPEEDUP':>8}"
+    )
+    with tempfile.TemporaryDirectory(prefix="avocado_") as directory:
+        create_tree(directory, args.files)
+        sequential = None
+        for processes in args.processes:
+            config["resolver.parallel"] = processes
+            start = time.monotonic()
+            resolutions = resolve([directory], config=config)
+            elapsed = time.monotonic() - start
+            if sequential is None:
+                sequential = elapsed
+            tests = sum(
+                len(resolution.resolutions)
+                for resolution in resolutions
+                if resolution.result == ReferenceResolutionResult.SUCCESS
+            )
+            print(
+                f"{processes:>10} {args.files:>8} {tests:>8} {elapsed:>10.3f} "
+                f"{sequential / elapsed:>8.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
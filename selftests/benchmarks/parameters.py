@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+
+"""
+Measures the time taken by tests that get lots of parameters.
+
+A variant is made of leaves of a tree of parameters, each leaf having
+its own parameters, and inheriting the ones of its ancestors.  For each
+(simulated) test, a new set of parameters for the variant is created,
+and all of the parameters are retrieved, from the default paths, from
+an absolute path, and from a glob-like path, a number of times.
+"""
+
+import argparse
+import time
+
+from avocado.core.parameters import AvocadoParams
+from avocado.core.tree import TreeNode
+
+
+def create_variant(number_of_leaves, number_of_keys):
+    root = TreeNode()
+    run = root.get_node("/run", True)
+    run.value = {f"common_{key}": key for key in range(number_of_keys)}
+    leaves = []
+    for index in range(number_of_leaves):
+        leaf = run.get_node(f"/run/domain_{index}/leaf_{index}", True)
+        leaf.value = {f"key_{index}_{key}": key for key in range(number_of_keys)}
+        leaves.append(leaf)
+    return leaves
+
+
+def get_all(params, number_of_leaves, number_of_keys):
+    for key in range(number_of_keys):
+        params.get(f"common_{key}")
+        params.get(f"common_{key}", "/run/*")
+        for index in range(number_of_leaves):
+            params.get(f"key_{index}_{key}")
+            params.get(f"key_{index}_{key}", f"/run/domain_{index}/*")
+            params.get(f"key_{index}_{key}", "/run/*/leaf_*")
+        params.get(f"missing_{key}", default=key)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--leaves", type=int, default=8)
+    parser.add_argument("--keys", type=int, default=200)
+    parser.add_argument("--tests", type=int, default=20)
+    parser.add_argument("--iterations", type=int, default=5)
+    args = parser.parse_args()
+
+    leaves = create_variant(args.leaves, args.keys)
+    start = time.monotonic()
+    gets = 0
+    for _ in range(args.tests):
+        params = AvocadoParams(leaves, ["/run/*"])
+        for _ in range(args.iterations):
+            get_all(params, args.leaves, args.keys)
+            gets += args.keys * (3 + args.leaves * 3)
+    elapsed = time.monotonic() - start
+    print(f"{'LEAVES':>8} {'KEYS':>8} {'GETS':>10} {'WALL (s)':>10} {'GETS/s':>10}")
+    print(
+        f"{args.leaves:>8} {args.keys:>8} {gets:>10} {elapsed:>10.3f} "
+        f"{gets / elapsed:>10.0f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+
+"""
+Measures the rate of tasks run by the process spawner.
+
+Short tasks are spawned, a number of them at a time, and waited for,
+either by starting a new runner process for each task, or by forking
+each task from a pool of task servers (--spawner-process-pool).  For
+short tasks, the start up of a new runner process dominates, so the
+pool is expected to run many more tasks per second.
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from avocado.core.nrunner.runnable import Runnable
+from avocado.core.nrunner.task import Task
+from avocado.core.task.runtime import RuntimeTask
+from avocado.plugins.spawners.process import ProcessSpawner
+
+JOB_ID = "0000000000000000000000000000000000000000"
+
+
+async def spawn_and_wait(spawner, runtime_task, semaphore):
+    async with semaphore:
+        assert await spawner.spawn_task(runtime_task)
+        await spawner.wait_task(runtime_task)
+
+
+def run(kind, uri, number_of_tasks, parallel, pool, output_dir):
+    spawner = ProcessSpawner(config={"spawner.process.pool": pool})
+    runtime_tasks = []
+    for index in range(1, number_of_tasks + 1):
+        identifier = f"{index}-{kind}"
+        task = Task(Runnable(kind, uri, config={}), identifier, job_id=JOB_ID)
+        task.setup_output_dir(os.path.join(output_dir, f"{pool}-{identifier}"))
+        runtime_tasks.append(RuntimeTask(task))
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    semaphore = asyncio.Semaphore(parallel)
+    start = time.monotonic()
+    loop.run_until_complete(
+        asyncio.gather(
+            *[spawn_and_wait(spawner, rt, semaphore) for rt in runtime_tasks]
+        )
+    )
+    elapsed = time.monotonic() - start
+    loop.close()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--kind", default="exec-test")
+    parser.add_argument("--uri", default="/bin/true")
+    parser.add_argument("--tasks", type=int, default=200)
+    parser.add_argument("--parallel", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    print(f"{'SPAWNER':>14} {'TASKS':>8} {'WALL (s)':>10} {'TASKS/s':>10}")
+    with tempfile.TemporaryDirectory(prefix="avocado_") as output_dir:
+        for pool in (False, True):
+            elapsed = run(
+                args.kind, args.uri, args.tasks, args.parallel, pool, output_dir
+            )
+            name = "process-pool" if pool else "process"
+            print(
+                f"{name:>14} {args.tasks:>8} {elapsed:>10.3f} "
+                f"{args.tasks / elapsed:>10.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+
+"""
+Compares slot based and resource aware scheduling of tasks.
+
+A simulated machine, with a number of CPUs and an amount of memory, runs
+a workload mixing light tasks (1 CPU, little memory) with heavy ones
+(many CPUs, lots of memory).  When the CPUs demanded by the running tasks
+exceed the CPUs of the machine, all of them progress proportionally
+slower, like in a real, oversubscribed, machine.  Tasks started while the
+memory demanded exceeds the memory of the machine are counted as being
+at risk of running out of memory.
+
+With slot based scheduling, up to a number of tasks (the number of
+CPUs) run at the same time, no matter their weight.  With resource aware
+scheduling (--resources-scheduling), tasks only start when their CPUs
+and memory fit in what's left of the machine.
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+from avocado.core.nrunner.runnable import Runnable
+from avocado.core.nrunner.task import Task
+from avocado.core.spawners.mock import MockStatusRepoSpawner
+from avocado.core.status.repo import StatusRepo
+from avocado.core.task import resources
+from avocado.core.task.runtime import RuntimeTask
+from avocado.core.task.statemachine import TaskStateMachine, Worker
+
+JOB_ID = "0000000000000000000000000000000000000000"
+
+#: Interval, in seconds, of the simulated machine's clock
+TICK = 0.005
+
+
+class SimulatedSpawner(MockStatusRepoSpawner):
+    """Runs tasks on a simulated machine with limited CPUs and memory."""
+
+    def __init__(self, status_repo, cpus, memory, durations):
+        super().__init__(status_repo)
+        self.cpus = cpus
+        self.memory = memory
+        self.durations = durations
+        #: Remaining work, in CPU seconds, and completion event by task
+        self.running = {}
+        self.cpu_demand = 0.0
+        self.memory_demand = 0
+        self.busy = 0.0
+        self.at_risk = 0
+        self.ticker = None
+
+    def _message(self, runtime_task, status, **kwargs):
+        self._status_repo.process_message(
+            {
+                "id": str(runtime_task.task.identifier),
+                "job_id": self._status_repo.job_id,
+                "status": status,
+                "time": time.monotonic(),
+                **kwargs,
+            }
+        )
+
+    async def _tick(self):
+        while True:
+            await asyncio.sleep(TICK)
+            if not self.running:
+                continue
+            rate = min(1.0, self.cpus / self.cpu_demand)
+            self.busy += TICK * min(self.cpus, self.cpu_demand)
+            for runtime_task, (remaining, event) in list(self.running.items()):
+                cpu = runtime_task.resources.cpu
+                remaining -= TICK * cpu * rate
+                if remaining > 0:
+                    self.running[runtime_task] = (remaining, event)
+                    continue
+                del self.running[runtime_task]
+                self.cpu_demand -= cpu
+                self.memory_demand -= runtime_task.resources.memory
+                self._message(runtime_task, "finished", result="pass")
+                event.set()
+
+    async def spawn_task(self, runtime_task):
+        if self.ticker is None:
+            self.ticker = asyncio.ensure_future(self._tick())
+        task_resources = runtime_task.resources
+        self.cpu_demand += task_resources.cpu
+        self.memory_demand += task_resources.memory
+        if self.memory_demand > self.memory:
+            self.at_risk += 1
+        work = self.durations[runtime_task] * task_resources.cpu
+        self.running[runtime_task] = (work, asyncio.Event())
+        self._message(runtime_task, "started", output_dir="")
+        return True
+
+    def is_task_alive(self, runtime_task):
+        return runtime_task in self.running
+
+    async def wait_task(self, runtime_task):
+        entry = self.running.get(runtime_task)
+        if entry is not None:
+            await entry[1].wait()
+
+
+def get_workload(number_of_tasks, heavy_ratio, cpus, memory, duration, seed):
+    rand = random.Random(seed)
+    runtime_tasks = []
+    durations = {}
+    for index in range(1, number_of_tasks + 1):
+        if rand.random() < heavy_ratio:
+            cpu = max(2, cpus // 2)
+            task_memory = memory // 3
+            task_duration = duration * rand.uniform(2, 4)
+        else:
+            cpu = 1
+            task_memory = memory // 32
+            task_duration = duration * rand.uniform(0.5, 1.5)
+        tags = {
+            resources.RESOURCES_CPU_TAG: {str(cpu)},
+            resources.RESOURCES_MEMORY_TAG: {str(task_memory)},
+        }
+        runnable = Runnable("noop", "noop", tags=tags)
+        runtime_task = RuntimeTask(Task(runnable, f"{index:04}", job_id=JOB_ID))
+        runtime_tasks.append(runtime_task)
+        durations[runtime_task] = task_duration
+    return runtime_tasks, durations
+
+
+def run(args, resource_aware):
+    runtime_tasks, durations = get_workload(
+        args.tasks, args.heavy_ratio, args.cpus, args.memory, args.duration, args.seed
+    )
+    budget = None
+    if resource_aware:
+        budget = resources.ResourceBudget(args.cpus, args.memory)
+    status_repo = StatusRepo(JOB_ID)
+    spawner = SimulatedSpawner(status_repo, args.cpus, args.memory, durations)
+    state_machine = TaskStateMachine(runtime_tasks, status_repo, budget)
+    workers = [
+        Worker(state_machine, spawner, max_running=args.cpus).run()
+        for _ in range(args.cpus)
+    ]
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    start = time.monotonic()
+    loop.run_until_complete(asyncio.gather(*workers))
+    elapsed = time.monotonic() - start
+    spawner.ticker.cancel()
+    loop.run_until_complete(asyncio.gather(spawner.ticker, return_exceptions=True))
+    loop.close()
+    utilization = spawner.busy / (elapsed * args.cpus)
+    return elapsed, utilization, spawner.at_risk
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tasks", type=int, default=200)
+    parser.add_argument("--cpus", type=int, default=8)
+    parser.add_argument("--memory", type=int, default=16 * 1024**3)
+    parser.add_argument("--heavy-ratio", type=float, default=0.2)
+    parser.add_argument(
+        "--duration",
+        type=float,
+        default=0.05,
+        help="Duration, in seconds, of an average light task",
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'SCHEDULING':>14} {'MAKESPAN (s)':>14} {'CPU UTIL':>10} {'OOM RISK':>10}")
+    for resource_aware in (False, True):
+        elapsed, utilization, at_risk = run(args, resource_aware)
+        name = "resources" if resource_aware else "slots"
+        print(f"{name:>14} {elapsed:>14.3f} {utilization:>10.1%} {at_risk:>10}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+
+"""
+Measures the time to find Avocado tests with and without the safeloader cache.
+
+A synthetic tree of test files is created, where each test class inherits
+from a class defined in a shared base module, which itself inherits from
+avocado.Test.  Tests are then found in all files without the cache, with
+an empty ("cold") cache, and with a populated ("warm") cache.
+"""
+
+import argparse
+import os
+import tempfile
+import time
+
+from avocado.core.safeloader import find_avocado_tests
+from avocado.core.safeloader.cache import SafeloaderCache
+
+BASE_MODULE = """from avocado import Test
+
+
+class Base(Test):
+    '''
+    :avocado: tags=base
+    '''
+
+    def test_base(self):
+        pass
+"""
+
+TEST_MODULE = """from base import Base
+
+
+class Test{index}(Base):
+    '''
+    :avocado: tags=synthetic,index:{index}
+    '''
+
+    def test_a(self):
+        pass
+
+    def test_b(self):
+        '''
+        :avocado: tags=slow
+        '''
+
+    def helper(self):
+        return {index}
+"""
+
+
+def create_tree(directory, number_of_files):
+    with open(os.path.join(directory, "base.py"), "w", encoding="utf-8") as base:
+        base.write(BASE_MODULE)
+    paths = []
+    for index in range(number_of_files):
+        path = os.path.join(directory, f"test_{index:05}.py")
+        with open(path, "w", encoding="utf-8") as test:
+            test.write(TEST_MODULE.format(index=index))
+        paths.append(path)
+    return paths
+
+
+def find_all(paths, cache):
+    start = time.monotonic()
+    tests = 0
+    for path in paths:
+        found, _ = find_avocado_tests(path, cache)
+        tests += sum(len(methods) for methods in found.values())
+    return time.monotonic() - start, tests
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--files", type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"{'CACHE':>8} {'FILES':>8} {'TESTS':>8} {'WALL (s)':>10} {'FILES/s':>10}")
+    with tempfile.TemporaryDirectory(prefix="avocado_") as directory:
+        tree = os.path.join(directory, "tree")
+        os.mkdir(tree)
+        paths = create_tree(tree, args.files)
+        cache = SafeloaderCache(os.path.join(directory, "cache"))
+        for name, cache_used in (("none", None), ("cold", cache), ("warm", cache)):
+            elapsed, tests = find_all(paths, cache_used)
+            print(
+                f"{name:>8} {args.files:>8} {tests:>8} {elapsed:>10.3f} "
+                f"{args.files / elapsed:>10.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+
+"""
+Measures the throughput of status messages sent to a status server.
+
+A client posts a number of stdout messages, followed by a finished
+message, to a status server listening on a UNIX domain socket, both
+with JSON lines and with frames, and the time until the status
+repository processes the finished message is measured.
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+from avocado.core.nrunner.task import TaskStatusService
+from avocado.core.status.repo import StatusRepo
+from avocado.core.status.server import StatusServer
+
+JOB_ID = "0000000000000000000000000000000000000000"
+
+
+def post(uri, use_frames, number_of_messages, payload):
+    service = TaskStatusService(uri, use_frames=use_frames)
+    if use_frames:
+        while not service._frames:
+            service._check_handshake_reply()
+            time.sleep(0.001)
+    for _ in range(number_of_messages):
+        service.post(
+            {
+                "id": "1-bench",
+                "job_id": JOB_ID,
+                "status": "running",
+                "type": "stdout",
+                "log": payload,
+                "time": time.monotonic(),
+            }
+        )
+    service.post(
+        {
+            "id": "1-bench",
+            "job_id": JOB_ID,
+            "status": "finished",
+            "result": "pass",
+            "time": time.monotonic(),
+        }
+    )
+    service.close()
+
+
+def run(use_frames, number_of_messages, payload_size):
+    payload = os.urandom(payload_size)
+    with tempfile.TemporaryDirectory(prefix="avocado_bench_") as tmpdir:
+        uri = os.path.join(tmpdir, ".status_server.sock")
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        repo = StatusRepo(JOB_ID)
+        server = StatusServer(uri, repo)
+        loop.run_until_complete(server.create_server())
+        start = time.monotonic()
+        client = loop.run_in_executor(
+            None, post, uri, use_frames, number_of_messages, payload
+        )
+        loop.run_until_complete(
+            asyncio.gather(client, repo.wait_task_result("1-bench"))
+        )
+        elapsed = time.monotonic() - start
+        server.close()
+        loop.close()
+    assert len(repo.get_all_task_data("1-bench")) == number_of_messages + 1
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--messages", type=int, default=20000)
+    parser.add_argument(
+        "--payload-sizes", type=int, nargs="+", default=[64, 4096, 65536]
+    )
+    args = parser.parse_args()
+
+    print(f"{'PROTOCOL':>10} {'PAYLOAD (B)':>12} {'MSG/S':>12} {'MB/S':>10}")
+    for payload_size in args.payload_sizes:
+        for protocol, use_frames in (("json", False), ("frames", True)):
+            elapsed = run(use_frames, args.messages, payload_size)
+            rate = args.messages / elapsed
+            throughput = args.messages * payload_size / elapsed / 2**20
+            print(
+                f"{protocol:>10} {payload_size:>12} {rate:>12.0f} {throughput:>10.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+
+"""
+Measures the scheduling overhead of the task state machine.
+
+Thousands of noop tasks are pushed through the state machine by a number
+of workers, using a spawner that reports tasks as finished right away,
+so the measured time is spent on scheduling alone.  The overhead per
+task is expected to remain flat as the number of tasks grows.
+"""
+
+import argparse
+import asyncio
+import time
+
+from avocado.core.nrunner.runnable import Runnable
+from avocado.core.nrunner.task import Task
+from avocado.core.spawners.mock import MockStatusRepoSpawner
+from avocado.core.status.repo import StatusRepo
+from avocado.core.task.runtime import RuntimeTask
+from avocado.core.task.statemachine import TaskStateMachine, Worker
+
+JOB_ID = "0000000000000000000000000000000000000000"
+
+
+def run(number_of_tasks, number_of_workers):
+    runnable = Runnable("noop", "noop")
+    runtime_tasks = [
+        RuntimeTask(Task(runnable, f"{index}-noop", job_id=JOB_ID))
+        for index in range(1, number_of_tasks + 1)
+    ]
+    status_repo = StatusRepo(JOB_ID)
+    spawner = MockStatusRepoSpawner(status_repo)
+    state_machine = TaskStateMachine(runtime_tasks, status_repo)
+    workers = [
+        Worker(state_machine, spawner, max_running=number_of_workers).run()
+        for _ in range(number_of_workers)
+    ]
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    start = time.monotonic()
+    start_cpu = time.process_time()
+    loop.run_until_complete(asyncio.gather(*workers))
+    elapsed = time.monotonic() - start
+    elapsed_cpu = time.process_time() - start_cpu
+    loop.close()
+    assert len(state_machine.finished) == number_of_tasks
+    return elapsed, elapsed_cpu
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tasks", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+
+    print(f"{'TASKS':>8} {'WALL (s)':>10} {'CPU (s)':>10} {'OVERHEAD/TASK (us)':>20}")
+    for number_of_tasks in args.tasks:
+        elapsed, elapsed_cpu = run(number_of_tasks, args.workers)
+        per_task = elapsed / number_of_tasks * 1000000
+        print(
+            f"{number_of_tasks:>8} {elapsed:>10.3f} {elapsed_cpu:>10.3f} "
+            f"{per_task:>20.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
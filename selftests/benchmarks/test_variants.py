@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+
+"""
+Measures the time and memory to combine the tests of a suite with its
+variants, by copying every test for every variant up front, and by
+creating each test with a variant only when it's accessed.
+
+The time to get the first test, and to go over all of them, is measured,
+along with the memory allocated at its peak (as traced by tracemalloc).
+"""
+
+import argparse
+import copy
+import time
+import tracemalloc
+
+from avocado.core.nrunner.runnable import Runnable
+from avocado.core.suite import TestVariants
+from avocado.core.tree import TreeNode
+from avocado.core.varianter import dump_variant
+
+
+def create_runnables(number_of_tests):
+    config = {
+        "run.keep_tmp": None,
+        "runner.exectest.exitcodes.skip": [],
+        "runner.identifier_format": "{uri}",
+    }
+    return [
+        Runnable(
+            "exec-test",
+            f"/tests/test_{index:05}.sh",
+            "--arg",
+            config=dict(config),
+            tags={"fast": None},
+        )
+        for index in range(number_of_tests)
+    ]
+
+
+def create_variants(number_of_variants):
+    variants = []
+    for index in range(number_of_variants):
+        root = TreeNode()
+        node = TreeNode(f"variant_{index}", {"index": index})
+        root.add_child(node)
+        node.add_child(TreeNode("leaf", {"size": index * 2, "name": f"v{index}"}))
+        variants.append(
+            {
+                "variant": node.get_leaves(),
+                "variant_id": f"variant_{index}",
+                "paths": ["/run/*"],
+            }
+        )
+    return variants
+
+
+def copy_up_front(runnables, variants):
+    tests = []
+    for runnable in runnables:
+        for variant in variants:
+            runnable = copy.deepcopy(runnable)
+            runnable.variant = dump_variant(variant)
+            tests.append(runnable)
+    return tests
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tests", type=int, default=200)
+    parser.add_argument("--variants", type=int, default=100)
+    args = parser.parse_args()
+
+    runnables = create_runnables(args.tests)
+    variants = create_variants(args.variants)
+    print(
+        f"{'EXPANSION':>10} {'TESTS':>8} {'FIRST (s)':>10} {'ALL (s)':>10} "
+        f"{'PEAK (MiB)':>11}"
+    )
+    for name, expand in (
+        ("up front", copy_up_front),
+        ("lazy", TestVariants),
+    ):
+        tracemalloc.start()
+        start = time.monotonic()
+        tests = expand(runnables, variants)
+        tests[0]  # pylint: disable=W0104
+        first = time.monotonic() - start
+        for _ in tests:
+            pass
+        elapsed = time.monotonic() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(
+            f"{name:>10} {len(tests):>8} {first:>10.3f} {elapsed:>10.3f} "
+            f"{peak / 2 ** 20:>11.1f}"
+        )
+        del tests
+
+
+if __name__ == "__main__":
+    main()
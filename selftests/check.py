@@ -27,16 +27,16 @@ TEST_SIZE = {
     "job-api-check-tmp-directory-exists": 1,
     "nrunner-interface": 90,
     "nrunner-requirement": 28,
-    "unit": 934,
+    "unit": 1024,
     "jobs": 11,
-    "functional-parallel": 353,
+    "functional-parallel": 364,
     "functional-serial": 7,
     "optional-plugins": 0,
     "optional-plugins-golang": 2,
     "optional-plugins-html": 3,
     "optional-plugins-robot": 3,
-    "optional-plugins-varianter_cit": 40,
-    "optional-plugins-varianter_yaml_to_mux": 50,
+    "optional-plugins-varianter_cit": 49,
+    "optional-plugins-varianter_yaml_to_mux": 55,
     "vmimage-variants": 256,
     "vmimage-tests": 35,
     "pre-release": 18,
@@ -34,6 +34,24 @@ class ProcessSpawnerTest(TestCaseTmpDir):
             expected = f"logdir is: {testdir}"
             self.assertIn(expected, debug_file.read())
 
+    @unittest.skipUnless(hasattr(os, "fork"), "fork is not available")
+    def test_pool(self):
+        test = script.Script(
+            os.path.join(self.tmpdir.name, "logdir_test.py"), TEST_LOGDIR
+        )
+        test.save()
+        result = process.run(
+            f"{AVOCADO} run --spawner-process-pool "
+            f"--job-results-dir {self.tmpdir.name} "
+            f"--disable-sysinfo --json - -- {test} {test} /bin/true"
+        )
+        res = json.loads(result.stdout_text)
+        self.assertEqual(res["pass"], 3)
+        for test_result in res["tests"][:2]:
+            with open(test_result["logfile"], "r", encoding="utf-8") as debug_file:
+                expected = f"logdir is: {test_result['logdir']}"
+                self.assertIn(expected, debug_file.read())
+
     @unittest.skipUnless(
         python_module_available("avocado-rogue"), "avocado-rogue not available"
     )
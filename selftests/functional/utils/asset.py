@@ -1,10 +1,11 @@
+import glob
 import os
 import tempfile
 import unittest
 
 from avocado.utils import asset
 from avocado.utils.filelock import FileLock
-from selftests.utils import TestCaseTmpDir, setup_avocado_loggers
+from selftests.utils import TestCaseTmpDir, setup_avocado_loggers, start_http_server
 
 setup_avocado_loggers()
 
@@ -214,5 +215,149 @@ class TestAsset(TestCaseTmpDir):
             a.get_metadata()
 
 
+class TestAssetDownload(TestCaseTmpDir):
+    def setUp(self):
+        super().setUp()
+        self.assetdir = tempfile.mkdtemp(dir=self.tmpdir.name)
+        self.assetname = "foo.tgz"
+        self.assethash = "3a033a8938c1af56eeb793669db83bcbd0c17ea5"
+        with open(
+            os.path.join(self.assetdir, self.assetname), "w", encoding="utf-8"
+        ) as f:
+            f.write("Test!")
+        self.cache_dir = tempfile.mkdtemp(dir=self.tmpdir.name)
+        self.server = start_http_server(self.assetdir)
+        self.url = f"http://127.0.0.1:{self.server.server_port}/{self.assetname}"
+
+    def test_fetch(self):
+        foo_tarball = asset.Asset(
+            self.url,
+            asset_hash=self.assethash,
+            algorithm="sha1",
+            cache_dirs=[self.cache_dir],
+        ).fetch()
+        with open(foo_tarball, "r", encoding="utf-8") as f:
+            self.assertEqual(f.read(), "Test!")
+        self.assertEqual(
+            asset.Asset.read_hash_from_file(f"{foo_tarball}-CHECKSUM", "sha1"),
+            ["sha1", self.assethash],
+        )
+        # no temporary files are left behind
+        self.assertEqual(
+            sorted(os.listdir(os.path.dirname(foo_tarball))),
+            [self.assetname, f"{self.assetname}-CHECKSUM"],
+        )
+
+    def test_fetch_hash_mismatch(self):
+        with self.assertRaises(OSError):
+            asset.Asset(
+                self.url,
+                asset_hash="0" * 40,
+                algorithm="sha1",
+                cache_dirs=[self.cache_dir],
+            ).fetch()
+        self.assertEqual(
+            glob.glob(os.path.join(self.cache_dir, "**", "foo.tgz*"), recursive=True),
+            [],
+        )
+
+    def test_fetch_resume(self):
+        fetch = asset.Asset(
+            self.url,
+            asset_hash=self.assethash,
+            algorithm="sha1",
+            cache_dirs=[self.cache_dir],
+        )
+        # the connection is lost after 2 bytes
+        self.server.limit = 2
+        with self.assertRaises(OSError):
+            fetch.fetch()
+        self.server.limit = None
+        foo_tarball = fetch.fetch()
+        with open(foo_tarball, "r", encoding="utf-8") as f:
+            self.assertEqual(f.read(), "Test!")
+        self.assertEqual(self.server.ranges, [(0, 5), (2, 5)])
+        self.assertEqual(
+            sorted(os.listdir(os.path.dirname(foo_tarball))),
+            [self.assetname, f"{self.assetname}-CHECKSUM"],
+        )
+
+    def test_fetch_expired_partial(self):
+        fetch = asset.Asset(
+            self.url,
+            asset_hash=self.assethash,
+            algorithm="sha1",
+            cache_dirs=[self.cache_dir],
+            expire=60,
+        )
+        # the connection is lost after 2 bytes
+        self.server.limit = 2
+        with self.assertRaises(OSError):
+            fetch.fetch()
+        self.server.limit = None
+        partials = glob.glob(
+            os.path.join(self.cache_dir, "**", "*-PARTIAL*"), recursive=True
+        )
+        self.assertTrue(partials)
+        for partial in partials:
+            os.utime(partial, (1000, 1000))
+        foo_tarball = fetch.fetch()
+        with open(foo_tarball, "r", encoding="utf-8") as f:
+            self.assertEqual(f.read(), "Test!")
+        # the download was started over, instead of resumed
+        self.assertEqual(self.server.ranges, [(0, 5), (0, 5)])
+
+    def test_fetch_store_hardlinks(self):
+        asset.AssetStore(self.cache_dir).migrate(hardlinks=True)
+        foo_tarball = asset.Asset(self.url, cache_dirs=[self.cache_dir]).fetch()
+        # the same content, from another location
+        os.link(
+            os.path.join(self.assetdir, self.assetname),
+            os.path.join(self.assetdir, "bar.tgz"),
+        )
+        bar_tarball = asset.Asset(
+            self.url.replace(self.assetname, "bar.tgz"), cache_dirs=[self.cache_dir]
+        ).fetch()
+        self.assertTrue(os.path.samefile(foo_tarball, bar_tarball))
+        self.assertEqual(len(self.server.ranges), 2)
+        # with its hash, it's not downloaded again
+        baz_tarball = asset.Asset(
+            "baz.tgz",
+            asset_hash=self.assethash,
+            algorithm="sha1",
+            locations=[self.url],
+            cache_dirs=[self.cache_dir],
+        ).fetch()
+        self.assertTrue(os.path.samefile(foo_tarball, baz_tarball))
+        self.assertEqual(len(self.server.ranges), 2)
+
+    def test_fetch_store(self):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        if not asset._supports_reflinks(self.cache_dir):
+            self.skipTest("The filesystem doesn't support reflinks")
+        store = asset.AssetStore(self.cache_dir)
+        store.migrate()
+        foo_tarball = asset.Asset(self.url, cache_dirs=[self.cache_dir]).fetch()
+        baz_tarball = asset.Asset(
+            "baz.tgz",
+            asset_hash=self.assethash,
+            algorithm="sha1",
+            locations=[self.url],
+            cache_dirs=[self.cache_dir],
+        ).fetch()
+        self.assertEqual(len(self.server.ranges), 1)
+        # files of their own, sharing a single copy of the content
+        self.assertFalse(os.path.samefile(foo_tarball, baz_tarball))
+        with open(foo_tarball, "rb") as foo, open(baz_tarball, "rb") as baz:
+            self.assertEqual(foo.read(), baz.read())
+        content_dir = os.path.join(store.path, "sha1", self.assethash[:2])
+        self.assertEqual(os.listdir(content_dir), [self.assethash])
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        super().tearDown()
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,104 @@
+import hashlib
+import http.server
+import json
+import os
+import unittest
+
+from avocado.utils import download
+from selftests.utils import TestCaseTmpDir, setup_avocado_loggers, start_http_server
+
+setup_avocado_loggers()
+
+
+class NoRangesHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
+    def log_message(self, *args):  # pylint: disable=W0221
+        pass
+
+
+class UrlDownloadResume(TestCaseTmpDir):
+    def setUp(self):
+        super().setUp()
+        self.served = os.path.join(self.tmpdir.name, "served")
+        os.makedirs(self.served)
+        self.content = os.urandom(64 * 1024)
+        with open(os.path.join(self.served, "file.img"), "wb") as served_file:
+            served_file.write(self.content)
+        self.hash = hashlib.sha1(self.content).hexdigest()
+        self.filename = os.path.join(self.tmpdir.name, "file.img")
+        self.journal = f"{self.filename}.journal"
+        self.server = None
+
+    def start_server(self, handler=None):
+        if handler is None:
+            self.server = start_http_server(self.served)
+        else:
+            self.server = start_http_server(self.served, handler)
+        return f"http://127.0.0.1:{self.server.server_port}/file.img"
+
+    def download(self, url, connections=1):
+        return download.url_download_resume(
+            url, self.filename, "sha1", connections=connections, chunk_size=4096
+        )
+
+    def assertDownloaded(self, file_hash):
+        self.assertEqual(file_hash, self.hash)
+        with open(self.filename, "rb") as downloaded:
+            self.assertEqual(downloaded.read(), self.content)
+        self.assertFalse(os.path.exists(self.journal))
+
+    def test_resume(self):
+        url = self.start_server()
+        self.server.limit = 10000
+        with self.assertRaises(OSError):
+            self.download(url)
+        with open(self.journal, encoding="utf-8") as journal_file:
+            self.assertEqual(json.load(journal_file)["ranges"], [[10000, 65536]])
+        self.server.limit = None
+        self.assertDownloaded(self.download(url))
+        self.assertEqual(self.server.ranges, [(0, 65536), (10000, 65536)])
+
+    def test_connections(self):
+        url = self.start_server()
+        self.server.limit = 10000
+        with self.assertRaises(OSError):
+            self.download(url, connections=4)
+        self.server.limit = None
+        self.assertDownloaded(self.download(url, connections=4))
+        self.assertEqual(
+            sorted(self.server.ranges),
+            [
+                (0, 16384),
+                (10000, 16384),
+                (16384, 32768),
+                (26384, 32768),
+                (32768, 49152),
+                (42768, 49152),
+                (49152, 65536),
+                (59152, 65536),
+            ],
+        )
+
+    def test_changed(self):
+        url = self.start_server()
+        self.server.limit = 10000
+        with self.assertRaises(OSError):
+            self.download(url)
+        # the file is not the same anymore
+        os.utime(os.path.join(self.served, "file.img"), (0, 0))
+        self.server.limit = None
+        self.assertDownloaded(self.download(url))
+        self.assertEqual(self.server.ranges, [(0, 65536), (0, 65536)])
+
+    def test_no_ranges(self):
+        url = self.start_server(NoRangesHTTPRequestHandler)
+        self.assertDownloaded(self.download(url))
+
+    def tearDown(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+        super().tearDown()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -42,6 +42,33 @@ class Parameters(unittest.TestCase):
         # Note: Different origin of the same value, which should produce
         # a crash, are tested in yaml2mux selftest
 
+    def test_compiled_paths(self):
+        params = parameters.AvocadoParams([tree.TreeNode()], ["/run"])
+        self.assertIs(
+            params._greedy_path_to_re("/foo/*"), params._greedy_path_to_re("/foo/*")
+        )
+
+    def test_indexes(self):
+        root = tree.TreeNode()
+        root.value = {"timeout": 1}
+        node_foo = root.get_node("/run/foo", True)
+        node_foo.value = {"foo": "foo", "name": "foo"}
+        node_bar = root.get_node("/run/bar", True)
+        node_bar.value = {"bar": "bar", "name": "bar"}
+        params = parameters.AvocadoParams([node_foo, node_bar], ["/run/*"])
+        other = parameters.AvocadoParams([node_foo, node_bar], ["/run/*"])
+        for _ in range(2):
+            self.assertEqual(params.get("timeout"), 1)
+            self.assertEqual(params.get("foo"), "foo")
+            self.assertEqual(params.get("bar", "/run/*"), "bar")
+            self.assertEqual(params.get("foo", "/run/bar"), None)
+            self.assertEqual(params.get("name", "/run/b*"), "bar")
+            self.assertEqual(params.get("missing", default="default"), "default")
+            with self.assertRaisesRegex(ValueError, "'name'.*/run/foo=>foo"):
+                params.get("name")
+        # the indexes built while getting parameters don't make a difference
+        self.assertEqual(params._rel_paths, other._rel_paths)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -3,8 +3,9 @@ Assets plugin unit tests
 """
 
 import ast
+import threading
 import unittest
-from unittest.mock import mock_open, patch
+from unittest.mock import Mock, mock_open, patch
 
 from avocado.plugins import assets
 
@@ -105,6 +106,104 @@ class AssetsPlugin(unittest.TestCase):
         self.assertEqual(expected_fail, fail)
 
 
+class AssetPrefetch(unittest.TestCase):
+    """
+    Unit tests for the concurrent fetch of the assets of many tests
+    """
+
+    CALLS = [
+        {
+            "name": "first.tar.gz",
+            "locations": ["https://localhost/first.tar.gz"],
+            "asset_hash": None,
+            "algorithm": None,
+            "expire": None,
+        },
+        {
+            "name": "second.tar.gz",
+            "locations": ["https://localhost/second.tar.gz"],
+            "asset_hash": None,
+            "algorithm": None,
+            "expire": "1d",
+        },
+    ]
+
+    @patch("avocado.plugins.assets.FetchAssetHandler")
+    def test_duplicates(self, mocked_fetch_asset_handler):
+        mocked_fetch_asset_handler.return_value.calls = self.CALLS
+        prefetch = assets.AssetPrefetch(cache_dirs=[])
+        first_keys = prefetch.add("first.py", {})
+        second_keys = prefetch.add("second.py", {})
+        self.assertEqual(first_keys, second_keys)
+        self.assertEqual(len(prefetch), 2)
+        with patch("avocado.plugins.assets.Asset") as mocked_asset:
+            success, fail = prefetch.wait()
+        self.assertEqual(mocked_asset.return_value.fetch.call_count, 2)
+        self.assertEqual(sorted(success), ["first.tar.gz", "second.tar.gz"])
+        self.assertEqual(fail, [])
+        self.assertEqual(
+            prefetch.get_results(second_keys), (["first.tar.gz", "second.tar.gz"], [])
+        )
+
+    @patch("avocado.plugins.assets.FetchAssetHandler")
+    def test_fail(self, mocked_fetch_asset_handler):
+        mocked_fetch_asset_handler.return_value.calls = self.CALLS
+        prefetch = assets.AssetPrefetch(cache_dirs=[])
+        keys = prefetch.add("test.py", {})
+
+        def fetch(asset):
+            if asset["name"] == "second.tar.gz":
+                raise OSError("Failed to fetch second.tar.gz.")
+
+        with patch("avocado.plugins.assets.Asset") as mocked_asset:
+            mocked_asset.side_effect = lambda **asset: Mock(
+                fetch=lambda timeout: fetch(asset)
+            )
+            success, fail = prefetch.get_results(keys)
+            prefetch.wait()
+        self.assertEqual(success, ["first.tar.gz"])
+        self.assertTrue(isinstance(fail[0], OSError))
+
+    @patch("avocado.plugins.assets.FetchAssetHandler")
+    def test_concurrent(self, mocked_fetch_asset_handler):
+        mocked_fetch_asset_handler.return_value.calls = self.CALLS
+        prefetch = assets.AssetPrefetch(workers=2, cache_dirs=[])
+        prefetch.add("test.py", {})
+        # each fetch only finishes when both are in progress
+        barrier = threading.Barrier(2, timeout=10)
+        with patch("avocado.plugins.assets.Asset") as mocked_asset:
+            mocked_asset.return_value.fetch.side_effect = lambda timeout: barrier.wait()
+            success, fail = prefetch.wait()
+        self.assertEqual(len(success), 2)
+        self.assertEqual(fail, [])
+
+    @patch("avocado.plugins.assets.FetchAssetHandler")
+    def test_are_fetched_cancel(self, mocked_fetch_asset_handler):
+        mocked_fetch_asset_handler.side_effect = lambda test_file, *_: Mock(
+            calls=self.CALLS[:1] if test_file == "first.py" else self.CALLS[1:]
+        )
+        prefetch = assets.AssetPrefetch(workers=1, cache_dirs=[])
+        first_keys = prefetch.add("first.py", {})
+        second_keys = prefetch.add("second.py", {})
+        released = threading.Event()
+        done = []
+        prefetch.add_done_callback(lambda: done.append(True))
+        with patch("avocado.plugins.assets.Asset") as mocked_asset:
+            mocked_asset.return_value.fetch.side_effect = lambda timeout: (
+                released.wait(10)
+            )
+            prefetch.start()
+            self.assertFalse(prefetch.are_fetched(first_keys))
+            # the first fetch is in progress, and the second one is pending
+            threading.Timer(0.1, released.set).start()
+            prefetch.cancel()
+        self.assertEqual(mocked_asset.return_value.fetch.call_count, 1)
+        self.assertTrue(prefetch.are_fetched(first_keys + second_keys))
+        self.assertEqual(prefetch.get_results(first_keys), (["first.tar.gz"], []))
+        # fetched or cancelled
+        self.assertEqual(len(done), 2)
+
+
 TEST_CLASS_SOURCE = r"""
 from avocado import Test
 
@@ -1,11 +1,19 @@
 import asyncio
+import os
+import signal
+import tempfile
 import unittest
 
 from avocado.core.nrunner.runnable import Runnable
 from avocado.core.nrunner.task import Task
 from avocado.core.spawners.mock import MockRandomAliveSpawner, MockSpawner
 from avocado.core.task.runtime import RuntimeTask
-from avocado.plugins.spawners.process import ProcessSpawner, ProcessSpawnerHandle
+from avocado.plugins.spawners.process import (
+    ProcessSpawner,
+    ProcessSpawnerHandle,
+    TaskServerProcess,
+)
+from selftests.utils import skipUnlessPathExists, temp_dir_prefix
 
 
 class Process(unittest.TestCase):
@@ -24,6 +32,73 @@ class Process(unittest.TestCase):
         self.assertFalse(self.spawner.is_task_alive(self.runtime_task))
 
 
+@unittest.skipUnless(hasattr(os, "fork"), "fork is not available")
+class ProcessPool(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory(prefix=temp_dir_prefix(self))
+        self.spawner = ProcessSpawner(config={"spawner.process.pool": True})
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+
+    def get_runtime_task(self, identifier, *args):
+        task = Task(Runnable("exec-test", *args, config={}), identifier)
+        task.setup_output_dir(os.path.join(self.tmpdir.name, identifier))
+        return RuntimeTask(task)
+
+    async def spawn_and_wait(self, runtime_task):
+        self.assertTrue(await self.spawner.spawn_task(runtime_task))
+        await self.spawner.wait_task(runtime_task)
+        return runtime_task.spawner_handle.process
+
+    @skipUnlessPathExists("/bin/true")
+    @skipUnlessPathExists("/bin/false")
+    def test_spawn_wait(self):
+        first, second = self.loop.run_until_complete(
+            asyncio.gather(
+                self.spawn_and_wait(self.get_runtime_task("1-true", "/bin/true")),
+                self.spawn_and_wait(self.get_runtime_task("2-false", "/bin/false")),
+            )
+        )
+        self.assertIsInstance(first, TaskServerProcess)
+        self.assertIsInstance(second, TaskServerProcess)
+        self.assertNotEqual(first.pid, second.pid)
+        # the exit code is the runner's, not the test's
+        self.assertEqual(first.returncode, 0)
+        self.assertEqual(second.returncode, 0)
+        self.assertEqual(len(self.spawner._task_servers), 1)
+
+    @skipUnlessPathExists("/bin/sleep")
+    def test_terminate(self):
+        runtime_task = self.get_runtime_task("1-sleep", "/bin/sleep", "60")
+
+        async def spawn_and_terminate():
+            self.assertTrue(await self.spawner.spawn_task(runtime_task))
+            self.assertTrue(self.spawner.is_task_alive(runtime_task))
+            return await self.spawner.terminate_task(runtime_task)
+
+        self.assertTrue(self.loop.run_until_complete(spawn_and_terminate()))
+        process = runtime_task.spawner_handle.process
+        self.assertEqual(process.returncode, -signal.SIGTERM)
+        with self.assertRaises(ProcessLookupError):
+            process.terminate()
+
+    @skipUnlessPathExists("/bin/true")
+    def test_close(self):
+        runtime_task = self.get_runtime_task("1-true", "/bin/true")
+        self.loop.run_until_complete(self.spawn_and_wait(runtime_task))
+        procs = self.spawner._task_servers_procs
+        directory = self.spawner._task_servers_dir.name
+        self.loop.run_until_complete(self.spawner.close())
+        self.assertEqual([proc.returncode for proc in procs], [0])
+        self.assertFalse(os.path.exists(directory))
+        self.assertEqual(self.spawner._task_servers, {})
+
+    def tearDown(self):
+        self.loop.run_until_complete(self.spawner.close())
+        self.loop.close()
+        self.tmpdir.cleanup()
+
+
 class MockProcessFinishQuickly:
     async def wait(self):
         return 0
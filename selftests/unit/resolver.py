@@ -1,8 +1,10 @@
 import os
+import pickle
 import stat
 import unittest.mock
 
 from avocado.core import resolver
+from avocado.core.settings import settings
 from avocado.utils import script
 
 #: What is commonly known as "0664" or "u=rw,g=rw,o=r"
@@ -309,3 +311,57 @@ class Resolver(unittest.TestCase):
             "selftests/.data/safeloader/data/double_import.py:Test4.test4",
         ]
         self._check(exps, result[0].resolutions)
+
+    def test_parallel(self):
+        config = settings.as_dict()
+        config["resolver.safeloader_cache"] = False
+        references = [
+            os.path.join("selftests", ".data", "safeloader", "data"),
+            os.path.join("examples", "tests"),
+        ]
+        expected = resolver.resolve(references, config=config)
+        config["resolver.parallel"] = 2
+        with unittest.mock.patch.object(
+            resolver, "PARALLEL_RESOLUTION_BATCH_SIZE", 4
+        ), unittest.mock.patch.object(
+            resolver,
+            "_iter_resolve_in_parallel",
+            wraps=resolver._iter_resolve_in_parallel,
+        ) as resolve_in_parallel, unittest.mock.patch.object(
+            resolver, "LOG"
+        ) as log:
+            result = resolver.resolve(references, config=config)
+        resolve_in_parallel.assert_called_once()
+        # no batch was resolved out of the pool
+        self.assertEqual(log.debug.call_count, 1)
+        self.assertEqual(
+            [(res.reference, res.result, res.origin) for res in result],
+            [(res.reference, res.result, res.origin) for res in expected],
+        )
+        self.assertEqual(
+            [[runnable.uri for runnable in res.resolutions] for res in result],
+            [[runnable.uri for runnable in res.resolutions] for res in expected],
+        )
+
+    def test_check_missing_references(self):
+        found = resolver.ReferenceResolution(
+            "found.py", resolver.ReferenceResolutionResult.SUCCESS
+        )
+        not_found = resolver.ReferenceResolution(
+            "not_found.py", resolver.ReferenceResolutionResult.NOTFOUND
+        )
+        resolver.check_missing_references(["found.py", "examples"], [found, not_found])
+        with self.assertRaises(
+            resolver.JobTestSuiteReferenceResolutionError
+        ) as context:
+            resolver.check_missing_references(
+                ["found.py", "not_found.py", "missing.py"], [found, not_found]
+            )
+        self.assertIn(
+            "No tests found for given test references: not_found.py, missing.py",
+            str(context.exception),
+        )
+
+    def test_result_pickle(self):
+        for result in resolver.ReferenceResolutionResult:
+            self.assertIs(pickle.loads(pickle.dumps(result)), result)
@@ -155,6 +155,8 @@ class RunnableFromRecipe(unittest.TestCase):
                     "run.keep_tmp",
                     "runner.exectest.exitcodes.skip",
                     "runner.exectest.clear_env",
+                    "runner.heartbeat.interval",
+                    "runner.heartbeat.max_interval",
                     "runner.identifier_format",
                 ]
             ),
@@ -1,8 +1,15 @@
+import os
 import sys
+import tempfile
+import threading
 import unittest
+from unittest.mock import Mock, patch
 
-from avocado.core.nrunner.runnable import Runnable
-from selftests.utils import skipUnlessPathExists
+from avocado.core.nrunner import runnable as runnable_module
+from avocado.core.nrunner.runnable import Runnable, RunnerCapabilitiesCache
+from avocado.core.nrunner.runner import Heartbeat
+from avocado.plugins.runners.noop import NoOpRunner
+from selftests.utils import skipUnlessPathExists, temp_dir_prefix
 
 
 class Runner(unittest.TestCase):
@@ -204,3 +211,114 @@ class PickRunner(unittest.TestCase):
 
     def test_pick_runner_command_empty(self):
         self.assertFalse(Runnable.pick_runner_command(self.kind, {}))
+
+
+class RunnerCapabilitiesCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory(prefix=temp_dir_prefix(self))
+        self.cache = RunnerCapabilitiesCache(
+            os.path.join(self.tmpdir.name, "cache", "capabilities.json")
+        )
+        self.runner = os.path.join(self.tmpdir.name, "avocado-runner-mykind")
+        with open(self.runner, "w", encoding="utf-8") as runner:
+            runner.write('#!/bin/sh\necho \'{"runnables": ["mykind"]}\'\n')
+        os.chmod(self.runner, 0o755)
+        self.capabilities = {"runnables": ["mykind"]}
+
+    def test_set_get(self):
+        self.assertIsNone(self.cache.get([self.runner]))
+        self.cache.set([self.runner], self.capabilities)
+        self.assertEqual(self.cache.get([self.runner]), self.capabilities)
+        self.assertIn(self.runner, self.cache.get_all())
+        self.cache.clear()
+        self.assertIsNone(self.cache.get([self.runner]))
+
+    def test_stale(self):
+        self.cache.set([self.runner], self.capabilities)
+        stat = os.stat(self.runner)
+        os.utime(self.runner, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+        self.assertIsNone(self.cache.get([self.runner]))
+        self.cache.set([self.runner], self.capabilities)
+        with patch.object(runnable_module, "VERSION", "0.0"):
+            self.assertIsNone(self.cache.get([self.runner]))
+
+    def test_stale_entry_point_module(self):
+        module_path = os.path.join(self.tmpdir.name, "mykind_runner.py")
+        with open(module_path, "w", encoding="utf-8") as module:
+            module.write("CAPABILITIES = {}\n")
+        entry_point = Mock(module_name="mykind_runner")
+        with patch.object(sys, "path", [self.tmpdir.name] + sys.path), patch.object(
+            runnable_module.pkg_resources,
+            "iter_entry_points",
+            return_value=[entry_point],
+        ):
+            self.cache.set([self.runner], self.capabilities)
+            self.assertEqual(self.cache.get([self.runner]), self.capabilities)
+            # the runner module is changed, but not its console script
+            stat = os.stat(module_path)
+            os.utime(module_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+            self.assertIsNone(self.cache.get([self.runner]))
+
+    def test_not_cacheable(self):
+        for runner_command in (["sh", "-c", "true"], ["/does/not/exist"]):
+            self.cache.set(runner_command, self.capabilities)
+            self.assertIsNone(self.cache.get(runner_command))
+
+    @skipUnlessPathExists("/bin/sh")
+    def test_get_capabilities_from_runner_command(self):
+        with patch.object(
+            runnable_module, "RunnerCapabilitiesCache", return_value=self.cache
+        ), patch.object(
+            Runnable, "_probe_capabilities", wraps=Runnable._probe_capabilities
+        ) as probe:
+            for _ in range(2):
+                self.assertEqual(
+                    Runnable.get_capabilities_from_runner_command([self.runner]),
+                    self.capabilities,
+                )
+            probe.assert_called_once()
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+
+class HeartbeatTest(unittest.TestCase):
+    def test_adaptive_interval(self):
+        heartbeat = Heartbeat(0.0, 0.0)
+        self.assertTrue(heartbeat.is_due())
+        heartbeat = Heartbeat(60.0, 240.0)
+        self.assertFalse(heartbeat.is_due())
+        heartbeat._next = 0
+        self.assertTrue(heartbeat.is_due())
+        self.assertEqual(heartbeat._current_interval, 120.0)
+        heartbeat._next = 0
+        self.assertTrue(heartbeat.is_due())
+        heartbeat._next = 0
+        self.assertTrue(heartbeat.is_due())
+        self.assertEqual(heartbeat._current_interval, 240.0)
+        heartbeat.reset()
+        self.assertEqual(heartbeat._current_interval, 60.0)
+        self.assertFalse(heartbeat.is_due())
+
+    def test_from_config(self):
+        heartbeat = Heartbeat.from_config(
+            {"runner.heartbeat.interval": 1, "runner.heartbeat.max_interval": None}
+        )
+        self.assertEqual(heartbeat.interval, 1.0)
+        self.assertEqual(heartbeat.max_interval, 5.0)
+
+    def test_running_loop_wait(self):
+        finished = threading.Event()
+        timeouts = []
+
+        def wait(timeout):
+            timeouts.append(timeout)
+            finished.set()
+
+        heartbeat = Heartbeat(60.0, 60.0)
+        running = list(NoOpRunner().running_loop(finished.is_set, heartbeat, wait))
+        self.assertEqual(running, [])
+        self.assertEqual(len(timeouts), 1)
+        self.assertGreater(timeouts[0], 59.0)
+        heartbeat._next = 0
+        self.assertEqual(heartbeat.get_remaining(), 0.0)
@@ -0,0 +1,135 @@
+import os
+import unittest.mock
+
+from avocado.core.safeloader import cache, core
+from selftests.utils import TestCaseTmpDir, setup_avocado_loggers
+
+setup_avocado_loggers()
+
+
+PARENT = """from avocado import Test
+
+class Parent(Test):
+    '''
+    :avocado: tags=parent
+    '''
+    def test_parent(self):
+        pass
+"""
+
+CHILD = """from parent import Parent
+
+class Child(Parent):
+    '''
+    :avocado: tags=child,arch:x86_64
+    '''
+    def test_child(self):
+        '''
+        :avocado: dependency={"type": "package", "name": "foo"}
+        '''
+
+class Disabled(Parent):
+    '''
+    :avocado: disable
+    '''
+"""
+
+
+class SafeloaderCache(TestCaseTmpDir):
+    def setUp(self):
+        super().setUp()
+        self.parent = self._write("parent.py", PARENT)
+        self.child = self._write("child.py", CHILD)
+        self.cache = cache.SafeloaderCache(os.path.join(self.tmpdir.name, "cache"))
+        # created beforehand, as adding to the directory of the source files
+        # would invalidate the entries, as a module could show up there
+        os.makedirs(self.cache.path)
+
+    def _write(self, name, content, mtime_ns=None):
+        path = os.path.join(self.tmpdir.name, name)
+        with open(path, "w", encoding="utf-8") as source_file:
+            source_file.write(content)
+        if mtime_ns is not None:
+            os.utime(path, ns=(mtime_ns, mtime_ns))
+        return path
+
+    def _find(self):
+        with unittest.mock.patch(
+            "avocado.core.safeloader.core._find_python_tests",
+            wraps=core._find_python_tests,
+        ) as find:
+            result = core.find_avocado_tests(self.child, self.cache)
+        return result, find.called
+
+    def test_hit(self):
+        uncached = core.find_avocado_tests(self.child)
+        result, examined = self._find()
+        self.assertTrue(examined)
+        self.assertEqual(result, uncached)
+        result, examined = self._find()
+        self.assertFalse(examined)
+        self.assertEqual(result, uncached)
+        self.assertEqual(
+            result[0]["Child"][0],
+            (
+                "test_child",
+                {"child": None, "arch": {"x86_64"}, "parent": None},
+                [{"type": "package", "name": "foo"}],
+            ),
+        )
+        self.assertEqual(result[1], {"Disabled"})
+        entries = self.cache.get_all()
+        self.assertEqual(len(entries), 1)
+        examined = [stamp[0] for stamp in entries[0]["files"]]
+        self.assertIn(self.child, examined)
+        self.assertIn(self.parent, examined)
+
+    def test_changed_file(self):
+        self._find()
+        self._write("child.py", CHILD.replace("test_child", "test_renamed"))
+        result, examined = self._find()
+        self.assertTrue(examined)
+        self.assertEqual(result[0]["Child"][0][0], "test_renamed")
+
+    def test_changed_parent(self):
+        self._find()
+        stat = os.stat(self.parent)
+        # same size and modification time, so that only the content differs
+        self._write(
+            "parent.py",
+            PARENT.replace("test_parent", "test_change"),
+            stat.st_mtime_ns + 1,
+        )
+        result, examined = self._find()
+        self.assertTrue(examined)
+        self.assertEqual(result[0]["Child"][1][0], "test_change")
+
+    def test_touched_file(self):
+        self._find()
+        stat = os.stat(self.child)
+        self._write("child.py", CHILD, stat.st_mtime_ns + 10**9)
+        _, examined = self._find()
+        self.assertFalse(examined)
+
+    def test_missing_module(self):
+        self._write("child.py", CHILD.replace("from parent", "from missing"))
+        result, _ = self._find()
+        self.assertEqual(result[0], {})
+        # the module imported shows up later
+        self._write("missing.py", PARENT)
+        result, examined = self._find()
+        self.assertTrue(examined)
+        self.assertIn("Child", result[0])
+
+    def test_clear_disabled(self):
+        self._find()
+        self.cache.clear()
+        self.assertEqual(self.cache.get_all(), [])
+        disabled = cache.SafeloaderCache()
+        disabled.path = None
+        core.find_avocado_tests(self.child, disabled)
+        self.assertEqual(disabled.get_all(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+import os
+import unittest.mock
+
+from avocado.core import resolver
+from avocado.core.safeloader import core, index
+from avocado.core.settings import settings
+from selftests.utils import TestCaseTmpDir, setup_avocado_loggers
+
+setup_avocado_loggers()
+
+
+PARENT = """import unittest
+
+from avocado import Test
+
+class Parent(Test):
+    def test_parent(self):
+        pass
+
+class UnitParent(unittest.TestCase):
+    def test_unit_parent(self):
+        pass
+"""
+
+CHILD = """from parent import Parent
+
+class Child(Parent):
+    def test_child(self):
+        pass
+"""
+
+UNIT_CHILD = """from parent import UnitParent
+
+class UnitChild(UnitParent):
+    def test_unit_child(self):
+        pass
+"""
+
+
+class ModuleIndex(TestCaseTmpDir):
+    def setUp(self):
+        super().setUp()
+        self.parent = self._write("parent.py", PARENT)
+        self.child = self._write("child.py", CHILD)
+        self.unit_child = self._write("unit_child.py", UNIT_CHILD)
+
+    def _write(self, name, content):
+        path = os.path.join(self.tmpdir.name, name)
+        with open(path, "w", encoding="utf-8") as source_file:
+            source_file.write(content)
+        return path
+
+    def test_parse_once(self):
+        avocado_tests = core.find_avocado_tests(self.child)
+        unittests = core.find_python_unittests(self.child)
+        with index.ModuleIndex.session() as module_index:
+            self.assertEqual(core.find_avocado_tests(self.child), avocado_tests)
+            self.assertEqual(core.find_python_unittests(self.child), unittests)
+        self.assertEqual(module_index.parse_counts[self.child], 1)
+        self.assertEqual(module_index.parse_counts[self.parent], 1)
+        self.assertEqual(max(module_index.parse_counts.values()), 1)
+        self.assertGreater(module_index.reused, 0)
+        self.assertEqual(
+            [name for name, _, _ in avocado_tests[0]["Child"]],
+            ["test_child", "test_parent"],
+        )
+
+    def test_session(self):
+        self.assertIsNone(index.ModuleIndex.get_active())
+        with index.ModuleIndex.session() as module_index:
+            self.assertIs(index.ModuleIndex.get_active(), module_index)
+            with index.ModuleIndex.session() as nested:
+                self.assertIs(nested, module_index)
+            self.assertIs(index.ModuleIndex.get_active(), module_index)
+        self.assertIsNone(index.ModuleIndex.get_active())
+
+    def test_resolve(self):
+        config = settings.as_dict()
+        config["resolver.safeloader_cache"] = False
+        with unittest.mock.patch(
+            "avocado.core.safeloader.index.parse", wraps=index.parse
+        ) as parse:
+            resolutions = resolver.resolve([self.child, self.unit_child], config=config)
+        # the second file is looked at by both resolvers, and both
+        # look at the parent module
+        parsed = [call.args[0] for call in parse.call_args_list]
+        self.assertEqual(sorted(set(parsed)), sorted(parsed))
+        self.assertIn(self.child, parsed)
+        self.assertIn(self.unit_child, parsed)
+        self.assertIn(self.parent, parsed)
+        origins = {
+            resolution.origin
+            for resolution in resolutions
+            if resolution.result == resolver.ReferenceResolutionResult.SUCCESS
+        }
+        self.assertIn("avocado-instrumented", origins)
+        self.assertIn("python-unittest", origins)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,13 @@
+import asyncio
+import os
+import tempfile
+import tracemalloc
 from unittest import TestCase
 
 from avocado.core.status import repo, utils
+from selftests.utils import temp_dir_prefix
+
+JOB_ID = "0000000000000000000000000000000000000000"
 
 
 class StatusRepo(TestCase):
@@ -116,6 +123,35 @@ class StatusRepo(TestCase):
             {"status": "running", "time": 1597894378.6103745},
         )
 
+    def test_coalesce_heartbeats(self):
+        for time, msg_type in ((1.0, None), (2.0, None), (3.0, "stdout"), (4.0, None)):
+            msg = {
+                "id": "1-foo",
+                "status": "running",
+                "time": time,
+                "job_id": "0000000000000000000000000000000000000000",
+            }
+            if msg_type is not None:
+                msg.update({"type": msg_type, "log": b"out"})
+            self.status_repo.process_message(msg)
+        for time in (5.0, 6.0):
+            msg = {
+                "id": "1-foo",
+                "status": "running",
+                "time": time,
+                "job_id": "0000000000000000000000000000000000000000",
+            }
+            self.status_repo.process_message(msg)
+        self.assertEqual(
+            self.status_repo.get_all_task_data("1-foo"),
+            [
+                {"status": "running", "time": 2.0},
+                {"status": "running", "time": 3.0, "type": "stdout", "log": b"out"},
+                {"status": "running", "time": 6.0},
+            ],
+        )
+        self.assertEqual(self.status_repo._status["1-foo"], ("running", 6.0))
+
     def test_task_status_time(self):
         msg = {
             "id": "1-foo",
@@ -172,6 +208,8 @@ class StatusRepo(TestCase):
         msg = {
             "id": "1-foo",
             "status": "running",
+            "type": "log",
+            "log": b"still running",
             "time": 1000000002.0,
             "job_id": "0000000000000000000000000000000000000000",
         }
@@ -211,3 +249,195 @@ class StatusRepo(TestCase):
         )
         with self.assertRaises(IndexError):
             self.status_repo.status_journal_summary_pop()
+
+    def test_get_result_set_for_tasks(self):
+        for task_id, result in (
+            ("1-foo", "pass"),
+            ("2-bar", "fail"),
+            ("3-baz", "skip"),
+        ):
+            msg = {
+                "id": task_id,
+                "status": "finished",
+                "result": result,
+                "job_id": "0000000000000000000000000000000000000000",
+            }
+            self.status_repo.process_message(msg)
+        self.assertEqual(
+            self.status_repo.get_result_set_for_tasks(["1-foo", "2-bar"]),
+            {"pass", "fail"},
+        )
+        self.assertEqual(self.status_repo.get_result_set_for_tasks(["4-qux"]), set())
+
+    def test_wait_task_result(self):
+        loop = asyncio.new_event_loop()
+        self.addCleanup(loop.close)
+        msg = {
+            "id": "1-foo",
+            "status": "finished",
+            "time": 1000000004.0,
+            "result": "pass",
+            "job_id": "0000000000000000000000000000000000000000",
+        }
+        waiter = loop.create_task(self.status_repo.wait_task_result("1-foo"))
+        loop.call_soon(self.status_repo.process_message, msg)
+        latest = loop.run_until_complete(asyncio.wait_for(waiter, 5))
+        self.assertEqual(latest["result"], "pass")
+        # result is already available, so it should not wait at all
+        latest = loop.run_until_complete(self.status_repo.wait_task_result("1-foo"))
+        self.assertEqual(latest["result"], "pass")
+
+    def test_status_journal_summary_get(self):
+        loop = asyncio.new_event_loop()
+        self.addCleanup(loop.close)
+        msg = {
+            "id": "1-foo",
+            "status": "running",
+            "time": 1000000001.0,
+            "job_id": "0000000000000000000000000000000000000000",
+        }
+        getter = loop.create_task(self.status_repo.status_journal_summary_get())
+        loop.call_soon(self.status_repo.process_message, msg)
+        self.assertEqual(
+            loop.run_until_complete(asyncio.wait_for(getter, 5)),
+            (1000000001.0, "1-foo", "running", 0),
+        )
+
+    def test_wait_status_journal_summary_drained(self):
+        loop = asyncio.new_event_loop()
+        self.addCleanup(loop.close)
+        msg = {
+            "id": "1-foo",
+            "status": "running",
+            "time": 1000000001.0,
+            "job_id": "0000000000000000000000000000000000000000",
+        }
+        self.status_repo.process_message(msg)
+        drained = loop.create_task(
+            self.status_repo.wait_status_journal_summary_drained()
+        )
+        loop.call_soon(self.status_repo.status_journal_summary_pop)
+        loop.run_until_complete(asyncio.wait_for(drained, 5))
+        with self.assertRaises(IndexError):
+            self.status_repo.status_journal_summary_pop()
+
+
+class StatusRepoJournal(TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory(prefix=temp_dir_prefix(self))
+        self.journal_path = os.path.join(self.tmpdir.name, "status_journal")
+
+    def get_status_repo(self, max_memory=repo.STATUS_REPO_MAX_MEMORY):
+        status_repo = repo.StatusRepo(JOB_ID, self.journal_path, max_memory)
+        self.addCleanup(status_repo.close)
+        return status_repo
+
+    @staticmethod
+    def process_output(status_repo, task_id, time, log):
+        status_repo.process_message(
+            {
+                "id": task_id,
+                "status": "running",
+                "type": "stdout",
+                "log": log,
+                "time": time,
+                "job_id": JOB_ID,
+            }
+        )
+
+    def test_get_task_data(self):
+        # no room for caching anything but the latest message
+        status_repo = self.get_status_repo(max_memory=0)
+        for time in range(1, 4):
+            self.process_output(status_repo, "1-foo", float(time), b"\x00" * time)
+        self.process_output(status_repo, "2-bar", 4.0, b"bar")
+        self.assertEqual(
+            status_repo.get_task_data("1-foo", 0),
+            {"status": "running", "type": "stdout", "log": b"\x00", "time": 1.0},
+        )
+        self.assertEqual(status_repo.get_task_data("1-foo", 2)["log"], b"\x00" * 3)
+        self.assertEqual(status_repo.get_task_data("1-foo", -1)["time"], 3.0)
+        self.assertEqual(status_repo.get_latest_task_data("2-bar")["log"], b"bar")
+        self.assertEqual(
+            [data["time"] for data in status_repo.get_all_task_data("1-foo")],
+            [1.0, 2.0, 3.0],
+        )
+        with self.assertRaises(IndexError):
+            status_repo.get_task_data("1-foo", 3)
+        self.assertIsNone(status_repo.get_all_task_data("3-baz"))
+        self.assertIsNone(status_repo.get_latest_task_data("3-baz"))
+
+    def test_append(self):
+        status_repo = self.get_status_repo()
+        self.process_output(status_repo, "1-foo", 1.0, b"foo")
+        status_repo.close()
+        # a repo for a different suite of the same job reuses the journal
+        status_repo = self.get_status_repo(max_memory=0)
+        self.process_output(status_repo, "1-foo", 2.0, b"foo")
+        self.process_output(status_repo, "1-foo", 3.0, b"foo")
+        self.assertEqual(status_repo.get_task_data("1-foo", 0)["time"], 2.0)
+        status_repo.close()
+        with open(self.journal_path, "rb") as journal:
+            frames = journal.read()
+        messages = []
+        while frames:
+            _, size = utils.FRAME_HEADER.unpack_from(frames)
+            body = frames[utils.FRAME_HEADER.size : utils.FRAME_HEADER.size + size]
+            messages.extend(utils.frame_decode(body))
+            frames = frames[utils.FRAME_HEADER.size + size :]
+        self.assertEqual([message["time"] for message in messages], [1.0, 2.0, 3.0])
+        self.assertEqual(set(message["id"] for message in messages), {"1-foo"})
+
+    def test_coalesce_heartbeats(self):
+        # no room for caching anything but the latest message
+        status_repo = self.get_status_repo(max_memory=0)
+
+        def process_heartbeat(task_id, time):
+            status_repo.process_message(
+                {"id": task_id, "status": "running", "time": time, "job_id": JOB_ID}
+            )
+
+        process_heartbeat("1-foo", 1.0)
+        # the last frame in the journal is rewritten
+        process_heartbeat("1-foo", 2.0)
+        self.process_output(status_repo, "2-bar", 2.5, b"bar")
+        # the frame is not the last one anymore, so a new one is appended
+        process_heartbeat("1-foo", 3.0)
+        self.process_output(status_repo, "1-foo", 4.0, b"foo")
+        self.assertEqual(
+            [data["time"] for data in status_repo.get_all_task_data("1-foo")],
+            [3.0, 4.0],
+        )
+        status_repo.close()
+        with open(self.journal_path, "rb") as journal:
+            frames = journal.read()
+        times = []
+        while frames:
+            _, size = utils.FRAME_HEADER.unpack_from(frames)
+            body = frames[utils.FRAME_HEADER.size : utils.FRAME_HEADER.size + size]
+            times.extend(message["time"] for message in utils.frame_decode(body))
+            frames = frames[utils.FRAME_HEADER.size + size :]
+        # the first frame is the one left unused
+        self.assertEqual(times, [2.0, 2.5, 3.0, 4.0])
+
+    def test_bounded_memory(self):
+        status_repo = self.get_status_repo(max_memory=2**16)
+
+        def process(start, count):
+            for number in range(start + 1, start + count + 1):
+                log = number.to_bytes(4, "big") * 1024
+                self.process_output(status_repo, f"{number % 10}-foo", number, log)
+                status_repo.status_journal_summary_pop()
+
+        tracemalloc.start()
+        self.addCleanup(tracemalloc.stop)
+        process(0, 1000)
+        before, _ = tracemalloc.get_traced_memory()
+        process(1000, 10000)
+        after, _ = tracemalloc.get_traced_memory()
+        # keeping the messages in memory would take over 40MiB, while the
+        # journal index takes 16 bytes per message
+        self.assertLess(after - before, 2**20)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
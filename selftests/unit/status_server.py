@@ -0,0 +1,153 @@
+import asyncio
+import os
+import socket
+import tempfile
+import time
+import unittest
+
+from avocado.core.nrunner.task import STATUS_HANDSHAKE_TIMEOUT, TaskStatusService
+from avocado.core.status.repo import StatusRepo
+from avocado.core.status.server import StatusServer
+
+JOB_ID = "0000000000000000000000000000000000000000"
+
+
+class StatusServerClient(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory(prefix="avocado_" + __name__)
+        self.uri = os.path.join(self.tmpdir.name, ".status_server.sock")
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        self.repo = StatusRepo(JOB_ID)
+        self.server = StatusServer(self.uri, self.repo)
+        self.loop.run_until_complete(self.server.create_server())
+
+    def tearDown(self):
+        self.server.close()
+        self.loop.close()
+        self.tmpdir.cleanup()
+
+    def post_messages(self, use_frames):
+        def client():
+            service = TaskStatusService(self.uri, use_frames=use_frames)
+            if use_frames:
+                timeout = time.monotonic() + 5
+                while not service._frames and time.monotonic() < timeout:
+                    service._check_handshake_reply()
+                    time.sleep(0.01)
+            for index in range(10):
+                service.post(
+                    {
+                        "id": "1-foo",
+                        "job_id": JOB_ID,
+                        "status": "running",
+                        "type": "stdout",
+                        "log": f"line {index}\n".encode(),
+                        "time": float(index),
+                    }
+                )
+            service.post(
+                {
+                    "id": "1-foo",
+                    "job_id": JOB_ID,
+                    "status": "finished",
+                    "result": "pass",
+                    "time": 10.0,
+                }
+            )
+            framed = service._frames
+            service.close()
+            return framed
+
+        framed = self.loop.run_until_complete(self.loop.run_in_executor(None, client))
+        self.loop.run_until_complete(
+            asyncio.wait_for(self.repo.wait_task_result("1-foo"), 5)
+        )
+        return framed
+
+    def check_messages(self):
+        data = self.repo.get_all_task_data("1-foo")
+        self.assertEqual(len(data), 11)
+        self.assertEqual(
+            b"".join(message["log"] for message in data[:10]),
+            b"".join(f"line {index}\n".encode() for index in range(10)),
+        )
+        self.assertEqual(data[-1]["result"], "pass")
+
+    def test_frames(self):
+        self.assertTrue(self.post_messages(use_frames=True))
+        self.check_messages()
+
+    def test_json_lines(self):
+        self.assertFalse(self.post_messages(use_frames=False))
+        self.check_messages()
+
+    def test_close_before_handshake_reply(self):
+        def client():
+            service = TaskStatusService(self.uri)
+            service.post(
+                {
+                    "id": "1-foo",
+                    "job_id": JOB_ID,
+                    "status": "started",
+                    "output_dir": self.tmpdir.name,
+                    "time": 0.0,
+                }
+            )
+            service.post(
+                {
+                    "id": "1-foo",
+                    "job_id": JOB_ID,
+                    "status": "finished",
+                    "result": "pass",
+                    "time": 1.0,
+                }
+            )
+            # not checking the handshake reply, a short lived client closes
+            # the connection while the server may have not read anything
+            service.close()
+
+        self.loop.run_until_complete(self.loop.run_in_executor(None, client))
+        data = self.loop.run_until_complete(
+            asyncio.wait_for(self.repo.wait_task_result("1-foo"), 5)
+        )
+        self.assertEqual(data["result"], "pass")
+
+    def test_output_not_held(self):
+        def client():
+            service = TaskStatusService(self.uri)
+            service._check_handshake_reply(5)
+            heartbeat = {"id": "1-foo", "job_id": JOB_ID, "status": "running"}
+            service.post(heartbeat)
+            held = len(service._pending)
+            service.post(dict(heartbeat, type="stdout", log=b"output\n"))
+            sent = not service._pending
+            service.close()
+            return held, sent
+
+        held, sent = self.loop.run_until_complete(
+            self.loop.run_in_executor(None, client)
+        )
+        self.assertEqual(held, 1)
+        self.assertTrue(sent)
+
+
+class StatusServerWithoutFrames(unittest.TestCase):
+    def test_close(self):
+        with tempfile.TemporaryDirectory(prefix="avocado_" + __name__) as tmpdir:
+            uri = os.path.join(tmpdir, ".status_server.sock")
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+                server.bind(uri)
+                server.listen()
+                service = TaskStatusService(uri)
+                service.post({"id": "1-foo", "job_id": JOB_ID, "status": "running"})
+                # the server never replies to the handshake, as older ones
+                start = time.monotonic()
+                service.close()
+                self.assertLess(
+                    time.monotonic() - start, STATUS_HANDSHAKE_TIMEOUT + 0.5
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -17,3 +17,34 @@ class JSON(TestCase):
     def test_loads_base64(self):
         data = '{"__base64_encoded__": "dGhpcyBpcyBob3cgd2UgZW5jb2RlIGJ5dGVz"}'
         self.assertEqual(utils.json_loads(data), b"this is how we encode bytes")
+
+
+class Frame(TestCase):
+    def test_encode_decode(self):
+        messages = [
+            {"id": "1-foo", "status": "started", "time": 1.0},
+            {
+                "id": "1-foo",
+                "status": "running",
+                "type": "stdout",
+                "log": b"\x00\xffraw bytes\n",
+            },
+            {"id": "1-foo", "status": "finished", "result": "pass"},
+        ]
+        frame = utils.frame_encode(messages)
+        marker, size = utils.FRAME_HEADER.unpack_from(frame)
+        self.assertEqual(marker, utils.FRAME_MARKER)
+        self.assertEqual(size, len(frame) - utils.FRAME_HEADER.size)
+        self.assertEqual(utils.frame_decode(frame[utils.FRAME_HEADER.size :]), messages)
+
+    def test_raw_payload(self):
+        payload = b"x" * 4096
+        frame = utils.frame_encode([{"log": payload}])
+        # no base64 encoding, so the payload is carried as is
+        self.assertIn(payload, frame)
+        self.assertLess(len(frame), len(payload) + 64)
+
+    def test_decode_invalid(self):
+        frame = utils.frame_encode([{"log": b"abc"}])
+        with self.assertRaises(utils.StatusMsgInvalidFrameError):
+            utils.frame_decode(frame[utils.FRAME_HEADER.size : -1])
@@ -1,7 +1,9 @@
 import tempfile
 import unittest.mock
 
-from avocado.core.suite import TestSuite
+from avocado.core.nrunner.runnable import Runnable
+from avocado.core.suite import TestSuite, TestVariants
+from avocado.core.tree import TreeNode
 from avocado.utils import path as utils_path
 from selftests.utils import setup_avocado_loggers, temp_dir_prefix
 
@@ -96,9 +98,77 @@ class TestSuiteTest(unittest.TestCase):
         runnable = suite.tests[0]
         self.assertEqual(runnable.config.get("runner.identifier_format"), "nothing-op")
 
+    def test_test_parameters(self):
+        config = {
+            "resolver.references": [
+                "examples/nrunner/recipes/runnable/noop.json",
+            ],
+            "run.test_parameters": [("foo", "bar")],
+        }
+        suite = TestSuite.from_config(config)
+        self.assertEqual(len(suite.tests), 1)
+        self.assertEqual(
+            suite.tests[0].variant["variant"], [("/", [("/", "foo", "bar")])]
+        )
+
     def tearDown(self):
         self.tmpdir.cleanup()
 
 
+class TestVariantsTest(unittest.TestCase):
+    def setUp(self):
+        self.runnables = [Runnable("noop", f"test_{index}") for index in range(3)]
+        self.variants = []
+        for index in range(2):
+            node = TreeNode(f"variant_{index}", {"index": index})
+            self.variants.append(
+                {"variant": [node], "variant_id": f"variant_{index}", "paths": ["/"]}
+            )
+
+    def test_variants_per_test(self):
+        tests = TestVariants(self.runnables, self.variants)
+        self.assertEqual(len(tests), 6)
+        self.assertEqual(
+            [(test.uri, test.variant["variant_id"]) for test in tests],
+            [
+                ("test_0", "variant_0"),
+                ("test_0", "variant_1"),
+                ("test_1", "variant_0"),
+                ("test_1", "variant_1"),
+                ("test_2", "variant_0"),
+                ("test_2", "variant_1"),
+            ],
+        )
+
+    def test_tests_per_variant(self):
+        tests = TestVariants(self.runnables, self.variants, True)
+        self.assertEqual(
+            [(test.uri, test.variant["variant_id"]) for test in tests[:4]],
+            [
+                ("test_0", "variant_0"),
+                ("test_1", "variant_0"),
+                ("test_2", "variant_0"),
+                ("test_0", "variant_1"),
+            ],
+        )
+        self.assertEqual(tests[-1].uri, "test_2")
+        self.assertEqual(tests[-1].variant["variant_id"], "variant_1")
+        with self.assertRaises(IndexError):
+            tests[6]  # pylint: disable=W0104
+
+    def test_shared(self):
+        tests = TestVariants(self.runnables, self.variants)
+        # tests are only created once, so that changes to them are kept
+        self.assertIs(tests[0], tests[0])
+        tests[0].output_dir = "/output"
+        self.assertEqual(tests[0].output_dir, "/output")
+        self.assertIsNone(self.runnables[0].output_dir)
+        self.assertIsNone(self.runnables[0].variant)
+        # a variant is serialized only once
+        self.assertIs(tests[0].variant, tests[2].variant)
+        self.assertIsNot(tests[0].variant, tests[1].variant)
+        self.assertIs(tests[0].config, tests[1].config)
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,109 @@
+import json
+import os
+import unittest
+
+from avocado.core.nrunner.runnable import Runnable
+from avocado.core.nrunner.task import Task
+from avocado.core.task import durations
+from avocado.core.task.runtime import RuntimeTask
+from avocado.core.test_id import TestID
+from selftests.utils import TestCaseTmpDir
+
+
+def get_runtime_task(index, name, dependencies=()):
+    runnable = Runnable("noop", name)
+    task = RuntimeTask(Task(runnable, TestID(index, name)))
+    task.dependencies.extend(dependencies)
+    return task
+
+
+def write_results(logs_dir, job, tests):
+    results_dir = os.path.join(logs_dir, job)
+    os.makedirs(results_dir)
+    content = {
+        "tests": [
+            {"name": name, "time_elapsed": elapsed, "status": status}
+            for name, elapsed, status in tests
+        ]
+    }
+    with open(
+        os.path.join(results_dir, "results.json"), "w", encoding="utf-8"
+    ) as results_file:
+        json.dump(content, results_file)
+    return results_dir
+
+
+class DurationHistory(TestCaseTmpDir):
+    def test_from_results_dir(self):
+        write_results(self.tmpdir.name, "job-1", [("a", 1.0, "PASS")])
+        write_results(
+            self.tmpdir.name, "job-2", [("a", 3.0, "FAIL"), ("b", 0.5, "SKIP")]
+        )
+        current = write_results(self.tmpdir.name, "job-3", [("a", 100.0, "PASS")])
+        history = durations.DurationHistory.from_results_dir(
+            self.tmpdir.name, exclude=current
+        )
+        self.assertEqual(len(history), 1)
+        self.assertEqual(history.get("a"), 2.0)
+        self.assertIsNone(history.get("b"))
+
+    def test_from_results_dir_recent_jobs(self):
+        old = write_results(self.tmpdir.name, "job-1", [("a", 1.0, "PASS")])
+        write_results(self.tmpdir.name, "job-2", [("a", 3.0, "PASS")])
+        os.utime(os.path.join(old, "results.json"), (0, 0))
+        history = durations.DurationHistory.from_results_dir(self.tmpdir.name, jobs=1)
+        self.assertEqual(history.get("a"), 3.0)
+
+    def test_expected_durations(self):
+        history = durations.DurationHistory({"a": [4.0], "b": [2.0], "c": [1.0]})
+        known = get_runtime_task(1, "a")
+        unknown = get_runtime_task(2, "z")
+        runnable = Runnable("package", None, name="foo")
+        requirement = RuntimeTask(
+            Task(runnable, "1-requirement", category="dependency")
+        )
+        expected = history.get_expected_durations([known, unknown, requirement])
+        self.assertEqual(expected[known], 4.0)
+        self.assertEqual(expected[unknown], 4.0)
+        self.assertEqual(expected[requirement], 0.0)
+
+
+class Ordering(unittest.TestCase):
+    def test_longest_first(self):
+        short, medium, long = [
+            get_runtime_task(index, name)
+            for index, name in enumerate(("short", "medium", "long"), 1)
+        ]
+        expected = {short: 1.0, medium: 2.0, long: 3.0}
+        self.assertEqual(
+            durations.order_by_duration([short, medium, long], expected),
+            [long, medium, short],
+        )
+
+    def test_dependencies(self):
+        long = get_runtime_task(1, "long")
+        requirement = get_runtime_task(2, "requirement")
+        dependent = get_runtime_task(3, "dependent", [requirement])
+        ties = [get_runtime_task(index, "tie") for index in (4, 5)]
+        expected = {long: 3.0, requirement: 0.0, dependent: 5.0}
+        expected.update(dict.fromkeys(ties, 1.0))
+        ordered = durations.order_by_duration(
+            [long, dependent, ties[0], ties[1], requirement], expected
+        )
+        self.assertEqual(ordered, [requirement, dependent, long, ties[0], ties[1]])
+
+    def test_predict_makespan(self):
+        tasks = [get_runtime_task(index, str(index)) for index in range(1, 5)]
+        expected = dict(zip(tasks, (1.0, 1.0, 1.0, 3.0)))
+        self.assertEqual(durations.predict_makespan(tasks, expected, 2), 4.0)
+        ordered = durations.order_by_duration(tasks, expected)
+        self.assertEqual(durations.predict_makespan(ordered, expected, 2), 3.0)
+        dependent = get_runtime_task(5, "5", [tasks[3]])
+        expected[dependent] = 1.0
+        self.assertEqual(
+            durations.predict_makespan(ordered + [dependent], expected, 4), 4.0
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
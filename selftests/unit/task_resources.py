@@ -0,0 +1,123 @@
+import unittest
+
+from avocado.core.nrunner.runnable import Runnable
+from avocado.core.nrunner.task import Task
+from avocado.core.task import resources
+from avocado.core.task.runtime import RuntimeTask
+from avocado.core.task.statemachine import TaskQueue
+
+JOB_ID = "0000000000000000000000000000000000000000"
+
+
+def get_runtime_task(identifier, cpu=None, memory=None):
+    tags = {}
+    if cpu is not None:
+        tags[resources.RESOURCES_CPU_TAG] = {str(cpu)}
+    if memory is not None:
+        tags[resources.RESOURCES_MEMORY_TAG] = {memory}
+    runnable = Runnable("noop", "noop", tags=tags)
+    return RuntimeTask(Task(runnable, identifier, job_id=JOB_ID))
+
+
+class TaskResources(unittest.TestCase):
+    def test_default(self):
+        runnable = Runnable("noop", "noop")
+        self.assertEqual(
+            resources.TaskResources.from_runnable(runnable),
+            resources.TaskResources(1.0, 0),
+        )
+
+    def test_tags(self):
+        runnable = Runnable(
+            "noop",
+            "noop",
+            tags={
+                resources.RESOURCES_CPU_TAG: {"0.5", "2"},
+                resources.RESOURCES_MEMORY_TAG: {"512m"},
+            },
+        )
+        self.assertEqual(
+            resources.TaskResources.from_runnable(runnable),
+            resources.TaskResources(2.0, 512 * 1024 * 1024),
+        )
+
+    def test_invalid_tags(self):
+        runnable = Runnable(
+            "noop",
+            "noop",
+            tags={
+                resources.RESOURCES_CPU_TAG: {"many"},
+                resources.RESOURCES_MEMORY_TAG: {"lots"},
+            },
+        )
+        with self.assertLogs(resources.LOG, "WARNING"):
+            self.assertEqual(
+                resources.TaskResources.from_runnable(runnable),
+                resources.TaskResources(1.0, 0),
+            )
+
+    def test_runtime_task(self):
+        runtime_task = get_runtime_task("1", cpu=4, memory="1k")
+        self.assertEqual(runtime_task.resources, resources.TaskResources(4.0, 1024))
+
+
+class ResourceBudget(unittest.TestCase):
+    def test_acquire_release(self):
+        budget = resources.ResourceBudget(cpu=4, memory_bytes=2048)
+        first = get_runtime_task("1", cpu=3, memory="1k")
+        second = get_runtime_task("2", cpu=2)
+        self.assertTrue(budget.fits(first.resources))
+        budget.acquire(first, first.resources)
+        self.assertEqual(budget.cpu_in_use, 3)
+        self.assertEqual(budget.memory_in_use, 1024)
+        self.assertFalse(budget.fits(second.resources))
+        budget.release(first)
+        # releasing a task that holds no resources is harmless
+        budget.release(first)
+        self.assertEqual(budget.cpu_in_use, 0)
+        self.assertEqual(budget.memory_in_use, 0)
+        self.assertTrue(budget.fits(second.resources))
+
+    def test_oversized_runs_alone(self):
+        budget = resources.ResourceBudget(cpu=2, memory_bytes=1024)
+        big = get_runtime_task("1", cpu=8, memory="1m")
+        small = get_runtime_task("2")
+        self.assertTrue(budget.fits(big.resources))
+        budget.acquire(big, big.resources)
+        self.assertFalse(budget.fits(small.resources))
+
+    def test_admit_first_fit(self):
+        budget = resources.ResourceBudget(cpu=4, memory_bytes=None)
+        running = get_runtime_task("1", cpu=3)
+        budget.acquire(running, running.resources)
+        head = get_runtime_task("2", cpu=2)
+        fitting = get_runtime_task("3", cpu=1)
+        ready = TaskQueue([fitting])
+        self.assertIs(budget.admit(head, ready), fitting)
+        self.assertEqual(list(ready), [head])
+        self.assertEqual(budget.cpu_in_use, 4)
+        self.assertIsNone(budget.admit(ready.popleft(), ready))
+        self.assertEqual(list(ready), [head])
+
+    def test_admit_bypass_limit(self):
+        budget = resources.ResourceBudget(cpu=4, memory_bytes=None)
+        running = get_runtime_task("running", cpu=3)
+        budget.acquire(running, running.resources)
+        head = get_runtime_task("head", cpu=2)
+        ready = TaskQueue([head])
+        for index in range(resources.RESOURCES_MAX_BYPASS + 1):
+            small = get_runtime_task(str(index), cpu=1)
+            ready.append(small)
+            admitted = budget.admit(ready.popleft(), ready)
+            if index < resources.RESOURCES_MAX_BYPASS:
+                self.assertIs(admitted, small)
+                budget.release(small)
+            else:
+                self.assertIsNone(admitted)
+        self.assertEqual(list(ready), [head, small])
+        budget.release(running)
+        self.assertIs(budget.admit(ready.popleft(), ready), head)
+
+
+if __name__ == "__main__":
+    unittest.main()
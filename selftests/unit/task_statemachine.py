@@ -0,0 +1,234 @@
+import asyncio
+import threading
+import time
+import unittest
+
+from avocado.core.nrunner.runnable import Runnable
+from avocado.core.nrunner.task import Task
+from avocado.core.spawners.mock import MockStatusRepoSpawner
+from avocado.core.status.repo import StatusRepo
+from avocado.core.task import resources, statemachine
+from avocado.core.task.runtime import RuntimeTask, RuntimeTaskStatus
+
+JOB_ID = "0000000000000000000000000000000000000000"
+
+
+def get_runtime_tasks(number_of_tasks):
+    runnable = Runnable("noop", "noop")
+    return [
+        RuntimeTask(Task(runnable, f"{index:03}", job_id=JOB_ID))
+        for index in range(1, number_of_tasks + 1)
+    ]
+
+
+class TaskQueue(unittest.TestCase):
+    def setUp(self):
+        self.runtime_tasks = get_runtime_tasks(3)
+        self.queue = statemachine.TaskQueue(self.runtime_tasks)
+
+    def test_order(self):
+        first, second, third = self.runtime_tasks
+        self.assertEqual(list(self.queue), [first, second, third])
+        self.assertEqual(self.queue.popleft(), first)
+        self.queue.append(first)
+        self.assertEqual(list(self.queue), [second, third, first])
+        self.queue.appendleft(third)
+        self.assertEqual(list(self.queue), [third, second, first])
+        self.assertEqual(self.queue.pop(), first)
+
+    def test_contains_remove(self):
+        first, second, third = self.runtime_tasks
+        self.assertIn(second, self.queue)
+        self.queue.remove(second)
+        self.assertNotIn(second, self.queue)
+        self.assertEqual(list(self.queue), [first, third])
+        with self.assertRaises(ValueError):
+            self.queue.remove(second)
+
+    def test_empty(self):
+        queue = statemachine.TaskQueue()
+        self.assertFalse(queue)
+        self.assertEqual(len(queue), 0)
+        with self.assertRaises(IndexError):
+            queue.popleft()
+        with self.assertRaises(IndexError):
+            queue.pop()
+
+
+class TaskStateMachine(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+
+    def tearDown(self):
+        self.loop.close()
+
+    def run_workers(
+        self,
+        runtime_tasks,
+        number_of_workers,
+        max_triaging=None,
+        max_running=None,
+        resource_budget=None,
+        spawner=None,
+        start_checks=None,
+    ):
+        status_repo = StatusRepo(JOB_ID)
+        if spawner is None:
+            spawner = MockStatusRepoSpawner(status_repo)
+        else:
+            spawner = spawner(status_repo)
+        state_machine = statemachine.TaskStateMachine(
+            runtime_tasks, status_repo, resource_budget, start_checks
+        )
+        workers = [
+            statemachine.Worker(
+                state_machine,
+                spawner,
+                max_triaging=max_triaging,
+                max_running=max_running,
+            ).run()
+            for _ in range(number_of_workers)
+        ]
+        self.loop.run_until_complete(asyncio.wait_for(asyncio.gather(*workers), 10))
+        return state_machine
+
+    def test_all_finished(self):
+        runtime_tasks = get_runtime_tasks(200)
+        state_machine = self.run_workers(runtime_tasks, 8)
+        self.assertEqual(len(state_machine.finished), 200)
+        for runtime_task in runtime_tasks:
+            self.assertEqual(runtime_task.result, "pass")
+
+    def test_dependencies_wakeup(self):
+        runtime_tasks = get_runtime_tasks(10)
+        # the first task depends on the last one, and will only be able to
+        # run after a transition notifies it has finished
+        runtime_tasks[0].dependencies.append(runtime_tasks[-1])
+        state_machine = self.run_workers(
+            runtime_tasks, 2, max_triaging=10, max_running=1
+        )
+        self.assertEqual(len(state_machine.finished), 10)
+        self.assertEqual(state_machine.finished.pop(), runtime_tasks[0])
+        self.assertEqual(runtime_tasks[0].status, RuntimeTaskStatus.FINISHED)
+
+    def test_start_checks(self):
+        runtime_tasks = get_runtime_tasks(5)
+        held = Runnable("noop", "noop")
+        runtime_tasks[0] = RuntimeTask(Task(held, "001", job_id=JOB_ID))
+
+        def others_finished(runnable):
+            if runnable is not held:
+                return True
+            return all(
+                runtime_task.status == RuntimeTaskStatus.FINISHED
+                for runtime_task in runtime_tasks[1:]
+            )
+
+        state_machine = self.run_workers(
+            runtime_tasks, 2, max_running=2, start_checks=[others_finished]
+        )
+        self.assertEqual(len(state_machine.finished), 5)
+        self.assertEqual(state_machine.finished.pop(), runtime_tasks[0])
+        self.assertEqual(runtime_tasks[0].result, "pass")
+
+    def test_held_task_yields(self):
+        runtime_tasks = get_runtime_tasks(3)
+        held = Runnable("noop", "noop")
+        runtime_tasks[0] = RuntimeTask(Task(held, "001", job_id=JOB_ID))
+        fetched = threading.Event()
+        checks = []
+
+        def is_fetched(runnable):
+            if runnable is not held:
+                return True
+            checks.append(time.monotonic())
+            return fetched.is_set()
+
+        status_repo = StatusRepo(JOB_ID)
+        spawner = MockStatusRepoSpawner(status_repo)
+        state_machine = statemachine.TaskStateMachine(
+            runtime_tasks, status_repo, start_checks=[is_fetched]
+        )
+        ticks = []
+
+        async def other():
+            # keeps running while the task is held
+            while len(ticks) < 20:
+                ticks.append(time.monotonic())
+                await asyncio.sleep(0.01)
+            fetched.set()
+            # as an asset fetched in another thread would
+            thread = threading.Thread(target=state_machine.release_held_threadsafe)
+            thread.start()
+            thread.join()
+
+        workers = [
+            statemachine.Worker(state_machine, spawner, max_running=2).run()
+            for _ in range(2)
+        ]
+        self.loop.run_until_complete(
+            asyncio.wait_for(asyncio.gather(other(), *workers), 10)
+        )
+        self.assertEqual(len(ticks), 20)
+        self.assertEqual(len(state_machine.finished), 3)
+        self.assertEqual(runtime_tasks[0].result, "pass")
+        # checked again when woken up, not in a busy loop
+        self.assertLess(len(checks), 10)
+        self.assertLess(checks[-1] - ticks[-1], statemachine.TRANSITION_WAIT_TIMEOUT)
+
+    def test_resource_budget(self):
+        budget = resources.ResourceBudget(cpu=4, memory_bytes=None)
+        runtime_tasks = []
+        for index in range(1, 21):
+            cpu = 3 if index % 2 else 1
+            runnable = Runnable(
+                "noop", "noop", tags={resources.RESOURCES_CPU_TAG: {str(cpu)}}
+            )
+            runtime_tasks.append(
+                RuntimeTask(Task(runnable, f"{index:03}", job_id=JOB_ID))
+            )
+        cpu_in_use = []
+
+        class Spawner(MockStatusRepoSpawner):
+            async def spawn_task(self, runtime_task):
+                cpu_in_use.append(budget.cpu_in_use)
+                await asyncio.sleep(0.01)
+                return await super().spawn_task(runtime_task)
+
+        state_machine = self.run_workers(
+            runtime_tasks,
+            8,
+            max_running=8,
+            resource_budget=budget,
+            spawner=Spawner,
+        )
+        self.assertEqual(len(state_machine.finished), 20)
+        self.assertEqual(len(cpu_in_use), 20)
+        self.assertLessEqual(max(cpu_in_use), 4)
+        self.assertEqual(budget.cpu_in_use, 0)
+        for runtime_task in runtime_tasks:
+            self.assertEqual(runtime_task.result, "pass")
+
+    def test_wait_for_transition(self):
+        state_machine = statemachine.TaskStateMachine([], StatusRepo(JOB_ID))
+
+        async def notify():
+            async with state_machine.lock:
+                state_machine.notify_transition()
+
+        async def wait():
+            since = state_machine.transitions
+            self.loop.call_soon(asyncio.ensure_future, notify())
+            return await state_machine.wait_for_transition(since, 5)
+
+        self.assertTrue(self.loop.run_until_complete(wait()))
+        self.assertFalse(
+            self.loop.run_until_complete(
+                state_machine.wait_for_transition(state_machine.transitions, 0.01)
+            )
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,8 +1,18 @@
+import hashlib
+import json
 import os
 import tempfile
+import time
 import unittest
+import unittest.mock
 
-from avocado.utils.asset import Asset
+from avocado.utils.asset import (
+    CATALOG_FILENAME,
+    STORE_DIRNAME,
+    Asset,
+    AssetCatalog,
+    AssetStore,
+)
 from selftests.utils import TestCaseTmpDir, setup_avocado_loggers
 
 setup_avocado_loggers()
@@ -61,5 +71,274 @@ class TestAsset(TestCaseTmpDir):
         self.assertEqual(result, 2, msg)
 
 
+class Catalog(TestCaseTmpDir):
+    def setUp(self):
+        super().setUp()
+        self.cache_dir = os.path.join(self.tmpdir.name, "cache")
+        self.by_name = os.path.join(self.cache_dir, "by_name")
+        os.makedirs(self.by_name)
+        self.small = self.create_asset("small.img", 1)
+        self.big = self.create_asset("big.img", 100)
+        with open(f"{self.big}-CHECKSUM", "w", encoding="utf-8") as hash_file:
+            hash_file.write(f"sha1 {40 * 'a'}\n")
+        with open(
+            os.path.join(self.by_name, "big_metadata.json"), "w", encoding="utf-8"
+        ) as metadata_file:
+            json.dump({"type": "vmimage"}, metadata_file)
+        # not assets
+        self.create_asset("small.img.lock", 5)
+        self.create_asset("other.img-PARTIAL", 10)
+        os.utime(self.small, (1000, 1000))
+        os.utime(self.big, (2000, 2000))
+
+    def tearDown(self):
+        AssetCatalog.close_connections()
+        super().tearDown()
+
+    def create_asset(self, name, size):
+        path = os.path.join(self.by_name, name)
+        with open(path, "wb") as asset_file:
+            asset_file.write(b"a" * size)
+        return path
+
+    def test_rescan(self):
+        catalog = AssetCatalog(self.cache_dir)
+        entries = catalog.get_entries()
+        self.assertTrue(os.path.isfile(os.path.join(self.cache_dir, CATALOG_FILENAME)))
+        self.assertEqual([entry.path for entry in entries], [self.big, self.small])
+        self.assertEqual(entries[0].name, "big.img")
+        self.assertEqual(entries[0].asset_hash, 40 * "a")
+        self.assertEqual(entries[0].algorithm, "sha1")
+        self.assertEqual(entries[0].size, 100)
+        self.assertEqual(entries[0].atime, 2000)
+        self.assertEqual(json.loads(entries[0].metadata), {"type": "vmimage"})
+        self.assertIsNone(entries[1].asset_hash)
+        # changes made by other means are found by a rescan
+        os.remove(self.small)
+        new = self.create_asset("new.img", 10)
+        self.assertEqual(len(AssetCatalog(self.cache_dir).get_entries()), 2)
+        self.assertEqual(catalog.rescan(), 2)
+        self.assertEqual(
+            sorted(entry.path for entry in catalog.get_entries()), [self.big, new]
+        )
+
+    def test_add_touch_remove(self):
+        catalog = AssetCatalog(self.cache_dir)
+        catalog.rescan()
+        catalog.touch(self.small)
+        entries = catalog.get_entries()
+        self.assertEqual(entries[0].path, self.small)
+        self.assertGreater(entries[0].atime, time.time() - 60)
+        # recent enough not to be written again
+        catalog.touch(self.small)
+        self.assertEqual(catalog.get_entries()[0].atime, entries[0].atime)
+        new = self.create_asset("new.img", 10)
+        catalog.add(new, 40 * "b", "sha1")
+        self.assertEqual(catalog.get_entries()[0].asset_hash, 40 * "b")
+        catalog.remove(new)
+        catalog.remove(self.small)
+        self.assertEqual([entry.path for entry in catalog.get_entries()], [self.big])
+
+    def test_shared_connection(self):
+        connection = AssetCatalog(self.cache_dir)._connect()
+        self.assertIs(AssetCatalog(self.cache_dir)._connect(), connection)
+        AssetCatalog.close_connections()
+        self.assertIsNot(AssetCatalog(self.cache_dir)._connect(), connection)
+
+    def test_unusable_database(self):
+        # a directory in the way of the database
+        os.mkdir(os.path.join(self.cache_dir, CATALOG_FILENAME))
+        catalog = AssetCatalog(self.cache_dir)
+        with unittest.mock.patch.object(AssetCatalog, "_rescan") as rescan:
+            catalog.add(self.small)
+            catalog.touch(self.big)
+            catalog.remove(self.small)
+            rescan.assert_not_called()
+        entries = catalog.get_entries()
+        self.assertEqual([entry.path for entry in entries], [self.big, self.small])
+        self.assertEqual(catalog.rescan(), 2)
+
+    def test_for_path(self):
+        self.assertIsNone(AssetCatalog.for_path(self.small))
+        AssetCatalog(self.cache_dir).rescan()
+        self.assertEqual(AssetCatalog.for_path(self.small).cache_dir, self.cache_dir)
+        Asset.remove_asset_by_path(self.small)
+        self.assertEqual(Asset.get_all_assets([self.cache_dir]), [self.big])
+
+    def test_filters(self):
+        cache_dirs = [self.cache_dir]
+        self.assertEqual(Asset.get_assets_by_size(">=100", cache_dirs), [self.big])
+        self.assertEqual(Asset.get_assets_by_size("<100", cache_dirs), [self.small])
+        self.assertEqual(
+            Asset.get_assets_unused_for_days(1, cache_dirs), [self.big, self.small]
+        )
+        AssetCatalog(self.cache_dir).touch(self.big)
+        self.assertEqual(Asset.get_assets_unused_for_days(1, cache_dirs), [self.small])
+        with self.assertRaises(OSError):
+            Asset.get_assets_by_size("~100", cache_dirs)
+
+    def test_remove_partial_downloads(self):
+        old = self.create_asset("old.img-PARTIAL", 10)
+        old_journal = self.create_asset("old.img-PARTIAL.journal", 10)
+        orphan_journal = self.create_asset("orphan.img-PARTIAL.journal", 10)
+        # the partial file is old, but its journal was just written to
+        resumed = self.create_asset("resumed.img-PARTIAL", 10)
+        self.create_asset("resumed.img-PARTIAL.journal", 10)
+        for path in (old, old_journal, orphan_journal, resumed):
+            os.utime(path, (1000, 1000))
+        # the assets, all unused for days, go along
+        Asset.remove_assets_by_unused_for_days(1, [self.cache_dir])
+        self.assertEqual(
+            sorted(os.listdir(self.by_name)),
+            [
+                "big_metadata.json",
+                "other.img-PARTIAL",
+                "resumed.img-PARTIAL",
+                "resumed.img-PARTIAL.journal",
+                "small.img.lock",
+            ],
+        )
+
+    def test_remove_by_overall_limit(self):
+        Asset.remove_assets_by_overall_limit(50, [self.cache_dir])
+        self.assertEqual(Asset.get_all_assets([self.cache_dir]), [])
+        self.assertFalse(os.path.exists(self.big))
+
+    def test_no_cache_dir(self):
+        missing = os.path.join(self.tmpdir.name, "missing")
+        self.assertEqual(Asset.get_all_assets([missing]), [])
+        AssetCatalog(missing).add(self.small)
+        self.assertFalse(os.path.exists(missing))
+
+
+class Store(TestCaseTmpDir):
+    def setUp(self):
+        super().setUp()
+        self.cache_dir = os.path.join(self.tmpdir.name, "cache")
+        self.content = b"a" * 100
+        self.hash = hashlib.sha1(self.content).hexdigest()
+        self.first = self.create_asset("by_name/first.img", self.content)
+        self.second = self.create_asset(f"by_location/{40 * 'f'}/b.img", self.content)
+        self.other = self.create_asset("by_name/other.img", b"b" * 10)
+        self.local = os.path.join(self.cache_dir, "by_name", "local.img")
+        os.symlink(self.other, self.local)
+        # as on a filesystem with reflinks, where the clones that can't be
+        # made as reflinks fall back to copies
+        patcher = unittest.mock.patch(
+            "avocado.utils.asset._supports_reflinks", return_value=True
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        AssetCatalog.close_connections()
+        super().tearDown()
+
+    def create_asset(self, name, content):
+        path = os.path.join(self.cache_dir, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as asset_file:
+            asset_file.write(content)
+        return path
+
+    def test_migrate(self):
+        store = AssetStore(self.cache_dir)
+        self.assertFalse(store.enabled)
+        # the space is freed only where reflinks can be used
+        self.assertEqual(store.migrate()[0], 3)
+        self.assertTrue(store.enabled)
+        self.assertFalse(store.hardlinks)
+        content_path = store.get_content_path(self.hash, "sha1")
+        self.assertFalse(os.path.samefile(self.first, content_path))
+        self.assertFalse(os.path.samefile(self.second, content_path))
+        self.assertEqual(
+            Asset.read_hash_from_file(f"{self.second}-CHECKSUM"), ["sha1", self.hash]
+        )
+        with open(self.second, "rb") as asset_file:
+            self.assertEqual(asset_file.read(), self.content)
+        # the content in the store is not an asset by itself
+        self.assertEqual(AssetCatalog(self.cache_dir).rescan(), 4)
+        self.assertEqual(store.migrate()[0], 3)
+
+    def test_migrate_hardlinks(self):
+        store = AssetStore(self.cache_dir)
+        self.assertEqual(store.migrate(hardlinks=True), (3, 100, 0))
+        self.assertTrue(store.hardlinks)
+        content_path = store.get_content_path(self.hash, "sha1")
+        self.assertTrue(os.path.samefile(self.first, content_path))
+        self.assertTrue(os.path.samefile(self.second, content_path))
+        self.assertEqual(store.migrate(hardlinks=True), (3, 0, 0))
+        # back to files of their own
+        self.assertEqual(store.migrate()[:2], (3, 0))
+        self.assertFalse(store.hardlinks)
+        self.assertFalse(os.path.samefile(self.first, content_path))
+        self.assertFalse(os.path.samefile(self.second, content_path))
+        with open(self.second, "rb") as asset_file:
+            self.assertEqual(asset_file.read(), self.content)
+
+    def test_migrate_no_reflinks(self):
+        store = AssetStore(self.cache_dir)
+        with unittest.mock.patch(
+            "avocado.utils.asset._supports_reflinks", return_value=False
+        ):
+            # the store would only add a copy of each asset
+            with self.assertRaises(OSError):
+                store.migrate()
+            self.assertFalse(store.enabled)
+            self.assertEqual(store.migrate(hardlinks=True), (3, 100, 0))
+
+    def test_modified_hardlink(self):
+        store = AssetStore(self.cache_dir)
+        store.migrate(hardlinks=True)
+        content_path = store.get_content_path(self.hash, "sha1")
+        # modified in place, by a user allowed to
+        os.chmod(self.first, 0o644)
+        with open(self.first, "ab") as asset_file:
+            asset_file.write(b"b")
+        new = os.path.join(self.cache_dir, "by_name", "new.img")
+        self.assertFalse(store.materialize(new, self.hash, "sha1"))
+        self.assertFalse(os.path.exists(new))
+        self.assertFalse(os.path.exists(content_path))
+
+    def test_migrate_unused(self):
+        store = AssetStore(self.cache_dir)
+        store.migrate()
+        os.remove(self.other)
+        self.assertEqual(store.migrate()[:2], (2, 10))
+        self.assertEqual(
+            os.listdir(os.path.join(self.cache_dir, STORE_DIRNAME, "sha1")),
+            [self.hash[:2]],
+        )
+
+    def test_for_path(self):
+        self.assertIsNone(AssetStore.for_path(self.first))
+        AssetStore(self.cache_dir).migrate()
+        self.assertEqual(AssetStore.for_path(self.second).cache_dir, self.cache_dir)
+
+    def test_fetch_from_store(self):
+        AssetStore(self.cache_dir).migrate()
+        asset = Asset(
+            "new.img",
+            asset_hash=self.hash,
+            algorithm="sha1",
+            locations=["http://127.0.0.1:1/new.img"],
+            cache_dirs=[self.cache_dir],
+        )
+        path = asset.fetch()
+        self.assertEqual(path, os.path.join(self.cache_dir, "by_name", "new.img"))
+        with open(path, "rb") as asset_file:
+            self.assertEqual(asset_file.read(), self.content)
+        self.assertEqual(asset.find_asset_file(), path)
+
+    def test_remove(self):
+        store = AssetStore(self.cache_dir)
+        store.migrate()
+        content_path = store.get_content_path(self.hash, "sha1")
+        Asset.remove_asset_by_path(self.first)
+        self.assertTrue(os.path.isfile(content_path))
+        Asset.remove_asset_by_path(self.second)
+        self.assertFalse(os.path.exists(content_path))
+
+
 if __name__ == "__main__":
     unittest.main()
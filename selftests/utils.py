@@ -1,7 +1,11 @@
+import functools
+import http.server
+import io
 import logging
 import os
 import sys
 import tempfile
+import threading
 import unittest
 
 import pkg_resources
@@ -172,3 +176,59 @@ class TestCaseTmpDir(unittest.TestCase):
 
     def tearDown(self):
         self.tmpdir.cleanup()
+
+
+class RangeHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
+    """
+    Serves files, supporting requests of a single range of bytes.
+
+    The ranges requested are recorded in the ``ranges`` list of the server
+    (None for whole files) and, if the ``limit`` of the server is set, no more than that number
+    of bytes are sent for each request, as if the connection was lost.
+    """
+
+    def end_headers(self):
+        self.send_header("Accept-Ranges", "bytes")
+        super().end_headers()
+
+    def send_head(self):
+        range_header = self.headers.get("Range")
+        if range_header is None:
+            if self.command == "GET":
+                self.server.ranges.append(None)
+            return super().send_head()
+        path = self.translate_path(self.path)
+        size = os.path.getsize(path)
+        start, stop = range_header.split("=", 1)[1].split("-")
+        start = int(start)
+        stop = int(stop) + 1 if stop else size
+        self.server.ranges.append((start, stop))
+        with open(path, "rb") as served_file:
+            served_file.seek(start)
+            data = served_file.read(stop - start)
+        self.send_response(206)
+        self.send_header("Content-Range", f"bytes {start}-{stop - 1}/{size}")
+        self.send_header("Content-Length", str(stop - start))
+        self.end_headers()
+        return io.BytesIO(data[: self.server.limit])
+
+    def log_message(self, *args):  # pylint: disable=W0221
+        pass
+
+
+def start_http_server(directory, handler=RangeHTTPRequestHandler):
+    """
+    Starts serving the files in a directory, on a random local port.
+
+    :param directory: the directory whose files are served
+    :param handler: the request handler class
+    :returns: the server, which should be shut down by the caller
+    :rtype: :class:`http.server.ThreadingHTTPServer`
+    """
+    server = http.server.ThreadingHTTPServer(
+        ("127.0.0.1", 0), functools.partial(handler, directory=directory)
+    )
+    server.ranges = []
+    server.limit = None
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
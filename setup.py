@@ -395,10 +395,12 @@ if __name__ == "__main__":
                 "run = avocado.plugins.run:RunInit",
                 "podman = avocado.plugins.spawners.podman:PodmanSpawnerInit",
                 "lxc = avocado.plugins.spawners.lxc:LXCSpawnerInit",
+                "process = avocado.plugins.spawners.process:ProcessSpawnerInit",
                 "nrunner = avocado.plugins.runner_nrunner:RunnerInit",
                 "testlogsui = avocado.plugins.testlogs:TestLogsUIInit",
                 "human = avocado.plugins.human:HumanInit",
                 "exec-runnables-recipe = avocado.plugins.resolvers:ExecRunnablesRecipeInit",
+                "python-resolvers = avocado.plugins.resolvers:PythonResolversInit",
             ],
             "avocado.plugins.cli": [
                 "xunit = avocado.plugins.xunit:XUnitCLI",
@@ -410,6 +412,7 @@ if __name__ == "__main__":
                 "json_variants = avocado.plugins.json_variants:JsonVariantsCLI",
                 "nrunner = avocado.plugins.runner_nrunner:RunnerCLI",
                 "podman = avocado.plugins.spawners.podman:PodmanCLI",
+                "process = avocado.plugins.spawners.process:ProcessSpawnerCLI",
             ],
             "avocado.plugins.cli.cmd": [
                 "config = avocado.plugins.config:Config",
@@ -497,6 +500,8 @@ if __name__ == "__main__":
             ],
             "avocado.plugins.cache": [
                 "requirement = avocado.plugins.requirement_cache:RequirementCache",
+                "runners = avocado.plugins.runners_cache:RunnersCache",
+                "safeloader = avocado.plugins.safeloader_cache:SafeloaderCache",
             ],
         },
         zip_safe=False,